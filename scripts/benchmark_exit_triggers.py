@@ -0,0 +1,103 @@
+"""
+Benchmark: bisect-ladder exit triggers vs. scanning every open trade per tick.
+
+Usage:
+    python scripts/benchmark_exit_triggers.py [--positions 10000] [--symbols 500] [--ticks 20000] [--volatility 0.005]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.models.paper_trading import PaperTrade, TradeStatus, TradeType  # noqa: E402
+from src.services.paper_trading.exit_trigger_engine import ExitTriggerEngine  # noqa: E402
+from src.stores.open_position_index import OpenPositionIndex  # noqa: E402
+
+
+def _synthetic_trades(n_positions: int, n_symbols: int, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    base_prices = rng.uniform(100, 2000, n_symbols)
+    trades = []
+    for i in range(n_positions):
+        entry = float(base_prices[i % n_symbols] * rng.uniform(0.98, 1.02))
+        long = bool(rng.random() < 0.7)
+        stop_gap, target_gap = rng.uniform(0.01, 0.08), rng.uniform(0.02, 0.15)
+        trades.append(PaperTrade(
+            trade_id=f"trade_{i:06d}",
+            account_id=f"acct_{i % 25}",
+            symbol=f"SYM{i % n_symbols:04d}",
+            trade_type=TradeType.BUY if long else TradeType.SELL,
+            quantity=int(rng.integers(1, 100)),
+            entry_price=entry,
+            entry_timestamp="2026-01-01T09:15:00+00:00",
+            strategy_rationale="benchmark",
+            claude_session_id="benchmark",
+            stop_loss=entry * (1 - stop_gap if long else 1 + stop_gap),
+            target_price=entry * (1 + target_gap if long else 1 - target_gap),
+        ))
+    return trades, base_prices
+
+
+def _scan(trades_by_symbol, symbol, price):
+    fired = []
+    for trade in trades_by_symbol.get(symbol, ()):
+        if trade.is_stop_loss_triggered(price):
+            fired.append((trade.trade_id, TradeStatus.STOPPED_OUT))
+        elif trade.is_target_hit(price):
+            fired.append((trade.trade_id, TradeStatus.CLOSED))
+    return fired
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--positions", type=int, default=10_000)
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--ticks", type=int, default=20_000)
+    parser.add_argument("--volatility", type=float, default=0.005, help="Std-dev of tick moves around the symbol price")
+    args = parser.parse_args()
+
+    trades, base_prices = _synthetic_trades(args.positions, args.symbols)
+    index = OpenPositionIndex()
+    index.load(trades)
+
+    started = time.perf_counter()
+    engine = ExitTriggerEngine(None, SimpleNamespace(open_positions=index))
+    build = time.perf_counter() - started
+
+    trades_by_symbol = {}
+    for trade in trades:
+        trades_by_symbol.setdefault(trade.symbol, []).append(trade)
+
+    rng = np.random.default_rng(11)
+    symbol_ids = rng.integers(0, args.symbols, size=args.ticks)
+    moves = rng.normal(0, args.volatility, size=args.ticks)
+    ticks = [
+        (f"SYM{symbol_id:04d}", float(base_prices[symbol_id] * (1 + move)))
+        for symbol_id, move in zip(symbol_ids, moves)
+    ]
+
+    started = time.perf_counter()
+    ladder_fired = sum(len(engine.evaluate(symbol, price)) for symbol, price in ticks)
+    ladder = time.perf_counter() - started
+
+    started = time.perf_counter()
+    scan_fired = sum(len(_scan(trades_by_symbol, symbol, price)) for symbol, price in ticks)
+    scan = time.perf_counter() - started
+
+    assert ladder_fired == scan_fired, (ladder_fired, scan_fired)
+    print(f"positions={args.positions} symbols={args.symbols} ticks={args.ticks} armed_levels={engine.armed_levels()}")
+    print(f"ladder build: {build * 1000:.1f} ms")
+    print(f"{'method':>8} {'total (s)':>10} {'per tick (us)':>14} {'crossings':>10}")
+    print(f"{'scan':>8} {scan:>10.3f} {scan / args.ticks * 1e6:>14.2f} {scan_fired:>10}")
+    print(f"{'ladder':>8} {ladder:>10.3f} {ladder / args.ticks * 1e6:>14.2f} {ladder_fired:>10}")
+    print(f"speedup: {scan / ladder:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
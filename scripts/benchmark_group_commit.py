@@ -0,0 +1,111 @@
+"""
+Benchmark: commit-per-write vs. group commit for tick-style inserts.
+
+Writes --rows quote upserts to a fresh SQLite file four ways:
+  per-commit        one commit per statement on a rollback-journal database (the old store pattern)
+  per-commit (wal)  the same with WAL + synchronous=NORMAL
+  group writer      GroupCommitWriter buffering on a count/interval trigger
+  pooled writers    --writers concurrent tasks awaiting SQLiteConnectionPool.execute_write
+
+Usage:
+    python scripts/benchmark_group_commit.py [--rows 5000] [--writers 50] [--batch 500] [--interval-ms 50]
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import aiosqlite
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.core.database_state.connection_pool import SQLiteConnectionPool, configure_connection  # noqa: E402
+from src.core.group_commit import GroupCommitWriter  # noqa: E402
+
+SCHEMA = "CREATE TABLE IF NOT EXISTS quotes (symbol TEXT PRIMARY KEY, last_price REAL NOT NULL, ts REAL NOT NULL)"
+UPSERT = "INSERT OR REPLACE INTO quotes (symbol, last_price, ts) VALUES (?, ?, ?)"
+
+
+def _rows(n_rows: int):
+    return [(f"SYM{i % 2000:04d}", 100.0 + i * 0.01, float(i)) for i in range(n_rows)]
+
+
+async def _per_commit(path: Path, rows, wal: bool):
+    db = await aiosqlite.connect(str(path))
+    if wal:
+        await configure_connection(db, 5000)
+    await db.execute(SCHEMA)
+    started = time.perf_counter()
+    for row in rows:
+        await db.execute(UPSERT, row)
+        await db.commit()
+    elapsed = time.perf_counter() - started
+    await db.close()
+    return elapsed, len(rows)
+
+
+async def _group_writer(path: Path, rows, batch: int, interval_ms: float):
+    db = await aiosqlite.connect(str(path))
+    await configure_connection(db, 5000)
+    await db.execute(SCHEMA)
+    await db.commit()
+    writer = GroupCommitWriter.for_connection(db, max_batch=batch, max_delay_ms=interval_ms, name="bench")
+    started = time.perf_counter()
+    for row in rows:
+        await writer.execute(UPSERT, row)
+    await writer.close()
+    elapsed = time.perf_counter() - started
+    commits = writer.get_stats()["commits"]
+    await db.close()
+    return elapsed, commits
+
+
+async def _pooled_writers(path: Path, rows, writers: int):
+    pool = SQLiteConnectionPool(path, reader_count=1)
+    await pool.open()
+    await pool.writer.execute(SCHEMA)
+
+    async def _worker(chunk):
+        for row in chunk:
+            await pool.execute_write(UPSERT, row, store="bench")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(_worker(rows[index::writers]) for index in range(writers)))
+    elapsed = time.perf_counter() - started
+    commits = pool.get_stats()["batches"]
+    await pool.close()
+    return elapsed, commits
+
+
+async def _run(args) -> None:
+    rows = _rows(args.rows)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        results = [
+            ("per-commit", await _per_commit(tmp_dir / "a.db", rows, wal=False)),
+            ("per-commit (wal)", await _per_commit(tmp_dir / "b.db", rows, wal=True)),
+            ("group writer", await _group_writer(tmp_dir / "c.db", rows, args.batch, args.interval_ms)),
+            (f"pooled x{args.writers}", await _pooled_writers(tmp_dir / "d.db", rows, args.writers)),
+        ]
+
+    baseline = results[0][1][0]
+    print(f"rows={args.rows} batch={args.batch} interval_ms={args.interval_ms} writers={args.writers}")
+    print(f"{'method':>18} {'total (s)':>10} {'inserts/s':>12} {'commits':>8} {'speedup':>8}")
+    for name, (elapsed, commits) in results:
+        print(f"{name:>18} {elapsed:>10.3f} {args.rows / elapsed:>12.0f} {commits:>8} {baseline / elapsed:>7.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=5_000)
+    parser.add_argument("--writers", type=int, default=50, help="Concurrent tasks for the pooled writer run")
+    parser.add_argument("--batch", type=int, default=500, help="GroupCommitWriter max_batch")
+    parser.add_argument("--interval-ms", type=float, default=50.0, help="GroupCommitWriter max_delay_ms")
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark: per-call overhead of a fresh httpx client vs. the pooled client.
+
+Starts a local keep-alive stub of the Codex runtime health endpoint, then
+issues --calls requests (sequentially, and --concurrency at a time) two ways:
+  fresh client   ``async with httpx.AsyncClient()`` per request (the old pattern)
+  pooled client  CodexRuntimeClient on a long-lived HttpClientPool client
+
+Loopback TCP setup is the cheapest it will ever be; against a remote host
+with TLS the gap is larger.
+
+Usage:
+    python scripts/benchmark_http_pooling.py [--calls 500] [--concurrency 20]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.core.http_clients import HttpClientPool  # noqa: E402
+from src.services.codex_runtime_client import CodexRuntimeClient  # noqa: E402
+
+BODY = json.dumps({"status": "ready", "authenticated": True}).encode("utf-8")
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_GET(self):  # noqa: N802
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        return
+
+
+async def _fresh_call(base_url: str) -> None:
+    async with httpx.AsyncClient(timeout=10.0) as client:
+        response = await client.get(f"{base_url}/health")
+        response.json()
+
+
+async def _run(label: str, call, calls: int, concurrency: int) -> None:
+    started = time.perf_counter()
+    for _ in range(calls):
+        await call()
+    sequential = time.perf_counter() - started
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _bounded():
+        async with semaphore:
+            await call()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(_bounded() for _ in range(calls)))
+    concurrent = time.perf_counter() - started
+
+    print(f"{label:>15} {sequential / calls * 1e6:>18.1f} {calls / concurrent:>20.0f}")
+
+
+async def main_async(calls: int, concurrency: int) -> None:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    pool = HttpClientPool()
+    pooled = CodexRuntimeClient(base_url, timeout_seconds=10.0, http_client=pool.get("codex_runtime", timeout=10.0))
+
+    # Warm both paths so imports and the first connection are not measured
+    await _fresh_call(base_url)
+    await pooled.get_health()
+
+    print(f"calls={calls} concurrency={concurrency}")
+    print(f"{'method':>15} {'sequential (us/call)':>18} {'concurrent (calls/s)':>20}")
+    try:
+        await _run("fresh client", lambda: _fresh_call(base_url), calls, concurrency)
+        await _run("pooled client", pooled.get_health, calls, concurrency)
+    finally:
+        await pool.close()
+        server.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main_async(args.calls, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark: cold-start symbol resolution from the provider dump vs. the instrument master index.
+
+Builds a synthetic Upstox-style BOD file with --instruments rows, then resolves
+--symbols symbols the old way (gunzip + json.loads + build a dict on every
+process start) and the new way (mmap the compiled index + hash probes).
+
+Usage:
+    python scripts/benchmark_instrument_master.py [--instruments 9000] [--symbols 2000]
+"""
+
+import argparse
+import gzip
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.services.instrument_master import InstrumentIndex, upstox_instruments_from_json  # noqa: E402
+
+
+def _bod_records(n_instruments: int):
+    return [
+        {
+            "segment": "NSE_EQ",
+            "instrument_type": "EQ",
+            "trading_symbol": f"SYM{index:05d}",
+            "instrument_key": f"NSE_EQ|INE{index:09d}",
+            "name": f"Synthetic Company {index} Limited",
+            "exchange": "NSE",
+            "isin": f"INE{index:09d}",
+            "lot_size": 1,
+            "tick_size": 5.0,
+            "freeze_quantity": 100000.0,
+            "exchange_token": str(100000 + index),
+            "security_type": "NORMAL",
+        }
+        for index in range(n_instruments)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--instruments", type=int, default=9_000)
+    parser.add_argument("--symbols", type=int, default=2_000)
+    args = parser.parse_args()
+
+    records = _bod_records(args.instruments)
+    symbols = [f"SYM{index:05d}" for index in range(0, args.instruments, max(1, args.instruments // args.symbols))][: args.symbols]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        dump_path = Path(tmp) / "NSE.json.gz"
+        index_path = Path(tmp) / "upstox_nse.idx"
+        dump_path.write_bytes(gzip.compress(json.dumps(records).encode("utf-8")))
+        InstrumentIndex.write(index_path, upstox_instruments_from_json(records), "2026-01-01")
+
+        started = time.perf_counter()
+        parsed = json.loads(gzip.decompress(dump_path.read_bytes()).decode("utf-8"))
+        symbol_map = {
+            item["trading_symbol"].upper(): item["instrument_key"]
+            for item in parsed
+            if item.get("segment") == "NSE_EQ" and item.get("instrument_type") in {"EQ", "BE"}
+        }
+        old_keys = [symbol_map.get(symbol) for symbol in symbols]
+        old_elapsed = time.perf_counter() - started
+
+        started = time.perf_counter()
+        index = InstrumentIndex(index_path)
+        new_keys = [instrument.key if instrument else None for instrument in map(index.get, symbols)]
+        new_elapsed = time.perf_counter() - started
+        index.close()
+
+        assert old_keys == new_keys
+        dump_kb = dump_path.stat().st_size / 1024
+        index_kb = index_path.stat().st_size / 1024
+
+    print(f"instruments={args.instruments} symbols resolved={len(symbols)}")
+    print(f"{'method':>22} {'cold start (ms)':>16} {'file (KiB)':>11}")
+    print(f"{'json dump + dict':>22} {old_elapsed * 1000:>16.2f} {dump_kb:>11.0f}")
+    print(f"{'mmap instrument index':>22} {new_elapsed * 1000:>16.2f} {index_kb:>11.0f}")
+    print(f"speedup: {old_elapsed / new_elapsed:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
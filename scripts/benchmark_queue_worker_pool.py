@@ -0,0 +1,92 @@
+"""
+Load test: scheduler throughput vs. worker count.
+
+Queues --tasks FUNDAMENTALS_UPDATE tasks whose stub handler sleeps for
+--handler-ms (an I/O-bound task), then drains them through a QueueWorkerPool
+backed by the real SchedulerTaskService/SchedulerTaskStore on a temporary
+SQLite database, once per worker count. Sequential (1 worker) is the old
+one-thread-per-queue behaviour.
+
+Usage:
+    python scripts/benchmark_queue_worker_pool.py [--tasks 200] [--handler-ms 50] [--workers 1,2,4,8,16]
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import aiosqlite
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.models.scheduler import QueueName, TaskType  # noqa: E402
+from src.services.scheduler.queue_worker_pool import QueueConcurrencyPolicy, QueueWorkerPool  # noqa: E402
+from src.services.scheduler.task_service import SchedulerTaskService  # noqa: E402
+from src.stores.scheduler_task_store import SchedulerTaskStore  # noqa: E402
+
+
+async def run_once(db_path: Path, workers: int, tasks: int, handler_seconds: float) -> float:
+    connection = await aiosqlite.connect(str(db_path))
+    service = SchedulerTaskService(SchedulerTaskStore(connection))
+    await service.initialize()
+
+    async def _stub_handler(task):
+        await asyncio.sleep(handler_seconds)
+        return {"symbol": task.payload.get("symbol")}
+
+    service.register_handler(TaskType.FUNDAMENTALS_UPDATE, _stub_handler)
+    for index in range(tasks):
+        await service.create_task(QueueName.DATA_FETCHER, TaskType.FUNDAMENTALS_UPDATE, {"symbol": f"SYM{index}"})
+
+    done = asyncio.Event()
+    completed = 0
+
+    async def _on_complete(task):
+        nonlocal completed
+        completed += 1
+        if completed == tasks:
+            done.set()
+
+    policy = QueueConcurrencyPolicy(
+        max_workers=workers,
+        queue_concurrency={QueueName.DATA_FETCHER.value: workers},
+        task_type_concurrency={TaskType.FUNDAMENTALS_UPDATE.value: workers},
+    )
+    pool = QueueWorkerPool(service, policy, on_task_complete=_on_complete)
+    started = time.perf_counter()
+    await pool.start([QueueName.DATA_FETCHER])
+    await done.wait()
+    elapsed = time.perf_counter() - started
+    await pool.stop()
+    await service.cleanup()
+    await connection.close()
+    return elapsed
+
+
+async def main_async(tasks: int, handler_ms: float, worker_counts) -> None:
+    print(f"tasks={tasks} handler={handler_ms:.0f}ms")
+    print(f"{'workers':>8} {'seconds':>9} {'tasks/s':>9} {'speedup':>8}")
+    baseline = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for workers in worker_counts:
+            db_path = Path(tmp) / f"queue_{workers}.db"
+            elapsed = await run_once(db_path, workers, tasks, handler_ms / 1000)
+            baseline = baseline or elapsed
+            print(f"{workers:>8} {elapsed:>9.2f} {tasks / elapsed:>9.1f} {baseline / elapsed:>7.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=200)
+    parser.add_argument("--handler-ms", type=float, default=50.0)
+    parser.add_argument("--workers", default="1,2,4,8,16")
+    args = parser.parse_args()
+    worker_counts = [int(value) for value in args.workers.split(",")]
+    asyncio.run(main_async(args.tasks, args.handler_ms, worker_counts))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark: vectorized universe indicators vs. the per-symbol pandas loop.
+
+Usage:
+    python scripts/benchmark_universe_indicators.py [--bars 250] [--sizes 100 1000 2000]
+"""
+
+import argparse
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.config import Config  # noqa: E402
+from src.services.technical_indicators_service import TechnicalIndicatorsService  # noqa: E402
+
+
+def _synthetic_universe(n_symbols: int, n_bars: int, seed: int = 42):
+    rng = np.random.default_rng(seed)
+    closes = 500 + np.cumsum(rng.normal(0, 5, (n_symbols, n_bars)), axis=1)
+    spread = np.abs(rng.normal(0, 3, (n_symbols, n_bars)))
+    return closes + spread, closes - spread, closes
+
+
+def _per_symbol_loop(service, symbols, highs, lows, closes):
+    dates = [(date(2025, 1, 1) + timedelta(days=i)).isoformat() for i in range(closes.shape[1])]
+    results = {}
+    for row, symbol in enumerate(symbols):
+        history = [
+            {"date": d, "open": c, "high": h, "low": low, "close": c, "volume": 0}
+            for d, h, low, c in zip(dates, highs[row], lows[row], closes[row])
+        ]
+        results[symbol] = service.calculate_all_indicators(history)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--bars", type=int, default=250)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 2000])
+    args = parser.parse_args()
+
+    service = TechnicalIndicatorsService(Config())
+    print(f"{'symbols':>8} {'per-symbol (s)':>15} {'vectorized (s)':>15} {'speedup':>9}")
+    for size in args.sizes:
+        symbols = [f"SYM{i:05d}" for i in range(size)]
+        highs, lows, closes = _synthetic_universe(size, args.bars)
+
+        started = time.perf_counter()
+        frame = service.calculate_universe_indicators(symbols, highs, lows, closes)
+        vectorized = time.perf_counter() - started
+
+        started = time.perf_counter()
+        looped = _per_symbol_loop(service, symbols, highs, lows, closes)
+        per_symbol = time.perf_counter() - started
+
+        sample = symbols[-1]
+        assert np.isclose(frame.loc[sample, "macd"], looped[sample]["macd"])
+        print(f"{size:>8} {per_symbol:>15.3f} {vectorized:>15.4f} {per_symbol / vectorized:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
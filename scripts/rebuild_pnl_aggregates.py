@@ -0,0 +1,48 @@
+"""
+Rebuild the paper_trade_aggregates table from paper_trades.
+
+The close paths keep the aggregates current and the store backfills an empty
+table on startup; run this after trades were edited outside the store or to
+backfill a single account.
+
+Usage:
+    python scripts/rebuild_pnl_aggregates.py [--db state/robo_trader.db] [--account-id paper_swing_main]
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+import aiosqlite
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.config import load_config  # noqa: E402
+from src.stores.paper_trading_store import PaperTradingStore  # noqa: E402
+
+
+async def _run(args) -> None:
+    db_path = args.db or load_config().state_dir / "robo_trader.db"
+    if not Path(db_path).exists():
+        raise SystemExit(f"Database not found: {db_path}")
+
+    db = await aiosqlite.connect(str(db_path))
+    try:
+        store = PaperTradingStore(db)
+        await store.initialize()
+        written = await store.rebuild_performance_aggregates(args.account_id)
+    finally:
+        await db.close()
+    print(f"{db_path}: wrote {written} aggregate rows for {args.account_id or 'all accounts'}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--db", type=Path, default=None, help="SQLite database (default: <state_dir>/robo_trader.db)")
+    parser.add_argument("--account-id", default=None, help="Rebuild one account only")
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -27,7 +27,8 @@ async def create_agents_mcp_server(
     state_manager,
     kite_service=None,
     indicators_service=None,
-    fundamental_service=None
+    fundamental_service=None,
+    indicator_engine=None
 ):
     """
     Create the agents MCP server with all agent tools.
@@ -41,11 +42,14 @@ async def create_agents_mcp_server(
         kite_service: Optional KiteConnectService for real market data
         indicators_service: Optional TechnicalIndicatorsService for indicator calculations
         fundamental_service: Optional FundamentalService for fundamental data
+        indicator_engine: Optional IncrementalIndicatorEngine for streaming indicators
     """
     
     # Create tools with dependencies via closures
     portfolio_tool = create_portfolio_analyzer_tool(config, state_manager)
-    technical_tool = create_technical_analyst_tool(config, state_manager, kite_service, indicators_service)
+    technical_tool = create_technical_analyst_tool(
+        config, state_manager, kite_service, indicators_service, indicator_engine
+    )
     fundamental_tool = create_fundamental_screener_tool(config, state_manager, fundamental_service)
     risk_tool = create_risk_manager_tool(config, state_manager)
     execution_tool = create_execution_agent_tool(config, state_manager, kite_service)
@@ -63,7 +67,8 @@ async def create_agents_mcp_server(
         state_manager,
         kite_service=kite_service,
         indicators_service=indicators_service,
-        fundamental_service=fundamental_service
+        fundamental_service=fundamental_service,
+        indicator_engine=indicator_engine
     )
     
     # Combine all tools
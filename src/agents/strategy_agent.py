@@ -17,6 +17,7 @@ from ..core.database_state import DatabaseStateManager
 from ..services.kite_connect_service import KiteConnectService
 from ..services.technical_indicators_service import TechnicalIndicatorsService
 from ..services.fundamental_service import FundamentalService
+from ..services.indicator_engine import IncrementalIndicatorEngine
 
 
 def create_strategy_tools(
@@ -24,7 +25,8 @@ def create_strategy_tools(
     state_manager: DatabaseStateManager,
     kite_service: Optional[KiteConnectService] = None,
     indicators_service: Optional[TechnicalIndicatorsService] = None,
-    fundamental_service: Optional[FundamentalService] = None
+    fundamental_service: Optional[FundamentalService] = None,
+    indicator_engine: Optional[IncrementalIndicatorEngine] = None
 ) -> List:
     """Create strategy tools with dependencies via closure."""
     
@@ -60,7 +62,8 @@ def create_strategy_tools(
 
             # Collect market data using available services
             market_analysis = await _collect_market_data(
-                symbols, kite_service, indicators_service, fundamental_service, analysis_depth
+                symbols, kite_service, indicators_service, fundamental_service, analysis_depth,
+                indicator_engine
             )
 
             # Generate strategy recommendations
@@ -212,7 +215,8 @@ async def _collect_market_data(
     kite_service: Optional[KiteConnectService],
     indicators_service: Optional[TechnicalIndicatorsService],
     fundamental_service: Optional[FundamentalService],
-    analysis_depth: str
+    analysis_depth: str,
+    indicator_engine: Optional[IncrementalIndicatorEngine] = None
 ) -> Dict[str, Any]:
     """Collect comprehensive market data for analysis."""
     market_data = {}
@@ -244,8 +248,10 @@ async def _collect_market_data(
             except Exception as e:
                 logger.warning(f"Failed to get price for {symbol}: {e}")
 
-        # Get technical indicators
-        if kite_service and indicators_service and analysis_depth in ["standard", "deep"]:
+        # Get technical indicators; the streaming engine keeps seeded symbols current
+        if indicator_engine and analysis_depth in ["standard", "deep"] and indicator_engine.has_symbol(symbol):
+            symbol_data["technical_indicators"] = indicator_engine.get_indicators(symbol)
+        elif kite_service and indicators_service and analysis_depth in ["standard", "deep"]:
             try:
                 from datetime import timedelta
                 to_date = datetime.now(timezone.utc).strftime('%Y-%m-%d')
@@ -261,6 +267,8 @@ async def _collect_market_data(
                 if historical_data and len(historical_data) >= 30:
                     indicators = indicators_service.calculate_all_indicators(historical_data)
                     symbol_data["technical_indicators"] = indicators
+                    if indicator_engine:
+                        indicator_engine.seed(symbol, historical_data)
             except Exception as e:
                 logger.warning(f"Failed to calculate indicators for {symbol}: {e}")
 
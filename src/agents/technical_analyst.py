@@ -16,13 +16,15 @@ from ..core.database_state import DatabaseStateManager
 from ..core.state_models import Signal
 from ..services.kite_connect_service import KiteConnectService
 from ..services.technical_indicators_service import TechnicalIndicatorsService
+from ..services.indicator_engine import IncrementalIndicatorEngine
 
 
 def create_technical_analyst_tool(
     config: Config,
     state_manager: DatabaseStateManager,
     kite_service: Optional[KiteConnectService] = None,
-    indicators_service: Optional[TechnicalIndicatorsService] = None
+    indicators_service: Optional[TechnicalIndicatorsService] = None,
+    indicator_engine: Optional[IncrementalIndicatorEngine] = None
 ):
     """Create technical analyst tool with dependencies via closure."""
     
@@ -39,15 +41,14 @@ def create_technical_analyst_tool(
                     "is_error": True
                 }
 
-            if not indicators_service:
-                indicators_service = TechnicalIndicatorsService(config)
+            service = indicators_service or TechnicalIndicatorsService(config)
 
             signals = {}
             for symbol in symbols:
                 try:
                     # Fetch real historical data from Kite Connect
                     indicators = await _calculate_indicators(
-                        symbol, timeframe, kite_service, indicators_service
+                        symbol, timeframe, kite_service, service, indicator_engine
                     )
                     
                     if indicators:
@@ -84,10 +85,15 @@ async def _calculate_indicators(
     symbol: str,
     timeframe: str,
     kite_service: KiteConnectService,
-    indicators_service: TechnicalIndicatorsService
+    indicators_service: TechnicalIndicatorsService,
+    indicator_engine: Optional[IncrementalIndicatorEngine] = None
 ) -> Optional[Dict[str, float]]:
     """Calculate technical indicators using real Kite Connect historical data."""
     try:
+        # Daily indicators are kept current by the streaming engine once seeded
+        if indicator_engine and timeframe == "day" and indicator_engine.has_symbol(symbol):
+            return indicator_engine.get_indicators(symbol)
+
         # Map timeframe to Kite Connect interval
         timeframe_map = {
             "1m": "minute",
@@ -129,6 +135,8 @@ async def _calculate_indicators(
 
         # Calculate all indicators
         indicators = indicators_service.calculate_all_indicators(historical_data)
+        if indicator_engine and interval == "day":
+            indicator_engine.seed(symbol, historical_data)
         
         logger.info(f"Calculated indicators for {symbol}: RSI={indicators.get('rsi'):.2f}, MACD={indicators.get('macd'):.2f}")
         return indicators
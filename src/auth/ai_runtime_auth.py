@@ -9,6 +9,7 @@ from typing import Any, Dict, Optional
 
 from loguru import logger
 
+from src.core.http_clients import get_http_client_pool
 from src.services.codex_runtime_client import CodexRuntimeClient, CodexRuntimeError
 
 
@@ -62,7 +63,11 @@ _runtime_force_validation_timeout_seconds = float(os.getenv("AI_RUNTIME_FORCE_VA
 def _build_client() -> CodexRuntimeClient:
     base_url = os.getenv("CODEX_RUNTIME_URL", "http://127.0.0.1:8765")
     timeout = float(os.getenv("AI_RUNTIME_TIMEOUT_SECONDS", "90"))
-    return CodexRuntimeClient(base_url, timeout_seconds=timeout)
+    return CodexRuntimeClient(
+        base_url,
+        timeout_seconds=timeout,
+        http_client=get_http_client_pool().get("codex_runtime", timeout=timeout),
+    )
 
 
 def record_ai_runtime_limit(message: str, *, code: Optional[str] = None) -> None:
@@ -56,6 +56,10 @@ class ExecutionConfig(BaseModel):
     time_in_force: str = Field(default="DAY", description="Time in force")
     auto_approve_paper: bool = Field(default=True, description="Auto-approve in paper mode")
     require_manual_approval_live: bool = Field(default=True, description="Require manual approval in live mode")
+    paper_tick_exits_enabled: bool = Field(
+        default=False,
+        description="Close paper trades on the first tick that crosses their stop-loss or target",
+    )
 
 
 class IntegrationConfig(BaseModel):
@@ -72,6 +76,10 @@ class IntegrationConfig(BaseModel):
     upstox_sandbox_access_token: Optional[str] = Field(default=None, description="Upstox sandbox access token (30-day validity)")
     quote_stream_provider: str = Field(default="upstox", description="Default paper-mode quote stream provider")
     upstox_stream_mode: str = Field(default="ltpc", description="Default Upstox stream mode")
+    quote_coalesce_interval_ms: int = Field(
+        default=0,
+        description="Flush interval for coalesced streaming ticks (0 = apply every tick individually)",
+    )
     anthropic_api_key: Optional[str] = Field(default=None, description="Anthropic API key")
     perplexity_api_keys: List[str] = Field(default_factory=list, description="Perplexity API keys (with automatic failover)")
 
@@ -89,6 +97,20 @@ class AIRuntimeConfig(BaseModel):
     codex_reasoning_light: str = Field(default="low", description="Reasoning effort for lightweight requests")
     codex_reasoning_deep: str = Field(default="medium", description="Reasoning effort for deeper requests")
     timeout_seconds: float = Field(default=90.0, description="Default timeout for runtime requests")
+    response_cache_enabled: bool = Field(default=True, description="Reuse persisted responses for identical structured requests")
+    response_cache_max_entries: int = Field(default=2000, description="LRU bound on persisted AI responses")
+    response_cache_ttl_seconds: Dict[str, float] = Field(
+        default_factory=dict,
+        description="Per-role TTL overrides (research, review, decision, discovery, triage, default)",
+    )
+    feature_extraction_concurrency: int = Field(
+        default=5,
+        description="Discovery candidates whose features are extracted concurrently",
+    )
+    feature_extraction_timeout_seconds: float = Field(
+        default=120.0,
+        description="Per-candidate timeout for discovery feature extraction",
+    )
 
 
 class AgentFeatureConfig(BaseModel):
@@ -243,6 +265,41 @@ class DatabaseConfig(BaseModel):
     backup_enabled: bool = Field(default=True, description="Enable automatic database backups")
     backup_interval_hours: int = Field(default=24, description="Backup interval in hours")
     max_backup_files: int = Field(default=7, description="Maximum number of backup files to keep")
+    wal_enabled: bool = Field(default=True, description="Use SQLite write-ahead logging so reads never block on writes")
+    reader_pool_size: int = Field(default=4, description="Read-only pooled connections (0 disables the pool)")
+    write_batch_size: int = Field(default=128, description="Maximum queued writes applied per group commit")
+    busy_timeout_ms: int = Field(default=5000, description="How long a connection waits on a locked database")
+    group_commit_max_batch: int = Field(default=500, description="Buffered high-frequency writes that force a group commit")
+    group_commit_interval_ms: float = Field(default=50.0, description="Longest a buffered high-frequency write waits for its commit")
+
+
+class HttpConfig(BaseModel):
+    """Pooled outbound HTTP client configuration."""
+    max_connections: int = Field(default=50, description="Maximum open connections per pooled client")
+    max_keepalive_connections: int = Field(default=20, description="Idle connections kept alive per pooled client")
+    keepalive_expiry_seconds: float = Field(default=30.0, description="How long an idle connection is kept open")
+    http2: bool = Field(default=True, description="Negotiate HTTP/2 when the h2 package is installed")
+
+
+class EventBusConfig(BaseModel):
+    """Event bus publish pipeline configuration."""
+    pipeline_enabled: bool = Field(default=False, description="Use the non-blocking batched publish pipeline")
+    queue_maxsize: int = Field(default=10000, description="Maximum queued events per event type")
+    flush_interval_ms: int = Field(default=50, description="Write-behind flush interval in milliseconds")
+    flush_batch_size: int = Field(default=500, description="Pending writes that trigger an early flush")
+    max_pending_inserts: int = Field(
+        default=20000,
+        description="Buffered event inserts at which publishers wait for a flush; "
+        "while flushes fail, the oldest beyond it are dropped",
+    )
+    shutdown_drain_timeout_seconds: float = Field(
+        default=5.0,
+        description="Maximum time close() waits for queued events to be dispatched",
+    )
+    durability: Dict[str, str] = Field(
+        default_factory=dict,
+        description="Per event type durability overrides: none, batched or sync",
+    )
 
 
 class SchedulingConfig(BaseModel):
@@ -251,6 +308,19 @@ class SchedulingConfig(BaseModel):
     market_screening_interval_minutes: int = Field(default=240, description="Market screening interval")
     market_hours_start: str = Field(default="09:15", description="Market open time (IST)")
     market_hours_end: str = Field(default="15:30", description="Market close time (IST)")
+    max_concurrent_tasks: int = Field(default=8, description="Worker slots shared by all scheduler queues")
+    queue_concurrency: Dict[str, int] = Field(
+        default_factory=lambda: {"data_fetcher": 4},
+        description="Concurrent tasks per queue (queues not listed run one task at a time)",
+    )
+    task_type_concurrency: Dict[str, int] = Field(
+        default_factory=lambda: {"fundamentals_update": 4, "news_monitoring": 4, "earnings_check": 4},
+        description="Concurrent tasks per task type across all queues (types not listed are bounded only by their queue)",
+    )
+    queue_weights: Dict[str, int] = Field(
+        default_factory=lambda: {"paper_trading_execution": 3, "portfolio_sync": 2, "data_fetcher": 1},
+        description="Relative share of free worker slots each queue gets when several have work",
+    )
 
 
 class Config(BaseModel):
@@ -262,6 +332,8 @@ class Config(BaseModel):
     max_turns: int = Field(default=100, description="Maximum conversation turns")
 
     database: DatabaseConfig = Field(default_factory=DatabaseConfig)
+    event_bus: EventBusConfig = Field(default_factory=EventBusConfig)
+    http: HttpConfig = Field(default_factory=HttpConfig)
     risk: RiskConfig = Field(default_factory=RiskConfig)
     technical: TechnicalConfig = Field(default_factory=TechnicalConfig)
     screening: ScreeningConfig = Field(default_factory=ScreeningConfig)
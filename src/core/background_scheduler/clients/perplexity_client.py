@@ -11,6 +11,9 @@ from typing import List, Optional, Any
 from openai import OpenAI, AuthenticationError
 from loguru import logger
 
+from src.core.http_clients import get_http_client_pool
+from src.core.rate_limiter import Priority, get_rate_limiter
+
 from .api_key_rotator import APIKeyRotator
 from .retry_handler import RetryConfig, retry_on_rate_limit
 from .perplexity_prompt_manager import PromptManager
@@ -135,6 +138,7 @@ class PerplexityClient:
         """
         async def _make_request() -> str:
             """Inner function for retry wrapper."""
+            await get_rate_limiter().acquire("perplexity", Priority.RESEARCH, client="scheduler")
             api_key = self.key_rotator.get_next_key()
             if not api_key:
                 logger.error("No Perplexity API keys available")
@@ -143,7 +147,9 @@ class PerplexityClient:
             try:
                 client = OpenAI(
                     api_key=api_key,
-                    base_url="https://api.perplexity.ai"
+                    base_url="https://api.perplexity.ai",
+                    timeout=self.timeout_seconds,
+                    http_client=get_http_client_pool().get_sync("perplexity", timeout=self.timeout_seconds)
                 )
 
                 response_format_config = self._get_response_format_config(response_format)
@@ -169,7 +175,7 @@ class PerplexityClient:
                 raise RuntimeError(f"Authentication failed: {e}")
 
         try:
-            return await retry_on_rate_limit(_make_request, max_retries=5)
+            return await retry_on_rate_limit(_make_request, max_retries=5, endpoint="perplexity")
         except Exception as e:
             logger.error(f"Perplexity API failed: {e}")
             return None
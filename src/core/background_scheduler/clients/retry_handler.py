@@ -5,6 +5,8 @@ import random
 from typing import Callable, TypeVar, Any, Optional
 from loguru import logger
 
+from src.core.rate_limiter import get_rate_limiter
+
 T = TypeVar('T')
 
 
@@ -70,6 +72,7 @@ async def retry_with_backoff(
     *args,
     config: Optional[RetryConfig] = None,
     retryable_exceptions: tuple = (RetryableError,),
+    rate_limit_endpoint: Optional[str] = None,
     **kwargs
 ) -> T:
     """Execute function with exponential backoff retry.
@@ -79,6 +82,8 @@ async def retry_with_backoff(
         args: Positional arguments for function
         config: Retry configuration (uses default if None)
         retryable_exceptions: Tuple of exceptions that trigger retry
+        rate_limit_endpoint: Shared limiter endpoint to pause for the backoff,
+            so other callers of the same provider back off too
         kwargs: Keyword arguments for function
 
     Returns:
@@ -109,6 +114,8 @@ async def retry_with_backoff(
 
             if attempt < config.max_retries - 1:
                 delay = config.get_backoff_delay(attempt)
+                if rate_limit_endpoint:
+                    get_rate_limiter().penalize(rate_limit_endpoint, delay)
                 logger.warning(
                     f"Attempt {attempt + 1}/{config.max_retries} failed: {e}. "
                     f"Retrying in {delay:.2f}s..."
@@ -129,6 +136,7 @@ async def retry_on_rate_limit(
     func: Callable[..., Any],
     *args,
     max_retries: int = 5,
+    endpoint: Optional[str] = None,
     **kwargs
 ) -> T:
     """Retry specifically on rate limit errors with longer backoff.
@@ -137,6 +145,7 @@ async def retry_on_rate_limit(
         func: Async function to execute
         args: Positional arguments
         max_retries: Maximum retry attempts
+        endpoint: Shared limiter endpoint paused while backing off
         kwargs: Keyword arguments
 
     Returns:
@@ -156,5 +165,6 @@ async def retry_on_rate_limit(
         *args,
         config=config,
         retryable_exceptions=(RateLimitError,),
+        rate_limit_endpoint=endpoint,
         **kwargs
     )
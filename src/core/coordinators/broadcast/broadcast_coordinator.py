@@ -240,8 +240,14 @@ class BroadcastCoordinator(BaseCoordinator):
             # Use direct logger to avoid format string issues
             logger.error(f"[{self.__class__.__name__}] Traceback: {traceback.format_exc()}")
 
+    def set_connection_stats_provider(self, provider: Callable) -> None:
+        """Report WebSocket fan-out stats (queue depths, durations) in health metrics."""
+        self.execution_coordinator.set_connection_stats_provider(provider)
+
     def get_health_metrics(self, monitor_metrics: Dict[str, Any] = None) -> Dict[str, Any]:
         """Get comprehensive health metrics."""
+        if monitor_metrics is None:
+            monitor_metrics = self.execution_coordinator.get_monitor_metrics()
         return self.health_coordinator.get_health_metrics(monitor_metrics)
 
     async def cleanup(self) -> None:
@@ -101,6 +101,17 @@ class BroadcastExecutionCoordinator(BaseCoordinator):
             self._health_monitor.add_error_handler(health_coordinator.handle_broadcast_error)
             self._health_monitor.add_recovery_handler(health_coordinator.handle_broadcast_recovery)
 
+    def set_connection_stats_provider(self, provider: Callable) -> None:
+        """Expose connection manager fan-out stats through the health monitor."""
+        if self._health_monitor:
+            self._health_monitor.set_connection_stats_provider(provider)
+
+    def get_monitor_metrics(self) -> Optional[Dict[str, Any]]:
+        """Get detailed health monitor metrics, if the monitor is available."""
+        if self._health_monitor:
+            return self._health_monitor.get_health_metrics()
+        return None
+
     async def broadcast_to_ui(self, message: Dict[str, Any], circuit_breaker_check=None) -> bool:
         """
         Broadcast message to all connected WebSocket clients.
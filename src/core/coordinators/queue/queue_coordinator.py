@@ -127,7 +127,7 @@ class QueueCoordinator(BaseCoordinator):
         self.monitoring_coordinator.set_queues_running(True)
 
         # CRITICAL: Actually start the queue execution loop
-        # This starts the ThreadSafeQueueExecutor workers that process tasks
+        # This starts the QueueWorkerPool dispatcher that leases and runs tasks
         self._log_info("Starting queue execution loop...")
         try:
             await self.execute_queues_sequential()
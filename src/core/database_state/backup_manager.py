@@ -6,7 +6,7 @@ Ensures critical data (analysis, trades, portfolio state) is never lost.
 """
 
 import asyncio
-import shutil
+import sqlite3
 from pathlib import Path
 from datetime import datetime, timezone, timedelta
 from typing import Optional, List
@@ -50,8 +50,8 @@ class DatabaseBackupManager:
                 backup_filename = f"{self.db_path.stem}_{label}_{timestamp}.db"
                 backup_path = self.backup_dir / backup_filename
 
-                # Copy database file
-                shutil.copy2(self.db_path, backup_path)
+                # Copy through SQLite so pages still in the WAL file are included
+                await asyncio.to_thread(_copy_database, self.db_path, backup_path)
                 logger.info(f"Database backup created: {backup_path}")
 
                 # Cleanup old backups
@@ -171,8 +171,8 @@ class DatabaseBackupManager:
                 if not current_backup:
                     logger.warning("Could not backup current database before restore")
 
-                # Restore from backup
-                shutil.copy2(backup_path, self.db_path)
+                # Restore from backup (through SQLite so open WAL connections stay consistent)
+                await asyncio.to_thread(_copy_database, backup_path, self.db_path)
                 logger.info(f"Database restored from backup: {backup_path}")
 
                 if current_backup:
@@ -214,3 +214,14 @@ class DatabaseBackupManager:
         except Exception as e:
             logger.error(f"Error getting backup stats: {e}")
             return {}
+
+
+def _copy_database(source: Path, target: Path) -> None:
+    """Copy a database with the SQLite online backup API."""
+    source_db = sqlite3.connect(str(source))
+    target_db = sqlite3.connect(str(target))
+    try:
+        source_db.backup(target_db)
+    finally:
+        target_db.close()
+        source_db.close()
@@ -6,12 +6,19 @@ Handles database initialization, connection pooling, and schema creation.
 
 import asyncio
 import aiosqlite
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 from loguru import logger
 
 from src.config import Config
 from src.core.database_state.backup_manager import DatabaseBackupManager
+from src.core.database_state.connection_pool import (
+    SQLiteConnectionPool,
+    WriteOperation,
+    open_direct_writer,
+)
+from src.core.group_commit import GroupCommitWriter, WriteBatch
 
 
 class BaseState:
@@ -36,6 +43,10 @@ class DatabaseConnection:
     Manages database connection and schema for all state managers.
 
     Provides connection pooling, transaction management, and table creation.
+    ``connection`` is the shared legacy connection (one of the pool's
+    DIRECT_WRITERS); stores that have moved to the access layer read through
+    ``read()`` (pooled read-only connections) and write through ``write()``
+    (single group-committing writer).
     """
 
     def __init__(self, config: Config):
@@ -53,6 +64,12 @@ class DatabaseConnection:
         self._connection_pool: Optional[aiosqlite.Connection] = None
         self._lock = asyncio.Lock()
 
+        # WAL reader pool + queued writer (None when database.reader_pool_size is 0)
+        self.pool: Optional[SQLiteConnectionPool] = None
+
+        # Write-behind buffers handed out by group_writer(), flushed on cleanup
+        self._group_writers: List[GroupCommitWriter] = []
+
         # Backup manager
         self.backup_manager = DatabaseBackupManager(
             self.db_path,
@@ -70,8 +87,9 @@ class DatabaseConnection:
         async with self._lock:
             try:
                 logger.info(f"Connecting to database at {self.db_path}")
+                db_config = self.config.database
                 self._connection_pool = await asyncio.wait_for(
-                    aiosqlite.connect(str(self.db_path)),
+                    open_direct_writer(self.db_path, db_config.busy_timeout_ms, wal=db_config.wal_enabled),
                     timeout=10.0
                 )
                 # Set row_factory to return Row objects instead of tuples
@@ -85,6 +103,16 @@ class DatabaseConnection:
                 )
                 logger.info("Database tables created successfully")
 
+                if db_config.reader_pool_size > 0:
+                    self.pool = SQLiteConnectionPool(
+                        self.db_path,
+                        reader_count=db_config.reader_pool_size,
+                        write_batch_size=db_config.write_batch_size,
+                        busy_timeout_ms=db_config.busy_timeout_ms,
+                        wal_enabled=db_config.wal_enabled,
+                    )
+                    await self.pool.open()
+
                 # Create automatic backup on startup if database exists and has data
                 if self.db_path.exists() and self.db_path.stat().st_size > 0:
                     await self.backup_manager.create_backup(label="startup")
@@ -594,9 +622,98 @@ class DatabaseConnection:
             raise RuntimeError("Database not initialized. Call initialize() first.")
         return self._connection_pool
 
+    @asynccontextmanager
+    async def read(self, store: str = "default") -> AsyncIterator[aiosqlite.Connection]:
+        """
+        Borrow a connection for SELECTs.
+
+        Uses the read-only pool when enabled, so reads do not queue behind
+        writes; otherwise yields the shared connection.
+        """
+        if self.pool is not None:
+            async with self.pool.read(store) as reader:
+                yield reader
+        else:
+            yield self.connection
+
+    async def write(self, operation: WriteOperation, store: str = "default") -> Any:
+        """
+        Run a write operation and commit it.
+
+        With the pool enabled the operation is queued for the single writer
+        and group-committed with concurrent writes; it must not commit itself.
+        """
+        if self.pool is not None:
+            return await self.pool.write(operation, store)
+        return await self._write_with_transaction(operation)
+
+    @asynccontextmanager
+    async def batch(self, store: str = "default") -> AsyncIterator[WriteBatch]:
+        """
+        Unit of work: collect writes and commit them together on exit.
+
+        Nothing is written if the block raises.
+
+        Example:
+            async with db.batch("portfolio") as batch:
+                batch.execute("UPDATE ...", params)
+                batch.executemany("INSERT ...", rows)
+        """
+        batch = WriteBatch()
+        yield batch
+        if batch:
+            await self.write(batch.apply, store)
+
+    def group_writer(self, store: str, **kwargs: Any) -> GroupCommitWriter:
+        """
+        Write-behind buffer for a high-frequency writer.
+
+        Buffered statements are committed together once
+        database.group_commit_max_batch are pending or
+        database.group_commit_interval_ms has elapsed.
+        """
+
+        async def _commit(batch: WriteBatch) -> None:
+            await self.write(batch.apply, store)
+
+        db_config = self.config.database
+        kwargs.setdefault("max_batch", db_config.group_commit_max_batch)
+        kwargs.setdefault("max_delay_ms", db_config.group_commit_interval_ms)
+        writer = GroupCommitWriter(_commit, name=store, **kwargs)
+        self._group_writers.append(writer)
+        return writer
+
+    async def _write_with_transaction(self, operation: WriteOperation) -> Any:
+        """Run an operation on the shared connection and commit, rolling back on failure."""
+        try:
+            result = await operation(self.connection)
+            await self.connection.commit()
+            return result
+        except Exception:
+            await self.connection.rollback()
+            raise
+
+    def get_query_stats(self) -> Dict[str, Any]:
+        """Per-store query latency histograms and writer batching counters."""
+        group_commit = {writer.name: writer.get_stats() for writer in self._group_writers}
+        if self.pool is None:
+            return {"pool_enabled": False, "group_commit": group_commit}
+        return {"pool_enabled": True, **self.pool.get_stats(), "group_commit": group_commit}
+
     async def cleanup(self) -> None:
         """Close database connection and cleanup resources."""
         async with self._lock:
+            for writer in self._group_writers:
+                try:
+                    await writer.close()
+                except Exception as e:
+                    logger.error(f"Failed to flush {writer.name} writes on shutdown: {e}")
+
+            if self.pool is not None:
+                # Commit anything still queued before the shutdown backup
+                await self.pool.close()
+                self.pool = None
+
             if self._connection_pool:
                 # Create a final backup before shutdown
                 await self.backup_manager.create_backup(label="shutdown")
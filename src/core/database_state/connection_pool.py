@@ -0,0 +1,355 @@
+"""
+SQLite access layer: WAL mode, a read-only connection pool and a single queued writer.
+
+Readers never wait on writers in WAL mode, so dashboard SELECTs run on their
+own pooled connections instead of queuing behind tick inserts and scheduler
+updates on a shared connection. Writes from every store go through one writer
+connection fed by a queue; whatever is queued when the writer wakes up is
+applied inside a single transaction (one savepoint per write) and committed
+once, so a burst of small writes costs one fsync instead of one each.
+"""
+
+import asyncio
+import time
+from bisect import bisect_left
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence
+
+import aiosqlite
+from loguru import logger
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS_MS = (0.5, 1.0, 2.0, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 500.0, 1000.0, 2500.0)
+
+WriteOperation = Callable[[aiosqlite.Connection], Awaitable[Any]]
+
+
+class QueryLatencyHistogram:
+    """Fixed-bucket latency histogram with approximate percentiles."""
+
+    def __init__(self, bounds: Sequence[float] = LATENCY_BUCKETS_MS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, duration_ms: float) -> None:
+        self.counts[bisect_left(self.bounds, duration_ms)] += 1
+        self.count += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+
+    def percentile(self, pct: float) -> float:
+        """Upper bound of the bucket holding the pct-th sample (max for the open bucket)."""
+        if not self.count:
+            return 0.0
+        rank = pct / 100.0 * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                return self.bounds[index] if index < len(self.bounds) else self.max_ms
+        return self.max_ms
+
+    def snapshot(self) -> Dict[str, Any]:
+        labels = [f"le_{bound:g}ms" for bound in self.bounds] + ["inf"]
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+@dataclass
+class _WriteJob:
+    operation: WriteOperation
+    store: str
+    future: asyncio.Future
+    submitted_at: float = field(default_factory=time.perf_counter)
+
+
+class SQLiteConnectionPool:
+    """
+    Reader pool plus single group-committing writer for one SQLite database.
+
+    Write operations are coroutines taking the writer connection. They run
+    inside the writer's transaction and must not commit or roll back
+    themselves; a failing operation is rolled back to its own savepoint
+    without affecting the rest of the batch.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        *,
+        reader_count: int = 4,
+        write_batch_size: int = 128,
+        busy_timeout_ms: int = 5000,
+        wal_enabled: bool = True,
+    ):
+        self.db_path = Path(db_path)
+        self.reader_count = max(1, reader_count)
+        self.write_batch_size = max(1, write_batch_size)
+        self.busy_timeout_ms = busy_timeout_ms
+        self.wal_enabled = wal_enabled
+
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._readers: List[aiosqlite.Connection] = []
+        self._idle_readers: Optional[asyncio.Queue] = None
+        self._write_queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+
+        self._read_latency: Dict[str, QueryLatencyHistogram] = {}
+        self._write_latency: Dict[str, QueryLatencyHistogram] = {}
+        self._stats = {
+            "reads": 0,
+            "writes": 0,
+            "write_errors": 0,
+            "batches": 0,
+            "batch_failures": 0,
+            "largest_batch": 0,
+        }
+
+    @property
+    def is_open(self) -> bool:
+        return self._writer is not None
+
+    @property
+    def writer(self) -> aiosqlite.Connection:
+        if self._writer is None:
+            raise RuntimeError("Connection pool not opened. Call open() first.")
+        return self._writer
+
+    async def open(self) -> None:
+        """Open the writer, switch the database to WAL and open the readers."""
+        # Autocommit mode: the writer loop issues BEGIN/COMMIT itself
+        self._writer = await aiosqlite.connect(str(self.db_path), isolation_level=None)
+        self._writer.row_factory = aiosqlite.Row
+        await configure_connection(self._writer, self.busy_timeout_ms, wal=self.wal_enabled)
+
+        self._idle_readers = asyncio.Queue()
+        reader_uri = f"{self.db_path.resolve().as_uri()}?mode=ro"
+        for _ in range(self.reader_count):
+            reader = await aiosqlite.connect(reader_uri, uri=True)
+            reader.row_factory = aiosqlite.Row
+            await reader.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+            self._readers.append(reader)
+            self._idle_readers.put_nowait(reader)
+
+        self._write_queue = asyncio.Queue()
+        self._writer_task = asyncio.create_task(self._writer_loop())
+        logger.info(
+            f"SQLite pool opened for {self.db_path.name}: "
+            f"{self.reader_count} readers, 1 writer, wal={self.wal_enabled}"
+        )
+
+    @asynccontextmanager
+    async def read(self, store: str = "default") -> AsyncIterator[aiosqlite.Connection]:
+        """Borrow a read-only connection; latency is recorded against ``store``."""
+        if self._idle_readers is None:
+            raise RuntimeError("Connection pool not opened. Call open() first.")
+        started = time.perf_counter()
+        reader = await self._idle_readers.get()
+        try:
+            yield reader
+        finally:
+            # Leave no read transaction open, or the WAL cannot be checkpointed past it
+            if reader.in_transaction:
+                await reader.rollback()
+            self._idle_readers.put_nowait(reader)
+            self._stats["reads"] += 1
+            self._histogram(self._read_latency, store).record((time.perf_counter() - started) * 1000)
+
+    async def fetchall(self, query: str, params: Iterable[Any] = (), store: str = "default") -> List[aiosqlite.Row]:
+        async with self.read(store) as db:
+            cursor = await db.execute(query, tuple(params))
+            rows = await cursor.fetchall()
+            await cursor.close()
+            return rows
+
+    async def fetchone(self, query: str, params: Iterable[Any] = (), store: str = "default") -> Optional[aiosqlite.Row]:
+        async with self.read(store) as db:
+            cursor = await db.execute(query, tuple(params))
+            row = await cursor.fetchone()
+            await cursor.close()
+            return row
+
+    async def write(self, operation: WriteOperation, store: str = "default") -> Any:
+        """
+        Queue a write and wait until its batch is committed.
+
+        Returns:
+            Whatever ``operation`` returned
+
+        Raises:
+            The operation's exception, or the commit error if the whole batch failed
+        """
+        if self._write_queue is None:
+            raise RuntimeError("Connection pool not opened. Call open() first.")
+        job = _WriteJob(operation, store, asyncio.get_running_loop().create_future())
+        self._write_queue.put_nowait(job)
+        return await job.future
+
+    async def execute_write(self, query: str, params: Iterable[Any] = (), store: str = "default") -> int:
+        """Queue one statement; returns its rowcount once committed."""
+        params = tuple(params)
+
+        async def _operation(db: aiosqlite.Connection) -> int:
+            cursor = await db.execute(query, params)
+            rowcount = cursor.rowcount
+            await cursor.close()
+            return rowcount
+
+        return await self.write(_operation, store)
+
+    async def executemany_write(self, query: str, rows: Iterable[Sequence[Any]], store: str = "default") -> None:
+        rows = [tuple(row) for row in rows]
+
+        async def _operation(db: aiosqlite.Connection) -> None:
+            await db.executemany(query, rows)
+
+        await self.write(_operation, store)
+
+    async def _writer_loop(self) -> None:
+        while True:
+            job = await self._write_queue.get()
+            if job is None:
+                return
+            batch = [job]
+            stopping = False
+            while len(batch) < self.write_batch_size:
+                try:
+                    queued = self._write_queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if queued is None:
+                    stopping = True
+                    break
+                batch.append(queued)
+            await self._commit_batch(batch)
+            if stopping:
+                return
+
+    async def _commit_batch(self, batch: List[_WriteJob]) -> None:
+        db = self._writer
+        outcomes: List[tuple] = []
+        try:
+            await db.execute("BEGIN IMMEDIATE")
+            for job in batch:
+                await db.execute("SAVEPOINT pool_write")
+                try:
+                    result = await job.operation(db)
+                except Exception as exc:
+                    await db.execute("ROLLBACK TO pool_write")
+                    await db.execute("RELEASE pool_write")
+                    outcomes.append((job, None, exc))
+                else:
+                    await db.execute("RELEASE pool_write")
+                    outcomes.append((job, result, None))
+            await db.execute("COMMIT")
+        except Exception as exc:
+            logger.error(f"Group commit of {len(batch)} writes failed: {exc}")
+            self._stats["batch_failures"] += 1
+            if db.in_transaction:
+                try:
+                    await db.execute("ROLLBACK")
+                except Exception as rollback_error:
+                    logger.error(f"Rollback after failed group commit failed: {rollback_error}")
+            outcomes = [(job, None, exc) for job in batch]
+        else:
+            self._stats["batches"] += 1
+            self._stats["largest_batch"] = max(self._stats["largest_batch"], len(batch))
+
+        committed_at = time.perf_counter()
+        for job, result, error in outcomes:
+            self._stats["writes"] += 1
+            self._histogram(self._write_latency, job.store).record((committed_at - job.submitted_at) * 1000)
+            if job.future.done():
+                continue
+            if error is not None:
+                self._stats["write_errors"] += 1
+                job.future.set_exception(error)
+            else:
+                job.future.set_result(result)
+
+    @staticmethod
+    def _histogram(table: Dict[str, QueryLatencyHistogram], store: str) -> QueryLatencyHistogram:
+        histogram = table.get(store)
+        if histogram is None:
+            histogram = table[store] = QueryLatencyHistogram()
+        return histogram
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool counters plus per-store read/write latency histograms."""
+        stores = sorted(set(self._read_latency) | set(self._write_latency))
+        return {
+            **self._stats,
+            "average_batch_size": round(self._stats["writes"] / self._stats["batches"], 2) if self._stats["batches"] else 0.0,
+            "write_queue_depth": self._write_queue.qsize() if self._write_queue else 0,
+            "idle_readers": self._idle_readers.qsize() if self._idle_readers else 0,
+            "reader_count": len(self._readers),
+            "stores": {
+                store: {
+                    "read": self._read_latency[store].snapshot() if store in self._read_latency else None,
+                    "write": self._write_latency[store].snapshot() if store in self._write_latency else None,
+                }
+                for store in stores
+            },
+        }
+
+    async def close(self) -> None:
+        """Commit queued writes, then close every connection."""
+        if self._writer_task is not None:
+            self._write_queue.put_nowait(None)
+            await self._writer_task
+            self._writer_task = None
+        for reader in self._readers:
+            await reader.close()
+        self._readers.clear()
+        self._idle_readers = None
+        if self._writer is not None:
+            await self._writer.close()
+            self._writer = None
+        logger.info(f"SQLite pool closed for {self.db_path.name}")
+
+
+# Connections that still write robo_trader.db directly instead of through the pool writer.
+# Each is opened with open_direct_writer(), so they serialize with the pool writer and
+# with each other on SQLite's write lock instead of failing with "database is locked".
+DIRECT_WRITERS = (
+    "legacy",  # DatabaseConnection.connection: state managers not yet on read()/write()
+    "paper_trading",  # PaperTradingStore: unit_of_work() transactions span several statements
+    "ai_response_cache",  # AIResponseCacheStore
+    "research_ledger",  # ResearchLedgerStore
+)
+
+
+async def open_direct_writer(db_path: Path, busy_timeout_ms: int, wal: bool = True) -> aiosqlite.Connection:
+    """
+    Open a read-write connection for one of DIRECT_WRITERS.
+
+    Implicit transactions start with BEGIN IMMEDIATE, taking the write lock
+    before the first statement. A deferred transaction that has already read
+    fails at once with SQLITE_BUSY when it tries to write after another
+    connection committed, and busy_timeout does not help there. An
+    immediate one just waits up to busy_timeout for the lock.
+    """
+    db = await aiosqlite.connect(str(db_path), isolation_level="IMMEDIATE")
+    await configure_connection(db, busy_timeout_ms, wal=wal)
+    return db
+
+
+async def configure_connection(db: aiosqlite.Connection, busy_timeout_ms: int, wal: bool = True) -> None:
+    """Apply the pragmas every read-write connection to a shared database should use."""
+    await db.execute(f"PRAGMA busy_timeout = {int(busy_timeout_ms)}")
+    if wal:
+        await db.execute("PRAGMA journal_mode = WAL")
+        # WAL makes NORMAL durable against application crashes; only power loss can drop the last commits
+        await db.execute("PRAGMA synchronous = NORMAL")
@@ -8,6 +8,7 @@ market data, positions, orders, and Kite Connect sessions.
 import json
 import sqlite3
 import asyncio
+from contextlib import nullcontext
 from datetime import datetime, date
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, asdict
@@ -212,6 +213,8 @@ class RealTimeTradingState(BaseState):
     def __init__(self, db_path: str):
         super().__init__(db_path)
         self._lock = asyncio.Lock()
+        # Ticks are group-committed instead of paying one commit per quote
+        self._quote_writer = self.db.group_writer("real_time_quotes")
         import logging
         self.logger = logging.getLogger(__name__)
 
@@ -365,35 +368,71 @@ class RealTimeTradingState(BaseState):
         )
 
     # Market Data Operations
-    async def store_real_time_quote(self, quote: RealTimeQuote) -> bool:
-        """Store real-time quote data."""
-        async with self._lock:
-            try:
-                cursor = await self.db.connection.execute("""
-                    INSERT OR REPLACE INTO real_time_quotes
-                    (symbol, last_price, change_price, change_percent, volume, timestamp, source)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    quote.symbol,
-                    quote.last_price,
-                    quote.change_price,
-                    quote.change_percent,
-                    quote.volume,
-                    quote.timestamp or datetime.utcnow().isoformat(),
-                    quote.source
-                ))
-                await self.db.connection.commit()
-                return True
+    def _quote_guard(self):
+        """Quote reads/writes use the access layer when pooled; otherwise the state lock."""
+        return self._lock if getattr(self.db, "pool", None) is None else nullcontext()
+
+    _QUOTE_UPSERT = """
+        INSERT OR REPLACE INTO real_time_quotes
+        (symbol, last_price, change_price, change_percent, volume, timestamp, source)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """
+
+    @staticmethod
+    def _quote_row(quote: RealTimeQuote) -> tuple:
+        return (
+            quote.symbol,
+            quote.last_price,
+            quote.change_price,
+            quote.change_percent,
+            quote.volume,
+            quote.timestamp or datetime.utcnow().isoformat(),
+            quote.source
+        )
 
-            except Exception as e:
-                self.logger.error(f"Failed to store real-time quote for {quote.symbol}: {e}")
-                return False
+    async def buffer_real_time_quote(self, quote: RealTimeQuote) -> bool:
+        """
+        Deferred write: buffer a quote for the next group commit.
+
+        True means the quote was buffered, not committed; it is committed with
+        other ticks on the count/interval trigger, or by flush_quotes().
+        """
+        try:
+            await self._quote_writer.execute(self._QUOTE_UPSERT, self._quote_row(quote))
+            return True
+
+        except Exception as e:
+            self.logger.error(f"Failed to buffer real-time quote for {quote.symbol}: {e}")
+            return False
+
+    async def buffer_real_time_quotes(self, quotes: List[RealTimeQuote]) -> bool:
+        """Deferred write: buffer a bulk quote response as one statement (see buffer_real_time_quote)."""
+        if not quotes:
+            return True
+        try:
+            await self._quote_writer.executemany(self._QUOTE_UPSERT, [self._quote_row(quote) for quote in quotes])
+            return True
+
+        except Exception as e:
+            self.logger.error(f"Failed to buffer {len(quotes)} real-time quotes: {e}")
+            return False
+
+    async def flush_quotes(self) -> None:
+        """Commit buffered quotes now."""
+        await self._quote_writer.flush()
+
+    async def _flush_quotes_before_read(self) -> None:
+        try:
+            await self.flush_quotes()
+        except Exception as e:
+            self.logger.warning(f"Reading quotes without {self._quote_writer.pending} buffered ticks: {e}")
 
     async def get_latest_quote(self, symbol: str) -> Optional[RealTimeQuote]:
         """Get latest quote for a symbol."""
-        async with self._lock:
+        await self._flush_quotes_before_read()
+        async with self._quote_guard(), self.db.read("real_time_quotes") as db:
             try:
-                cursor = await self.db.connection.execute("""
+                cursor = await db.execute("""
                     SELECT * FROM real_time_quotes
                     WHERE symbol = ?
                     ORDER BY timestamp DESC
@@ -408,13 +447,13 @@ class RealTimeTradingState(BaseState):
 
     async def get_multiple_quotes(self, symbols: List[str]) -> Dict[str, RealTimeQuote]:
         """Get latest quotes for multiple symbols."""
-        async with self._lock:
+        if not symbols:
+            return {}
+        await self._flush_quotes_before_read()
+        async with self._quote_guard(), self.db.read("real_time_quotes") as db:
             try:
-                if not symbols:
-                    return {}
-
                 placeholders = ','.join(['?' for _ in symbols])
-                cursor = await self.db.connection.execute(f"""
+                cursor = await db.execute(f"""
                     SELECT * FROM real_time_quotes
                     WHERE symbol IN ({placeholders})
                     ORDER BY timestamp DESC
@@ -7,7 +7,7 @@ for code that expects the older database connection pattern.
 
 import aiosqlite
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator
 
 
 class DatabaseWrapper:
@@ -47,4 +47,19 @@ class DatabaseWrapper:
         """
         # Return the existing connection directly
         # DatabaseConnection already manages the connection pooling
-        yield self.db_connection.connection
\ No newline at end of file
+        yield self.db_connection.connection
+
+    @asynccontextmanager
+    async def read(self, store: str = "default") -> AsyncGenerator[aiosqlite.Connection, None]:
+        """
+        Borrow a connection for read-only queries.
+
+        Yields a pooled read-only connection when the access layer is enabled,
+        so SELECTs do not wait behind writers on the shared connection.
+        """
+        async with self.db_connection.read(store) as reader:
+            yield reader
+
+    async def write(self, operation, store: str = "default") -> Any:
+        """Queue a write operation for the single group-committing writer."""
+        return await self.db_connection.write(operation, store)
@@ -205,7 +205,7 @@ class DependencyContainer:
             "execution_service", "risk_service", "portfolio_service", "feature_management_service",
             "strategy_evolution_engine", "event_router_service",
             "safety_layer", "event_bus", "learning_engine", "conversation_manager",
-            "background_scheduler", "ai_planner", "state_manager", "resource_manager"
+            "background_scheduler", "ai_planner", "state_manager", "ai_response_cache", "http_client_pool", "resource_manager"
         ]
 
         for service_name in services_to_cleanup:
@@ -33,13 +33,49 @@ async def register_core_services(container: 'DependencyContainer') -> None:
 
     container._register_singleton("config", create_config)
 
+    # HTTP client pool - singleton (keep-alive connections for every outbound integration)
+    async def create_http_client_pool():
+        from src.core.http_clients import HttpPoolSettings, get_http_client_pool
+
+        pool = get_http_client_pool()
+        pool.configure(HttpPoolSettings.from_config(container.config))
+        return pool
+
+    container._register_singleton("http_client_pool", create_http_client_pool)
+
+    # AI response cache - singleton (persisted structured responses keyed by request digest)
+    async def create_ai_response_cache():
+        from src.core.database_state.connection_pool import open_direct_writer
+        from src.stores.ai_response_cache_store import AIResponseCacheStore
+
+        runtime_config = container.config.ai_runtime
+        if not runtime_config.response_cache_enabled:
+            return None
+        db_config = container.config.database
+        connection = await open_direct_writer(
+            container.config.state_dir / "robo_trader.db", db_config.busy_timeout_ms, wal=db_config.wal_enabled
+        )
+        store = AIResponseCacheStore(
+            connection,
+            max_entries=runtime_config.response_cache_max_entries,
+            ttl_by_role=runtime_config.response_cache_ttl_seconds,
+        )
+        await store.initialize()
+        await store.purge_expired()
+        return store
+
+    container._register_singleton("ai_response_cache", create_ai_response_cache)
+
     async def create_codex_runtime_client():
         from src.services.codex_runtime_client import CodexRuntimeClient
 
         runtime_config = container.config.ai_runtime
+        http_client_pool = await container.get("http_client_pool")
         return CodexRuntimeClient(
             runtime_config.codex_runtime_url,
             timeout_seconds=runtime_config.timeout_seconds,
+            http_client=http_client_pool.get("codex_runtime", timeout=runtime_config.timeout_seconds),
+            response_cache=await container.get("ai_response_cache"),
         )
 
     container._register_singleton("codex_runtime_client", create_codex_runtime_client)
@@ -121,7 +157,9 @@ async def register_core_services(container: 'DependencyContainer') -> None:
     async def create_queue_state_repository():
         from ..repositories import QueueStateRepository
         database = await container.get("database")
-        repo = QueueStateRepository(database)
+        # Status polls read the task store's live counters instead of aggregating queue_tasks
+        task_service = await container.get("task_service")
+        repo = QueueStateRepository(database, task_store=task_service.store)
         await repo.initialize()
         logger.info("QueueStateRepository initialized")
         return repo
@@ -154,7 +192,7 @@ async def register_core_services(container: 'DependencyContainer') -> None:
         from ..models.scheduler import TaskType
 
         state_manager = await container.get("state_manager")
-        task_store = SchedulerTaskStore(state_manager.db.connection)
+        task_store = SchedulerTaskStore(state_manager.db.connection, pool=state_manager.db.pool)
 
         task_service = SchedulerTaskService(task_store)
         await task_service.initialize()
@@ -612,7 +650,12 @@ async def register_core_services(container: 'DependencyContainer') -> None:
             queue_state_repository = await container.get("queue_state_repository")
         except Exception as e:
             logger.debug(f"QueueStateRepository not available for SequentialQueueManager: {e}")
-        return SequentialQueueManager(task_service, queue_state_repository)
+        from ..services.scheduler.queue_worker_pool import QueueConcurrencyPolicy
+        return SequentialQueueManager(
+            task_service,
+            queue_state_repository,
+            policy=QueueConcurrencyPolicy.from_config(container.config),
+        )
 
     container._register_singleton("sequential_queue_manager", create_sequential_queue_manager)
 
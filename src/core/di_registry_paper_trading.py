@@ -8,7 +8,6 @@ Handles registration of paper trading infrastructure:
 """
 
 import logging
-import aiosqlite
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -19,10 +18,15 @@ async def register_paper_trading_services(container: 'DependencyContainer') -> N
 
     # Paper Trading Infrastructure
     async def create_paper_trading_store():
+        from src.core.database_state.connection_pool import open_direct_writer
         from src.stores.paper_trading_store import PaperTradingStore
-        db_path = container.config.state_dir / "robo_trader.db"
-        connection = await aiosqlite.connect(str(db_path))
-        store = PaperTradingStore(connection)
+        state_manager = await container.get("state_manager")
+        db_config = container.config.database
+        connection = await open_direct_writer(
+            container.config.state_dir / "robo_trader.db", db_config.busy_timeout_ms, wal=db_config.wal_enabled
+        )
+        # Dashboard reads go through the shared WAL reader pool
+        store = PaperTradingStore(connection, pool=state_manager.db.pool)
         await store.initialize()
         return store
 
@@ -54,12 +58,29 @@ async def register_paper_trading_services(container: 'DependencyContainer') -> N
 
     container._register_singleton("paper_trading_price_monitor", create_paper_trading_price_monitor)
 
+    # Paper Trading Exit Trigger Engine (tick-driven stop-loss / target exits)
+    async def create_paper_trading_exit_trigger_engine():
+        if not container.config.execution.paper_tick_exits_enabled:
+            logger.info("Tick-driven paper exits disabled (execution.paper_tick_exits_enabled=false)")
+            return None
+
+        from src.services.paper_trading.exit_trigger_engine import ExitTriggerEngine
+        event_bus = await container.get("event_bus")
+        store = await container.get("paper_trading_store")
+        engine = ExitTriggerEngine(event_bus, store)
+        logger.info(f"ExitTriggerEngine armed with {engine.armed_levels()} stop/target levels")
+        return engine
+
+    container._register_singleton("paper_trading_exit_trigger_engine", create_paper_trading_exit_trigger_engine)
+
     # Paper Trading Account Manager
     async def create_paper_trading_account_manager():
         from src.services.paper_trading.account_manager import PaperTradingAccountManager
         store = await container.get("paper_trading_store")
         market_data_service = await container.get("market_data_service")
         price_monitor = await container.get("paper_trading_price_monitor")
+        # Tick consumers of the open-position index start alongside the price monitor
+        await container.get("paper_trading_exit_trigger_engine")
         manager = PaperTradingAccountManager(store, market_data_service, price_monitor)
         logger.info("PaperTradingAccountManager created with Zerodha MarketDataService and PriceMonitor")
         return manager
@@ -168,9 +189,12 @@ async def register_paper_trading_services(container: 'DependencyContainer') -> N
 
     # Research Ledger Store (structured feature extraction persistence)
     async def create_research_ledger_store():
+        from src.core.database_state.connection_pool import open_direct_writer
         from src.stores.research_ledger_store import ResearchLedgerStore
-        db_path = container.config.state_dir / "robo_trader.db"
-        connection = await aiosqlite.connect(str(db_path))
+        db_config = container.config.database
+        connection = await open_direct_writer(
+            container.config.state_dir / "robo_trader.db", db_config.busy_timeout_ms, wal=db_config.wal_enabled
+        )
         store = ResearchLedgerStore(connection)
         await store.initialize()
         logger.info("ResearchLedgerStore initialized")
@@ -249,6 +273,15 @@ async def register_paper_trading_services(container: 'DependencyContainer') -> N
 
     container._register_singleton("deterministic_scorer", create_deterministic_scorer)
 
+    # NSE Universe (preloaded discovery universe with sector/cap bitmaps, reloaded on file change)
+    async def create_nse_universe_service():
+        from src.services.nse_universe import NSEUniverseService
+        universe_service = NSEUniverseService()
+        await universe_service.initialize()
+        return universe_service
+
+    container._register_singleton("nse_universe_service", create_nse_universe_service)
+
     # Stock Discovery Service (PT-002: Autonomous Stock Discovery)
     async def create_stock_discovery_service():
         from src.services.paper_trading.stock_discovery import StockDiscoveryService
@@ -262,6 +295,7 @@ async def register_paper_trading_services(container: 'DependencyContainer') -> N
         deterministic_scorer = await container.get("deterministic_scorer")
         learning_service = await container.get("paper_trading_learning_service")
         account_manager = await container.get("paper_trading_account_manager")
+        universe_service = await container.get("nse_universe_service")
 
         # Create and initialize service
         discovery_service = StockDiscoveryService(
@@ -273,6 +307,7 @@ async def register_paper_trading_services(container: 'DependencyContainer') -> N
             deterministic_scorer=deterministic_scorer,
             learning_service=learning_service,
             account_manager=account_manager,
+            universe_service=universe_service,
         )
         await discovery_service.initialize()
 
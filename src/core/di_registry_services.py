@@ -17,6 +17,7 @@ from src.services.learning_service import LearningService
 from src.services.strategy_evolution_engine import StrategyEvolutionEngine
 from src.models.market_data import MarketDataProvider
 from src.services.market_data_service import MarketDataService
+from src.services.indicator_engine import IncrementalIndicatorEngine
 from src.services.quote_stream_adapter import NullQuoteStreamAdapter, UpstoxQuoteStreamAdapter, KiteTickerQuoteStreamAdapter
 from src.services.trading_capability_service import TradingCapabilityService
 from src.services.feature_management.service import FeatureManagementService
@@ -97,6 +98,7 @@ async def register_domain_services(container: 'DependencyContainer') -> None:
             event_bus,
             broker=broker,
             default_provider=default_provider,
+            indicator_engine=await container.get("indicator_engine"),
         )
         quote_stream_adapter = await container.get("quote_stream_adapter")
         quote_stream_adapter.set_quote_update_callback(market_data_service._update_market_data)
@@ -106,6 +108,12 @@ async def register_domain_services(container: 'DependencyContainer') -> None:
 
     container._register_singleton("market_data_service", create_market_data_service)
 
+    # Streaming technical indicators (fed ticks by the market data service)
+    async def create_indicator_engine():
+        return IncrementalIndicatorEngine()
+
+    container._register_singleton("indicator_engine", create_indicator_engine)
+
     # Trading Capability Service
     async def create_trading_capability_service():
         return TradingCapabilityService(container)
@@ -15,6 +15,8 @@ import aiosqlite
 from loguru import logger
 
 from src.config import Config
+from src.core.event_pipeline import EventDurability, EventPublishPipeline
+from src.core.group_commit import GroupCommitWriter
 
 
 class EventType(Enum):
@@ -146,6 +148,7 @@ class EventBus:
     - Event persistence for replay
     - Dead letter queue for failed events
     - Event correlation and tracing
+    - Optional non-blocking pipeline mode (config.event_bus.pipeline_enabled)
     """
 
     def __init__(self, config: Config):
@@ -156,15 +159,34 @@ class EventBus:
         # In-memory subscriptions
         self._subscriptions: Dict[EventType, Set[EventHandler]] = {}
         self._lock = asyncio.Lock()
+        # Guards every write and commit on _db_connection, in both modes
+        self._write_lock = asyncio.Lock()
 
         # Database connection
         self._db_connection: Optional[aiosqlite.Connection] = None
 
+        # Direct mode: processed marks are group-committed instead of one commit per handler
+        self._processed_writer: Optional[GroupCommitWriter] = None
+
+        # Non-blocking publish pipeline (pipeline mode only)
+        self._pipeline: Optional[EventPublishPipeline] = None
+        if config.event_bus.pipeline_enabled:
+            self._pipeline = EventPublishPipeline(self)
+
     async def initialize(self) -> None:
         """Initialize the event bus."""
         async with self._lock:
             self._db_connection = await aiosqlite.connect(str(self.db_path))
             await self._create_tables()
+            self._processed_writer = GroupCommitWriter.for_connection(
+                self._db_connection,
+                lock=self._write_lock,
+                max_batch=self.config.database.group_commit_max_batch,
+                max_delay_ms=self.config.database.group_commit_interval_ms,
+                name="event_bus_processed",
+            )
+            if self._pipeline:
+                await self._pipeline.start()
             logger.info("Event bus initialized")
 
     async def _create_tables(self) -> None:
@@ -208,9 +230,15 @@ class EventBus:
 
     async def publish(self, event: Event) -> None:
         """Publish an event to the bus."""
+        if self._pipeline:
+            await self._pipeline.publish(event)
+            logger.debug(f"Queued event {event.id} of type {event.type.value}")
+            return
+
         async with self._lock:
             # Store event in database
-            await self._persist_event(event)
+            async with self._write_lock:
+                await self._persist_event(event)
 
             # Notify subscribers
             await self._notify_subscribers(event)
@@ -256,14 +284,17 @@ class EventBus:
 
     async def _mark_event_processed(self, event_id: str) -> None:
         """Mark an event as processed."""
-        await self._db_connection.execute("""
+        await self._processed_writer.execute("""
             UPDATE events SET status = 'processed', processed_at = ?
             WHERE id = ?
         """, (datetime.now(timezone.utc).isoformat(), event_id))
-        await self._db_connection.commit()
 
     async def _handle_failed_event(self, event: Event, error_message: str) -> None:
         """Handle a failed event by moving to dead letter queue."""
+        async with self._write_lock:
+            await self._record_failed_event(event, error_message)
+
+    async def _record_failed_event(self, event: Event, error_message: str) -> None:
         # Increment retry count
         await self._db_connection.execute("""
             UPDATE events SET retry_count = retry_count + 1
@@ -307,6 +338,7 @@ class EventBus:
 
     async def get_pending_events(self, event_type: Optional[EventType] = None, limit: int = 100) -> List[Event]:
         """Get pending events for processing."""
+        await self.flush()
         query = "SELECT * FROM events WHERE status = 'pending'"
         params = []
 
@@ -337,6 +369,7 @@ class EventBus:
 
     async def replay_events(self, from_timestamp: str, to_timestamp: Optional[str] = None) -> List[Event]:
         """Replay events within a time range."""
+        await self.flush()
         query = "SELECT * FROM events WHERE timestamp >= ?"
         params = [from_timestamp]
 
@@ -364,8 +397,36 @@ class EventBus:
 
         return events
 
+    def durability_for(self, event_type: EventType) -> EventDurability:
+        """Get the persistence level applied to an event type."""
+        if self._pipeline:
+            return self._pipeline.durability_for(event_type)
+        return EventDurability.SYNC
+
+    async def flush(self) -> None:
+        """Persist any events buffered by the write-behind pipeline."""
+        if self._pipeline:
+            await self._pipeline.flush()
+        if self._processed_writer:
+            await self._processed_writer.flush()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get publish latency and queue depth metrics."""
+        if self._pipeline:
+            return {"mode": "pipeline", **self._pipeline.get_metrics()}
+        return {
+            "mode": "direct",
+            "subscribed_types": len(self._subscriptions),
+            "processed_marks": self._processed_writer.get_stats() if self._processed_writer else None,
+        }
+
     async def close(self) -> None:
         """Close the event bus."""
+        if self._pipeline:
+            await self._pipeline.stop()
+        if self._processed_writer:
+            await self._processed_writer.close()
+            self._processed_writer = None
         if self._db_connection:
             await self._db_connection.close()
             self._db_connection = None
@@ -0,0 +1,339 @@
+"""
+Event Publish Pipeline for Robo Trader
+
+Non-blocking publish path for the EventBus. Publishers enqueue into bounded
+per-type queues and return immediately; a write-behind task persists events
+in batched transactions and per-type worker tasks dispatch handlers.
+"""
+
+import asyncio
+import json
+import time
+from collections import deque
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Deque, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+if TYPE_CHECKING:
+    from src.core.event_bus import Event, EventBus, EventType
+
+
+class EventDurability(Enum):
+    """How strongly an event must be persisted before publish returns."""
+    NONE = "none"        # Never written to the events table
+    BATCHED = "batched"  # Written by the write-behind task in a group commit
+    SYNC = "sync"        # Written and committed before publish returns
+
+
+# Event type values whose durability differs from the BATCHED default.
+DEFAULT_DURABILITY_OVERRIDES: Dict[str, EventDurability] = {
+    "market.price_update": EventDurability.NONE,
+    "execution.order_placed": EventDurability.SYNC,
+    "execution.order_filled": EventDurability.SYNC,
+    "execution.order_rejected": EventDurability.SYNC,
+    "execution.order_cancelled": EventDurability.SYNC,
+    "risk.stop_loss_trigger": EventDurability.SYNC,
+    "trade_lifecycle.update": EventDurability.SYNC,
+}
+
+_LATENCY_SAMPLES = 2048
+
+# Event type being dispatched by the current worker; inherited by handler tasks.
+_dispatching_type: ContextVar[Optional["EventType"]] = ContextVar("_dispatching_type", default=None)
+
+
+class EventPublishPipeline:
+    """
+    Bounded, batched publish pipeline used by EventBus in pipeline mode.
+
+    Features:
+    - Per-EventType bounded queues with dedicated dispatch workers
+    - Write-behind persistence with time-or-count group commits
+    - Per-type durability (none / batched / sync)
+    - Publish latency and queue depth metrics
+    """
+
+    def __init__(self, bus: "EventBus"):
+        self.bus = bus
+        settings = bus.config.event_bus
+        self.queue_maxsize = settings.queue_maxsize
+        self.flush_interval = settings.flush_interval_ms / 1000.0
+        self.flush_batch_size = settings.flush_batch_size
+        self.max_pending_inserts = max(settings.max_pending_inserts, self.flush_batch_size)
+        self.drain_timeout = settings.shutdown_drain_timeout_seconds
+
+        self._durability: Dict[str, EventDurability] = dict(DEFAULT_DURABILITY_OVERRIDES)
+        for type_value, level in settings.durability.items():
+            self._durability[type_value] = EventDurability(level)
+
+        self._queues: Dict["EventType", asyncio.Queue] = {}
+        self._workers: Dict["EventType", asyncio.Task] = {}
+        self._pending_inserts: List[Tuple[Any, ...]] = []
+        self._pending_processed: List[Tuple[str, str]] = []
+        self._flush_wakeup = asyncio.Event()
+        self._writer_task: Optional[asyncio.Task] = None
+        self._running = False
+
+        self._publish_latencies_us: Deque[float] = deque(maxlen=_LATENCY_SAMPLES)
+        self._stats = {
+            "events_published": 0,
+            "events_dispatched": 0,
+            "events_dropped": 0,
+            "events_overflowed": 0,
+            "events_failed": 0,
+            "events_persisted": 0,
+            "inserts_dropped": 0,
+            "flushes": 0,
+        }
+
+    def durability_for(self, event_type: "EventType") -> EventDurability:
+        """Return the configured durability level for an event type."""
+        return self._durability.get(event_type.value, EventDurability.BATCHED)
+
+    async def start(self) -> None:
+        """Start the write-behind task."""
+        if self._running:
+            return
+        self._running = True
+        self._writer_task = asyncio.create_task(self._write_behind_loop())
+        logger.info("Event publish pipeline started")
+
+    async def stop(self) -> None:
+        """Drain queued events within the shutdown timeout, flush and stop all tasks."""
+        if not self._running:
+            return
+
+        queues = list(self._queues.values())
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(queue.join() for queue in queues)),
+                timeout=self.drain_timeout,
+            )
+        except asyncio.TimeoutError:
+            abandoned = sum(queue.qsize() for queue in queues)
+            logger.warning(
+                f"Event pipeline drain timed out after {self.drain_timeout}s; "
+                f"abandoning {abandoned} queued events (durable ones stay pending in the events table)"
+            )
+
+        self._running = False
+        tasks = list(self._workers.values())
+        if self._writer_task:
+            tasks.append(self._writer_task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers.clear()
+        self._writer_task = None
+
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(f"Final event pipeline flush failed: {e}")
+        logger.info("Event publish pipeline stopped")
+
+    async def publish(self, event: "Event") -> None:
+        """Enqueue an event for persistence and dispatch."""
+        started = time.perf_counter()
+        durability = self.durability_for(event.type)
+
+        if durability is EventDurability.SYNC:
+            async with self.bus._write_lock:
+                await self._insert_rows(self.bus._db_connection, [self._event_row(event)])
+                await self.bus._db_connection.commit()
+            self._stats["events_persisted"] += 1
+        elif durability is EventDurability.BATCHED:
+            self._pending_inserts.append(self._event_row(event))
+            if len(self._pending_inserts) >= self.max_pending_inserts:
+                await self._flush_for_backpressure()
+            elif len(self._pending_inserts) >= self.flush_batch_size:
+                self._flush_wakeup.set()
+
+        if event.type in self.bus._subscriptions:
+            await self._enqueue(event, durability)
+
+        self._stats["events_published"] += 1
+        self._publish_latencies_us.append((time.perf_counter() - started) * 1_000_000)
+
+    async def _flush_for_backpressure(self) -> None:
+        """The insert buffer is full: the publisher flushes it before returning."""
+        try:
+            await self.flush()
+        except Exception as e:
+            # flush() has already dropped the oldest rows beyond the cap
+            logger.error(f"Event flush under backpressure failed: {e}")
+
+    async def _enqueue(self, event: "Event", durability: EventDurability) -> None:
+        """Put an event on its type queue, applying ring semantics to non-durable events."""
+        queue = self._queues.get(event.type)
+        if queue is None:
+            queue = asyncio.Queue(maxsize=self.queue_maxsize)
+            self._queues[event.type] = queue
+            self._workers[event.type] = asyncio.create_task(self._dispatch_loop(event.type, queue))
+
+        if durability is EventDurability.NONE and queue.full():
+            # Ring behaviour: the oldest non-durable event is superseded by the newest.
+            try:
+                queue.get_nowait()
+                queue.task_done()
+                self._stats["events_dropped"] += 1
+            except asyncio.QueueEmpty:
+                pass
+
+        if queue.full() and _dispatching_type.get() is event.type:
+            # A handler re-publishing its own event type must not wait on the
+            # queue it is draining. The event is already persisted (or buffered)
+            # as pending, so it stays recoverable through get_pending_events().
+            self._stats["events_overflowed"] += 1
+            logger.warning(
+                f"Event queue for {event.type.value} is full; not dispatching "
+                f"{event.id} published from its own dispatch worker"
+            )
+            return
+
+        # Durable events apply backpressure to publishers while the queue is full.
+        await queue.put(event)
+
+    async def _dispatch_loop(self, event_type: "EventType", queue: asyncio.Queue) -> None:
+        """Dispatch events of one type to its subscribers, in order."""
+        _dispatching_type.set(event_type)
+        while True:
+            event = await queue.get()
+            try:
+                handlers = list(self.bus._subscriptions.get(event_type, ()))
+                if handlers:
+                    errors = await asyncio.gather(
+                        *(self._safe_handle_event(handler, event) for handler in handlers)
+                    )
+                    await self._record_outcome(event, [error for error in errors if error])
+                self._stats["events_dispatched"] += 1
+            except Exception as e:
+                logger.error(f"Event dispatch failed for {event.id}: {e}")
+            finally:
+                queue.task_done()
+
+    async def _safe_handle_event(self, handler: Any, event: "Event") -> Optional[str]:
+        """Run a handler and return its error message, if any."""
+        try:
+            await handler.handle_event(event)
+            return None
+        except Exception as e:
+            logger.error(f"Event handler {type(handler).__name__} failed for event {event.id}: {e}")
+            return f"{type(handler).__name__}: {e}"
+
+    async def _record_outcome(self, event: "Event", errors: List[str]) -> None:
+        """Write one final status for an event once all of its handlers have run."""
+        if self.durability_for(event.type) is EventDurability.NONE:
+            return
+
+        if not errors:
+            self._pending_processed.append((datetime.now(timezone.utc).isoformat(), event.id))
+            return
+
+        self._stats["events_failed"] += 1
+        await self.flush()
+        await self.bus._handle_failed_event(event, "; ".join(errors))
+
+    async def _write_behind_loop(self) -> None:
+        """Flush pending writes every interval or as soon as a batch fills."""
+        while self._running:
+            try:
+                await asyncio.wait_for(self._flush_wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Event write-behind flush failed: {e}")
+
+    async def flush(self) -> None:
+        """Persist all buffered inserts and processed marks in one transaction.
+
+        Buffers are only released once the commit succeeds; on failure the
+        transaction is rolled back and the rows are put back for the next flush,
+        keeping at most ``max_pending_inserts`` (the oldest are dropped).
+        """
+        connection = self.bus._db_connection
+        if connection is None:
+            return
+
+        async with self.bus._write_lock:
+            if not self._pending_inserts and not self._pending_processed:
+                return
+
+            inserts, self._pending_inserts = self._pending_inserts, []
+            processed, self._pending_processed = self._pending_processed, []
+            try:
+                if inserts:
+                    await self._insert_rows(connection, inserts)
+                if processed:
+                    await connection.executemany(
+                        "UPDATE events SET status = 'processed', processed_at = ? WHERE id = ?",
+                        processed,
+                    )
+                await connection.commit()
+            except Exception:
+                await connection.rollback()
+                self._pending_inserts = inserts + self._pending_inserts
+                self._pending_processed = processed + self._pending_processed
+                overflow = len(self._pending_inserts) - self.max_pending_inserts
+                if overflow > 0:
+                    del self._pending_inserts[:overflow]
+                    self._stats["inserts_dropped"] += overflow
+                    logger.error(f"Event persistence is failing; dropped the {overflow} oldest buffered events")
+                raise
+
+        self._stats["events_persisted"] += len(inserts)
+        self._stats["flushes"] += 1
+
+    @staticmethod
+    async def _insert_rows(connection: Any, rows: List[Tuple[Any, ...]]) -> None:
+        """Insert event rows; shared by the sync and write-behind paths."""
+        await connection.executemany(
+            """
+            INSERT OR IGNORE INTO events
+                (id, type, timestamp, source, data, correlation_id, version, status)
+            VALUES (?, ?, ?, ?, ?, ?, ?, 'pending')
+            """,
+            rows,
+        )
+
+    @staticmethod
+    def _event_row(event: "Event") -> Tuple[Any, ...]:
+        return (
+            event.id,
+            event.type.value,
+            event.timestamp,
+            event.source,
+            json.dumps(event.data),
+            event.correlation_id,
+            event.version,
+        )
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get publish latency, queue depth and persistence statistics."""
+        samples = sorted(self._publish_latencies_us)
+
+        def percentile(p: float) -> float:
+            if not samples:
+                return 0.0
+            return round(samples[min(len(samples) - 1, int(p * len(samples)))], 2)
+
+        return {
+            **self._stats,
+            "publish_latency_us": {
+                "p50": percentile(0.50),
+                "p95": percentile(0.95),
+                "p99": percentile(0.99),
+                "max": round(samples[-1], 2) if samples else 0.0,
+            },
+            "queue_depths": {
+                event_type.value: queue.qsize() for event_type, queue in self._queues.items()
+            },
+            "pending_inserts": len(self._pending_inserts),
+            "pending_processed_marks": len(self._pending_processed),
+        }
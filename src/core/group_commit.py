@@ -0,0 +1,213 @@
+"""
+Write batching: units of work and time-or-count group commit.
+
+A ``WriteBatch`` collects statements and applies them in one transaction.
+``GroupCommitWriter`` is the write-behind variant for high-frequency writers
+(ticks, event status marks): statements are buffered and committed together
+once ``max_batch`` are pending or ``max_delay_ms`` has passed since the first
+one, so a burst of N writes costs one fsync instead of N.
+"""
+
+import asyncio
+import sqlite3
+import time
+from contextlib import nullcontext
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import aiosqlite
+from loguru import logger
+
+
+def is_retryable_write_error(error: BaseException) -> bool:
+    """True for lock contention, the only write failure that can succeed unchanged on retry."""
+    if not isinstance(error, sqlite3.OperationalError):
+        return False
+    message = str(error).lower()
+    return "locked" in message or "busy" in message
+
+
+class WriteBatch:
+    """Statements collected by a unit of work, applied together in one transaction."""
+
+    def __init__(self):
+        self.statements: List[Tuple[str, Any, bool]] = []
+
+    def execute(self, query: str, params: Iterable[Any] = ()) -> None:
+        self.statements.append((query, tuple(params), False))
+
+    def executemany(self, query: str, rows: Iterable[Sequence[Any]]) -> None:
+        self.statements.append((query, [tuple(row) for row in rows], True))
+
+    def extend(self, other: "WriteBatch") -> None:
+        self.statements.extend(other.statements)
+
+    def __len__(self) -> int:
+        return len(self.statements)
+
+    @classmethod
+    def of(cls, statements: Iterable[Tuple[str, Any, bool]]) -> "WriteBatch":
+        batch = cls()
+        batch.statements = list(statements)
+        return batch
+
+    async def apply(self, db: aiosqlite.Connection) -> None:
+        """Execute every statement on ``db``; the caller owns commit/rollback."""
+        for query, params, many in self.statements:
+            if many:
+                await db.executemany(query, params)
+            else:
+                await db.execute(query, params)
+
+
+class GroupCommitWriter:
+    """
+    Buffers writes and commits them as one batch on a count or time trigger.
+
+    ``execute()`` returns as soon as the statement is buffered; call
+    ``flush()`` where read-your-writes matters and ``close()`` on shutdown.
+    A commit that fails on lock contention puts the batch back in front of
+    newer writes so it is retried on the next flush; beyond ``max_pending``
+    the oldest are dropped. Any other failure is pinned to its statement by
+    committing the batch one statement at a time: the failing statements are
+    dropped and counted as ``rejected``, the rest are committed.
+    """
+
+    def __init__(
+        self,
+        commit: Callable[[WriteBatch], Awaitable[None]],
+        *,
+        max_batch: int = 500,
+        max_delay_ms: float = 50.0,
+        max_pending: Optional[int] = None,
+        name: str = "default",
+    ):
+        self._commit = commit
+        self.max_batch = max(1, max_batch)
+        self.max_delay = max(0.0, max_delay_ms) / 1000.0
+        self.max_pending = max_pending or self.max_batch * 20
+        self.name = name
+
+        self._pending = WriteBatch()
+        self._flush_lock = asyncio.Lock()
+        self._timer: Optional[asyncio.Task] = None
+        self._stats = {
+            "statements": 0,
+            "commits": 0,
+            "failed_commits": 0,
+            "dropped": 0,
+            "rejected": 0,
+            "largest_batch": 0,
+            "last_commit_ms": 0.0,
+        }
+
+    @classmethod
+    def for_connection(
+        cls,
+        connection: aiosqlite.Connection,
+        *,
+        lock: Optional[asyncio.Lock] = None,
+        **kwargs: Any,
+    ) -> "GroupCommitWriter":
+        """Group-commit straight onto an aiosqlite connection (optionally under a lock)."""
+
+        async def _commit(batch: WriteBatch) -> None:
+            async with lock if lock is not None else nullcontext():
+                try:
+                    await batch.apply(connection)
+                    await connection.commit()
+                except Exception:
+                    await connection.rollback()
+                    raise
+
+        return cls(_commit, **kwargs)
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    async def execute(self, query: str, params: Iterable[Any] = ()) -> None:
+        self._pending.execute(query, params)
+        await self._after_buffer()
+
+    async def executemany(self, query: str, rows: Iterable[Sequence[Any]]) -> None:
+        self._pending.executemany(query, rows)
+        await self._after_buffer()
+
+    async def _after_buffer(self) -> None:
+        self._stats["statements"] += 1
+        if len(self._pending) >= self.max_batch:
+            await self.flush()
+        elif self._timer is None or self._timer.done():
+            self._timer = asyncio.create_task(self._flush_after_delay())
+
+    async def _flush_after_delay(self) -> None:
+        await asyncio.sleep(self.max_delay)
+        try:
+            # Shielded so close() cancelling the timer never interrupts a commit in flight
+            await asyncio.shield(self.flush())
+        except Exception as e:
+            logger.error(f"Group commit for {self.name} failed; {self.pending} writes kept for retry: {e}")
+
+    async def flush(self) -> None:
+        """Commit everything buffered so far."""
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            batch, self._pending = self._pending, WriteBatch()
+            started = time.perf_counter()
+            try:
+                await self._commit(batch)
+            except Exception as e:
+                self._stats["failed_commits"] += 1
+                if is_retryable_write_error(e):
+                    self._requeue(batch)
+                    raise
+                logger.warning(f"Group commit for {self.name} failed ({e}); isolating the failing statements")
+                await self._commit_each(batch)
+                return
+            self._stats["commits"] += 1
+            self._stats["largest_batch"] = max(self._stats["largest_batch"], len(batch))
+            self._stats["last_commit_ms"] = round((time.perf_counter() - started) * 1000, 3)
+
+    def _requeue(self, batch: WriteBatch) -> None:
+        """Put ``batch`` back in front of newer writes, keeping at most ``max_pending``."""
+        batch.extend(self._pending)
+        overflow = len(batch) - self.max_pending
+        if overflow > 0:
+            batch.statements = batch.statements[overflow:]
+            self._stats["dropped"] += overflow
+        self._pending = batch
+
+    async def _commit_each(self, batch: WriteBatch) -> None:
+        """Commit statements one by one, dropping those that fail for good."""
+        for index, statement in enumerate(batch.statements):
+            try:
+                await self._commit(WriteBatch.of([statement]))
+            except Exception as e:
+                if is_retryable_write_error(e):
+                    self._requeue(WriteBatch.of(batch.statements[index:]))
+                    raise
+                self._stats["rejected"] += 1
+                logger.error(f"Group commit for {self.name} dropped a failing statement ({e}): {statement[0]}")
+            else:
+                self._stats["commits"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        commits = self._stats["commits"]
+        return {
+            "name": self.name,
+            **self._stats,
+            "pending": self.pending,
+            "statements_per_commit": round(self._stats["statements"] / commits, 2) if commits else 0.0,
+        }
+
+    async def close(self) -> None:
+        """Stop the delay timer and commit whatever is still buffered."""
+        if self._timer is not None and not self._timer.done() and self._timer is not asyncio.current_task():
+            self._timer.cancel()
+            try:
+                await self._timer
+            except asyncio.CancelledError:
+                pass
+        self._timer = None
+        await self.flush()
@@ -0,0 +1,134 @@
+"""
+Long-lived, pooled HTTP clients.
+
+Every outbound integration (Codex runtime sidecar, Perplexity, instrument
+downloads) borrows a named client from one ``HttpClientPool`` instead of
+opening a fresh ``httpx`` client per request, so repeated calls reuse
+keep-alive connections (and HTTP/2 where the ``h2`` package is installed)
+rather than paying TCP/TLS setup each time. The DI container owns the pool
+and closes it on shutdown.
+"""
+
+import importlib.util
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import httpx
+from loguru import logger
+
+
+@dataclass(frozen=True)
+class HttpPoolSettings:
+    """Connection limits shared by every pooled client."""
+    max_connections: int = 50
+    max_keepalive_connections: int = 20
+    keepalive_expiry_seconds: float = 30.0
+    http2: bool = True
+
+    @classmethod
+    def from_config(cls, config: Any) -> "HttpPoolSettings":
+        http_config = getattr(config, "http", None)
+        if http_config is None:
+            return cls()
+        return cls(
+            max_connections=http_config.max_connections,
+            max_keepalive_connections=http_config.max_keepalive_connections,
+            keepalive_expiry_seconds=http_config.keepalive_expiry_seconds,
+            http2=http_config.http2,
+        )
+
+    @property
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry_seconds,
+        )
+
+
+def _http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+class HttpClientPool:
+    """
+    Named ``httpx`` clients created on first use and reused until ``close()``.
+
+    Async callers use ``get()``; SDKs that need a synchronous transport (the
+    OpenAI client used for Perplexity) use ``get_sync()``. Per-request timeouts
+    are still passed on each call; the timeout given here is only the default.
+    """
+
+    def __init__(self, settings: Optional[HttpPoolSettings] = None):
+        self.settings = settings or HttpPoolSettings()
+        self._http2 = self.settings.http2 and _http2_available()
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._sync_clients: Dict[str, httpx.Client] = {}
+        self._stats = {"clients_created": 0, "borrows": 0}
+
+    def configure(self, settings: HttpPoolSettings) -> None:
+        """Apply new limits to clients created from now on."""
+        self.settings = settings
+        self._http2 = settings.http2 and _http2_available()
+
+    def get(self, name: str, *, timeout: float = 30.0, follow_redirects: bool = False) -> httpx.AsyncClient:
+        """Shared async client for ``name``."""
+        self._stats["borrows"] += 1
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            client = self._clients[name] = httpx.AsyncClient(
+                timeout=timeout,
+                limits=self.settings.limits,
+                http2=self._http2,
+                follow_redirects=follow_redirects,
+            )
+            self._stats["clients_created"] += 1
+        return client
+
+    def get_sync(self, name: str, *, timeout: float = 30.0) -> httpx.Client:
+        """Shared blocking client for ``name`` (for SDKs that take an ``http_client``)."""
+        self._stats["borrows"] += 1
+        client = self._sync_clients.get(name)
+        if client is None or client.is_closed:
+            client = self._sync_clients[name] = httpx.Client(
+                timeout=timeout,
+                limits=self.settings.limits,
+                http2=self._http2,
+            )
+            self._stats["clients_created"] += 1
+        return client
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "http2": self._http2,
+            "max_connections": self.settings.max_connections,
+            "max_keepalive_connections": self.settings.max_keepalive_connections,
+            "clients": sorted([*self._clients, *(f"{name} (sync)" for name in self._sync_clients)]),
+        }
+
+    async def close(self) -> None:
+        """Close every client; the pool can hand out fresh ones afterwards."""
+        clients, self._clients = self._clients, {}
+        sync_clients, self._sync_clients = self._sync_clients, {}
+        for name, client in clients.items():
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"Error closing HTTP client {name}: {e}")
+        for name, client in sync_clients.items():
+            try:
+                client.close()
+            except Exception as e:
+                logger.warning(f"Error closing HTTP client {name}: {e}")
+
+
+_http_client_pool: Optional[HttpClientPool] = None
+
+
+def get_http_client_pool() -> HttpClientPool:
+    """Get the process-wide pool (also registered in the DI container as ``http_client_pool``)."""
+    global _http_client_pool
+    if _http_client_pool is None:
+        _http_client_pool = HttpClientPool()
+    return _http_client_pool
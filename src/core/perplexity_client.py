@@ -16,12 +16,14 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 from enum import Enum
-import httpx
 
 from loguru import logger
 from openai import OpenAI
 from pydantic import BaseModel, Field
 
+from src.core.http_clients import get_http_client_pool
+from src.core.rate_limiter import Priority, Quota, get_rate_limiter
+
 
 class QueryType(Enum):
     """Types of queries supported by the client."""
@@ -149,6 +151,11 @@ class PerplexityClient:
         # Rate limiting
         rate_config = self.config.get('rate_limit', {})
         self.rate_limiter = RateLimitConfig(**rate_config)
+        if rate_config:
+            get_rate_limiter().configure(
+                "perplexity",
+                Quota.per_minute(self.rate_limiter.requests_per_minute, burst=self.rate_limiter.burst_limit),
+            )
 
         # Circuit breaker
         circuit_config = self.config.get('circuit_breaker', {})
@@ -306,7 +313,8 @@ Provide structured data with all available information for each stock.
             client = OpenAI(
                 api_key=api_key,
                 base_url="https://api.perplexity.ai",
-                http_client=httpx.Client(timeout=self.api_timeout)
+                timeout=self.api_timeout,
+                http_client=get_http_client_pool().get_sync("perplexity", timeout=self.api_timeout)
             )
 
             # Define response schema based on query type
@@ -445,34 +453,17 @@ Provide structured data with all available information for each stock.
         return key
 
     async def _apply_rate_limiting(self) -> None:
-        """Apply rate limiting to avoid API quota exhaustion."""
-        now = datetime.now()
+        """Wait for a Perplexity token from the limiter shared with the scheduler clients."""
+        await get_rate_limiter().acquire("perplexity", Priority.RESEARCH, client="fundamentals")
 
-        # Clean old request times
+        now = datetime.now()
         cutoff = now - timedelta(minutes=1)
         self.request_times = [t for t in self.request_times if t > cutoff]
-
-        # Check if we're over the limit
-        if len(self.request_times) >= self.rate_limiter.requests_per_minute:
-            # Calculate wait time
-            oldest_request = min(self.request_times)
-            wait_seconds = (oldest_request + timedelta(minutes=1) - now).total_seconds()
-
-            if wait_seconds > 0:
-                logger.info(f"Rate limit reached, waiting {wait_seconds:.1f} seconds")
-                await asyncio.sleep(wait_seconds)
-
-        # Allow burst requests
-        elif len(self.request_times) >= self.rate_limiter.burst_limit:
-            await asyncio.sleep(1)  # Small delay for burst control
-
         self.request_times.append(now)
 
     def _handle_rate_limit_exceeded(self) -> None:
-        """Handle rate limit exceeded by backing off."""
-        logger.warning("Rate limit exceeded, increasing cooldown")
-        # Could implement exponential backoff here
-        pass
+        """Pause every Perplexity caller for the cooldown after a rate-limit response."""
+        get_rate_limiter().penalize("perplexity", self.rate_limiter.cooldown_seconds)
 
     def _can_make_request(self) -> bool:
         """Check if circuit breaker allows making requests."""
@@ -519,6 +510,7 @@ Provide structured data with all available information for each stock.
             },
             "rate_limiting": {
                 "requests_in_last_minute": len(self.request_times),
-                "limit_per_minute": self.rate_limiter.requests_per_minute
+                "limit_per_minute": self.rate_limiter.requests_per_minute,
+                "shared_limiter": get_rate_limiter().get_stats().get("perplexity", {})
             }
         }
@@ -0,0 +1,263 @@
+"""
+Shared async rate limiting for broker and research clients.
+
+Each endpoint has a token bucket (sustained rate plus burst capacity).
+Callers that cannot be served immediately wait in priority lanes (order
+placement ahead of quote polling ahead of research); within a lane, callers
+from different clients are served round-robin so one busy client cannot
+starve the rest. A single dispatcher per endpoint grants queued requests the
+moment tokens are available, instead of every caller sleeping for a
+worst-case interval.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+from loguru import logger
+
+
+class Priority(IntEnum):
+    """Lane order; lower values are served first."""
+    ORDER = 0
+    QUOTE = 1
+    DEFAULT = 2
+    RESEARCH = 3
+
+
+@dataclass(frozen=True)
+class Quota:
+    """Sustained ``rate`` in requests per second with room for ``burst`` back-to-back requests."""
+    rate: float
+    burst: float = 1.0
+
+    @classmethod
+    def per_minute(cls, requests: float, burst: Optional[float] = None) -> "Quota":
+        return cls(rate=requests / 60.0, burst=burst if burst is not None else max(1.0, requests / 60.0))
+
+
+# Published Kite Connect limits and the Perplexity tier this app is configured for
+DEFAULT_QUOTAS: Dict[str, Quota] = {
+    "kite.orders": Quota(rate=10, burst=10),
+    "kite.quote": Quota(rate=1, burst=1),
+    "kite.historical": Quota(rate=3, burst=3),
+    "kite.default": Quota(rate=10, burst=10),
+    "perplexity": Quota.per_minute(50, burst=10),
+}
+
+_UTILIZATION_WINDOW = 60.0
+
+
+@dataclass
+class _Waiter:
+    future: asyncio.Future
+    cost: float
+
+
+class EndpointLimiter:
+    """Token bucket plus priority/fair wait queues for one endpoint."""
+
+    def __init__(self, name: str, quota: Quota, clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.quota = quota
+        self._clock = clock
+        self._tokens = float(quota.burst)
+        self._updated = clock()
+        self._paused_until = 0.0
+        # priority -> client -> FIFO; OrderedDict order is the round-robin order
+        self._lanes: Dict[Priority, "OrderedDict[str, Deque[_Waiter]]"] = {}
+        self._waiting = 0
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._grants: Deque[Tuple[float, float]] = deque()
+        self._stats = {
+            "granted": 0,
+            "throttled": 0,
+            "cancelled": 0,
+            "penalties": 0,
+            "total_wait_ms": 0.0,
+            "max_wait_ms": 0.0,
+        }
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(float(self.quota.burst), self._tokens + (now - self._updated) * self.quota.rate)
+        self._updated = now
+
+    def _try_take(self, cost: float) -> float:
+        """Take ``cost`` tokens if available; otherwise return the seconds until they will be."""
+        now = self._clock()
+        if now < self._paused_until:
+            return self._paused_until - now
+        self._refill(now)
+        if self._tokens >= cost:
+            self._tokens -= cost
+            self._grants.append((now, cost))
+            return 0.0
+        return (cost - self._tokens) / self.quota.rate
+
+    async def acquire(self, priority: Priority = Priority.DEFAULT, client: str = "default", cost: float = 1.0) -> float:
+        """Wait for capacity; returns the seconds spent waiting."""
+        cost = min(float(cost), float(self.quota.burst))
+        if not self._waiting and self._try_take(cost) == 0.0:
+            self._record(0.0)
+            return 0.0
+
+        started = self._clock()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        lane = self._lanes.setdefault(Priority(priority), OrderedDict())
+        lane.setdefault(client, deque()).append(_Waiter(future, cost))
+        self._waiting += 1
+        if self._dispatcher is None or self._dispatcher.done() or self._dispatcher.get_loop() is not loop:
+            self._dispatcher = asyncio.create_task(self._dispatch(), name=f"rate-limiter:{self.name}")
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            self._stats["cancelled"] += 1
+            raise
+        waited = self._clock() - started
+        self._record(waited)
+        return waited
+
+    def _head(self) -> Optional[Tuple[Priority, str, _Waiter]]:
+        """Next waiter to serve, dropping any whose caller gave up."""
+        for priority in sorted(self._lanes):
+            lane = self._lanes[priority]
+            while lane:
+                client, queue = next(iter(lane.items()))
+                while queue and queue[0].future.done():
+                    queue.popleft()
+                    self._waiting -= 1
+                if queue:
+                    return priority, client, queue[0]
+                del lane[client]
+        return None
+
+    async def _dispatch(self) -> None:
+        while True:
+            head = self._head()
+            if head is None:
+                return
+            priority, client, waiter = head
+            delay = self._try_take(waiter.cost)
+            if delay > 0:
+                # Re-pick after sleeping so a higher-priority arrival goes first
+                await asyncio.sleep(delay)
+                continue
+            lane = self._lanes[priority]
+            lane[client].popleft()
+            self._waiting -= 1
+            if lane[client]:
+                lane.move_to_end(client)
+            else:
+                del lane[client]
+            waiter.future.set_result(None)
+
+    def set_quota(self, quota: Quota) -> None:
+        """Change the quota in place; tokens, stats and queued waiters carry over."""
+        self._refill(self._clock())
+        self.quota = quota
+        self._tokens = min(self._tokens, float(quota.burst))
+        dispatcher = self._dispatcher
+        if dispatcher is not None and not dispatcher.done():
+            # It may be sleeping on a delay computed from the old rate
+            dispatcher.cancel()
+            self._dispatcher = dispatcher.get_loop().create_task(self._dispatch(), name=f"rate-limiter:{self.name}")
+
+    def penalize(self, seconds: float) -> None:
+        """Pause the endpoint after the provider reports a rate-limit error."""
+        self._paused_until = max(self._paused_until, self._clock() + max(0.0, seconds))
+        self._tokens = 0.0
+        self._stats["penalties"] += 1
+
+    def _record(self, waited: float) -> None:
+        waited_ms = waited * 1000
+        self._stats["granted"] += 1
+        self._stats["total_wait_ms"] += waited_ms
+        if waited > 0:
+            self._stats["throttled"] += 1
+            self._stats["max_wait_ms"] = max(self._stats["max_wait_ms"], waited_ms)
+
+    def get_stats(self) -> Dict[str, Any]:
+        now = self._clock()
+        self._refill(now)
+        while self._grants and self._grants[0][0] < now - _UTILIZATION_WINDOW:
+            self._grants.popleft()
+        used = sum(cost for _, cost in self._grants)
+        granted = self._stats["granted"]
+        return {
+            "rate_per_second": self.quota.rate,
+            "burst": self.quota.burst,
+            "tokens_available": round(self._tokens, 3),
+            # Share of the window's capacity actually consumed (1.0 = running at the provider limit)
+            "utilization": round(min(1.0, used / (self.quota.rate * _UTILIZATION_WINDOW + self.quota.burst)), 4),
+            "paused_for_seconds": round(max(0.0, self._paused_until - now), 3),
+            "queued": {
+                priority.name.lower(): sum(len(queue) for queue in lane.values())
+                for priority, lane in sorted(self._lanes.items())
+            },
+            **self._stats,
+            "total_wait_ms": round(self._stats["total_wait_ms"], 3),
+            "max_wait_ms": round(self._stats["max_wait_ms"], 3),
+            "avg_wait_ms": round(self._stats["total_wait_ms"] / granted, 3) if granted else 0.0,
+        }
+
+
+class RateLimiter:
+    """
+    Per-endpoint limiters shared by every client of a provider.
+
+    Endpoints without a configured quota are not limited.
+    """
+
+    def __init__(self, quotas: Optional[Dict[str, Quota]] = None, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._endpoints: Dict[str, EndpointLimiter] = {}
+        for endpoint, quota in (quotas or {}).items():
+            self.configure(endpoint, quota)
+
+    def configure(self, endpoint: str, quota: Quota) -> None:
+        if quota.rate <= 0 or quota.burst <= 0:
+            raise ValueError(f"Quota for {endpoint} must have a positive rate and burst")
+        limiter = self._endpoints.get(endpoint)
+        if limiter is None:
+            self._endpoints[endpoint] = EndpointLimiter(endpoint, quota, self._clock)
+        elif limiter.quota != quota:
+            # Clients configure on construction; never drop the bucket or its waiters
+            limiter.set_quota(quota)
+
+    async def acquire(
+        self,
+        endpoint: str,
+        priority: Priority = Priority.DEFAULT,
+        client: str = "default",
+        cost: float = 1.0,
+    ) -> float:
+        """Wait until ``endpoint`` has capacity for this request; returns the seconds waited."""
+        limiter = self._endpoints.get(endpoint)
+        if limiter is None:
+            return 0.0
+        return await limiter.acquire(priority, client, cost)
+
+    def penalize(self, endpoint: str, seconds: float) -> None:
+        limiter = self._endpoints.get(endpoint)
+        if limiter is not None:
+            logger.warning(f"Rate limit hit on {endpoint}; pausing for {seconds:.1f}s")
+            limiter.penalize(seconds)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: limiter.get_stats() for name, limiter in self._endpoints.items()}
+
+
+_rate_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Get the process-wide limiter (provider quotas are per API key, not per client)."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = RateLimiter(DEFAULT_QUOTAS)
+    return _rate_limiter
@@ -250,6 +250,9 @@ class QueueStatistics:
     average_duration_ms: float
     last_completed_task_id: Optional[str] = None
     last_completed_at: Optional[str] = None
+    # p50/p95/p99 over recent completions, for the queue and per task type
+    duration_percentiles_ms: Dict[str, float] = field(default_factory=dict)
+    task_type_durations_ms: Dict[str, Dict[str, float]] = field(default_factory=dict)
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
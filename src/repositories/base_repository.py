@@ -70,7 +70,8 @@ class BaseRepository(Generic[T]):
                 await repo.update(...)
                 # Commits on success, rolls back on exception
         """
-        async with self.db.connection.execute("BEGIN"):
+        # IMMEDIATE: take the write lock up front so the pool writer and direct writers wait, not fail
+        async with self.db.connection.execute("BEGIN IMMEDIATE"):
             try:
                 yield
                 await self.db.connection.commit()
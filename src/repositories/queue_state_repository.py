@@ -1,7 +1,9 @@
 """Queue state repository for efficient queue status queries.
 
 Single source of truth for all queue status information.
-Uses optimized SQL queries to aggregate task data into QueueState objects.
+When given the SchedulerTaskStore, statuses come from its live in-memory
+queue counters; otherwise SQL queries aggregate task data into QueueState
+objects.
 """
 
 import logging
@@ -9,6 +11,7 @@ from typing import Dict, Optional, List
 from datetime import datetime, timezone, timedelta
 
 from .base_repository import BaseRepository
+from ..core.database_state.base import DatabaseConnection
 from ..models.domain import QueueState, QueueStatus
 from ..models.scheduler import QueueName
 
@@ -25,9 +28,22 @@ class QueueStateRepository(BaseRepository[QueueState]):
 
     Pattern:
         All queue status queries go through this repository.
-        No in-memory state tracking - always query database.
+        Counts come from the task store's live counters when available,
+        which it maintains on every task transition and reconciles with the
+        table periodically; without a task store, always query database.
     """
 
+    def __init__(self, database: DatabaseConnection, task_store=None):
+        """Initialize repository.
+
+        Args:
+            database: DatabaseConnection instance for async queries
+            task_store: Optional SchedulerTaskStore whose live queue counters
+                answer status queries without touching queue_tasks
+        """
+        super().__init__(database)
+        self.task_store = task_store
+
     async def initialize(self) -> None:
         """Initialize repository (tables created by SchedulerTaskStore)."""
         await super().initialize()
@@ -49,6 +65,10 @@ class QueueStateRepository(BaseRepository[QueueState]):
         """
         self._log_query("get_status", f"Getting status for queue: {queue_name}")
 
+        if self.task_store is not None:
+            stats = await self.task_store.get_live_queue_stats()
+            return self._state_from_counters(stats, queue_name, self._get_timestamp())
+
         today_start = self._get_today_start()
         snapshot_ts = self._get_timestamp()
 
@@ -124,6 +144,15 @@ class QueueStateRepository(BaseRepository[QueueState]):
         """
         self._log_query("get_all_statuses", "Getting status for all queues")
 
+        if self.task_store is not None:
+            stats = await self.task_store.get_live_queue_stats()
+            snapshot_ts = self._get_timestamp()
+            queue_names = {queue_enum.value for queue_enum in QueueName} | set(stats.queue_names())
+            return {
+                queue_name: self._state_from_counters(stats, queue_name, snapshot_ts)
+                for queue_name in queue_names
+            }
+
         today_start = self._get_today_start()
         snapshot_ts = self._get_timestamp()
 
@@ -199,6 +228,17 @@ class QueueStateRepository(BaseRepository[QueueState]):
             - total_completed_today: Total completed today
             - total_failed: Total failed tasks
         """
+        if self.task_store is not None:
+            stats = await self.task_store.get_live_queue_stats()
+            counters = [stats.get(queue_name) for queue_name in stats.queue_names()]
+            return {
+                "total_queues": len(counters),
+                "total_pending": sum(c.pending for c in counters),
+                "total_running": sum(c.running for c in counters),
+                "total_completed_today": sum(c.completed_today for c in counters),
+                "total_failed": sum(c.failed for c in counters),
+            }
+
         today_start = self._get_today_start()
 
         query = """
@@ -231,6 +271,22 @@ class QueueStateRepository(BaseRepository[QueueState]):
             "total_failed": result['total_failed'] or 0
         }
 
+    @staticmethod
+    def _state_from_counters(stats, queue_name: str, snapshot_ts: str) -> QueueState:
+        """Build a QueueState from the task store's live counters."""
+        counters = stats.get(queue_name)
+        return QueueState.from_aggregation(
+            queue_name=queue_name,
+            pending=counters.pending,
+            running=counters.running,
+            completed=counters.completed_today,
+            failed=counters.failed,
+            avg_duration=counters.average_duration_ms or None,
+            last_activity=counters.last_completed_at,
+            current_task=stats.current_task(queue_name),
+            snapshot_ts=snapshot_ts
+        )
+
     async def _get_current_task(self, queue_name: str) -> Optional[Dict[str, str]]:
         """Get currently running task for a queue.
 
@@ -7,6 +7,7 @@ import json
 import logging
 import re
 import uuid
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional, Type, TypeVar
 
@@ -35,6 +36,7 @@ from src.models.agent_artifacts import (
 )
 from src.models.market_data import MarketData
 from src.services.codex_runtime_client import CodexRuntimeError, _normalize_output_schema
+from src.stores.ai_response_cache_store import content_digest, response_digest
 from src.services.claude_agent.context_builder import ContextBuilder
 
 logger = logging.getLogger(__name__)
@@ -73,6 +75,7 @@ class AgentArtifactService:
     RESEARCH_QUOTE_PREFLIGHT_WAIT_SECONDS = 4.0
     RESEARCH_QUOTE_PREFLIGHT_POLL_SECONDS = 0.5
     RESEARCH_MEMORY_FRESH_HOURS = 6
+    RESEARCH_CACHE_MAX_PACKETS = 64
     SESSION_TARGET_ACTIONABLE_COUNT = 1
     MAX_RESEARCH_ATTEMPTS_PER_SESSION = 6
     DISCOVERY_POSTURE = "balanced"
@@ -91,7 +94,8 @@ class AgentArtifactService:
         self.context_builder = ContextBuilder(token_limit=1800)
         self._decision_cache: Dict[str, DecisionEnvelope] = {}
         self._review_cache: Dict[str, ReviewEnvelope] = {}
-        self._research_cache: Dict[str, Dict[str, ResearchPacket]] = {}
+        # account -> key (candidate id, "symbol:X", "_latest") -> packet, least recently used first
+        self._research_cache: Dict[str, "OrderedDict[str, ResearchPacket]"] = {}
         self.discovery_candidate_max_age = timedelta(hours=self.DISCOVERY_CANDIDATE_MAX_AGE_HOURS)
 
     @staticmethod
@@ -773,7 +777,7 @@ class AgentArtifactService:
         criteria = self.research_criteria()
 
         if not refresh:
-            cached = self._get_cached_research(account_id, candidate_id=candidate_id, symbol=symbol)
+            cached = await self._get_cached_research(account_id, candidate_id=candidate_id, symbol=symbol)
             if cached is not None:
                 return ResearchEnvelope(
                     status="ready",
@@ -1041,6 +1045,7 @@ class AgentArtifactService:
                 max_turns=3,
                 max_budget_usd=0.75,
                 timeout_seconds=self.FOCUSED_RESEARCH_SYNTHESIS_TIMEOUT_SECONDS,
+                symbols=[candidate.symbol],
             )
         except TradingError as exc:
             usage_limit_message = self._extract_usage_limited_message(str(exc))
@@ -1145,7 +1150,7 @@ class AgentArtifactService:
             )
         )
 
-        self._store_research(account_id, research)
+        await self._store_research(account_id, research)
         if learning_service is not None:
             await learning_service.record_research_packet(
                 account_id,
@@ -1328,6 +1333,12 @@ class AgentArtifactService:
             output_model=DecisionEnvelopePayload,
             allowed_tools=[],
             session_id=f"decision:{account_id}",
+            cache_context=snapshot.model_dump(mode="json"),
+            market_inputs={
+                str(getattr(position, "symbol", "")): getattr(position, "current_price", None)
+                for position in positions
+            },
+            symbols=[str(getattr(position, "symbol", "")) for position in positions],
         )
         decisions, confidence_blockers, ready_decision_count = self._finalize_decision_packets(
             response.decisions,
@@ -1448,6 +1459,7 @@ class AgentArtifactService:
             output_model=ReviewReport,
             allowed_tools=[],
             session_id=f"review:{account_id}",
+            cache_context=snapshot.model_dump(mode="json"),
         )
         review.strategy_proposals = self._deterministic_strategy_proposals(snapshot.improvement_report)
         review, review_blockers = self._finalize_review_report(
@@ -2798,27 +2810,82 @@ class AgentArtifactService:
                 ordered.append(candidate)
         return ordered[: AgentArtifactService.MAX_RESEARCH_ATTEMPTS_PER_SESSION]
 
-    def _get_cached_research(
+    async def _response_cache(self) -> Optional[Any]:
+        """Persistent AI response cache, or None when it is disabled or unavailable."""
+        try:
+            return await self.container.get("ai_response_cache")
+        except Exception:
+            return None
+
+    @staticmethod
+    def _research_cache_keys(research: ResearchPacket) -> List[str]:
+        keys = ["_latest"]
+        if research.candidate_id:
+            keys.append(research.candidate_id)
+        if research.symbol:
+            keys.append(f"symbol:{research.symbol.upper()}")
+        return keys
+
+    async def _get_cached_research(
         self,
         account_id: str,
         *,
         candidate_id: Optional[str],
         symbol: Optional[str],
     ) -> Optional[ResearchPacket]:
-        cache = self._research_cache.get(account_id, {})
-        if candidate_id and candidate_id in cache:
-            return cache[candidate_id]
-        if symbol:
-            return cache.get(f"symbol:{symbol.upper()}")
-        return cache.get("_latest")
+        """Return a still-fresh research packet from memory, falling back to the persistent cache."""
+        if candidate_id:
+            key = candidate_id
+        elif symbol:
+            key = f"symbol:{symbol.upper()}"
+        else:
+            key = "_latest"
+
+        cache = self._research_cache.get(account_id)
+        research = cache.get(key) if cache else None
+        if research is None:
+            response_cache = await self._response_cache()
+            if response_cache is None:
+                return None
+            stored = await response_cache.get_alias(content_digest("research_packet", account_id, key))
+            if stored is None:
+                return None
+            research = ResearchPacket.model_validate(stored)
+            self._remember_research(account_id, research)
+
+        if self._freshness_from_timestamp(
+            research.generated_at,
+            max_age_hours=self.RESEARCH_MEMORY_FRESH_HOURS,
+        ) != "fresh":
+            self._research_cache.get(account_id, OrderedDict()).pop(key, None)
+            return None
+        self._research_cache[account_id].move_to_end(key)
+        return research
 
-    def _store_research(self, account_id: str, research: ResearchPacket) -> None:
-        cache = self._research_cache.setdefault(account_id, {})
-        cache["_latest"] = research
-        if research.candidate_id:
-            cache[research.candidate_id] = research
-        if research.symbol:
-            cache[f"symbol:{research.symbol.upper()}"] = research
+    def _remember_research(self, account_id: str, research: ResearchPacket) -> None:
+        cache = self._research_cache.setdefault(account_id, OrderedDict())
+        for key in self._research_cache_keys(research):
+            cache[key] = research
+            cache.move_to_end(key)
+        while len(cache) > self.RESEARCH_CACHE_MAX_PACKETS:
+            cache.popitem(last=False)
+
+    async def _store_research(self, account_id: str, research: ResearchPacket) -> None:
+        self._remember_research(account_id, research)
+        response_cache = await self._response_cache()
+        if response_cache is None:
+            return
+        # One entry per packet; the lookup keys are aliases outside the LRU bound
+        await response_cache.put(
+            content_digest("research_packet", account_id, research.research_id),
+            role="research_packet",
+            response=research.model_dump(mode="json"),
+            symbols=[research.symbol],
+            aliases=[
+                content_digest("research_packet", account_id, key)
+                for key in self._research_cache_keys(research)
+            ],
+        )
 
     async def _run_structured_role(
         self,
@@ -2834,7 +2901,18 @@ class AgentArtifactService:
         max_turns: int = 2,
         max_budget_usd: Optional[float] = None,
         timeout_seconds: float = 45.0,
+        cache_context: Optional[Dict[str, Any]] = None,
+        market_inputs: Optional[Dict[str, Any]] = None,
+        symbols: Optional[List[str]] = None,
     ) -> tuple[T, Dict[str, Any]]:
+        """
+        Run one role against the AI runtime, reusing a persisted response when possible.
+
+        The cache key covers role, system prompt, prompt, schema, model and
+        reasoning. Roles whose prompt carries a delta-serialized context pass
+        the full ``cache_context`` to key on instead of the prompt text. A
+        cached response is discarded once ``market_inputs`` change.
+        """
         del client_type, allowed_tools, max_turns, max_budget_usd
 
         runtime_client = await self.container.get("codex_runtime_client")
@@ -2873,6 +2951,23 @@ class AgentArtifactService:
             "Return only valid JSON with no markdown, commentary, or code fences.\n"
             "The JSON must match the provided structured output schema exactly."
         )
+        response_cache = await self._response_cache()
+        cache_digest = response_digest(
+            role_name,
+            system_prompt,
+            strict_prompt if cache_context is None else json.dumps(cache_context, sort_keys=True, default=str),
+            schema,
+            selected_model,
+            {"reasoning": reasoning},
+        )
+        freshness = content_digest(market_inputs) if market_inputs else ""
+        if response_cache is not None:
+            cached = await response_cache.get(cache_digest, freshness=freshness)
+            if cached is not None:
+                return (
+                    output_model.model_validate(cached["payload"]),
+                    {**cached["provider_metadata"], "response_cache": "hit"},
+                )
         try:
             prompt_cache_key = f"paper-trading:{role_name}:{session_id.split(':')[0]}"
             request_payload = {
@@ -2904,7 +2999,8 @@ class AgentArtifactService:
                     web_search_enabled=False,
                     network_access_enabled=False,
                     working_directory=str(self.container.config.project_dir),
-                        session_id=session_id,
+                    session_id=session_id,
+                    cache_role=None,
                 )
                 payload = response.get("output")
 
@@ -2916,10 +3012,20 @@ class AgentArtifactService:
                     "usage": usage,
                 }
 
-            return (
-                output_model.model_validate(payload or {}),
-                provider_metadata,
-            )
+            result = output_model.model_validate(payload or {})
+            if response_cache is not None:
+                await response_cache.put(
+                    cache_digest,
+                    role=role_name,
+                    response={
+                        "payload": result.model_dump(mode="json"),
+                        "provider_metadata": provider_metadata if isinstance(provider_metadata, dict) else {},
+                    },
+                    model=selected_model,
+                    freshness=freshness,
+                    symbols=symbols or (),
+                )
+            return result, provider_metadata
         except CodexRuntimeError as exc:
             usage_limit_message = self._extract_usage_limited_message(str(exc))
             if usage_limit_message or exc.usage_limited:
@@ -4,10 +4,12 @@ from __future__ import annotations
 
 import json
 from copy import deepcopy
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Optional
 
 import httpx
 
+from src.stores.ai_response_cache_store import AIResponseCacheStore, content_digest, response_digest
+
 
 class CodexRuntimeError(RuntimeError):
     """Raised when the local Codex runtime returns an actionable failure."""
@@ -31,11 +33,42 @@ class CodexRuntimeError(RuntimeError):
 
 
 class CodexRuntimeClient:
-    """Thin async client for the repo-local Codex runtime service."""
+    """
+    Thin async client for the repo-local Codex runtime service.
 
-    def __init__(self, base_url: str, *, timeout_seconds: float = 90.0) -> None:
+    Requests go through one long-lived ``httpx.AsyncClient`` so keep-alive
+    connections are reused; pass the pooled client from ``HttpClientPool`` or
+    let the client open (and ``close()``) its own.
+
+    With a ``response_cache``, ``run_structured`` answers repeated identical
+    requests from the persisted cache instead of re-running the model.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        *,
+        timeout_seconds: float = 90.0,
+        http_client: Optional[httpx.AsyncClient] = None,
+        response_cache: Optional[AIResponseCacheStore] = None,
+    ) -> None:
         self.base_url = base_url.rstrip("/")
         self.timeout_seconds = timeout_seconds
+        self.response_cache = response_cache
+        self._http_client = http_client
+        self._owns_http_client = http_client is None
+
+    def _client(self) -> httpx.AsyncClient:
+        if self._http_client is None or getattr(self._http_client, "is_closed", False):
+            self._http_client = httpx.AsyncClient(timeout=self.timeout_seconds)
+            self._owns_http_client = True
+        return self._http_client
+
+    async def close(self) -> None:
+        """Close the HTTP client if this instance opened it."""
+        if self._owns_http_client and self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
 
     def _runtime_validation_timeout(self, timeout_seconds: Optional[float]) -> float:
         return timeout_seconds or min(self.timeout_seconds, 45.0)
@@ -67,9 +100,42 @@ class CodexRuntimeClient:
         network_access_enabled: bool = False,
         working_directory: Optional[str] = None,
         session_id: Optional[str] = None,
+        cache_role: Optional[str] = "default",
+        market_inputs: Optional[Dict[str, Any]] = None,
+        symbols: Iterable[str] = (),
     ) -> Dict[str, Any]:
+        """
+        Run one structured-output request.
+
+        ``cache_role`` selects the response-cache TTL (``None`` bypasses the
+        cache); a cached response is only reused while ``market_inputs`` (the
+        prices/data the prompt was built from) are unchanged. Session-bound
+        requests are never cached.
+        """
         normalized_schema = _normalize_output_schema(output_schema)
-        return await self._request_json(
+        cache = self.response_cache if cache_role and not session_id else None
+        digest = freshness = ""
+        if cache is not None:
+            digest = response_digest(
+                cache_role,
+                system_prompt,
+                prompt,
+                normalized_schema,
+                model,
+                {
+                    "reasoning": reasoning,
+                    "web_search_enabled": web_search_enabled,
+                    "web_search_mode": web_search_mode,
+                    "network_access_enabled": network_access_enabled,
+                },
+            )
+            freshness = content_digest(market_inputs) if market_inputs else ""
+            cached = await cache.get(digest, freshness=freshness)
+            if cached is not None:
+                cached["cache_hit"] = True
+                return cached
+
+        response = await self._request_json(
             "POST",
             "/v1/structured/run",
             json_body={
@@ -88,6 +154,16 @@ class CodexRuntimeClient:
             },
             timeout_seconds=timeout_seconds,
         )
+        if cache is not None:
+            await cache.put(
+                digest,
+                role=cache_role,
+                response=response,
+                model=model,
+                freshness=freshness,
+                symbols=symbols,
+            )
+        return response
 
     async def run_focused_research(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         return await self._request_json(
@@ -141,8 +217,7 @@ class CodexRuntimeClient:
         url = f"{self.base_url}{path}"
 
         try:
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                response = await client.request(method, url, json=_drop_none(json_body))
+            response = await self._client().request(method, url, json=_drop_none(json_body), timeout=timeout)
         except httpx.TimeoutException as exc:
             raise CodexRuntimeError(
                 f"Codex runtime timed out after {timeout:.1f}s.",
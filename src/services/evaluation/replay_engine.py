@@ -5,12 +5,25 @@ Replays historical OHLCV data through the DeterministicScorer using cached
 ResearchLedgerEntry data. Does NOT call Claude for replay — uses stored features.
 
 Outputs trade-by-trade P&L, max drawdown, Sharpe ratio, win rate, profit factor.
+
+``ReplayEngine.sweep`` runs the same simulation for a whole grid of
+(stop-loss, take-profit, buy-threshold) parameters at once: bars and ledger
+signals are loaded once into (symbol x date) arrays and the engine steps
+through dates with numpy across every (parameter set x symbol) pair. Large
+grids are split across a process pool.
 """
 
+import asyncio
+import itertools
 import logging
 import math
+import os
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Sequence
+
+import numpy as np
+import pandas as pd
 
 from src.services.recommendation_engine.deterministic_scorer import DeterministicScorer, BUY_THRESHOLD
 
@@ -64,6 +77,173 @@ class ReplayResult:
         }
 
 
+@dataclass
+class ReplayArrays:
+    """Bars and ledger signals aligned on a (symbol x date) grid; NaN where a symbol has no bar."""
+    symbols: List[str]
+    dates: List[str]
+    highs: np.ndarray
+    lows: np.ndarray
+    closes: np.ndarray
+    signals: np.ndarray     # ledger BUY score on the bar's date, NaN otherwise
+    last_closes: np.ndarray  # close of each symbol's final bar (used to mark open trades)
+
+
+# Elements of the per-chunk (params x symbols x dates) exit-P&L buffer (~64 MB of float64)
+_SWEEP_CHUNK_ELEMENTS = 8_000_000
+
+SWEEP_METRIC_COLUMNS = [
+    "total_trades",
+    "winning_trades",
+    "losing_trades",
+    "total_pnl",
+    "max_drawdown_pct",
+    "win_rate",
+    "profit_factor",
+    "sharpe_ratio",
+]
+
+
+def build_replay_arrays(
+    historical_prices: Dict[str, List[Dict[str, Any]]],
+    ledger_history: Dict[str, List[Dict[str, Any]]],
+    from_date: str,
+    to_date: str,
+) -> ReplayArrays:
+    """Align bars and ledger entries for every symbol that has ledger history."""
+    symbols = [symbol for symbol in historical_prices if ledger_history.get(symbol)]
+    dates = sorted({
+        bar.get("date", "")[:10]
+        for symbol in symbols
+        for bar in historical_prices[symbol]
+        if from_date <= bar.get("date", "")[:10] <= to_date
+    })
+    date_index = {date: column for column, date in enumerate(dates)}
+
+    shape = (len(symbols), len(dates))
+    highs, lows, closes, signals = (np.full(shape, np.nan) for _ in range(4))
+    last_closes = np.full(len(symbols), np.nan)
+
+    for row, symbol in enumerate(symbols):
+        # Same date -> entry mapping as ReplayEngine.replay (later entries overwrite earlier ones)
+        entry_by_date: Dict[str, Dict] = {}
+        for entry in ledger_history[symbol]:
+            entry_by_date[entry.get("timestamp", "")[:10]] = entry
+
+        bars = historical_prices[symbol]
+        if bars:
+            last_closes[row] = bars[-1].get("close", np.nan)
+        for bar in bars:
+            column = date_index.get(bar.get("date", "")[:10])
+            if column is None:
+                continue
+            close = bar.get("close", 0.0)
+            closes[row, column] = close
+            highs[row, column] = bar.get("high", close)
+            lows[row, column] = bar.get("low", close)
+            entry = entry_by_date.get(dates[column])
+            if entry is not None and entry.get("action", "HOLD") == "BUY":
+                signals[row, column] = entry.get("score", 0)
+
+    return ReplayArrays(symbols, dates, highs, lows, closes, signals, last_closes)
+
+
+def simulate_parameter_grid(
+    arrays: ReplayArrays,
+    stop_loss_pcts: np.ndarray,
+    take_profit_pcts: np.ndarray,
+    buy_thresholds: np.ndarray,
+) -> np.ndarray:
+    """
+    Simulate ReplayEngine.replay semantics for P parameter sets at once.
+
+    Returns a (P, len(SWEEP_METRIC_COLUMNS)) array of metrics.
+    """
+    n_params = len(stop_loss_pcts)
+    n_symbols, n_dates = arrays.closes.shape
+    chunk = max(1, _SWEEP_CHUNK_ELEMENTS // max(1, n_symbols * n_dates))
+    results = np.zeros((n_params, len(SWEEP_METRIC_COLUMNS)))
+    for start in range(0, n_params, chunk):
+        stop = slice(start, min(n_params, start + chunk))
+        results[stop] = _simulate_chunk(
+            arrays,
+            np.asarray(stop_loss_pcts[stop], dtype=float),
+            np.asarray(take_profit_pcts[stop], dtype=float),
+            np.asarray(buy_thresholds[stop], dtype=float),
+        )
+    return results
+
+
+def _simulate_chunk(
+    arrays: ReplayArrays,
+    stop_loss_pcts: np.ndarray,
+    take_profit_pcts: np.ndarray,
+    buy_thresholds: np.ndarray,
+) -> np.ndarray:
+    n_params = len(stop_loss_pcts)
+    n_symbols, n_dates = arrays.closes.shape
+    stop_factor = (1 - stop_loss_pcts / 100)[:, None]
+    target_factor = (1 + take_profit_pcts / 100)[:, None]
+    thresholds = buy_thresholds[:, None]
+
+    entry = np.full((n_params, n_symbols), np.nan)
+    exit_pnl = np.full((n_params, n_symbols, n_dates), np.nan)
+
+    with np.errstate(invalid="ignore"):
+        for column in range(n_dates):
+            low = arrays.lows[:, column]
+            high = arrays.highs[:, column]
+            stop_price = entry * stop_factor
+            target_price = entry * target_factor
+
+            # Stop is checked before target on the same bar, as in replay()
+            hit_stop = low <= stop_price
+            hit_target = ~hit_stop & (high >= target_price)
+            exit_price = np.where(hit_stop, stop_price, np.where(hit_target, target_price, np.nan))
+            exit_pnl[:, :, column] = (exit_price - entry) * 100  # Assume 100 shares
+            entry[hit_stop | hit_target] = np.nan
+
+            # A symbol closed on this bar may re-enter at its close
+            enter = np.isnan(entry) & (arrays.signals[:, column] > thresholds)
+            entry = np.where(enter, arrays.closes[:, column], entry)
+
+        # Remaining open trades are marked at each symbol's last close, after all closed trades
+        final_pnl = (arrays.last_closes - entry) * 100
+
+    # Trade order matches replay(): per symbol by bar, then open trades in symbol order
+    pnl = np.concatenate([exit_pnl.reshape(n_params, -1), final_pnl], axis=1)
+    traded = ~np.isnan(pnl)
+    pnl = np.where(traded, pnl, 0.0)
+
+    counts = traded.sum(axis=1)
+    wins = (pnl > 0).sum(axis=1)
+    losses = (pnl < 0).sum(axis=1)
+    total = pnl.sum(axis=1)
+    gross_profit = np.where(pnl > 0, pnl, 0.0).sum(axis=1)
+    gross_loss = -np.where(pnl < 0, pnl, 0.0).sum(axis=1)
+
+    equity = np.cumsum(pnl, axis=1)
+    peak = np.maximum.accumulate(np.maximum(equity, 0.0), axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        drawdown = np.where(peak > 0, (peak - equity) / peak * 100, 0.0)
+        max_drawdown = drawdown.max(axis=1, initial=0.0)
+
+        win_rate = np.where(counts > 0, wins / counts * 100, 0.0)
+        profit_factor = np.where(
+            gross_loss > 0, gross_profit / gross_loss, np.where(gross_profit > 0, np.inf, 0.0)
+        )
+
+        mean = np.where(counts > 0, total / counts, 0.0)
+        deviation = np.where(traded, pnl - mean[:, None], 0.0)
+        variance = np.where(counts > 1, (deviation ** 2).sum(axis=1) / (counts - 1), 0.0)
+        std = np.sqrt(variance)
+        sharpe = np.where((counts > 1) & (std > 0), mean / std * math.sqrt(252), 0.0)
+
+    return np.column_stack([
+        counts, wins, losses, total, max_drawdown, win_rate, profit_factor, sharpe,
+    ])
+
+
 class ReplayEngine:
     """
     Replays historical data through the scoring system.
@@ -213,3 +393,61 @@ class ReplayEngine:
         )
 
         return result
+
+    async def sweep(
+        self,
+        historical_prices: Dict[str, List[Dict[str, Any]]],
+        from_date: str,
+        to_date: str,
+        stop_loss_pcts: Sequence[float],
+        take_profit_pcts: Sequence[float],
+        buy_thresholds: Sequence[float] = (BUY_THRESHOLD,),
+        max_workers: Optional[int] = None,
+        process_pool_min_params: int = 256,
+    ) -> pd.DataFrame:
+        """
+        Replay every combination of stop / target / buy-threshold parameters.
+
+        Ledger history is loaded once for all symbols and the simulation runs
+        vectorized across symbols and parameter sets. Grids with at least
+        ``process_pool_min_params`` combinations are split across a process pool.
+
+        Returns:
+            DataFrame with one row per parameter set: stop_loss_pct,
+            take_profit_pct, buy_threshold and the ReplayResult metrics
+        """
+        ledger_history = await self.research_ledger_store.get_history_for_symbols(
+            list(historical_prices), limit=100
+        )
+        arrays = build_replay_arrays(historical_prices, ledger_history, from_date, to_date)
+
+        grid = np.array(list(itertools.product(stop_loss_pcts, take_profit_pcts, buy_thresholds)), dtype=float)
+        grid = grid.reshape(-1, 3)
+        workers = max_workers or os.cpu_count() or 1
+
+        if len(grid) >= process_pool_min_params and workers > 1:
+            chunks = np.array_split(grid, min(workers, len(grid)))
+            loop = asyncio.get_running_loop()
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                parts = await asyncio.gather(*(
+                    loop.run_in_executor(
+                        pool, simulate_parameter_grid, arrays, chunk[:, 0], chunk[:, 1], chunk[:, 2]
+                    )
+                    for chunk in chunks
+                ))
+            metrics = np.vstack(parts)
+        else:
+            metrics = await asyncio.to_thread(
+                simulate_parameter_grid, arrays, grid[:, 0], grid[:, 1], grid[:, 2]
+            )
+
+        frame = pd.DataFrame(grid, columns=["stop_loss_pct", "take_profit_pct", "buy_threshold"])
+        frame[SWEEP_METRIC_COLUMNS] = metrics
+        for column in ("total_trades", "winning_trades", "losing_trades"):
+            frame[column] = frame[column].astype(int)
+
+        logger.info(
+            f"Replay sweep complete: {len(frame)} parameter sets x {len(arrays.symbols)} symbols "
+            f"x {len(arrays.dates)} dates"
+        )
+        return frame
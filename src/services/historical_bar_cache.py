@@ -0,0 +1,178 @@
+"""
+Historical Bar Cache
+
+Gap-filling read-through cache in front of the broker's historical-data
+endpoint. Bars are persisted in a ``BarStore``; a request only fetches the
+calendar-date ranges that were never fetched before, merges them, and then
+serves the whole slice from disk in columnar form. Today's bars are still
+forming, so today is never recorded as covered and is refetched on demand.
+"""
+
+import asyncio
+import logging
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from src.stores.bar_store import IST, BarSeries, BarStore, DateRange, bars_from_records
+
+logger = logging.getLogger(__name__)
+
+BarFetcher = Callable[[str, date, date, str], Awaitable[List[Dict[str, Any]]]]
+
+# Longest date span Kite serves per historical_data request, by interval
+MAX_DAYS_PER_REQUEST: Dict[str, int] = {
+    "minute": 60,
+    "3minute": 100,
+    "5minute": 100,
+    "10minute": 100,
+    "15minute": 200,
+    "30minute": 200,
+    "60minute": 400,
+    "day": 2000,
+    "week": 2000,
+    "month": 2000,
+}
+
+
+def _as_date(value: Union[str, date, datetime]) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def split_range(start: date, end: date, max_days: int) -> List[DateRange]:
+    """Split an inclusive date range into chunks no longer than ``max_days``."""
+    chunks: List[DateRange] = []
+    cursor = start
+    while cursor <= end:
+        chunk_end = min(end, cursor + timedelta(days=max_days - 1))
+        chunks.append((cursor, chunk_end))
+        cursor = chunk_end + timedelta(days=1)
+    return chunks
+
+
+class HistoricalBarCache:
+    """
+    Read-through OHLCV cache keyed by (symbol, interval, date range).
+
+    ``fetcher`` performs one broker request for an inclusive date range and
+    is expected to apply the broker's own rate limiting. Concurrent requests
+    for the same symbol and interval share one fetch.
+    """
+
+    def __init__(self, store: BarStore, fetcher: BarFetcher, prefetch_concurrency: int = 3):
+        self.store = store
+        self._fetcher = fetcher
+        self._prefetch_concurrency = max(1, prefetch_concurrency)
+        self._locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+        self._stats = {
+            "requests": 0,
+            "hits": 0,
+            "partial_hits": 0,
+            "misses": 0,
+            "fetches": 0,
+            "bars_fetched": 0,
+            "fetch_errors": 0,
+        }
+
+    @staticmethod
+    def _today() -> date:
+        return datetime.now(timezone.utc).astimezone(IST).date()
+
+    async def get_bars(
+        self,
+        symbol: str,
+        from_date: Union[str, date, datetime],
+        to_date: Union[str, date, datetime],
+        interval: str = "day",
+    ) -> BarSeries:
+        """Return bars for [from_date, to_date], fetching only the missing dates."""
+        symbol = symbol.upper()
+        start, end = _as_date(from_date), _as_date(to_date)
+        self._stats["requests"] += 1
+
+        lock = self._locks.setdefault((symbol, interval), asyncio.Lock())
+        async with lock:
+            gaps = self.store.missing_ranges(symbol, interval, start, end)
+            if not gaps:
+                self._stats["hits"] += 1
+            else:
+                self._stats["misses" if gaps == [(start, end)] else "partial_hits"] += 1
+                await self._fill(symbol, interval, gaps)
+
+        return self.store.read(symbol, interval, start, end)
+
+    async def _fill(self, symbol: str, interval: str, gaps: Iterable[DateRange]) -> None:
+        today = self._today()
+        max_days = MAX_DAYS_PER_REQUEST.get(interval, 60)
+        fetched: List[np.ndarray] = []
+        covered: List[DateRange] = []
+        try:
+            for gap_start, gap_end in gaps:
+                for chunk_start, chunk_end in split_range(gap_start, gap_end, max_days):
+                    records = await self._fetcher(symbol, chunk_start, chunk_end, interval)
+                    self._stats["fetches"] += 1
+                    bars = bars_from_records(records or [])
+                    self._stats["bars_fetched"] += int(bars.shape[0])
+                    fetched.append(bars)
+                    # The current session's bar is incomplete until the day is over
+                    settled_end = min(chunk_end, today - timedelta(days=1))
+                    if settled_end >= chunk_start:
+                        covered.append((chunk_start, settled_end))
+        except Exception:
+            self._stats["fetch_errors"] += 1
+            raise
+        finally:
+            # Keep whatever chunks completed so a retry only asks for the rest
+            if fetched:
+                await asyncio.to_thread(self.store.merge, symbol, interval, np.concatenate(fetched), covered)
+
+    async def prefetch(
+        self,
+        symbols: Iterable[str],
+        from_date: Union[str, date, datetime],
+        to_date: Union[str, date, datetime],
+        interval: str = "day",
+    ) -> Dict[str, Any]:
+        """
+        Warm the cache for a watchlist.
+
+        Symbols whose range is already covered cost nothing; the rest are
+        fetched with at most ``prefetch_concurrency`` broker requests in
+        flight. Returns per-symbol bar counts and the symbols that failed.
+        """
+        semaphore = asyncio.Semaphore(self._prefetch_concurrency)
+        unique_symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+
+        async def _warm(symbol: str) -> int:
+            async with semaphore:
+                return len(await self.get_bars(symbol, from_date, to_date, interval))
+
+        results = await asyncio.gather(*(_warm(symbol) for symbol in unique_symbols), return_exceptions=True)
+        bars: Dict[str, int] = {}
+        failed: Dict[str, str] = {}
+        for symbol, result in zip(unique_symbols, results):
+            if isinstance(result, BaseException):
+                failed[symbol] = str(result)
+            else:
+                bars[symbol] = result
+        if failed:
+            logger.warning(f"Historical prefetch failed for {len(failed)} of {len(unique_symbols)} symbols")
+        return {"bars": bars, "failed": failed}
+
+    def get_stats(self) -> Dict[str, Any]:
+        requests = self._stats["requests"]
+        return {
+            **self._stats,
+            "hit_rate": round(self._stats["hits"] / requests, 4) if requests else 0.0,
+        }
+
+
+def create_historical_bar_cache(state_dir: Optional[Path], fetcher: BarFetcher) -> HistoricalBarCache:
+    """Build a cache rooted at ``<state_dir>/bars``."""
+    return HistoricalBarCache(BarStore(Path(state_dir or "state") / "bars"), fetcher)
@@ -0,0 +1,262 @@
+"""
+Incremental Technical Indicator Engine
+
+Keeps O(1) rolling state per symbol per indicator so RSI, MACD, Bollinger
+Bands, EMA and ATR can be updated on every new bar or tick and queried in
+constant time. Formulas mirror TechnicalIndicatorsService exactly (pandas
+``ewm(adjust=False)`` EMAs and simple rolling means for RSI/ATR/Bollinger),
+so the streaming and batch paths agree.
+
+Ticks update a provisional "forming" bar; indicators for the forming bar
+are previewed from committed state without mutating it. A tick with a new
+date commits the forming bar (daily bars). MarketDataService feeds every
+applied tick in; consumers seed a symbol from daily history on first use.
+"""
+
+import math
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+import pandas as pd
+
+MIN_HISTORY_BARS = 30
+
+
+class _Ema:
+    """EMA equivalent to ``Series.ewm(span=period, adjust=False).mean()``."""
+
+    __slots__ = ("alpha", "value", "count")
+
+    def __init__(self, period: int):
+        self.alpha = 2.0 / (period + 1.0)
+        self.value: Optional[float] = None
+        self.count = 0
+
+    def preview(self, x: float) -> float:
+        if self.value is None:
+            return x
+        return self.alpha * x + (1.0 - self.alpha) * self.value
+
+    def update(self, x: float) -> float:
+        self.value = self.preview(x)
+        self.count += 1
+        return self.value
+
+
+class _RollingWindow:
+    """Fixed-size window with running sums; ``mean`` matches ``rolling(period).mean()``."""
+
+    __slots__ = ("period", "values", "total", "total_sq", "updates")
+
+    def __init__(self, period: int):
+        self.period = period
+        self.values: Deque[float] = deque(maxlen=period)
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.updates = 0
+
+    def _total_with(self, x: float) -> float:
+        if len(self.values) == self.period:
+            return self.total - self.values[0] + x
+        return self.total + x
+
+    def _total_sq_with(self, x: float) -> float:
+        if len(self.values) == self.period:
+            return self.total_sq - self.values[0] * self.values[0] + x * x
+        return self.total_sq + x * x
+
+    def preview_mean(self, x: float) -> Optional[float]:
+        if len(self.values) + 1 < self.period:
+            return None
+        return self._total_with(x) / self.period
+
+    def preview_std(self, x: float, mean: float) -> float:
+        """Sample standard deviation (ddof=1) of the window including x, from the running sums."""
+        count = min(len(self.values) + 1, self.period)
+        squared = self._total_sq_with(x) - count * mean * mean
+        return math.sqrt(max(squared, 0.0) / (count - 1))
+
+    def update(self, x: float) -> None:
+        self.total = self._total_with(x)
+        self.total_sq = self._total_sq_with(x)
+        self.values.append(x)
+        self.updates += 1
+        # Re-anchor once per window so floating drift in the running sums stays bounded.
+        if self.updates % self.period == 0:
+            self.total = math.fsum(self.values)
+            self.total_sq = math.fsum(v * v for v in self.values)
+
+
+class SymbolIndicatorState:
+    """Rolling indicator state for one symbol."""
+
+    def __init__(
+        self,
+        rsi_period: int = 14,
+        macd_fast: int = 12,
+        macd_slow: int = 26,
+        macd_signal: int = 9,
+        bollinger_period: int = 20,
+        bollinger_std: float = 2.0,
+        atr_period: int = 14,
+    ):
+        self.rsi_period = rsi_period
+        self.macd_slow = macd_slow
+        self.macd_signal_period = macd_signal
+        self.bollinger_std = bollinger_std
+        self.atr_period = atr_period
+
+        self.bars = 0
+        self.prev_close: Optional[float] = None
+        self.gains = _RollingWindow(rsi_period)
+        self.losses = _RollingWindow(rsi_period)
+        self.ema_fast = _Ema(macd_fast)
+        self.ema_slow = _Ema(macd_slow)
+        self.macd_signal = _Ema(macd_signal)
+        self.ema_9 = _Ema(9)
+        self.ema_21 = _Ema(21)
+        self.closes = _RollingWindow(bollinger_period)
+        self.true_ranges = _RollingWindow(atr_period)
+
+        self.forming: Optional[Dict[str, Any]] = None
+        self.last_bar_date: Optional[str] = None
+        self._committed: Optional[Dict[str, Optional[float]]] = None
+
+    def update_bar(self, high: float, low: float, close: float) -> None:
+        """Commit a completed bar."""
+        if self.prev_close is not None:
+            delta = close - self.prev_close
+            self.gains.update(delta if delta > 0 else 0.0)
+            self.losses.update(-delta if delta < 0 else 0.0)
+        self.true_ranges.update(self._true_range(high, low))
+
+        macd = self.ema_fast.update(close) - self.ema_slow.update(close)
+        self.macd_signal.update(macd)
+        self.ema_9.update(close)
+        self.ema_21.update(close)
+        self.closes.update(close)
+
+        self.prev_close = close
+        self.bars += 1
+
+    def _true_range(self, high: float, low: float) -> float:
+        if self.prev_close is None:
+            return high - low
+        return max(high - low, abs(high - self.prev_close), abs(low - self.prev_close))
+
+    def snapshot(self, high: float, low: float, close: float) -> Dict[str, Optional[float]]:
+        """Indicators as if (high, low, close) were the next bar; state is not mutated."""
+        bars = self.bars + 1
+        result: Dict[str, Optional[float]] = {"current_price": float(close)}
+
+        result["rsi"] = None
+        if bars >= self.rsi_period + 1 and self.prev_close is not None:
+            delta = close - self.prev_close
+            gain = self.gains.preview_mean(delta if delta > 0 else 0.0)
+            loss = self.losses.preview_mean(-delta if delta < 0 else 0.0)
+            if loss:
+                result["rsi"] = float(100 - (100 / (1 + gain / loss)))
+            else:
+                result["rsi"] = 100.0 if gain else float("nan")
+
+        macd = self.ema_fast.preview(close) - self.ema_slow.preview(close)
+        if bars >= self.macd_slow + self.macd_signal_period:
+            signal = self.macd_signal.preview(macd)
+            result.update(macd=float(macd), macd_signal=float(signal), macd_histogram=float(macd - signal))
+        else:
+            result.update(macd=None, macd_signal=None, macd_histogram=None)
+
+        middle = self.closes.preview_mean(close)
+        if middle is not None:
+            band = self.closes.preview_std(close, middle) * self.bollinger_std
+            result.update(bollinger_upper=middle + band, bollinger_middle=middle, bollinger_lower=middle - band)
+        else:
+            result.update(bollinger_upper=None, bollinger_middle=None, bollinger_lower=None)
+
+        ema_ready = bars >= 21
+        result["ema_9"] = float(self.ema_9.preview(close)) if ema_ready else None
+        result["ema_21"] = float(self.ema_21.preview(close)) if ema_ready else None
+
+        result["atr"] = None
+        if bars >= self.atr_period + 1:
+            result["atr"] = self.true_ranges.preview_mean(self._true_range(high, low))
+
+        return result
+
+    def current(self) -> Optional[Dict[str, Optional[float]]]:
+        """Indicators including the forming bar, or the last committed bar."""
+        if self.forming is not None:
+            bar = self.forming
+            return self.snapshot(bar["high"], bar["low"], bar["close"])
+        return self._committed
+
+
+class IncrementalIndicatorEngine:
+    """
+    Streaming indicator engine keyed by symbol.
+
+    Seed with daily history once (``seed``), then feed bars (``update_bar``)
+    or ticks (``update_tick``). Queries via ``get_indicators`` are constant time.
+    """
+
+    def __init__(self):
+        self._states: Dict[str, SymbolIndicatorState] = {}
+
+    def has_symbol(self, symbol: str) -> bool:
+        state = self._states.get(symbol)
+        return state is not None and state.bars >= MIN_HISTORY_BARS
+
+    def seed(self, symbol: str, historical_data: List[Dict[str, Any]]) -> None:
+        """Rebuild a symbol's state from OHLC history (same input as the batch path)."""
+        df = pd.DataFrame(historical_data)
+        df["date"] = pd.to_datetime(df["date"])
+        df = df.sort_values("date")
+
+        state = SymbolIndicatorState()
+        for high, low, close in zip(df["high"].tolist(), df["low"].tolist(), df["close"].tolist()):
+            self._commit(state, float(high), float(low), float(close))
+        last_date = df["date"].iloc[-1] if len(df) else None
+        state.last_bar_date = last_date.date().isoformat() if last_date is not None else None
+        self._states[symbol] = state
+
+    def update_bar(self, symbol: str, high: float, low: float, close: float, bar_date: Optional[str] = None) -> None:
+        """Commit one completed bar for a symbol."""
+        state = self._states.setdefault(symbol, SymbolIndicatorState())
+        state.forming = None
+        self._commit(state, float(high), float(low), float(close))
+        state.last_bar_date = bar_date
+
+    def update_tick(self, symbol: str, price: float, timestamp: Optional[str] = None) -> None:
+        """Fold a tick into the symbol's forming bar."""
+        state = self._states.get(symbol)
+        if state is None:
+            return
+
+        tick_date = (timestamp or "")[:10] or None
+        forming = state.forming
+        if forming is not None and tick_date and forming.get("date") and tick_date != forming["date"]:
+            self._commit(state, forming["high"], forming["low"], forming["close"])
+            state.last_bar_date = forming["date"]
+            forming = None
+
+        if forming is None:
+            if tick_date and tick_date == state.last_bar_date:
+                # Today's bar is already committed from history; ticks refine nothing new.
+                return
+            state.forming = {"date": tick_date, "high": price, "low": price, "close": price}
+        else:
+            forming["high"] = max(forming["high"], price)
+            forming["low"] = min(forming["low"], price)
+            forming["close"] = price
+
+    def get_indicators(self, symbol: str) -> Optional[Dict[str, Optional[float]]]:
+        """Constant-time indicator lookup in the calculate_all_indicators shape."""
+        state = self._states.get(symbol)
+        if state is None or state.bars < MIN_HISTORY_BARS:
+            return None
+        return state.current()
+
+    @staticmethod
+    def _commit(state: SymbolIndicatorState, high: float, low: float, close: float) -> None:
+        state._committed = state.snapshot(high, low, close)
+        state.update_bar(high, low, close)
@@ -0,0 +1,331 @@
+"""
+Instrument Master
+
+One symbol -> instrument lookup shared by the Kite and Upstox paths. Each
+provider's instrument list is downloaded at most once per trading day and
+compiled into a compact on-disk hash index (fixed-width records plus an
+open-addressing slot table). The index is memory-mapped on startup, so
+resolving thousands of symbols costs a few hash probes each instead of
+re-parsing the provider's CSV/JSON dump.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import mmap
+import os
+import struct
+import zlib
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# NSE publishes the day's instrument dump before the open; a new IST date means a new trading day
+IST = timezone(timedelta(hours=5, minutes=30))
+
+_MAGIC = b"RTINSTR1"
+_HEADER = struct.Struct("<8sII10s")  # magic, record count, slot count, trading day
+_RECORD = struct.Struct("<32sq40sid")  # symbol, token, key, lot size, tick size
+_SLOT = struct.Struct("<I")  # record index + 1, 0 = empty
+
+
+@dataclass(frozen=True)
+class Instrument:
+    """
+    Provider identifiers and contract details for one tradable symbol.
+
+    ``token`` is the Kite instrument token and ``key`` the Upstox instrument
+    key; lot and tick sizes are kept as the provider publishes them.
+    """
+
+    symbol: str
+    token: Optional[int] = None
+    key: Optional[str] = None
+    lot_size: int = 1
+    tick_size: float = 0.05
+
+
+InstrumentLoader = Callable[[], Awaitable[Iterable[Instrument]]]
+
+
+def current_trading_day(now: Optional[datetime] = None) -> str:
+    """IST calendar date the instrument dumps are published for."""
+    return (now or datetime.now(timezone.utc)).astimezone(IST).strftime("%Y-%m-%d")
+
+
+def dumped_on_current_trading_day(path: Path) -> bool:
+    """True when ``path`` was written on the current IST trading day (not merely in the last 24h)."""
+    try:
+        modified = datetime.fromtimestamp(path.stat().st_mtime, tz=timezone.utc)
+    except OSError:
+        return False
+    return current_trading_day(modified) == current_trading_day()
+
+
+class InstrumentIndex:
+    """Read-only, memory-mapped symbol index written by ``InstrumentIndex.write``."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        with open(path, "rb") as handle:
+            self._buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._count, self._slot_count, trading_day = _HEADER.unpack_from(self._buffer, 0)
+        if magic != _MAGIC:
+            self._buffer.close()
+            raise ValueError(f"{path} is not an instrument index")
+        self.trading_day = trading_day.decode("ascii")
+        self._records_offset = _HEADER.size
+        self._slots_offset = self._records_offset + self._count * _RECORD.size
+
+    def __len__(self) -> int:
+        return self._count
+
+    def get(self, symbol: str) -> Optional[Instrument]:
+        """O(1) lookup by trading symbol (case-insensitive)."""
+        encoded = symbol.upper().encode("utf-8")
+        if not self._slot_count or len(encoded) > 32:
+            return None
+        mask = self._slot_count - 1
+        slot = zlib.crc32(encoded) & mask
+        for _ in range(self._slot_count):
+            (entry,) = _SLOT.unpack_from(self._buffer, self._slots_offset + slot * _SLOT.size)
+            if not entry:
+                return None
+            record = _RECORD.unpack_from(self._buffer, self._records_offset + (entry - 1) * _RECORD.size)
+            if record[0].rstrip(b"\0") == encoded:
+                return self._decode(record)
+            slot = (slot + 1) & mask
+        return None
+
+    def close(self) -> None:
+        self._buffer.close()
+
+    @staticmethod
+    def _decode(record: Tuple[bytes, int, bytes, int, float]) -> Instrument:
+        symbol, token, key, lot_size, tick_size = record
+        key_text = key.rstrip(b"\0").decode("utf-8")
+        return Instrument(
+            symbol=symbol.rstrip(b"\0").decode("utf-8"),
+            token=token if token >= 0 else None,
+            key=key_text or None,
+            lot_size=lot_size,
+            tick_size=tick_size,
+        )
+
+    @classmethod
+    def write(cls, path: Path, instruments: Iterable[Instrument], trading_day: str) -> int:
+        """Compile instruments into an index file atomically; returns the record count."""
+        records: Dict[bytes, Instrument] = {}
+        for instrument in instruments:
+            encoded = instrument.symbol.upper().encode("utf-8")
+            if encoded and len(encoded) <= 32 and len((instrument.key or "").encode("utf-8")) <= 40:
+                records[encoded] = instrument
+
+        # Power-of-two table at most half full keeps linear probes short
+        slot_count = 1
+        while slot_count < max(2 * len(records), 1):
+            slot_count <<= 1
+        slots = [0] * slot_count
+        body = bytearray()
+        for index, (encoded, instrument) in enumerate(records.items()):
+            body += _RECORD.pack(
+                encoded,
+                instrument.token if instrument.token is not None else -1,
+                (instrument.key or "").encode("utf-8"),
+                int(instrument.lot_size or 1),
+                float(instrument.tick_size or 0.0),
+            )
+            slot = zlib.crc32(encoded) & (slot_count - 1)
+            while slots[slot]:
+                slot = (slot + 1) & (slot_count - 1)
+            slots[slot] = index + 1
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(temp_path, "wb") as handle:
+            handle.write(_HEADER.pack(_MAGIC, len(records), slot_count, trading_day.encode("ascii")))
+            handle.write(body)
+            handle.write(struct.pack(f"<{slot_count}I", *slots))
+        os.replace(temp_path, path)
+        return len(records)
+
+
+class InstrumentMaster:
+    """
+    Per-provider instrument indexes under ``<state_dir>/instruments``.
+
+    Callers pass the loader that downloads their provider's list; it only runs
+    when the on-disk index is missing or from an earlier trading day, and
+    concurrent callers for the same provider share one download.
+    """
+
+    def __init__(self, state_dir: Path):
+        self._dir = Path(state_dir) / "instruments"
+        self._indexes: Dict[str, InstrumentIndex] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._stats = {"builds": 0, "disk_loads": 0, "lookups": 0, "misses": 0}
+
+    def _index_path(self, provider: str, exchange: str) -> Path:
+        return self._dir / f"{provider}_{exchange}.idx".lower()
+
+    def is_ready(self, provider: str, exchange: str = "NSE") -> bool:
+        return f"{provider}:{exchange}" in self._indexes
+
+    def lookup(self, provider: str, symbol: str, exchange: str = "NSE") -> Optional[Instrument]:
+        """Synchronous lookup against an already-loaded index."""
+        index = self._indexes.get(f"{provider}:{exchange}")
+        self._stats["lookups"] += 1
+        instrument = index.get(symbol) if index is not None else None
+        if instrument is None:
+            self._stats["misses"] += 1
+        return instrument
+
+    async def resolve(
+        self, provider: str, symbol: str, loader: InstrumentLoader, exchange: str = "NSE"
+    ) -> Optional[Instrument]:
+        """Look up one symbol, loading or refreshing the provider's index first if needed."""
+        await self.ensure_loaded(provider, loader, exchange)
+        return self.lookup(provider, symbol, exchange)
+
+    async def ensure_loaded(self, provider: str, loader: InstrumentLoader, exchange: str = "NSE") -> InstrumentIndex:
+        """Return today's index for ``provider``, mapping it from disk or downloading it once."""
+        name = f"{provider}:{exchange}"
+        trading_day = current_trading_day()
+        index = self._indexes.get(name)
+        if index is not None and index.trading_day == trading_day:
+            return index
+
+        lock = self._locks.setdefault(name, asyncio.Lock())
+        async with lock:
+            index = self._indexes.get(name)
+            if index is not None and index.trading_day == trading_day:
+                return index
+
+            path = self._index_path(provider, exchange)
+            fresh = self._open(path) if path.exists() else None
+            if fresh is not None and fresh.trading_day == trading_day:
+                self._stats["disk_loads"] += 1
+            else:
+                try:
+                    instruments = list(await loader())
+                except Exception:
+                    if fresh is None and index is None:
+                        raise
+                    # A stale list still resolves nearly every symbol; retry on the next call
+                    logger.warning("Instrument download for %s failed; serving the previous trading day", name, exc_info=True)
+                    if index is None:
+                        self._indexes[name] = fresh
+                        return fresh
+                    if fresh is not None:
+                        fresh.close()
+                    return index
+                if fresh is not None:
+                    fresh.close()
+                count = await asyncio.to_thread(InstrumentIndex.write, path, instruments, trading_day)
+                fresh = self._open(path)
+                if fresh is None:
+                    raise RuntimeError(f"Instrument index {path} could not be reopened after writing")
+                self._stats["builds"] += 1
+                logger.info("Compiled %s instruments for %s into %s", count, name, path)
+
+            self._indexes[name] = fresh
+            if index is not None:
+                # Lookups never await, so nothing can still be reading the old mapping
+                index.close()
+            return fresh
+
+    @staticmethod
+    def _open(path: Path) -> Optional[InstrumentIndex]:
+        try:
+            return InstrumentIndex(path)
+        except (OSError, ValueError, struct.error) as exc:
+            logger.warning("Ignoring unreadable instrument index %s: %s", path, exc)
+            return None
+
+    def get_stats(self) -> Dict[str, object]:
+        return {
+            **self._stats,
+            "indexes": {name: {"instruments": len(index), "trading_day": index.trading_day}
+                        for name, index in self._indexes.items()},
+        }
+
+
+def parse_kite_instruments_csv(payload: str, exchange: str = "NSE") -> List[Instrument]:
+    """Parse the Kite ``/instruments`` CSV dump into instruments for one exchange."""
+    lines = payload.strip().split("\n")
+    if len(lines) < 2:
+        return []
+    headers = lines[0].strip().split(",")
+    try:
+        symbol_idx = headers.index("tradingsymbol")
+        token_idx = headers.index("instrument_token")
+        exchange_idx = headers.index("exchange")
+    except ValueError:
+        logger.warning("Kite instruments CSV missing required columns")
+        return []
+    lot_idx = headers.index("lot_size") if "lot_size" in headers else None
+    tick_idx = headers.index("tick_size") if "tick_size" in headers else None
+
+    instruments = []
+    for line in lines[1:]:
+        parts = line.strip().split(",")
+        if len(parts) <= max(symbol_idx, token_idx, exchange_idx) or parts[exchange_idx] != exchange:
+            continue
+        try:
+            instruments.append(Instrument(
+                symbol=parts[symbol_idx].upper(),
+                token=int(parts[token_idx]),
+                lot_size=int(parts[lot_idx]) if lot_idx is not None and parts[lot_idx] else 1,
+                tick_size=float(parts[tick_idx]) if tick_idx is not None and parts[tick_idx] else 0.05,
+            ))
+        except (ValueError, IndexError):
+            continue
+    return instruments
+
+
+def kite_instruments_from_sdk(records: Iterable[dict], exchange: str = "NSE") -> List[Instrument]:
+    """Convert ``KiteConnect.instruments()`` rows into instruments for one exchange."""
+    return [
+        Instrument(
+            symbol=str(item["tradingsymbol"]).upper(),
+            token=int(item["instrument_token"]),
+            lot_size=int(item.get("lot_size") or 1),
+            tick_size=float(item.get("tick_size") or 0.05),
+        )
+        for item in records
+        if item.get("exchange") == exchange and item.get("tradingsymbol") and item.get("instrument_token")
+    ]
+
+
+def upstox_instruments_from_json(records: Iterable[dict]) -> List[Instrument]:
+    """Convert Upstox BOD JSON rows into NSE cash-equity instruments."""
+    return [
+        Instrument(
+            symbol=str(item["trading_symbol"]).upper(),
+            key=item["instrument_key"],
+            lot_size=int(item.get("lot_size") or 1),
+            tick_size=float(item.get("tick_size") or 0.05),
+        )
+        for item in records
+        if item.get("segment") == "NSE_EQ"
+        and item.get("instrument_type") in {"EQ", "BE"}
+        and item.get("trading_symbol")
+        and item.get("instrument_key")
+    ]
+
+
+# Shared per state directory so every provider path maps the same indexes once
+_masters: Dict[Path, InstrumentMaster] = {}
+
+
+def get_instrument_master(state_dir: Path) -> InstrumentMaster:
+    """Get the process-wide instrument master for a state directory."""
+    key = Path(state_dir).resolve()
+    master = _masters.get(key)
+    if master is None:
+        master = _masters[key] = InstrumentMaster(key)
+    return master
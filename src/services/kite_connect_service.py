@@ -10,14 +10,19 @@ import logging
 import json
 import os
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
+from pathlib import Path
 from zoneinfo import ZoneInfo
 
 from src.core.errors import TradingError, ErrorCategory, ErrorSeverity
+from src.core.rate_limiter import Priority, get_rate_limiter
 from src.core.database_state.real_time_trading_state import (
     RealTimeTradingState, KiteSession, RealTimeQuote, OrderBookEntry
 )
+from src.services.instrument_master import get_instrument_master, kite_instruments_from_sdk
+from src.services.historical_bar_cache import create_historical_bar_cache
+from src.stores.bar_store import BarSeries
 
 try:
     from kiteconnect import KiteConnect, KiteTicker
@@ -302,6 +307,18 @@ class KiteConnectService:
     """Kite Connect integration service."""
 
     _market_timezone = ZoneInfo("Asia/Kolkata")
+    # Kite accepts at most 500 instruments per quote request
+    _quote_chunk_size = 500
+    # operation -> (rate-limited endpoint, lane); orders jump ahead of polling and research
+    _RATE_LIMIT_LANES = {
+        "place_order": ("kite.orders", Priority.ORDER),
+        "cancel_order": ("kite.orders", Priority.ORDER),
+        "quote": ("kite.quote", Priority.QUOTE),
+        "positions": ("kite.default", Priority.QUOTE),
+        "holdings": ("kite.default", Priority.QUOTE),
+        "historical_data": ("kite.historical", Priority.RESEARCH),
+        "instruments": ("kite.default", Priority.RESEARCH),
+    }
 
     def __init__(self, config: Dict[str, Any], real_time_state: RealTimeTradingState):
         self.config = config
@@ -319,9 +336,16 @@ class KiteConnectService:
         self._ws_threads = {}
         self._running = False
 
-        # Rate limiting
-        self._last_api_call = {}
-        self._min_interval = 0.1  # 100ms between calls
+        # Shared token buckets; Kite quotas are per API key, not per service instance
+        self._rate_limiter = get_rate_limiter()
+
+        # Shared with the quote stream resolvers; downloads instruments once per trading day
+        self._instruments = get_instrument_master(Path(getattr(config, "state_dir", None) or "state"))
+
+        # Persistent OHLCV bars; only date ranges never fetched before hit the broker
+        self._historical_bars = create_historical_bar_cache(
+            getattr(config, "state_dir", None), self._fetch_historical_chunk
+        )
 
     async def initialize(self, credentials: KiteCredentials) -> bool:
         """Initialize Kite Connect service."""
@@ -698,7 +722,14 @@ class KiteConnectService:
         )
 
     async def get_quotes(self, symbols: List[str]) -> Dict[str, QuoteData]:
-        """Get real-time quotes for multiple symbols."""
+        """
+        Get real-time quotes for multiple symbols.
+
+        Large lists are split into Kite-sized chunks fetched concurrently off
+        the event loop (each still paced by the quote rate limit), and all
+        resulting quotes are stored in one batched write. If only some chunks
+        fail, the quotes from the rest are returned.
+        """
         try:
             if not self.kite or not self._active_session:
                 raise TradingError(
@@ -707,67 +738,40 @@ class KiteConnectService:
                     severity=ErrorSeverity.HIGH
                 )
 
-            # Rate limiting
-            await self._rate_limit_check("quote")
-
             # Prepare instrument tokens
-            instruments = [f"NSE:{symbol}" for symbol in symbols]
+            instruments = list(dict.fromkeys(f"NSE:{symbol}" for symbol in symbols))
+            if not instruments:
+                return {}
+            chunks = [
+                instruments[index:index + self._quote_chunk_size]
+                for index in range(0, len(instruments), self._quote_chunk_size)
+            ]
 
-            # Get quotes
-            quotes_data = self.kite.quote(instruments)
+            responses = await asyncio.gather(
+                *(self._fetch_quote_chunk(chunk) for chunk in chunks),
+                return_exceptions=True,
+            )
+            failures = [response for response in responses if isinstance(response, BaseException)]
+            if len(failures) == len(responses):
+                raise failures[0]
+            if failures:
+                self.logger.warning(
+                    f"{len(failures)} of {len(chunks)} quote chunks failed; returning partial quotes: {failures[0]}"
+                )
 
             # Convert to QuoteData objects and store in database
             result = {}
-            for instrument, quote in quotes_data.items():
-                symbol = instrument.split(":")[-1] if ":" in instrument else instrument
-                ohlc = quote.get("ohlc", {}) or {}
-                change = quote.get("change")
-                if change is None:
-                    change = quote.get("net_change", 0.0)
-
-                close_price = ohlc.get("close")
-                if close_price in (None, 0):
-                    previous_price = quote["last_price"] - change if quote.get("last_price") is not None else 0
-                else:
-                    previous_price = close_price
-
-                change_percent = quote.get("change_percent")
-                if change_percent is None:
-                    change_percent = (change / previous_price * 100) if previous_price else 0.0
-
-                raw_timestamp = quote.get("timestamp", datetime.now(timezone.utc))
-                timestamp = self._normalize_quote_timestamp(raw_timestamp)
-                raw_last_trade_time = quote.get("last_trade_time", "")
-                last_trade_time = self._normalize_quote_timestamp(raw_last_trade_time) if raw_last_trade_time else ""
-
-                quote_data = QuoteData(
-                    instrument_token=quote["instrument_token"],
-                    timestamp=timestamp,
-                    last_price=quote["last_price"],
-                    last_quantity=quote.get("last_quantity", 0),
-                    last_trade_time=last_trade_time,
-                    average_price=quote["average_price"],
-                    volume=quote["volume"],
-                    buy_quantity=quote["buy_quantity"],
-                    sell_quantity=quote["sell_quantity"],
-                    ohlc=ohlc,
-                    change=change,
-                    change_percent=change_percent,
-                )
-
-                result[symbol] = quote_data
-
-                # Store in database
-                real_time_quote = RealTimeQuote(
-                    symbol=symbol,
-                    last_price=quote["last_price"],
-                    change_price=change,
-                    change_percent=change_percent,
-                    volume=quote["volume"],
-                    timestamp=timestamp,
-                )
-                await self.real_time_state.store_real_time_quote(real_time_quote)
-
+            rows = []
+            for quotes_data in responses:
+                if isinstance(quotes_data, BaseException):
+                    continue
+                for instrument, quote in quotes_data.items():
+                    symbol = instrument.split(":")[-1] if ":" in instrument else instrument
+                    quote_data, real_time_quote = self._convert_quote(symbol, quote)
+                    result[symbol] = quote_data
+                    rows.append(real_time_quote)
+
+            await self.real_time_state.buffer_real_time_quotes(rows)
             return result
 
         except Exception as e:
@@ -779,6 +783,57 @@ class KiteConnectService:
                 recoverable=True
             )
 
+    async def _fetch_quote_chunk(self, instruments: List[str]) -> Dict[str, Any]:
+        """One rate-limited Kite quote call, run in a worker thread."""
+        await self._rate_limit_check("quote")
+        return await asyncio.to_thread(self.kite.quote, instruments)
+
+    def _convert_quote(self, symbol: str, quote: Dict[str, Any]) -> Tuple[QuoteData, RealTimeQuote]:
+        """Build the API quote and the persisted quote from one Kite payload."""
+        ohlc = quote.get("ohlc", {}) or {}
+        change = quote.get("change")
+        if change is None:
+            change = quote.get("net_change", 0.0)
+
+        close_price = ohlc.get("close")
+        if close_price in (None, 0):
+            previous_price = quote["last_price"] - change if quote.get("last_price") is not None else 0
+        else:
+            previous_price = close_price
+
+        change_percent = quote.get("change_percent")
+        if change_percent is None:
+            change_percent = (change / previous_price * 100) if previous_price else 0.0
+
+        raw_timestamp = quote.get("timestamp", datetime.now(timezone.utc))
+        timestamp = self._normalize_quote_timestamp(raw_timestamp)
+        raw_last_trade_time = quote.get("last_trade_time", "")
+        last_trade_time = self._normalize_quote_timestamp(raw_last_trade_time) if raw_last_trade_time else ""
+
+        quote_data = QuoteData(
+            instrument_token=quote["instrument_token"],
+            timestamp=timestamp,
+            last_price=quote["last_price"],
+            last_quantity=quote.get("last_quantity", 0),
+            last_trade_time=last_trade_time,
+            average_price=quote["average_price"],
+            volume=quote["volume"],
+            buy_quantity=quote["buy_quantity"],
+            sell_quantity=quote["sell_quantity"],
+            ohlc=ohlc,
+            change=change,
+            change_percent=change_percent,
+        )
+        real_time_quote = RealTimeQuote(
+            symbol=symbol,
+            last_price=quote["last_price"],
+            change_price=change,
+            change_percent=change_percent,
+            volume=quote["volume"],
+            timestamp=timestamp,
+        )
+        return quote_data, real_time_quote
+
     def _normalize_quote_timestamp(self, raw_value: Any) -> str:
         """Normalize Zerodha timestamps into UTC ISO-8601 strings."""
         if isinstance(raw_value, datetime):
@@ -842,16 +897,9 @@ class KiteConnectService:
             )
 
     async def _rate_limit_check(self, operation: str):
-        """Check and enforce rate limiting."""
-        now = datetime.now()
-        last_call = self._last_api_call.get(operation, datetime.min)
-
-        # Ensure minimum interval between calls
-        time_since_last = (now - last_call).total_seconds()
-        if time_since_last < self._min_interval:
-            await asyncio.sleep(self._min_interval - time_since_last)
-
-        self._last_api_call[operation] = datetime.now()
+        """Wait for capacity on the Kite endpoint this operation is billed against."""
+        endpoint, priority = self._RATE_LIMIT_LANES.get(operation, ("kite.default", Priority.DEFAULT))
+        await self._rate_limiter.acquire(endpoint, priority, client=operation)
 
     async def close(self):
         """Close Kite Connect service and cleanup resources."""
@@ -927,7 +975,7 @@ class KiteConnectService:
 
     async def get_bulk_prices(self, symbols: List[str]) -> Dict[str, float]:
         """
-        Get prices for multiple symbols efficiently in a single API call.
+        Get prices for multiple symbols efficiently through one bulk quote request.
 
         Args:
             symbols: List of stock symbols
@@ -977,16 +1025,14 @@ class KiteConnectService:
                     severity=ErrorSeverity.HIGH
                 )
 
-            # Rate limiting
-            await self._rate_limit_check("instruments")
-
-            # Get instruments list
-            instruments = self.kite.instruments(exchange)
+            async def _load_instruments():
+                await self._rate_limit_check("instruments")
+                records = await asyncio.to_thread(self.kite.instruments, exchange)
+                return kite_instruments_from_sdk(records, exchange)
 
-            # Find matching instrument
-            for instrument in instruments:
-                if instrument.get("tradingsymbol") == symbol and instrument.get("exchange") == exchange:
-                    return instrument.get("instrument_token")
+            instrument = await self._instruments.resolve("kite", symbol, _load_instruments, exchange)
+            if instrument is not None:
+                return instrument.token
 
             self.logger.warning(f"Instrument token not found for {exchange}:{symbol}")
             return None
@@ -1006,6 +1052,9 @@ class KiteConnectService:
         """
         Get historical OHLC data from Kite Connect.
 
+        Served from the local bar cache; only dates that were never fetched
+        before are requested from the broker.
+
         Args:
             symbol: Stock symbol (e.g., "RELIANCE", "TCS")
             from_date: Start date in 'YYYY-MM-DD' format
@@ -1015,8 +1064,20 @@ class KiteConnectService:
             exchange: Exchange name (default: "NSE")
 
         Returns:
-            List of OHLC data dictionaries with keys: date, open, high, low, close, volume, oi
+            List of OHLC data dictionaries with keys: date, open, high, low, close, volume
         """
+        series = await self.get_historical_series(symbol, from_date, to_date, interval, exchange)
+        return series.to_records()
+
+    async def get_historical_series(
+        self,
+        symbol: str,
+        from_date: str,
+        to_date: str,
+        interval: str = "day",
+        exchange: str = "NSE"
+    ) -> BarSeries:
+        """Get historical OHLCV bars as column arrays, filling cache gaps from Kite."""
         try:
             if not self.kite or not self._active_session:
                 raise TradingError(
@@ -1025,36 +1086,10 @@ class KiteConnectService:
                     severity=ErrorSeverity.HIGH
                 )
 
-            # Get instrument token
-            instrument_token = await self.get_instrument_token(symbol, exchange)
-            if not instrument_token:
-                raise TradingError(
-                    f"Instrument token not found for {symbol}",
-                    category=ErrorCategory.API,
-                    severity=ErrorSeverity.MEDIUM
-                )
-
-            # Rate limiting
-            await self._rate_limit_check("historical_data")
-
-            # Get historical data
-            # Note: Kite Connect historical_data is synchronous, so we run it in executor
-            loop = asyncio.get_running_loop()
-            historical_data = await loop.run_in_executor(
-                None,
-                lambda: self.kite.historical_data(
-                    instrument_token=instrument_token,
-                    from_date=from_date,
-                    to_date=to_date,
-                    interval=interval,
-                    continuous=False,
-                    oi=False
-                )
+            return await self._historical_bars.get_bars(
+                self._historical_key(symbol, exchange), from_date, to_date, interval
             )
 
-            self.logger.info(f"Fetched {len(historical_data)} historical data points for {symbol} ({from_date} to {to_date})")
-            return historical_data
-
         except TradingError:
             raise
         except Exception as e:
@@ -1065,3 +1100,60 @@ class KiteConnectService:
                 severity=ErrorSeverity.MEDIUM,
                 recoverable=True
             )
+
+    async def prefetch_historical_data(
+        self,
+        symbols: List[str],
+        from_date: str,
+        to_date: str,
+        interval: str = "day",
+        exchange: str = "NSE"
+    ) -> Dict[str, Any]:
+        """Warm the bar cache for a watchlist with a bounded number of broker calls in flight."""
+        if not self.kite or not self._active_session:
+            raise TradingError(
+                "Kite Connect not authenticated",
+                category=ErrorCategory.AUTHENTICATION,
+                severity=ErrorSeverity.HIGH
+            )
+        return await self._historical_bars.prefetch(
+            [self._historical_key(symbol, exchange) for symbol in symbols], from_date, to_date, interval
+        )
+
+    def get_historical_cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss and fetch counters for the historical bar cache."""
+        return self._historical_bars.get_stats()
+
+    @staticmethod
+    def _historical_key(symbol: str, exchange: str) -> str:
+        return symbol.upper() if exchange == "NSE" else f"{exchange}:{symbol.upper()}"
+
+    async def _fetch_historical_chunk(self, key: str, from_date, to_date, interval: str) -> List[Dict[str, Any]]:
+        """One Kite historical_data request for an inclusive date range."""
+        exchange, _, symbol = key.rpartition(":")
+        exchange = exchange or "NSE"
+
+        instrument_token = await self.get_instrument_token(symbol, exchange)
+        if not instrument_token:
+            raise TradingError(
+                f"Instrument token not found for {symbol}",
+                category=ErrorCategory.API,
+                severity=ErrorSeverity.MEDIUM
+            )
+
+        await self._rate_limit_check("historical_data")
+
+        # Intraday bars for the last day are only included when the bound carries a time
+        to_bound = to_date.isoformat() if interval in {"day", "week", "month"} else f"{to_date.isoformat()} 23:59:59"
+        historical_data = await asyncio.to_thread(
+            self.kite.historical_data,
+            instrument_token=instrument_token,
+            from_date=from_date.isoformat(),
+            to_date=to_bound,
+            interval=interval,
+            continuous=False,
+            oi=False
+        )
+
+        self.logger.info(f"Fetched {len(historical_data)} historical data points for {symbol} ({from_date} to {to_date})")
+        return historical_data
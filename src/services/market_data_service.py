@@ -9,7 +9,7 @@ import asyncio
 import inspect
 import uuid
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Union
 from dataclasses import dataclass
 import aiosqlite
 from loguru import logger
@@ -23,6 +23,9 @@ from .quote_stream_adapter import (
     QuoteStreamStatus,
     QuoteSubscriptionRequest,
 )
+from .indicator_engine import IncrementalIndicatorEngine
+from .tick_coalescer import TickCoalescer
+from ..stores.tick_store import BufferedTickWriter, TickSeries, TickStore
 
 LEGACY_SYMBOL_ALIASES = {
     "HDFC": "HDFCBANK",
@@ -62,17 +65,26 @@ class MarketDataService(EventHandler):
         broker=None,
         quote_stream_adapter: Optional[QuoteStreamAdapter] = None,
         default_provider: MarketDataProvider = MarketDataProvider.UPSTOX,
+        indicator_engine: Optional[IncrementalIndicatorEngine] = None,
     ):
         self.config = config
         self.event_bus = event_bus
         self.broker = broker  # Optional for paper trading only
         self.quote_stream_adapter = quote_stream_adapter or NullQuoteStreamAdapter()
         self.default_provider = default_provider
+        # Streaming indicators; every applied tick extends the symbol's forming bar
+        self.indicator_engine = indicator_engine
         configured_mode = getattr(config.integration, "upstox_stream_mode", SubscriptionMode.LTP.value)
         self.default_subscription_mode = self._coerce_subscription_mode(configured_mode)
         self.db_path = config.state_dir / "market_data.db"
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
 
+        # Columnar tick history (replaces the price_history table)
+        self.tick_store = TickStore(config.state_dir / "ticks")
+        # Appends are batched and written off the event loop
+        self.tick_writer = BufferedTickWriter(self.tick_store)
+        self._history_retention_days = 30
+
         # Database connection
         self._db_connection: Optional[aiosqlite.Connection] = None
         self._lock = asyncio.Lock()
@@ -86,6 +98,12 @@ class MarketDataService(EventHandler):
         self._update_task: Optional[asyncio.Task] = None
         self._cleanup_task: Optional[asyncio.Task] = None
 
+        # Streaming tick ingestion (coalesced per symbol, applied in batches)
+        coalesce_interval_ms = config.integration.quote_coalesce_interval_ms
+        self._tick_coalescer: Optional[TickCoalescer] = None
+        if coalesce_interval_ms > 0:
+            self._tick_coalescer = TickCoalescer(self._apply_market_data_batch, coalesce_interval_ms)
+
         # Subscribe to relevant events
         self.event_bus.subscribe(EventType.MARKET_PRICE_UPDATE, self)
 
@@ -115,6 +133,13 @@ class MarketDataService(EventHandler):
             await self._load_subscriptions()
             await self._load_cached_data()
             await self.quote_stream_adapter.initialize()
+            attach_coalescer = getattr(self.quote_stream_adapter, "set_tick_coalescer", None)
+            if self._tick_coalescer and attach_coalescer is None:
+                # Adapters outside the QuoteStreamAdapter contract keep per-tick delivery
+                self._tick_coalescer = None
+            if self._tick_coalescer:
+                attach_coalescer(self._tick_coalescer)
+                await self._tick_coalescer.start()
             logger.info("Market data service initialized")
 
             # Start background tasks
@@ -150,20 +175,9 @@ class MarketDataService(EventHandler):
             created_at TEXT NOT NULL
         );
 
-        -- Price history (for analytics)
-        CREATE TABLE IF NOT EXISTS price_history (
-            id INTEGER PRIMARY KEY,
-            symbol TEXT NOT NULL,
-            price REAL NOT NULL,
-            volume INTEGER,
-            timestamp TEXT NOT NULL,
-            provider TEXT NOT NULL
-        );
-
         -- Indexes
         CREATE INDEX IF NOT EXISTS idx_cache_timestamp ON market_data_cache(timestamp);
         CREATE INDEX IF NOT EXISTS idx_subscriptions_active ON market_subscriptions(active);
-        CREATE INDEX IF NOT EXISTS idx_history_symbol_timestamp ON price_history(symbol, timestamp);
         """
 
         await self._db_connection.executescript(schema)
@@ -535,19 +549,18 @@ class MarketDataService(EventHandler):
                 now
             ))
 
-            # Store in price history
-            await self._db_connection.execute("""
-                INSERT INTO price_history (symbol, price, volume, timestamp, provider)
-                VALUES (?, ?, ?, ?, ?)
-            """, (
+            # Store in columnar tick history
+            self.tick_writer.add([(
                 market_data.symbol,
+                market_data.timestamp,
                 market_data.ltp,
                 market_data.volume,
-                market_data.timestamp,
-                market_data.provider
-            ))
+                market_data.provider,
+            )])
 
             await self._db_connection.commit()
+            if self.indicator_engine:
+                self.indicator_engine.update_tick(market_data.symbol, market_data.ltp, market_data.timestamp)
 
             # Emit price update event
             await self.event_bus.publish(Event(
@@ -563,6 +576,62 @@ class MarketDataService(EventHandler):
                 }
             ))
 
+    async def _apply_market_data_batch(self, batch: List[MarketData]) -> None:
+        """Apply a batch of coalesced ticks with one transaction and one event."""
+        if not batch:
+            return
+
+        async with self._lock:
+            for market_data in batch:
+                self._market_data[market_data.symbol] = market_data
+
+            now = datetime.now(timezone.utc).isoformat()
+            await self._db_connection.executemany("""
+                INSERT OR REPLACE INTO market_data_cache
+                (symbol, ltp, open_price, high_price, low_price, close_price, volume, timestamp, provider, cached_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, [
+                (
+                    md.symbol, md.ltp, md.open_price, md.high_price, md.low_price,
+                    md.close_price, md.volume, md.timestamp, md.provider, now,
+                )
+                for md in batch
+            ])
+            self.tick_writer.add(
+                (md.symbol, md.timestamp, md.ltp, md.volume, md.provider) for md in batch
+            )
+            await self._db_connection.commit()
+            if self.indicator_engine:
+                for md in batch:
+                    self.indicator_engine.update_tick(md.symbol, md.ltp, md.timestamp)
+
+            # One batched price update event; "prices" matches the shape risk and
+            # analytics handlers already read, "updates" carries per-symbol detail.
+            await self.event_bus.publish(Event(
+                id=f"price_batch_{uuid.uuid4().hex}",
+                type=EventType.MARKET_PRICE_UPDATE,
+                timestamp=now,
+                source="market_data_service",
+                data={
+                    "prices": {md.symbol: md.ltp for md in batch},
+                    "updates": [
+                        {
+                            "symbol": md.symbol,
+                            "price": md.ltp,
+                            "volume": md.volume,
+                            "provider": md.provider,
+                        }
+                        for md in batch
+                    ],
+                },
+            ))
+
+    def get_tick_ingestion_stats(self) -> Dict[str, Any]:
+        """Get ticks-received vs ticks-applied counters for the streaming path."""
+        if not self._tick_coalescer:
+            return {"coalescing": False}
+        return {"coalescing": True, **self._tick_coalescer.get_stats()}
+
     async def _background_price_updates(self) -> None:
         """Background task for polling non-streaming providers and healing streaming subscriptions."""
         while True:
@@ -615,12 +684,9 @@ class MarketDataService(EventHandler):
                 """, (cutoff_time,))
                 await self._db_connection.commit()
 
-                # Remove old price history (keep last 30 days)
-                history_cutoff = (datetime.now(timezone.utc) - timedelta(days=30)).isoformat()
-                await self._db_connection.execute("""
-                    DELETE FROM price_history WHERE timestamp < ?
-                """, (history_cutoff,))
-                await self._db_connection.commit()
+                # Drop whole day partitions of tick history (keep last 30 days)
+                history_cutoff = (datetime.now(timezone.utc) - timedelta(days=self._history_retention_days)).date()
+                await asyncio.to_thread(self.tick_store.drop_before, history_cutoff)
 
             except asyncio.CancelledError:
                 logger.info("Cache cleanup task cancelled")
@@ -629,27 +695,31 @@ class MarketDataService(EventHandler):
                 logger.error(f"Error in cache cleanup: {e}")
                 await asyncio.sleep(60)
 
-    async def get_price_history(self, symbol: str, hours: int = 24) -> List[Dict[str, Any]]:
-        """Get price history for a symbol."""
-        cutoff_time = (datetime.now(timezone.utc) - timedelta(hours=hours)).isoformat()
-
-        cursor = await self._db_connection.execute("""
-            SELECT price, volume, timestamp, provider
-            FROM price_history
-            WHERE symbol = ? AND timestamp > ?
-            ORDER BY timestamp ASC
-        """, (symbol, cutoff_time))
-
-        history = []
-        async for row in cursor:
-            history.append({
-                "price": row[0],
-                "volume": row[1],
-                "timestamp": row[2],
-                "provider": row[3]
-            })
+    async def get_price_history(
+        self,
+        symbol: str,
+        hours: int = 24,
+        as_format: str = "records",
+    ) -> Union[List[Dict[str, Any]], TickSeries, Any]:
+        """Get price history for a symbol.
+
+        Args:
+            symbol: Trading symbol
+            hours: Lookback window in hours
+            as_format: "records" (list of dicts), "arrays" (TickSeries of NumPy
+                columns) or "dataframe" (pandas DataFrame indexed by timestamp)
+        """
+        cutoff_time = datetime.now(timezone.utc) - timedelta(hours=hours)
+        await self.tick_writer.flush()
+        series = await asyncio.to_thread(
+            self.tick_store.read, self._normalize_symbol(symbol), cutoff_time
+        )
 
-        return history
+        if as_format == "arrays":
+            return series
+        if as_format == "dataframe":
+            return series.to_dataframe()
+        return series.to_records()
 
     async def get_active_subscriptions(self) -> Dict[str, MarketSubscription]:
         """Get all active subscriptions."""
@@ -664,6 +734,10 @@ class MarketDataService(EventHandler):
 
     async def close(self) -> None:
         """Close the market data service."""
+        if self._tick_coalescer:
+            self.quote_stream_adapter.set_tick_coalescer(None)
+            await self._tick_coalescer.stop()
+
         # Cancel background tasks
         if self._update_task:
             self._update_task.cancel()
@@ -679,6 +753,11 @@ class MarketDataService(EventHandler):
             except asyncio.CancelledError:
                 pass
 
+        try:
+            await self.tick_writer.close()
+        except Exception as e:
+            logger.error(f"Failed to write buffered ticks on close: {e}")
+
         if self._db_connection:
             await self._db_connection.close()
             self._db_connection = None
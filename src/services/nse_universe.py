@@ -0,0 +1,181 @@
+"""
+NSE Universe
+
+The discovery universe (data/nse_universe.json) loaded once into column
+tuples with a symbol -> row index and precomputed sector and market-cap
+bitmaps. A bitmap is a Python int whose bit ``i`` marks row ``i``, so
+criteria filters and exclusion sets (held, recently researched, watchlist)
+combine with single ``&``/``|``/``~`` operations over the whole universe
+instead of a per-stock loop. The file is re-read only when its mtime changes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_UNIVERSE_PATH = Path(__file__).resolve().parents[2] / "data" / "nse_universe.json"
+
+
+class NSEUniverse:
+    """Immutable columnar snapshot of the universe file."""
+
+    def __init__(self, stocks: Iterable[Dict[str, Any]]):
+        symbols: List[str] = []
+        names: List[str] = []
+        sectors: List[str] = []
+        caps: List[str] = []
+        index: Dict[str, int] = {}
+        for stock in stocks:
+            symbol = str(stock.get("symbol") or "").strip().upper()
+            if not symbol or symbol in index:
+                continue
+            index[symbol] = len(symbols)
+            symbols.append(symbol)
+            names.append(stock.get("name") or symbol)
+            sectors.append(stock.get("sector") or "Unknown")
+            caps.append(stock.get("cap") or "unknown")
+
+        self.symbols: Tuple[str, ...] = tuple(symbols)
+        self.names: Tuple[str, ...] = tuple(names)
+        self.sectors: Tuple[str, ...] = tuple(sectors)
+        self.caps: Tuple[str, ...] = tuple(caps)
+        self.index = index
+        self.all_mask = (1 << len(symbols)) - 1
+        self.sector_masks = self._bitmaps(self.sectors)
+        self.cap_masks = self._bitmaps(self.caps)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    @staticmethod
+    def _bitmaps(column: Tuple[str, ...]) -> Dict[str, int]:
+        masks: Dict[str, int] = {}
+        for row, value in enumerate(column):
+            masks[value] = masks.get(value, 0) | (1 << row)
+        return masks
+
+    def mask_for(self, symbols: Iterable[str]) -> int:
+        """Bitmap of the given symbols; symbols outside the universe are ignored."""
+        mask = 0
+        index = self.index
+        for symbol in symbols:
+            row = index.get(symbol)
+            if row is not None:
+                mask |= 1 << row
+        return mask
+
+    def select(self, sectors: Iterable[str] = (), caps: Iterable[str] = ()) -> int:
+        """Rows in any of ``sectors`` and any of ``caps`` (an empty filter allows all)."""
+        mask = self.all_mask
+        sectors, caps = set(sectors), set(caps)
+        if sectors:
+            mask &= self._union(self.sector_masks, sectors)
+        if caps:
+            mask &= self._union(self.cap_masks, caps)
+        return mask
+
+    @staticmethod
+    def _union(masks: Dict[str, int], keys: Iterable[str]) -> int:
+        mask = 0
+        for key in keys:
+            mask |= masks.get(key, 0)
+        return mask
+
+    @staticmethod
+    def rows(mask: int) -> List[int]:
+        """Row indices set in ``mask``, ascending."""
+        bits = bin(mask)[:1:-1]  # least-significant bit first
+        rows: List[int] = []
+        row = bits.find("1")
+        while row != -1:
+            rows.append(row)
+            row = bits.find("1", row + 1)
+        return rows
+
+    def records(self, mask: int, **extra: Any) -> List[Dict[str, Any]]:
+        """Materialize the rows in ``mask`` as stock dicts, in universe order."""
+        return [
+            {
+                "symbol": self.symbols[row],
+                "name": self.names[row],
+                "sector": self.sectors[row],
+                "cap": self.caps[row],
+                **extra,
+            }
+            for row in self.rows(mask)
+        ]
+
+
+class UniverseSelection(list):
+    """Stock dicts selected from a universe that remember the snapshot and mask behind them."""
+
+    def __init__(self, universe: NSEUniverse, mask: int, **extra: Any):
+        super().__init__(universe.records(mask, **extra))
+        self.universe = universe
+        self.mask = mask
+        self.extra = extra
+
+    def excluding(self, symbols: Iterable[str]) -> "UniverseSelection":
+        """The selection minus ``symbols``, as one mask operation."""
+        return UniverseSelection(self.universe, self.mask & ~self.universe.mask_for(symbols), **self.extra)
+
+
+class NSEUniverseService:
+    """Holds the current NSEUniverse and reloads it when the file changes on disk."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else DEFAULT_UNIVERSE_PATH
+        self._universe = NSEUniverse(())
+        self._loaded_mtime_ns: Optional[int] = None
+        self._reload_lock = asyncio.Lock()
+        self.reloads = 0
+
+    async def initialize(self) -> None:
+        await self.get_universe()
+        if not len(self._universe):
+            logger.warning("NSE universe is empty or missing: %s", self.path)
+            return
+        logger.info("NSE universe loaded: %s symbols from %s", len(self._universe), self.path)
+
+    def _mtime_ns(self) -> Optional[int]:
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    async def get_universe(self) -> NSEUniverse:
+        """Current snapshot, reloaded first if the file's mtime moved."""
+        mtime_ns = self._mtime_ns()
+        if mtime_ns is None or mtime_ns == self._loaded_mtime_ns:
+            return self._universe
+        async with self._reload_lock:
+            if mtime_ns != self._loaded_mtime_ns:
+                # Recorded even on failure: keep serving the previous snapshot until the file changes again
+                self._loaded_mtime_ns = mtime_ns
+                try:
+                    self._universe = await asyncio.to_thread(self._load, self.path)
+                    self.reloads += 1
+                except Exception as exc:  # noqa: BLE001
+                    logger.error("Failed to load NSE universe from %s: %s", self.path, exc)
+        return self._universe
+
+    @staticmethod
+    def _load(path: Path) -> NSEUniverse:
+        with open(path, "r", encoding="utf-8") as handle:
+            payload = json.load(handle)
+        return NSEUniverse(payload.get("universe", []))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "path": str(self.path),
+            "symbols": len(self._universe),
+            "sectors": len(self._universe.sector_masks),
+            "reloads": self.reloads,
+        }
@@ -504,9 +504,10 @@ class PaperTradingAccountManager:
                 "period": period
             }
 
-        # Filter trades based on period
-        closed_trades = await self.store.get_closed_trades(account_id)
-        filtered_trades = self._filter_trades_by_period(closed_trades, period)
+        # Closed-trade totals for the period come from the store's aggregates in one lookup
+        aggregates = await self.store.get_performance_aggregates(
+            account_id, start_date=self._period_start_date(period)
+        )
 
         # Get open trades for unrealized P&L
         open_trades = await self.store.get_open_trades(account_id)
@@ -539,10 +540,10 @@ class PaperTradingAccountManager:
                 )
 
         # Use PerformanceCalculator to calculate metrics
-        metrics = PerformanceCalculator.calculate_account_performance(
+        metrics = PerformanceCalculator.calculate_account_performance_from_aggregates(
             initial_balance=account.initial_balance,
             current_balance=account.current_balance,
-            closed_trades=filtered_trades,
+            aggregates=aggregates,
             open_trades=open_trades,
             current_prices=current_prices
         )
@@ -552,27 +553,18 @@ class PaperTradingAccountManager:
 
         return metrics
 
-    def _filter_trades_by_period(self, trades: List, period: str) -> List:
-        """Filter trades based on period."""
+    @staticmethod
+    def _period_start_date(period: str) -> Optional[str]:
+        """First exit day (YYYY-MM-DD, UTC) included in a metrics period; None for all-time."""
         from datetime import timedelta
 
         now = datetime.now(timezone.utc)
         if period == "today":
-            start_date = now.replace(hour=0, minute=0, second=0, microsecond=0)
+            start_date = now
         elif period == "week":
             start_date = now - timedelta(days=7)
         elif period == "month":
-            start_date = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+            start_date = now.replace(day=1)
         else:  # all-time
-            return trades
-
-        filtered = []
-        for trade in trades:
-            if hasattr(trade, 'exit_timestamp') and trade.exit_timestamp:
-                trade_date = self._parse_timestamp(trade.exit_timestamp)
-                if trade_date is None:
-                    continue
-                if trade_date >= start_date:
-                    filtered.append(trade)
-
-        return filtered
+            return None
+        return start_date.strftime("%Y-%m-%d")
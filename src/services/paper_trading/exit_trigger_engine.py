@@ -0,0 +1,261 @@
+"""
+Paper Trading Exit Trigger Engine
+
+Keeps, per symbol, sorted ladders of stop-loss and target levels for every
+open paper trade across all accounts. Each price tick bisects the ladders to
+find crossed levels in O(log n + k) and closes the affected trades in one
+store transaction, so exits fire on the tick that crosses them instead of on
+the next polling scan.
+
+Ladders are maintained from the store's OpenPositionIndex listener, so any
+trade opened, closed or re-levelled through PaperTradingStore is re-armed
+without extra queries.
+"""
+
+import asyncio
+import logging
+import uuid
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Set, Tuple
+
+from ...core.event_bus import Event, EventBus, EventHandler, EventType
+from ...models.paper_trading import TradeStatus, TradeType
+from ...stores.open_position_index import OpenPosition
+from ...stores.paper_trading_store import PaperTradingStore
+
+logger = logging.getLogger(__name__)
+
+# Ladder keys: (level kind, trade direction)
+_LONG_STOP = ("stop", TradeType.BUY)
+_SHORT_STOP = ("stop", TradeType.SELL)
+_LONG_TARGET = ("target", TradeType.BUY)
+_SHORT_TARGET = ("target", TradeType.SELL)
+
+
+class _Ladder:
+    """Levels sorted ascending with parallel trade IDs."""
+
+    __slots__ = ("levels", "trade_ids", "fires_below")
+
+    def __init__(self, fires_below: bool):
+        # fires_below: the level triggers when price <= level (long stop, short target);
+        # otherwise it triggers when price >= level (long target, short stop).
+        self.fires_below = fires_below
+        self.levels: List[float] = []
+        self.trade_ids: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.levels)
+
+    def add(self, level: float, trade_id: str) -> None:
+        index = bisect_right(self.levels, level)
+        self.levels.insert(index, level)
+        self.trade_ids.insert(index, trade_id)
+
+    def remove(self, level: float, trade_id: str) -> None:
+        index = bisect_left(self.levels, level)
+        while index < len(self.levels) and self.levels[index] == level:
+            if self.trade_ids[index] == trade_id:
+                del self.levels[index]
+                del self.trade_ids[index]
+                return
+            index += 1
+
+    def crossed(self, price: float) -> List[str]:
+        if self.fires_below:
+            return self.trade_ids[bisect_left(self.levels, price):]
+        return self.trade_ids[:bisect_right(self.levels, price)]
+
+
+class ExitTriggerEngine(EventHandler):
+    """
+    Tick-driven stop-loss / target executor for paper trades.
+
+    Stops take precedence when a gap crosses both levels of one trade. Exits
+    are filled at the tick price, matching PaperTradeExecutor.check_stop_loss.
+    """
+
+    def __init__(self, event_bus: Optional[EventBus], store: PaperTradingStore):
+        self.event_bus = event_bus
+        self.store = store
+        self._ladders: Dict[str, Dict[Tuple[str, TradeType], _Ladder]] = {}
+        self._armed: Dict[str, List[Tuple[str, Tuple[str, TradeType], float]]] = {}
+        self._stats = {
+            "ticks_evaluated": 0,
+            "stops_fired": 0,
+            "targets_fired": 0,
+            "exit_batches": 0,
+            "exit_failures": 0,
+        }
+        self._publish_tasks: Set[asyncio.Task] = set()
+
+        for position in store.open_positions.positions():
+            self._arm(position)
+        store.open_positions.add_listener(self._on_position_change)
+        if event_bus is not None:
+            event_bus.subscribe(EventType.MARKET_PRICE_UPDATE, self)
+
+    def _on_position_change(self, change: str, position: OpenPosition) -> None:
+        self._disarm(position.trade_id)
+        if change != "closed":
+            self._arm(position)
+
+    def _arm(self, position: OpenPosition) -> None:
+        long = position.trade_type == TradeType.BUY
+        entries = []
+        if position.stop_loss:
+            entries.append((_LONG_STOP if long else _SHORT_STOP, float(position.stop_loss)))
+        if position.target_price:
+            entries.append((_LONG_TARGET if long else _SHORT_TARGET, float(position.target_price)))
+        if not entries:
+            return
+
+        ladders = self._ladders.get(position.symbol)
+        if ladders is None:
+            ladders = self._ladders[position.symbol] = {
+                _LONG_STOP: _Ladder(fires_below=True),
+                _SHORT_STOP: _Ladder(fires_below=False),
+                _LONG_TARGET: _Ladder(fires_below=False),
+                _SHORT_TARGET: _Ladder(fires_below=True),
+            }
+        for key, level in entries:
+            ladders[key].add(level, position.trade_id)
+        self._armed[position.trade_id] = [(position.symbol, key, level) for key, level in entries]
+
+    def _disarm(self, trade_id: str) -> None:
+        for symbol, key, level in self._armed.pop(trade_id, ()):
+            ladders = self._ladders.get(symbol)
+            if ladders is None:
+                continue
+            ladders[key].remove(level, trade_id)
+            if not any(ladders.values()):
+                del self._ladders[symbol]
+
+    def armed_levels(self) -> int:
+        """Total number of stop and target levels currently armed."""
+        return sum(len(entries) for entries in self._armed.values())
+
+    def evaluate(self, symbol: str, price: float) -> List[Tuple[str, TradeStatus]]:
+        """Return (trade_id, exit status) for every level the price crosses, without side effects."""
+        ladders = self._ladders.get(symbol)
+        if not ladders:
+            return []
+
+        stopped = ladders[_LONG_STOP].crossed(price) + ladders[_SHORT_STOP].crossed(price)
+        exits = [(trade_id, TradeStatus.STOPPED_OUT) for trade_id in stopped]
+        stopped_ids = set(stopped)
+        for trade_id in ladders[_LONG_TARGET].crossed(price) + ladders[_SHORT_TARGET].crossed(price):
+            if trade_id not in stopped_ids:
+                exits.append((trade_id, TradeStatus.CLOSED))
+        return exits
+
+    async def on_prices(self, prices: Dict[str, float]) -> List[Dict[str, object]]:
+        """Fire exits crossed by a batch of prices in one store transaction."""
+        self._stats["ticks_evaluated"] += len(prices)
+        pending: List[Tuple[OpenPosition, float, TradeStatus]] = []
+        for symbol, price in prices.items():
+            for trade_id, status in self.evaluate(symbol, price):
+                position = self.store.open_positions.get(trade_id)
+                if position is not None:
+                    pending.append((position, price, status))
+        if not pending:
+            return []
+
+        # Disarm before awaiting the write so the next tick cannot fire the same trade twice.
+        for position, _, _ in pending:
+            self._disarm(position.trade_id)
+
+        try:
+            closed = await self.store.record_exits([
+                (position.trade_id, price, position.unrealized_pnl(price), status)
+                for position, price, status in pending
+            ])
+        except Exception as e:
+            self._stats["exit_failures"] += 1
+            logger.error(f"Failed to record {len(pending)} tick-triggered exits: {e}")
+            for position, _, _ in pending:
+                if self.store.open_positions.get(position.trade_id) is position:
+                    self._arm(position)
+            return []
+
+        self._stats["exit_batches"] += 1
+        closed_ids = {trade.trade_id for trade in closed}
+        exits = []
+        for position, price, status in pending:
+            if position.trade_id not in closed_ids:
+                continue
+            stopped = status == TradeStatus.STOPPED_OUT
+            self._stats["stops_fired" if stopped else "targets_fired"] += 1
+            exits.append({
+                "trade_id": position.trade_id,
+                "account_id": position.account_id,
+                "symbol": position.symbol,
+                "reason": "stop_loss" if stopped else "target",
+                "exit_price": price,
+                "realized_pnl": position.unrealized_pnl(price),
+            })
+
+        if exits:
+            logger.info(f"Tick-triggered exits: {[(e['symbol'], e['trade_id'], e['reason']) for e in exits]}")
+            self._schedule_publish(exits)
+        return exits
+
+    def _schedule_publish(self, exits: List[Dict[str, object]]) -> None:
+        """
+        Publish exits from a separate task.
+
+        on_prices usually runs inside this engine's MARKET_PRICE_UPDATE handler,
+        and a direct-mode EventBus holds its publish lock while it notifies
+        handlers, so publishing inline would wait on that lock forever.
+        """
+        if self.event_bus is None:
+            return
+        task = asyncio.create_task(self._publish_exits(exits))
+        self._publish_tasks.add(task)
+        task.add_done_callback(self._publish_tasks.discard)
+
+    async def _publish_exits(self, exits: List[Dict[str, object]]) -> None:
+        try:
+            await self.event_bus.publish(Event(
+                id=f"paper_exit_{uuid.uuid4().hex[:12]}",
+                type=EventType.TRADE_LIFECYCLE_UPDATE,
+                timestamp=datetime.now(timezone.utc).isoformat(),
+                source="paper_trading_exit_trigger_engine",
+                data={"exits": exits},
+            ))
+        except Exception as e:
+            logger.warning(f"Failed to publish tick-triggered exits: {e}")
+
+    async def handle_event(self, event: Event) -> None:
+        """Handle MARKET_PRICE_UPDATE events (single or coalesced)."""
+        if event.type != EventType.MARKET_PRICE_UPDATE:
+            return
+        try:
+            updates = event.data.get("updates")
+            if not isinstance(updates, list):
+                updates = [event.data]
+            prices = {
+                update["symbol"]: float(update["price"])
+                for update in updates
+                if update.get("symbol") and update.get("price") is not None
+            }
+            if prices:
+                await self.on_prices(prices)
+        except Exception as e:
+            logger.error(f"Exit trigger engine failed to process price update: {e}", exc_info=True)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get trigger statistics."""
+        return {
+            **self._stats,
+            "armed_levels": self.armed_levels(),
+            "symbols": len(self._ladders),
+        }
+
+    async def close(self) -> None:
+        """Stop receiving price updates and finish publishing fired exits."""
+        if self.event_bus is not None:
+            self.event_bus.unsubscribe(EventType.MARKET_PRICE_UPDATE, self)
+        if self._publish_tasks:
+            await asyncio.gather(*self._publish_tasks, return_exceptions=True)
@@ -247,6 +247,88 @@ class PerformanceCalculator:
             "monthly_roi": monthly_roi,
         }
 
+    @staticmethod
+    def calculate_account_performance_from_aggregates(
+        initial_balance: float,
+        current_balance: float,
+        aggregates: Dict[str, Any],
+        open_trades: List[PaperTrade],
+        current_prices: Optional[Dict[str, float]] = None
+    ) -> Dict[str, Any]:
+        """Calculate account performance from pre-aggregated closed-trade totals.
+
+        Produces the same keys as calculate_account_performance without
+        loading closed trades; the totals come from
+        PaperTradingStore.get_performance_aggregates().
+
+        Args:
+            initial_balance: Starting capital
+            current_balance: Current account balance
+            aggregates: Result of PaperTradingStore.get_performance_aggregates()
+            open_trades: List of open trades
+            current_prices: Dict of symbol -> current price (for open trades)
+
+        Returns:
+            Comprehensive performance metrics
+        """
+        if current_prices is None:
+            current_prices = {}
+        totals = aggregates["totals"]
+
+        total_pnl = current_balance - initial_balance
+        total_pnl_pct = (total_pnl / initial_balance * 100) if initial_balance > 0 else 0.0
+
+        closed_count = totals["closed_trades"]
+        winning_trades = totals["winning_trades"]
+        losing_trades = totals["losing_trades"]
+        total_realized_pnl = totals["realized_pnl"]
+
+        unrealized_pnl = 0.0
+        for trade in open_trades:
+            current_price = current_prices.get(trade.symbol, trade.entry_price)
+            unrealized_pnl += (current_price - trade.entry_price) * trade.quantity
+
+        win_rate = (winning_trades / closed_count * 100) if closed_count else 0.0
+        avg_hold_days = totals["hold_days_total"] / closed_count if closed_count else 0.0
+        avg_pnl_per_trade = total_realized_pnl / closed_count if closed_count else 0.0
+
+        gross_profit = totals["gross_profit"]
+        gross_loss = totals["gross_loss"]
+        avg_win = gross_profit / winning_trades if winning_trades else 0.0
+        avg_loss = -gross_loss / losing_trades if losing_trades else 0.0
+        profit_factor = gross_profit / gross_loss if gross_loss > 0 else float('inf') if gross_profit > 0 else 0.0
+
+        largest_win = totals["best_trade"] if winning_trades else 0.0
+        largest_loss = totals["worst_trade"] if losing_trades else 0.0
+
+        # Monthly ROI (approximate), measured from the first closed trade's exit day
+        first_trade = PerformanceCalculator._coerce_timestamp(totals["first_trade_date"])
+        days_elapsed = (PerformanceCalculator._current_time_like(first_trade) - first_trade).days if first_trade else 1
+        monthly_roi = (total_pnl_pct / max(1, days_elapsed / 30)) if days_elapsed > 0 else 0.0
+
+        return {
+            "initial_balance": initial_balance,
+            "current_balance": current_balance,
+            "total_pnl": total_pnl,
+            "total_pnl_percentage": total_pnl_pct,
+            "realized_pnl": total_realized_pnl,
+            "unrealized_pnl": unrealized_pnl,
+            "total_trades": closed_count + len(open_trades),
+            "closed_trades": closed_count,
+            "open_trades": len(open_trades),
+            "winning_trades": winning_trades,
+            "losing_trades": losing_trades,
+            "win_rate": win_rate,
+            "avg_win": avg_win,
+            "avg_loss": avg_loss,
+            "profit_factor": profit_factor,
+            "largest_win": largest_win,
+            "largest_loss": largest_loss,
+            "avg_hold_days": avg_hold_days,
+            "avg_pnl_per_trade": avg_pnl_per_trade,
+            "monthly_roi": monthly_roi,
+        }
+
     @staticmethod
     def calculate_strategy_effectiveness(
         closed_trades: List[PaperTrade],
@@ -56,7 +56,7 @@ class PaperTradingPriceMonitor(EventHandler):
 
         Args:
             event_bus: EventBus for subscribing to price updates
-            paper_trading_store: Store for fetching open trades
+            paper_trading_store: Store whose open-position index is read per tick
             broadcast_coordinator: BroadcastCoordinator for WebSocket broadcasting
         """
         self.event_bus = event_bus
@@ -86,35 +86,17 @@ class PaperTradingPriceMonitor(EventHandler):
         logger.info("PaperTradingPriceMonitor background tasks started")
 
     async def _refresh_monitored_symbols(self) -> None:
-        """Background task to refresh which symbols we're monitoring."""
+        """Background task to rebuild monitored symbols and check the position index."""
         while True:
             try:
                 await asyncio.sleep(30)  # Refresh every 30 seconds
 
-                # Get all accounts with open positions
-                # Note: This is a simplified version - in production you'd query all accounts
-                monitored_symbols = {}
-                active_accounts = set()
-
-                # For each active account, get their open positions
-                # (In production, you'd iterate through all accounts in the database)
-                for account_id in list(self._active_accounts):
-                    try:
-                        open_trades = await self.store.get_open_trades(account_id)
-                        if open_trades:
-                            active_accounts.add(account_id)
-                            for trade in open_trades:
-                                if trade.symbol not in monitored_symbols:
-                                    monitored_symbols[trade.symbol] = set()
-                                monitored_symbols[trade.symbol].add(account_id)
-                    except Exception as e:
-                        logger.error(f"Failed to refresh positions for account {account_id}: {e}")
-
-                self._monitored_symbols = monitored_symbols
-                self._active_accounts = active_accounts
-
-                if monitored_symbols:
-                    logger.debug(f"Monitoring {len(monitored_symbols)} symbols across {len(active_accounts)} accounts: {list(monitored_symbols.keys())}")
+                # Catches writes that bypassed PaperTradingStore (one query for all accounts)
+                await self.store.verify_open_position_index(repair=True)
+                self._rebuild_monitored_symbols()
+
+                if self._monitored_symbols:
+                    logger.debug(f"Monitoring {len(self._monitored_symbols)} symbols across {len(self._active_accounts)} accounts: {list(self._monitored_symbols.keys())}")
 
             except asyncio.CancelledError:
                 logger.info("Price monitor refresh task cancelled")
@@ -123,6 +105,16 @@ class PaperTradingPriceMonitor(EventHandler):
                 logger.error(f"Error refreshing monitored symbols: {e}")
                 await asyncio.sleep(60)  # Wait longer on error
 
+    def _rebuild_monitored_symbols(self) -> None:
+        """Derive symbol → account_ids for registered accounts from the open-position index."""
+        index = self.store.open_positions
+        monitored_symbols: Dict[str, Set[str]] = {}
+        for symbol in index.symbols():
+            accounts = index.accounts_for_symbol(symbol) & self._active_accounts
+            if accounts:
+                monitored_symbols[symbol] = accounts
+        self._monitored_symbols = monitored_symbols
+
     async def register_account(self, account_id: str) -> None:
         """Register an account for price monitoring.
 
@@ -130,6 +122,7 @@ class PaperTradingPriceMonitor(EventHandler):
             account_id: Account ID to start monitoring
         """
         self._active_accounts.add(account_id)
+        self._rebuild_monitored_symbols()
         logger.info(f"Registered account {account_id} for real-time price monitoring")
 
     async def unregister_account(self, account_id: str) -> None:
@@ -158,6 +151,13 @@ class PaperTradingPriceMonitor(EventHandler):
             return
 
         try:
+            # Coalesced streaming ticks arrive as one event carrying many updates
+            updates = event.data.get("updates")
+            if isinstance(updates, list):
+                for update in updates:
+                    await self._handle_symbol_price(update.get("symbol"), update.get("price"))
+                return
+
             symbol = event.data.get("symbol")
             new_price = event.data.get("price")
 
@@ -165,8 +165,19 @@ class PaperTradingPriceMonitor(EventHandler):
                 logger.warning(f"Invalid price update event: {event.data}")
                 return
 
-            # Check if this symbol affects any monitored positions
-            affected_accounts = self._monitored_symbols.get(symbol, set())
+            await self._handle_symbol_price(symbol, new_price)
+
+        except Exception as e:
+            logger.error(f"Error handling price update event: {e}", exc_info=True)
+
+    async def _handle_symbol_price(self, symbol: Optional[str], new_price: Optional[float]) -> None:
+        """Broadcast position updates for one symbol's new price."""
+        if not symbol or new_price is None:
+            return
+
+        try:
+            # Check if this symbol affects any monitored positions (index is always current)
+            affected_accounts = self.store.open_positions.accounts_for_symbol(symbol) & self._active_accounts
             if not affected_accounts:
                 # Not monitoring this symbol, skip
                 return
@@ -185,7 +196,7 @@ class PaperTradingPriceMonitor(EventHandler):
                 await self._broadcast_position_update(account_id, symbol, new_price)
 
         except Exception as e:
-            logger.error(f"Error handling price update event: {e}", exc_info=True)
+            logger.error(f"Error handling price update for {symbol}: {e}", exc_info=True)
 
     async def _broadcast_position_update(self, account_id: str, symbol: str, new_price: float) -> None:
         """Recalculate position P&L and broadcast via WebSocket.
@@ -196,9 +207,8 @@ class PaperTradingPriceMonitor(EventHandler):
             new_price: New market price
         """
         try:
-            # Get open trades for this symbol
-            all_trades = await self.store.get_open_trades(account_id)
-            affected_trades = [t for t in all_trades if t.symbol == symbol]
+            # Open positions for this symbol come from the in-memory index (no DB read per tick)
+            affected_trades = self.store.open_positions.positions_for(symbol, account_id)
 
             if not affected_trades:
                 return
@@ -206,7 +216,7 @@ class PaperTradingPriceMonitor(EventHandler):
             # Recalculate unrealized P&L for each affected position
             position_updates = []
             for trade in affected_trades:
-                unrealized_pnl = (new_price - trade.entry_price) * trade.quantity
+                unrealized_pnl = trade.unrealized_pnl(new_price)
                 unrealized_pnl_pct = (unrealized_pnl / (trade.entry_price * trade.quantity)) * 100 if trade.entry_price > 0 else 0.0
 
                 position_update = {
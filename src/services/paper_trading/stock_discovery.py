@@ -6,23 +6,23 @@ This service keeps discovery stateful and outcome-driven:
 - use prior research and trade outcomes to avoid redundant AI work
 - shortlist a small number of dark-horse candidates before spending tokens
 - batch external research for the shortlist only
+- extract features for the shortlist concurrently, streaming results into the watchlist
 - score extracted features deterministically
 """
 
 from __future__ import annotations
 
-import json
+import asyncio
 import uuid
 from datetime import datetime, timedelta, timezone
-from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
-import aiofiles
 from loguru import logger
 
 from ...auth.ai_runtime_auth import get_ai_runtime_status
 from ...core.errors import ErrorCategory, ErrorSeverity, TradingError
 from ...core.event_bus import Event, EventHandler
+from ..nse_universe import NSEUniverseService, UniverseSelection
 
 
 class StockDiscoveryService(EventHandler):
@@ -39,6 +39,7 @@ class StockDiscoveryService(EventHandler):
         *,
         learning_service=None,
         account_manager=None,
+        universe_service: Optional[NSEUniverseService] = None,
     ):
         self.state_manager = state_manager
         self.market_research_service = market_research_service
@@ -48,6 +49,7 @@ class StockDiscoveryService(EventHandler):
         self.deterministic_scorer = deterministic_scorer
         self.learning_service = learning_service
         self.account_manager = account_manager
+        self.universe_service = universe_service or NSEUniverseService()
 
         self.default_criteria = {
             "min_market_cap": "small",
@@ -64,6 +66,13 @@ class StockDiscoveryService(EventHandler):
         self.research_cooldown = timedelta(days=3)
         self.watchlist_cooldown = timedelta(days=2)
         self.discovery_memory_limit = 24
+        ai_runtime = getattr(config, "ai_runtime", None)
+        self.feature_extraction_concurrency = max(
+            1, int(getattr(ai_runtime, "feature_extraction_concurrency", self.max_deep_research_candidates))
+        )
+        self.feature_extraction_timeout_seconds = float(
+            getattr(ai_runtime, "feature_extraction_timeout_seconds", 120.0)
+        )
         self._running = False
 
     async def initialize(self) -> None:
@@ -209,14 +218,24 @@ class StockDiscoveryService(EventHandler):
                     "blockers": [scout_blocker],
                 }
             research_limit = min(len(discovery_candidates), self.max_deep_research_candidates)
+            streamed_updates: Dict[str, str] = {}
+
+            async def _stream_to_watchlist(analyzed_stock: Dict[str, Any]) -> None:
+                scored = (await self._score_stocks([analyzed_stock]))[0]
+                streamed_updates[scored["symbol"]] = await self._upsert_watchlist_entry(scored)
+
             analyzed_stocks = await self._analyze_candidates(
                 discovery_candidates[:research_limit],
                 criteria,
                 memory_context=memory_context,
                 market_conditions=market_conditions,
+                on_result=_stream_to_watchlist,
             )
             scored_stocks = await self._score_stocks(analyzed_stocks)
-            watchlist_updates = await self._update_watchlist(scored_stocks[: max(research_limit, 10)])
+            watchlist_updates = await self._update_watchlist(
+                scored_stocks[: max(research_limit, 10)],
+                upserted=streamed_updates,
+            )
 
             duration_ms = int((datetime.now(timezone.utc) - start_time).total_seconds() * 1000)
             high_potential = len([stock for stock in scored_stocks if stock.get("score", 0) > 70])
@@ -257,38 +276,20 @@ class StockDiscoveryService(EventHandler):
             ) from exc
 
     async def _load_market_universe(self, criteria: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Load the deterministic universe and apply coarse filters without AI."""
+        """Select the criteria's sectors and cap tiers from the preloaded universe without AI."""
         try:
-            universe_path = Path(__file__).parents[3] / "data" / "nse_universe.json"
-            async with aiofiles.open(universe_path, "r", encoding="utf-8") as handle:
-                payload = json.loads(await handle.read())
-            market_stocks = payload.get("universe", [])
+            universe = await self.universe_service.get_universe()
         except Exception as exc:  # noqa: BLE001
             logger.error("Failed to load NSE universe: %s", exc)
-            market_stocks = []
-
-        allowed_sectors = set(criteria.get("sectors", []))
-        allowed_caps = set(criteria.get("market_cap_tiers", []))
-
-        filtered: List[Dict[str, Any]] = []
-        for stock in market_stocks:
-            if allowed_sectors and stock.get("sector") not in allowed_sectors:
-                continue
-            if allowed_caps and stock.get("cap") not in allowed_caps:
-                continue
-
-            filtered.append(
-                {
-                    "symbol": stock["symbol"],
-                    "name": stock.get("name", stock["symbol"]),
-                    "sector": stock.get("sector", "Unknown"),
-                    "cap": stock.get("cap", "unknown"),
-                    "discovery_source": "stateful_opportunity_funnel",
-                    "screening_criteria": criteria,
-                }
-            )
+            return []
 
-        return filtered
+        mask = universe.select(criteria.get("sectors", []), criteria.get("market_cap_tiers", []))
+        return UniverseSelection(
+            universe,
+            mask,
+            discovery_source="stateful_opportunity_funnel",
+            screening_criteria=criteria,
+        )
 
     async def _build_discovery_memory(
         self,
@@ -399,15 +400,14 @@ class StockDiscoveryService(EventHandler):
         held_symbols = memory_context.get("held_symbols", set())
         recently_seen_watchlist = memory_context.get("stale_watchlist_symbols", set())
 
-        for stock in market_stocks:
-            symbol = stock["symbol"]
-            if symbol in held_symbols:
-                continue
-            if symbol in recent_symbols:
-                continue
-            if symbol in recently_seen_watchlist:
-                continue
+        excluded_symbols = set().union(held_symbols, recent_symbols, recently_seen_watchlist)
+        if isinstance(market_stocks, UniverseSelection):
+            eligible_stocks = market_stocks.excluding(excluded_symbols)
+        else:
+            eligible_stocks = [stock for stock in market_stocks if stock["symbol"] not in excluded_symbols]
 
+        for stock in eligible_stocks:
+            symbol = stock["symbol"]
             sector = stock.get("sector", "Unknown")
             cap = str(stock.get("cap", "unknown")).lower()
             sector_score = float(sector_scores.get(sector, 0.0))
@@ -560,71 +560,157 @@ class StockDiscoveryService(EventHandler):
         *,
         memory_context: Optional[Dict[str, Any]] = None,
         market_conditions: Optional[Dict[str, Any]] = None,
+        on_result: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
     ) -> List[Dict[str, Any]]:
-        """Deep-research a small shortlist only, using one batched research request."""
+        """
+        Deep-research a small shortlist through a bounded-concurrency pipeline.
+
+        Candidates without scout research share one batched research request;
+        the others start feature extraction right away. At most
+        ``feature_extraction_concurrency`` extractions run at once, each under
+        ``feature_extraction_timeout_seconds``, and every result is handed to
+        ``on_result`` as soon as it is ready. The first usage-limit signal
+        cancels the remaining candidates, which come back blocked. Results keep
+        the shortlist order.
+        """
         if not stocks:
             return []
 
-        logger.info("Analyzing %s candidate stocks via batched research", len(stocks))
+        logger.info(
+            "Analyzing %s candidate stocks via batched research (concurrency=%s)",
+            len(stocks),
+            self.feature_extraction_concurrency,
+        )
         symbols_to_fetch = [stock["symbol"] for stock in stocks if not stock.get("seed_research")]
         company_names = {stock["symbol"]: stock.get("name", stock["symbol"]) for stock in stocks if not stock.get("seed_research")}
-        batch_research: Dict[str, Dict[str, Any]] = {}
+        batch_research: Optional[asyncio.Task] = None
         if symbols_to_fetch:
-            batch_research = await self.market_research_service.collect_batch_symbol_research(
-                symbols_to_fetch,
-                company_names=company_names,
-                research_brief=self._build_research_brief(stocks, criteria, memory_context or {}, market_conditions or {}),
-                max_concurrent=len(symbols_to_fetch),
+            batch_research = asyncio.create_task(
+                self.market_research_service.collect_batch_symbol_research(
+                    symbols_to_fetch,
+                    company_names=company_names,
+                    research_brief=self._build_research_brief(stocks, criteria, memory_context or {}, market_conditions or {}),
+                    max_concurrent=len(symbols_to_fetch),
+                )
             )
 
-        analyzed_stocks: List[Dict[str, Any]] = []
-        for stock in stocks:
+        extraction_slots = asyncio.Semaphore(self.feature_extraction_concurrency)
+        usage_limit_errors: List[str] = []
+
+        async def _analyze(stock: Dict[str, Any]) -> Dict[str, Any]:
+            external_research: Dict[str, Any] = {}
             try:
-                external_research = dict(stock.get("seed_research") or batch_research.get(stock["symbol"], {}))
+                if stock.get("seed_research"):
+                    external_research = dict(stock["seed_research"])
+                else:
+                    # Shielded so a cancelled candidate does not cancel the shared batch
+                    external_research = dict((await asyncio.shield(batch_research)).get(stock["symbol"], {}))
                 if self._research_result_usage_limited(external_research):
-                    analyzed_stocks.append(
-                        {
-                            **stock,
-                            "external_research": external_research,
-                            "analysis_error": self._extract_research_error(external_research),
-                            "claude_analysis": {
-                                "symbol": stock["symbol"],
-                                "analysis_type": "blocked",
-                                "recommendation": "HOLD",
-                                "confidence": 0.0,
-                                "score": 0.0,
-                                "features": {},
-                                "key_factors": [],
-                                "risks": [self._extract_research_error(external_research)],
-                                "opportunities": [],
-                            },
-                            "research_timestamp": external_research.get("research_timestamp")
-                            or datetime.now(timezone.utc).isoformat(),
-                        }
+                    usage_limit_errors.append(self._extract_research_error(external_research))
+                    return self._blocked_candidate(stock, external_research, usage_limit_errors[0])
+
+                async with extraction_slots:
+                    if usage_limit_errors:
+                        return self._blocked_candidate(stock, external_research, usage_limit_errors[0])
+                    structured_analysis = await asyncio.wait_for(
+                        self._analyze_stock_features(stock, external_research),
+                        timeout=self.feature_extraction_timeout_seconds,
                     )
-                    continue
-
-                structured_analysis = await self._analyze_stock_features(stock, external_research)
-                analyzed_stocks.append(
-                    {
-                        **stock,
-                        "external_research": external_research,
-                        "claude_analysis": structured_analysis,
-                        "research_timestamp": external_research.get("research_timestamp")
-                        or datetime.now(timezone.utc).isoformat(),
-                    }
-                )
+                return {
+                    **stock,
+                    "external_research": external_research,
+                    "claude_analysis": structured_analysis,
+                    "research_timestamp": external_research.get("research_timestamp")
+                    or datetime.now(timezone.utc).isoformat(),
+                }
+            except asyncio.TimeoutError:
+                error = f"Feature extraction timed out after {self.feature_extraction_timeout_seconds:g}s"
+                logger.warning("%s for %s", error, stock.get("symbol"))
+                return {
+                    **stock,
+                    "external_research": external_research,
+                    "analysis_error": error,
+                    "claude_analysis": self._fallback_analysis(stock["symbol"], error),
+                    "research_timestamp": datetime.now(timezone.utc).isoformat(),
+                }
             except Exception as exc:  # noqa: BLE001
+                if self._is_usage_limit_error(str(exc)):
+                    usage_limit_errors.append(str(exc))
+                    return self._blocked_candidate(stock, external_research, str(exc))
                 logger.error("Failed to analyze stock %s: %s", stock.get("symbol"), exc)
-                analyzed_stocks.append(
-                    {
-                        **stock,
-                        "analysis_error": str(exc),
-                        "research_timestamp": datetime.now(timezone.utc).isoformat(),
-                    }
-                )
+                return {
+                    **stock,
+                    "analysis_error": str(exc),
+                    "research_timestamp": datetime.now(timezone.utc).isoformat(),
+                }
 
-        return analyzed_stocks
+        tasks = [asyncio.create_task(_analyze(stock)) for stock in stocks]
+        position = {task: index for index, task in enumerate(tasks)}
+        results: Dict[int, Dict[str, Any]] = {}
+        pending = set(tasks)
+
+        async def _publish(index: int, result: Dict[str, Any]) -> None:
+            results[index] = result
+            if on_result is None:
+                return
+            try:
+                await on_result(result)
+            except Exception as exc:  # noqa: BLE001
+                logger.error("Failed to stream discovery result for %s: %s", result.get("symbol"), exc)
+
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    await _publish(position[task], task.result())
+                if usage_limit_errors and pending:
+                    logger.warning(
+                        "AI runtime is usage-limited; cancelling %s remaining discovery candidates", len(pending)
+                    )
+                    for task in pending:
+                        task.cancel()
+                    await asyncio.gather(*pending, return_exceptions=True)
+                    for task in pending:
+                        index = position[task]
+                        if task.cancelled():
+                            result = self._blocked_candidate(stocks[index], {}, usage_limit_errors[0])
+                        else:
+                            result = task.result()
+                        await _publish(index, result)
+                    pending = set()
+        finally:
+            for task in pending:
+                task.cancel()
+            if batch_research is not None and not batch_research.done():
+                batch_research.cancel()
+
+        return [results[index] for index in range(len(stocks))]
+
+    def _blocked_candidate(
+        self,
+        stock: Dict[str, Any],
+        external_research: Dict[str, Any],
+        error: str,
+    ) -> Dict[str, Any]:
+        """Candidate left unanalyzed because the AI runtime is usage-limited."""
+        return {
+            **stock,
+            "external_research": external_research,
+            "analysis_error": error,
+            "claude_analysis": {
+                "symbol": stock["symbol"],
+                "analysis_type": "blocked",
+                "recommendation": "HOLD",
+                "confidence": 0.0,
+                "score": 0.0,
+                "features": {},
+                "key_factors": [],
+                "risks": [error],
+                "opportunities": [],
+            },
+            "research_timestamp": external_research.get("research_timestamp")
+            or datetime.now(timezone.utc).isoformat(),
+        }
 
     async def _discover_candidates_from_market(
         self,
@@ -738,7 +824,11 @@ class StockDiscoveryService(EventHandler):
 
     @classmethod
     def _research_result_usage_limited(cls, external_research: Dict[str, Any]) -> bool:
-        error_text = cls._extract_research_error(external_research).lower()
+        return cls._is_usage_limit_error(cls._extract_research_error(external_research))
+
+    @staticmethod
+    def _is_usage_limit_error(error: str) -> bool:
+        error_text = error.lower()
         return (
             "usage limit" in error_text
             or "usage-limited" in error_text
@@ -807,18 +897,25 @@ class StockDiscoveryService(EventHandler):
                 "opportunities": [],
             }
         except Exception as exc:  # noqa: BLE001
+            if self._is_usage_limit_error(str(exc)):
+                # Let the pipeline stop the remaining candidates
+                raise
             logger.warning("Feature extraction failed for %s: %s", stock["symbol"], exc)
-            return {
-                "symbol": stock["symbol"],
-                "analysis_type": "fallback",
-                "recommendation": "HOLD",
-                "confidence": 0.0,
-                "score": 0.0,
-                "features": {},
-                "key_factors": [],
-                "risks": [f"Feature extraction failed: {exc}"],
-                "opportunities": [],
-            }
+            return self._fallback_analysis(stock["symbol"], f"Feature extraction failed: {exc}")
+
+    @staticmethod
+    def _fallback_analysis(symbol: str, reason: str) -> Dict[str, Any]:
+        return {
+            "symbol": symbol,
+            "analysis_type": "fallback",
+            "recommendation": "HOLD",
+            "confidence": 0.0,
+            "score": 0.0,
+            "features": {},
+            "key_factors": [],
+            "risks": [reason],
+            "opportunities": [],
+        }
 
     async def _score_stocks(self, stocks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         scored_stocks = []
@@ -867,8 +964,20 @@ class StockDiscoveryService(EventHandler):
             logger.error("Failed to get discovery watchlist: %s", exc)
             return []
 
-    async def _update_watchlist(self, stocks: List[Dict[str, Any]]) -> Dict[str, Any]:
+    async def _update_watchlist(
+        self,
+        stocks: List[Dict[str, Any]],
+        *,
+        upserted: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Make the active watchlist match ``stocks``.
+
+        ``upserted`` maps symbols already written while discovery streamed
+        results to "added"/"updated"; those are counted, not written again.
+        """
         updates = {"added": 0, "updated": 0, "removed": 0, "skipped": 0}
+        upserted = upserted or {}
         active_watchlist = await self.state_manager.paper_trading.get_discovery_watchlist(limit=200, status="ACTIVE")
         active_by_symbol = {item.get("symbol"): item for item in active_watchlist if item.get("symbol")}
         active_symbols = set(active_by_symbol)
@@ -885,45 +994,52 @@ class StockDiscoveryService(EventHandler):
                 updates["skipped"] += 1
 
         for stock in stocks:
-            try:
-                existing = await self.state_manager.paper_trading.get_discovery_watchlist_by_symbol(stock["symbol"])
-                payload = {
-                    "symbol": stock["symbol"],
-                    "company_name": stock.get("name"),
-                    "sector": stock.get("sector"),
-                    "discovery_date": datetime.now(timezone.utc).date().isoformat(),
-                    "discovery_source": stock.get("discovery_source", "stateful_opportunity_funnel"),
-                    "discovery_reason": stock.get("discovery_reason", "Stateful discovery analysis"),
-                    "current_price": stock.get("current_price"),
-                    "recommendation": stock.get("recommendation", "WATCH"),
-                    "confidence_score": stock.get("score", 0) / 100,
-                    "research_summary": {
-                        "external_research": stock.get("external_research"),
-                        "structured_analysis": stock.get("claude_analysis"),
-                        "discovery_reason": stock.get("discovery_reason", ""),
-                        "opportunity_score": stock.get("opportunity_score"),
-                        "last_trigger_type": stock.get("last_trigger_type"),
-                    },
-                    "technical_indicators": stock.get("claude_analysis", {}).get("features", {}),
-                    "fundamental_metrics": stock.get("claude_analysis", {}).get("features", {}),
-                    "last_analyzed": now,
-                    "updated_at": now,
-                    "status": "ACTIVE",
-                }
-
-                if existing:
-                    await self.state_manager.paper_trading.update_discovery_watchlist(existing["id"], payload)
-                    updates["updated"] += 1
-                else:
-                    payload["created_at"] = now
-                    await self.state_manager.paper_trading.add_to_discovery_watchlist(payload)
-                    updates["added"] += 1
-            except Exception as exc:  # noqa: BLE001
-                logger.error("Failed to update watchlist for %s: %s", stock.get("symbol"), exc)
-                updates["skipped"] += 1
+            outcome = upserted.get(stock.get("symbol"))
+            if outcome not in ("added", "updated"):
+                outcome = await self._upsert_watchlist_entry(stock, now)
+            updates[outcome] += 1
 
         return updates
 
+    async def _upsert_watchlist_entry(self, stock: Dict[str, Any], now: Optional[str] = None) -> str:
+        """Write one scored candidate to the watchlist; returns "added", "updated" or "skipped"."""
+        now = now or datetime.now(timezone.utc).isoformat()
+        try:
+            existing = await self.state_manager.paper_trading.get_discovery_watchlist_by_symbol(stock["symbol"])
+            payload = {
+                "symbol": stock["symbol"],
+                "company_name": stock.get("name"),
+                "sector": stock.get("sector"),
+                "discovery_date": datetime.now(timezone.utc).date().isoformat(),
+                "discovery_source": stock.get("discovery_source", "stateful_opportunity_funnel"),
+                "discovery_reason": stock.get("discovery_reason", "Stateful discovery analysis"),
+                "current_price": stock.get("current_price"),
+                "recommendation": stock.get("recommendation", "WATCH"),
+                "confidence_score": stock.get("score", 0) / 100,
+                "research_summary": {
+                    "external_research": stock.get("external_research"),
+                    "structured_analysis": stock.get("claude_analysis"),
+                    "discovery_reason": stock.get("discovery_reason", ""),
+                    "opportunity_score": stock.get("opportunity_score"),
+                    "last_trigger_type": stock.get("last_trigger_type"),
+                },
+                "technical_indicators": stock.get("claude_analysis", {}).get("features", {}),
+                "fundamental_metrics": stock.get("claude_analysis", {}).get("features", {}),
+                "last_analyzed": now,
+                "updated_at": now,
+                "status": "ACTIVE",
+            }
+
+            if existing:
+                await self.state_manager.paper_trading.update_discovery_watchlist(existing["id"], payload)
+                return "updated"
+            payload["created_at"] = now
+            await self.state_manager.paper_trading.add_to_discovery_watchlist(payload)
+            return "added"
+        except Exception as exc:  # noqa: BLE001
+            logger.error("Failed to update watchlist for %s: %s", stock.get("symbol"), exc)
+            return "skipped"
+
     async def _create_discovery_session(
         self,
         session_id: str,
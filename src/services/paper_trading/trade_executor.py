@@ -330,31 +330,32 @@ class PaperTradeExecutor:
         else:  # SELL
             realized_pnl = (trade.entry_price - actual_exit_price) * trade.quantity
 
-        # Close trade
-        await self.store.close_trade(
-            trade_id=trade_id,
-            exit_price=actual_exit_price,  # Real-time market price!
-            realized_pnl=realized_pnl,
-            reason=reason
-        )
-
-        # Update account balance
-        if trade.trade_type == TradeType.BUY:
-            # Release locked buying power + realized P&L
-            await self.account_manager.unlock_buying_power(
-                account_id=trade.account_id,
-                amount=trade.entry_price * trade.quantity
-            )
-            # Add realized P&L to balance
-            if realized_pnl > 0:
-                await self.account_manager.update_balance(trade.account_id, realized_pnl)
-        else:  # SELL
-            # Release locked value + realized P&L
-            await self.account_manager.unlock_buying_power(
-                account_id=trade.account_id,
-                amount=trade.entry_price * trade.quantity
+        # Close the trade and settle the account in one transaction (one commit)
+        async with self.store.unit_of_work():
+            await self.store.close_trade(
+                trade_id=trade_id,
+                exit_price=actual_exit_price,  # Real-time market price!
+                realized_pnl=realized_pnl,
+                reason=reason
             )
 
+            # Update account balance
+            if trade.trade_type == TradeType.BUY:
+                # Release locked buying power + realized P&L
+                await self.account_manager.unlock_buying_power(
+                    account_id=trade.account_id,
+                    amount=trade.entry_price * trade.quantity
+                )
+                # Add realized P&L to balance
+                if realized_pnl > 0:
+                    await self.account_manager.update_balance(trade.account_id, realized_pnl)
+            else:  # SELL
+                # Release locked value + realized P&L
+                await self.account_manager.unlock_buying_power(
+                    account_id=trade.account_id,
+                    amount=trade.entry_price * trade.quantity
+                )
+
         logger.info(f"Position closed: {trade.symbol} P&L: ₹{realized_pnl} (exit price: ₹{actual_exit_price} from market)")
 
         # Phase 4: Auto-unsubscribe from market data if no more positions for this symbol
@@ -11,10 +11,9 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Awaitable, Callable, Dict, Iterable, Optional
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, Iterable, Optional
 
 import aiofiles
-import httpx
 
 # KiteTicker import for Zerodha streaming
 try:
@@ -23,7 +22,18 @@ except ImportError:
     KiteTicker = None
 
 from src.config import Config
+from src.core.http_clients import get_http_client_pool
 from src.models.market_data import MarketData, MarketDataProvider, SubscriptionMode
+from src.services.instrument_master import (
+    Instrument,
+    dumped_on_current_trading_day,
+    get_instrument_master,
+    parse_kite_instruments_csv,
+    upstox_instruments_from_json,
+)
+
+if TYPE_CHECKING:
+    from src.services.tick_coalescer import TickCoalescer
 
 logger = logging.getLogger(__name__)
 
@@ -76,6 +86,8 @@ class QuoteStreamAdapter(ABC):
 
     provider: MarketDataProvider
     supports_streaming: bool = True
+    _tick_coalescer: Optional["TickCoalescer"] = None
+    _loop: Optional[asyncio.AbstractEventLoop] = None
 
     @abstractmethod
     async def initialize(self) -> None:
@@ -101,6 +113,18 @@ class QuoteStreamAdapter(ABC):
         """Update the callback used for normalized quote delivery."""
         return None
 
+    def set_tick_coalescer(self, coalescer: Optional["TickCoalescer"]) -> None:
+        """Route ticks through a coalescing stage instead of one callback per tick."""
+        self._tick_coalescer = coalescer
+
+    def _deliver_quote(self, normalized: MarketData) -> None:
+        """Hand a normalized tick from the socket thread to the event loop."""
+        if self._tick_coalescer is not None:
+            self._tick_coalescer.offer(normalized)
+            return
+        if self._loop is not None and not self._loop.is_closed():
+            asyncio.run_coroutine_threadsafe(self._on_quote_update(normalized), self._loop)
+
 
 class NullQuoteStreamAdapter(QuoteStreamAdapter):
     """No-op adapter used when no quote provider is configured."""
@@ -137,60 +161,47 @@ class UpstoxInstrumentResolver:
     """Resolve NSE trading symbols to Upstox instrument keys using the official BOD JSON file."""
 
     NSE_INSTRUMENTS_URL = "https://assets.upstox.com/market-quote/instruments/exchange/NSE.json.gz"
+    PROVIDER = "upstox"
 
     def __init__(self, state_dir: Path) -> None:
         self._cache_path = state_dir / "upstox" / "nse_instruments.json.gz"
         self._cache_path.parent.mkdir(parents=True, exist_ok=True)
-        self._symbol_map: Dict[str, str] = {}
-        self._loaded_at: Optional[datetime] = None
-        self._lock = asyncio.Lock()
+        self._master = get_instrument_master(state_dir)
 
     @property
     def cache_ready(self) -> bool:
-        return bool(self._symbol_map)
+        return self._master.is_ready(self.PROVIDER)
 
     async def resolve_instrument_key(self, symbol: str) -> Optional[str]:
         """Resolve one NSE trading symbol to its Upstox instrument key."""
-        await self._ensure_loaded()
-        return self._symbol_map.get(symbol.upper())
-
-    async def _ensure_loaded(self) -> None:
-        async with self._lock:
-            if self._symbol_map and self._loaded_at and datetime.now(timezone.utc) - self._loaded_at < timedelta(hours=12):
-                return
+        instrument = await self._master.resolve(self.PROVIDER, symbol, self._load_instruments)
+        return instrument.key if instrument else None
+
+    async def _load_instruments(self) -> list[Instrument]:
+        """Download (or reuse today's raw download of) the BOD file for the instrument master."""
+        payload: Optional[bytes] = None
+        # The master stamps the parsed dump with today's trading day, so only today's raw dump is reusable
+        if dumped_on_current_trading_day(self._cache_path):
+            try:
+                async with aiofiles.open(self._cache_path, "rb") as handle:
+                    payload = await handle.read()
+            except OSError as exc:
+                logger.warning("Failed to read Upstox instrument cache %s: %s", self._cache_path, exc)
+                payload = None
+
+        if payload is None:
+            client = get_http_client_pool().get("upstox", follow_redirects=True)
+            response = await client.get(self.NSE_INSTRUMENTS_URL, timeout=20.0)
+            response.raise_for_status()
+            payload = response.content
+            try:
+                async with aiofiles.open(self._cache_path, "wb") as handle:
+                    await handle.write(payload)
+            except OSError as exc:
+                logger.warning("Failed to write Upstox instrument cache %s: %s", self._cache_path, exc)
 
-            payload: Optional[bytes] = None
-            if self._cache_path.exists():
-                age = datetime.now(timezone.utc) - datetime.fromtimestamp(self._cache_path.stat().st_mtime, tz=timezone.utc)
-                if age < timedelta(hours=24):
-                    try:
-                        async with aiofiles.open(self._cache_path, "rb") as handle:
-                            payload = await handle.read()
-                    except OSError as exc:
-                        logger.warning("Failed to read Upstox instrument cache %s: %s", self._cache_path, exc)
-                        payload = None
-
-            if payload is None:
-                async with httpx.AsyncClient(timeout=20.0, follow_redirects=True) as client:
-                    response = await client.get(self.NSE_INSTRUMENTS_URL)
-                    response.raise_for_status()
-                    payload = response.content
-                try:
-                    async with aiofiles.open(self._cache_path, "wb") as handle:
-                        await handle.write(payload)
-                except OSError as exc:
-                    logger.warning("Failed to write Upstox instrument cache %s: %s", self._cache_path, exc)
-
-            records = json.loads(gzip.decompress(payload).decode("utf-8"))
-            self._symbol_map = {
-                str(item.get("trading_symbol", "")).upper(): item["instrument_key"]
-                for item in records
-                if item.get("segment") == "NSE_EQ"
-                and item.get("instrument_type") in {"EQ", "BE"}
-                and item.get("trading_symbol")
-                and item.get("instrument_key")
-            }
-            self._loaded_at = datetime.now(timezone.utc)
+        records = await asyncio.to_thread(lambda: json.loads(gzip.decompress(payload).decode("utf-8")))
+        return upstox_instruments_from_json(records)
 
 
 class UpstoxQuoteStreamAdapter(QuoteStreamAdapter):
@@ -417,8 +428,7 @@ class UpstoxQuoteStreamAdapter(QuoteStreamAdapter):
                 normalized = self._normalize_feed(symbol, feed, payload.get("currentTs"))
                 if normalized is None:
                     continue
-                if self._loop is not None and not self._loop.is_closed():
-                    asyncio.run_coroutine_threadsafe(self._on_quote_update(normalized), self._loop)
+                self._deliver_quote(normalized)
             except Exception as exc:
                 logger.warning(
                     "Ignoring malformed Upstox feed for %s (%s): %s",
@@ -468,83 +478,49 @@ class KiteInstrumentResolver:
     """Resolve NSE trading symbols to Kite instrument tokens using the instruments API."""
 
     KITE_INSTRUMENTS_URL = "https://api.kite.trade/instruments"
+    PROVIDER = "kite"
 
     def __init__(self, api_key: str, access_token: str, state_dir: Path) -> None:
         self._api_key = api_key
         self._access_token = access_token
         self._cache_path = state_dir / "kite" / "nse_instruments.json"
         self._cache_path.parent.mkdir(parents=True, exist_ok=True)
-        self._symbol_map: Dict[str, int] = {}  # symbol -> instrument_token
-        self._loaded_at: Optional[datetime] = None
-        self._lock = asyncio.Lock()
+        self._master = get_instrument_master(state_dir)
 
     @property
     def cache_ready(self) -> bool:
-        return bool(self._symbol_map)
+        return self._master.is_ready(self.PROVIDER)
 
     async def resolve_instrument_token(self, symbol: str) -> Optional[int]:
         """Resolve one NSE trading symbol to its Kite instrument token."""
-        await self._ensure_loaded()
-        return self._symbol_map.get(symbol.upper())
-
-    async def _ensure_loaded(self) -> None:
-        async with self._lock:
-            if self._symbol_map and self._loaded_at and datetime.now(timezone.utc) - self._loaded_at < timedelta(hours=12):
-                return
-
-            payload: Optional[str] = None
-            if self._cache_path.exists():
-                age = datetime.now(timezone.utc) - datetime.fromtimestamp(self._cache_path.stat().st_mtime, tz=timezone.utc)
-                if age < timedelta(hours=24):
-                    try:
-                        async with aiofiles.open(self._cache_path, "r", encoding="utf-8") as handle:
-                            payload = await handle.read()
-                    except OSError as exc:
-                        logger.warning("Failed to read Kite instrument cache %s: %s", self._cache_path, exc)
-                        payload = None
-
-            if payload is None:
-                async with httpx.AsyncClient(timeout=30.0) as client:
-                    # Kite instruments endpoint requires api_key as query param
-                    url = f"{self.KITE_INSTRUMENTS_URL}?api_key={self._api_key}"
-                    response = await client.get(url)
-                    response.raise_for_status()
-                    payload = response.text
-                try:
-                    async with aiofiles.open(self._cache_path, "w", encoding="utf-8") as handle:
-                        await handle.write(payload)
-                except OSError as exc:
-                    logger.warning("Failed to write Kite instrument cache %s: %s", self._cache_path, exc)
-
-            # Parse CSV format: instrument_token,exchange,tradingsymbol,...
-            lines = payload.strip().split("\n")
-            if len(lines) < 2:
-                return
-
-            headers = lines[0].split(",")
+        instrument = await self._master.resolve(self.PROVIDER, symbol, self._load_instruments)
+        return instrument.token if instrument else None
+
+    async def _load_instruments(self) -> list[Instrument]:
+        """Download (or reuse today's raw download of) the instruments CSV for the instrument master."""
+        payload: Optional[str] = None
+        # The master stamps the parsed dump with today's trading day, so only today's raw dump is reusable
+        if dumped_on_current_trading_day(self._cache_path):
             try:
-                symbol_idx = headers.index("tradingsymbol")
-                token_idx = headers.index("instrument_token")
-                exchange_idx = headers.index("exchange")
-            except ValueError:
-                logger.warning("Kite instruments CSV missing required columns")
-                return
-
-            self._symbol_map = {}
-            for line in lines[1:]:
-                parts = line.split(",")
-                if len(parts) <= max(symbol_idx, token_idx, exchange_idx):
-                    continue
-                exchange = parts[exchange_idx]
-                symbol = parts[symbol_idx].upper()
-                try:
-                    token = int(parts[token_idx])
-                except ValueError:
-                    continue
-                if exchange == "NSE":
-                    self._symbol_map[symbol] = token
+                async with aiofiles.open(self._cache_path, "r", encoding="utf-8") as handle:
+                    payload = await handle.read()
+            except OSError as exc:
+                logger.warning("Failed to read Kite instrument cache %s: %s", self._cache_path, exc)
+                payload = None
+
+        if payload is None:
+            # Kite instruments endpoint requires api_key as query param
+            url = f"{self.KITE_INSTRUMENTS_URL}?api_key={self._api_key}"
+            response = await get_http_client_pool().get("kite").get(url, timeout=30.0)
+            response.raise_for_status()
+            payload = response.text
+            try:
+                async with aiofiles.open(self._cache_path, "w", encoding="utf-8") as handle:
+                    await handle.write(payload)
+            except OSError as exc:
+                logger.warning("Failed to write Kite instrument cache %s: %s", self._cache_path, exc)
 
-            self._loaded_at = datetime.now(timezone.utc)
+        return await asyncio.to_thread(parse_kite_instruments_csv, payload)
 
 
 class KiteTickerQuoteStreamAdapter(QuoteStreamAdapter):
@@ -876,8 +852,7 @@ class KiteTickerQuoteStreamAdapter(QuoteStreamAdapter):
             if normalized is None:
                 continue
 
-            if self._loop is not None and not self._loop.is_closed():
-                asyncio.run_coroutine_threadsafe(self._on_quote_update(normalized), self._loop)
+            self._deliver_quote(normalized)
 
     def _normalize_tick(self, symbol: str, tick: object) -> Optional[MarketData]:
         if not isinstance(tick, dict):
@@ -1,14 +1,15 @@
 """Sequential queue manager for task execution.
 
-This module implements the parallel queue, sequential task pattern:
+This module implements the parallel queue, bounded-concurrency task pattern:
 - selected queues execute in parallel
-- tasks within each queue execute sequentially (one-at-a-time per queue)
+- tasks within each queue run up to that queue's concurrency limit
+  (one-at-a-time unless configured otherwise), with per-TaskType limits
 
 Architecture Pattern - NON-BLOCKING EXECUTION:
-- Tasks execute in background threads via ThreadSafeQueueExecutor
+- Tasks execute as asyncio workers of a shared QueueWorkerPool
+- Free worker slots are shared across queues by weighted round-robin
 - Main event loop remains responsive for HTTP/WebSocket
-- Status updates callback to main event loop via run_coroutine_threadsafe()
-- Graceful shutdown waits for all executor threads
+- Graceful shutdown waits for in-flight tasks
 
 Phase 3: Uses QueueStateRepository for status queries (single source of truth)
 """
@@ -21,7 +22,7 @@ from datetime import datetime
 from ...models.scheduler import QueueName, SchedulerTask, TaskStatus
 from ...models.dto import QueueStatusDTO
 from .task_service import SchedulerTaskService
-from .thread_safe_queue_executor import ThreadSafeQueueExecutor
+from .queue_worker_pool import QueueConcurrencyPolicy, QueueWorkerPool
 
 logger = logging.getLogger(__name__)
 
@@ -32,14 +33,16 @@ class SequentialQueueManager:
 
     Architecture Pattern:
     - selected queues execute in parallel
-    - tasks within each queue execute sequentially (one-at-a-time per queue)
+    - tasks within each queue execute sequentially by default; I/O-bound
+      queues and task types can be given higher concurrency limits
 
     This prevents:
     - Database contention (PORTFOLIO_SYNC tasks run sequentially)
-    - Resource conflicts (each queue manages its own sequential execution)
+    - Resource conflicts (each queue stays within its own limit)
 
     While allowing:
     - Parallel processing across different queue types
+    - Concurrent I/O-bound tasks (fundamentals, news, earnings checks)
     - Better resource utilization
     - Independent queue execution
 
@@ -49,20 +52,28 @@ class SequentialQueueManager:
     - Eliminates dual sources of truth
     """
 
-    def __init__(self, task_service: SchedulerTaskService, queue_state_repository=None):
+    def __init__(
+        self,
+        task_service: SchedulerTaskService,
+        queue_state_repository=None,
+        policy: Optional[QueueConcurrencyPolicy] = None
+    ):
         """Initialize manager.
 
         Args:
             task_service: Task service for task operations
             queue_state_repository: Repository for status queries (Phase 3)
+            policy: Per-queue / per-task-type concurrency limits and queue weights
         """
         self.task_service = task_service
         self.queue_state_repository = queue_state_repository
+        self.policy = policy or QueueConcurrencyPolicy()
         self._running = False
         self._loop: Optional[asyncio.AbstractEventLoop] = None
 
-        # Thread-safe executors for each queue (3 parallel workers)
-        self._executors: Dict[QueueName, ThreadSafeQueueExecutor] = {}
+        # One async worker pool shared by every started queue
+        self._worker_pool: Optional[QueueWorkerPool] = None
+        self._queue_names: List[QueueName] = []
 
         # Execution tracking (for backward compatibility)
         self._execution_history: List[Dict[str, Any]] = []
@@ -70,20 +81,19 @@ class SequentialQueueManager:
 
     async def execute_queues(self) -> None:
         """
-        Execute all queues in parallel using thread-safe executors.
+        Execute all queues in parallel on the async worker pool.
 
         Architecture Pattern (NON-BLOCKING):
-        - 3+ queues execute in PARALLEL using ThreadSafeQueueExecutor
-        - Each executor runs tasks SEQUENTIALLY in a dedicated worker thread
+        - 3+ queues execute in PARALLEL on one QueueWorkerPool
+        - Each queue runs up to its configured concurrency (default: sequential)
         - Main event loop stays responsive for HTTP/WebSocket
-        - Thread callbacks use run_coroutine_threadsafe() to update async state
 
         Execution Flow:
-        1. Start executor for each queue (spawns worker thread)
-        2. Each thread runs _run_queue_loop() to process tasks sequentially
-        3. Task completion callbacks back to main event loop
+        1. Start the pool for the selected queues
+        2. The pool leases runnable tasks as create_task notifications arrive
+        3. Task completion callbacks update tracking state
         4. Main loop stays responsive for health checks and broadcasts
-        5. Shutdown waits for all executor threads to finish gracefully
+        5. Shutdown waits for in-flight tasks to finish gracefully
         """
         if self._running:
             logger.warning("Queue execution already in progress")
@@ -94,7 +104,7 @@ class SequentialQueueManager:
         self._loop = asyncio.get_running_loop()
         if not self._loop.is_running():
             raise RuntimeError("Event loop is not running - cannot start queue executors")
-        logger.info("Starting parallel queue execution (NON-BLOCKING with ThreadSafeQueueExecutor)")
+        logger.info("Starting parallel queue execution (NON-BLOCKING with QueueWorkerPool)")
 
         try:
             # Reload completed tasks from today
@@ -111,19 +121,16 @@ class SequentialQueueManager:
                 "AI_ANALYSIS, PORTFOLIO_ANALYSIS, and PAPER_TRADING_RESEARCH executors removed from startup path"
             )
 
-            # Create and start executor for each queue
-            for queue_name in queue_names:
-                executor = ThreadSafeQueueExecutor(
-                    queue_name=queue_name.value,
-                    task_service=self.task_service,
-                    loop=self._loop,
-                    on_task_complete=self._on_task_complete,
-                    on_task_failed=self._on_task_failed
-                )
-                self._executors[queue_name] = executor
-                await executor.start()
+            self._queue_names = queue_names
+            self._worker_pool = QueueWorkerPool(
+                self.task_service,
+                policy=self.policy,
+                on_task_complete=self._on_task_complete,
+                on_task_failed=self._on_task_failed
+            )
+            await self._worker_pool.start(queue_names)
 
-            logger.info(f"Started {len(self._executors)} queue executors (all running in parallel)")
+            logger.info(f"Started worker pool for {len(queue_names)} queues (all running in parallel)")
 
         except Exception as e:
             logger.error(f"Error starting queue execution: {e}")
@@ -209,50 +216,39 @@ class SequentialQueueManager:
             logger.error(f"Error in task failed callback: {e}")
 
     async def stop(self, timeout_seconds: int = 30) -> None:
-        """Stop all executors and wait for graceful shutdown.
+        """Stop the worker pool and wait for in-flight tasks.
 
         Args:
-            timeout_seconds: Max seconds to wait for all threads
+            timeout_seconds: Max seconds to wait for running tasks
         """
         if not self._running:
             return
 
-        logger.info(f"Stopping all {len(self._executors)} queue executors...")
+        logger.info(f"Stopping worker pool for {len(self._queue_names)} queues...")
         self._running = False
 
-        # Stop all executors concurrently
-        stop_tasks = [
-            executor.stop(timeout_seconds=timeout_seconds)
-            for executor in self._executors.values()
-        ]
-
-        results = await asyncio.gather(*stop_tasks, return_exceptions=True)
-
-        # Log results
-        for i, (queue_name, executor) in enumerate(self._executors.items()):
-            result = results[i]
-            if isinstance(result, Exception):
-                logger.error(f"Error stopping executor {queue_name.value}: {result}")
-            else:
-                logger.info(f"Queue {queue_name.value} executor stopped")
+        if self._worker_pool is not None:
+            try:
+                await self._worker_pool.stop(timeout_seconds=timeout_seconds)
+            except Exception as e:
+                logger.error(f"Error stopping queue worker pool: {e}")
 
-        logger.info("All queue executors stopped")
+        logger.info("All queue workers stopped")
 
     def is_running(self) -> bool:
         """Check if queue execution is running."""
         return self._running
 
     def get_current_task(self) -> Optional[str]:
-        """Get currently executing task ID (from any executor).
+        """Get currently executing task ID (from any queue).
 
         Returns:
             Task ID of current task, or None if idle
         """
-        for executor in self._executors.values():
-            current = executor.get_current_task()
-            if current:
-                return current.task_id
-        return None
+        if self._worker_pool is None:
+            return None
+        active = self._worker_pool.get_active_tasks()
+        return active[0].task_id if active else None
 
     def get_execution_history(self, limit: int = 100) -> List[Dict[str, Any]]:
         """Get recent execution history from all executors.
@@ -286,15 +282,23 @@ class SequentialQueueManager:
             # Fallback if repository not available
             queue_dtos = []
 
-        # Get status from each executor (for backward compatibility)
+        # Per-queue executor view (kept in the pre-pool shape for existing consumers)
+        pool_status = self._worker_pool.get_status() if self._worker_pool else {"queues": {}}
         executor_status = {}
-        for queue_name, executor in self._executors.items():
-            executor_status[queue_name.value] = await executor.get_status()
+        for queue_name, queue_status in pool_status["queues"].items():
+            active_tasks = queue_status["active_tasks"]
+            executor_status[queue_name] = {
+                "queue_name": queue_name,
+                "running": self._running,
+                "current_task": active_tasks[0] if active_tasks else None,
+                **queue_status,
+            }
 
         return {
             "running": self._running,
             "current_task": self.get_current_task(),
             "completed_tasks_today": len(self._completed_task_ids),
             "executors": executor_status,
+            "worker_pool": {key: value for key, value in pool_status.items() if key != "queues"},
             "queues": queue_dtos  # Phase 3: Unified DTOs (history available from repository)
         }
@@ -0,0 +1,340 @@
+"""Async worker pool with per-queue and per-task-type concurrency limits.
+
+Replaces one sequential OS thread per queue with a single dispatcher on the
+main event loop that leases tasks into a shared pool of worker slots:
+
+- Each queue runs up to its own concurrency limit (1 keeps it sequential)
+- Each TaskType runs up to its own limit across all queues, so I/O-bound
+  types (fundamentals, news, earnings) can fan out while others stay serial
+- Free slots are shared across queues by smooth weighted round-robin, so a
+  busy queue cannot starve the others and higher-weight queues get
+  proportionally more of the pool
+- Tasks whose dependencies have not completed are never claimed
+  (see SchedulerTaskStore.claim_next_task)
+
+Task handlers are coroutines that already ran on the main loop under the
+thread-per-queue design; running them as asyncio tasks keeps the loop just as
+responsive while removing the thread hops.
+"""
+
+import asyncio
+import logging
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Set
+
+from ...models.scheduler import QueueName, SchedulerTask, TaskType
+from .task_service import SchedulerTaskService
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class QueueConcurrencyPolicy:
+    """Concurrency limits and fairness weights for the worker pool."""
+    max_workers: int = 8
+    default_queue_concurrency: int = 1
+    queue_concurrency: Dict[str, int] = field(default_factory=dict)
+    task_type_concurrency: Dict[str, int] = field(default_factory=dict)
+    queue_weights: Dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def from_config(cls, config: Any) -> "QueueConcurrencyPolicy":
+        scheduling = getattr(config, "scheduling", None)
+        if scheduling is None:
+            return cls()
+        return cls(
+            max_workers=scheduling.max_concurrent_tasks,
+            queue_concurrency=dict(scheduling.queue_concurrency),
+            task_type_concurrency=dict(scheduling.task_type_concurrency),
+            queue_weights=dict(scheduling.queue_weights),
+        )
+
+    def queue_limit(self, queue_name: str) -> int:
+        return max(1, self.queue_concurrency.get(queue_name, self.default_queue_concurrency))
+
+    def task_type_limit(self, task_type: str) -> Optional[int]:
+        limit = self.task_type_concurrency.get(task_type)
+        return max(1, limit) if limit is not None else None
+
+    def weight(self, queue_name: str) -> int:
+        return max(1, self.queue_weights.get(queue_name, 1))
+
+
+class QueueWorkerPool:
+    """Lease and run tasks from several queues on a bounded pool of async workers."""
+
+    # A claimed task is leased for this long and renewed while it runs; if the
+    # worker dies the lease lapses and any worker of the queue reclaims it.
+    LEASE_SECONDS = 120.0
+    LEASE_RENEW_INTERVAL_SECONDS = 40.0
+    TASK_TIMEOUT_SECONDS = 900.0
+
+    def __init__(
+        self,
+        task_service: SchedulerTaskService,
+        policy: Optional[QueueConcurrencyPolicy] = None,
+        on_task_complete: Optional[Callable[[SchedulerTask], Coroutine]] = None,
+        on_task_failed: Optional[Callable[[SchedulerTask, str], Coroutine]] = None
+    ):
+        """Initialize pool.
+
+        Args:
+            task_service: Task service for claiming and executing tasks
+            policy: Concurrency limits and queue weights
+            on_task_complete: Optional callback when task completes
+            on_task_failed: Optional callback when task fails
+        """
+        self.task_service = task_service
+        self.policy = policy or QueueConcurrencyPolicy()
+        self.on_task_complete = on_task_complete
+        self.on_task_failed = on_task_failed
+        self.worker_id = f"pool-{uuid.uuid4().hex[:8]}"
+
+        self._queues: List[QueueName] = []
+        self._running = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake = asyncio.Event()
+        self._dispatcher: Optional[asyncio.Task] = None
+
+        self._active: Dict[str, asyncio.Task] = {}  # task_id -> worker task
+        self._active_tasks: Dict[str, SchedulerTask] = {}
+        self._active_by_queue: Dict[str, int] = {}
+        self._active_by_type: Dict[str, int] = {}
+        self._current_weight: Dict[str, int] = {}
+        self._drained: Set[str] = set()  # queues with nothing claimable since the last wake
+        self._type_blocked: Set[str] = set()  # drained queues that skipped saturated task types
+        self._stats = {"dispatched": 0, "completed": 0, "failed": 0, "empty_claims": 0}
+
+    async def start(self, queues: List[QueueName]) -> None:
+        """Start dispatching from ``queues``."""
+        if self._running:
+            logger.warning("Queue worker pool already running")
+            return
+        self._queues = list(queues)
+        self._running = True
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._drained.clear()
+        self._current_weight = {queue.value: 0 for queue in self._queues}
+        self.task_service.dispatch_notifier.add_listener(self._on_notify)
+        self._dispatcher = asyncio.create_task(self._dispatch_loop(), name="queue-worker-pool")
+        logger.info(
+            f"Started queue worker pool ({self.policy.max_workers} workers) for "
+            + ", ".join(f"{q.value}x{self.policy.queue_limit(q.value)}" for q in self._queues)
+        )
+
+    async def stop(self, timeout_seconds: int = 30) -> None:
+        """Stop dispatching and wait for in-flight tasks."""
+        if not self._running:
+            return
+        self._running = False
+        self.task_service.dispatch_notifier.remove_listener(self._on_notify)
+        self._wake.set()
+        if self._dispatcher is not None:
+            await self._dispatcher
+            self._dispatcher = None
+
+        in_flight = list(self._active.values())
+        if in_flight:
+            done, pending = await asyncio.wait(in_flight, timeout=timeout_seconds)
+            if pending:
+                logger.error(f"{len(pending)} queue tasks did not finish within {timeout_seconds}s; cancelling")
+                for worker in pending:
+                    worker.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+        logger.info("Queue worker pool stopped")
+
+    def _on_notify(self, queue_name: Optional[str]) -> None:
+        """Notifier callback; may run on any thread."""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            loop.call_soon_threadsafe(self._mark_ready, queue_name)
+        except RuntimeError:
+            pass
+
+    def _mark_ready(self, queue_name: Optional[str]) -> None:
+        if queue_name is None:
+            self._drained.clear()
+            self._type_blocked.clear()
+        else:
+            self._drained.discard(queue_name)
+        self._wake.set()
+
+    def _release_slot(self, queue_name: str, task_type: str) -> None:
+        """Make queues claimable again that were only held back by this task's slots."""
+        limit = self.policy.task_type_limit(task_type)
+        saturated = limit is not None and self._active_by_type[task_type] >= limit
+        self._active_by_queue[queue_name] -= 1
+        self._active_by_type[task_type] -= 1
+        self._drained.discard(queue_name)
+        if saturated:
+            self._drained -= self._type_blocked
+            self._type_blocked.clear()
+        self._wake.set()
+
+    def _saturated_types(self) -> List[TaskType]:
+        saturated = []
+        for task_type, running in self._active_by_type.items():
+            limit = self.policy.task_type_limit(task_type)
+            if limit is not None and running >= limit:
+                saturated.append(TaskType(task_type))
+        return saturated
+
+    def _pick_queue(self) -> Optional[QueueName]:
+        """Smooth weighted round-robin over queues that have free slots and may have work."""
+        eligible = [
+            queue for queue in self._queues
+            if queue.value not in self._drained
+            and self._active_by_queue.get(queue.value, 0) < self.policy.queue_limit(queue.value)
+        ]
+        if not eligible:
+            return None
+        total = 0
+        for queue in eligible:
+            weight = self.policy.weight(queue.value)
+            self._current_weight[queue.value] += weight
+            total += weight
+        chosen = max(eligible, key=lambda queue: self._current_weight[queue.value])
+        self._current_weight[chosen.value] -= total
+        return chosen
+
+    async def _dispatch_loop(self) -> None:
+        while self._running:
+            # Clear before claiming so a notification racing the claims is not lost
+            self._wake.clear()
+            try:
+                await self._fill_slots()
+                timeout = None
+                if len(self._active) < self.policy.max_workers:
+                    timeout = await self._lease_recheck_timeout()
+            except Exception as e:
+                logger.error(f"Queue worker pool dispatch error: {e}")
+                timeout = 1.0
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                # A lease may have lapsed: give every queue another claim
+                self._drained.clear()
+                self._type_blocked.clear()
+
+    async def _fill_slots(self) -> None:
+        while self._running and len(self._active) < self.policy.max_workers:
+            queue = self._pick_queue()
+            if queue is None:
+                return
+            saturated = self._saturated_types()
+            task = await self.task_service.claim_next_task(
+                queue,
+                self.worker_id,
+                self.LEASE_SECONDS,
+                exclude_task_types=saturated,
+            )
+            if task is None:
+                self._stats["empty_claims"] += 1
+                self._drained.add(queue.value)
+                if saturated:
+                    self._type_blocked.add(queue.value)
+                continue
+            self._launch(queue.value, task)
+
+    async def _lease_recheck_timeout(self) -> Optional[float]:
+        """Seconds until the earliest foreign lease among idle queues lapses."""
+        soonest = None
+        for queue in self._queues:
+            if queue.value not in self._drained:
+                continue
+            seconds = await self.task_service.seconds_until_lease_expiry(queue)
+            if seconds is not None and (soonest is None or seconds < soonest):
+                soonest = seconds
+        # SQLite timestamps have 1s resolution
+        return soonest + 1.0 if soonest is not None else None
+
+    def _launch(self, queue_name: str, task: SchedulerTask) -> None:
+        task_type = task.task_type.value
+        self._active_by_queue[queue_name] = self._active_by_queue.get(queue_name, 0) + 1
+        self._active_by_type[task_type] = self._active_by_type.get(task_type, 0) + 1
+        self._active_tasks[task.task_id] = task
+        self._stats["dispatched"] += 1
+        worker = asyncio.create_task(self._run_task(task), name=f"queue-task:{task.task_id}")
+        self._active[task.task_id] = worker
+
+        def _release(_: asyncio.Task) -> None:
+            self._active.pop(task.task_id, None)
+            self._active_tasks.pop(task.task_id, None)
+            self._release_slot(queue_name, task_type)
+
+        worker.add_done_callback(_release)
+
+    async def _run_task(self, task: SchedulerTask) -> None:
+        start_time = datetime.utcnow()
+        heartbeat = asyncio.create_task(self._renew_lease_until_done(task))
+        try:
+            logger.info(f"Executing task: {task.task_id} ({task.task_type.value})")
+            await asyncio.wait_for(self.task_service.execute_task(task), timeout=self.TASK_TIMEOUT_SECONDS)
+            duration_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+            logger.info(f"Task completed: {task.task_id} ({duration_ms}ms)")
+            self._stats["completed"] += 1
+            if self.on_task_complete:
+                await self.on_task_complete(task)
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            logger.error(f"Task timeout: {task.task_id} (>{self.TASK_TIMEOUT_SECONDS:.0f}s)")
+            await self._mark_failed(task, f"Task execution timeout (>{self.TASK_TIMEOUT_SECONDS:.0f}s)")
+        except Exception as e:
+            logger.error(f"Task execution error: {task.task_id} - {e}")
+            await self._mark_failed(task, str(e))
+        finally:
+            heartbeat.cancel()
+
+    async def _mark_failed(self, task: SchedulerTask, error_msg: str) -> None:
+        self._stats["failed"] += 1
+        try:
+            await self.task_service.mark_failed(task.task_id, error_msg)
+            if self.on_task_failed:
+                await self.on_task_failed(task, error_msg)
+        except Exception as e:
+            logger.error(f"Error marking task failed: {e}")
+
+    async def _renew_lease_until_done(self, task: SchedulerTask) -> None:
+        while True:
+            await asyncio.sleep(self.LEASE_RENEW_INTERVAL_SECONDS)
+            try:
+                if not await self.task_service.renew_lease(task.task_id, self.worker_id, self.LEASE_SECONDS):
+                    logger.warning(f"Lease on {task.task_id} was lost")
+                    return
+            except Exception as e:
+                logger.warning(f"Failed to renew lease on {task.task_id}: {e}")
+
+    def is_running(self) -> bool:
+        return self._running
+
+    def get_active_tasks(self, queue_name: Optional[str] = None) -> List[SchedulerTask]:
+        """Tasks currently executing, optionally for one queue."""
+        return [
+            task for task in self._active_tasks.values()
+            if queue_name is None or task.queue_name.value == queue_name
+        ]
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "worker_id": self.worker_id,
+            "running": self._running,
+            "max_workers": self.policy.max_workers,
+            "active_workers": len(self._active),
+            "active_by_task_type": {k: v for k, v in self._active_by_type.items() if v},
+            **self._stats,
+            "queues": {
+                queue.value: {
+                    "concurrency": self.policy.queue_limit(queue.value),
+                    "weight": self.policy.weight(queue.value),
+                    "active": self._active_by_queue.get(queue.value, 0),
+                    "active_tasks": [task.task_id for task in self.get_active_tasks(queue.value)],
+                }
+                for queue in self._queues
+            },
+        }
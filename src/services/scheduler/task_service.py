@@ -2,6 +2,7 @@
 
 import logging
 import asyncio
+import threading
 from typing import Optional, List, Dict, Any, Callable
 from datetime import datetime, timedelta
 
@@ -152,6 +153,66 @@ class RetryScheduler:
                 await asyncio.sleep(5)
 
 
+class TaskDispatchNotifier:
+    """Wake idle queue workers in this process when a queue gets runnable work.
+
+    Workers block on a ``threading.Event`` (they run in their own threads), so
+    an idle queue costs no database reads; ``notify()`` is safe to call from
+    the event loop or any thread.
+    """
+
+    def __init__(self):
+        """Initialize notifier."""
+        self._lock = threading.Lock()
+        self._subscribers: Dict[str, List[threading.Event]] = {}
+        self._listeners: List[Callable[[Optional[str]], None]] = []
+
+    def subscribe(self, queue_name: str) -> threading.Event:
+        """Register a worker for ``queue_name``; the returned event is set on new work."""
+        event = threading.Event()
+        with self._lock:
+            self._subscribers.setdefault(queue_name, []).append(event)
+        return event
+
+    def unsubscribe(self, queue_name: str, event: threading.Event) -> None:
+        """Remove a worker's event."""
+        with self._lock:
+            events = self._subscribers.get(queue_name, [])
+            if event in events:
+                events.remove(event)
+
+    def add_listener(self, listener: Callable[[Optional[str]], None]) -> None:
+        """Call ``listener(queue_name)`` on every notification (``None`` means all queues)."""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[Optional[str]], None]) -> None:
+        """Remove a listener."""
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def notify(self, queue_name: str) -> None:
+        """Wake every worker subscribed to ``queue_name``."""
+        with self._lock:
+            events = list(self._subscribers.get(queue_name, []))
+            listeners = list(self._listeners)
+        for event in events:
+            event.set()
+        for listener in listeners:
+            listener(queue_name)
+
+    def notify_all(self) -> None:
+        """Wake every subscribed worker."""
+        with self._lock:
+            events = [event for queue_events in self._subscribers.values() for event in queue_events]
+            listeners = list(self._listeners)
+        for event in events:
+            event.set()
+        for listener in listeners:
+            listener(None)
+
+
 class SchedulerTaskService:
     """Manage scheduler tasks and queues."""
 
@@ -161,6 +222,7 @@ class SchedulerTaskService:
         self.execution_tracker = execution_tracker
         self._task_handlers: Dict[TaskType, Callable] = {}
         self._retry_scheduler = RetryScheduler()
+        self.dispatch_notifier = TaskDispatchNotifier()
 
     async def initialize(self) -> None:
         """Initialize the task service."""
@@ -197,6 +259,7 @@ class SchedulerTaskService:
         # Handle both enum and string inputs for robustness
         queue_value = queue_name.value if hasattr(queue_name, 'value') else str(queue_name)
         logger.info(f"Created task: {task.task_id} in queue {queue_value}")
+        self.dispatch_notifier.notify(queue_value)
         return task
 
     async def get_task(self, task_id: str) -> Optional[SchedulerTask]:
@@ -209,11 +272,7 @@ class SchedulerTaskService:
 
     async def get_all_queue_statistics(self) -> Dict[str, QueueStatistics]:
         """Get statistics for all queues."""
-        stats = {}
-        for queue_name in QueueName:
-            queue_value = queue_name.value if hasattr(queue_name, 'value') else str(queue_name)
-            stats[queue_value] = await self.get_queue_statistics(queue_name)
-        return stats
+        return await self.store.get_all_queue_statistics()
 
     async def get_pending_tasks(
         self,
@@ -231,6 +290,34 @@ class SchedulerTaskService:
         logger.debug(f"get_pending_tasks() filtered to {len(ready_tasks)} ready tasks")
         return ready_tasks
 
+    async def claim_next_task(
+        self,
+        queue_name: QueueName,
+        worker_id: str,
+        lease_seconds: float = 300.0,
+        exclude_task_types: Optional[List[TaskType]] = None
+    ) -> Optional[SchedulerTask]:
+        """Lease the next runnable task of a queue to ``worker_id`` (None when idle)."""
+        return await self.store.claim_next_task(
+            queue_name, worker_id, lease_seconds, exclude_task_types or ()
+        )
+
+    async def renew_lease(self, task_id: str, worker_id: str, lease_seconds: float = 300.0) -> bool:
+        """Extend the lease on a running task."""
+        return await self.store.renew_lease(task_id, worker_id, lease_seconds)
+
+    async def seconds_until_lease_expiry(self, queue_name: QueueName) -> Optional[float]:
+        """Seconds until the queue's earliest running lease lapses, or None if nothing is leased."""
+        expires_at = await self.store.get_next_lease_expiry(queue_name)
+        if expires_at is None:
+            return None
+        return max(0.0, (expires_at - datetime.utcnow()).total_seconds())
+
+    def _notify_queue(self, task: Optional[SchedulerTask]) -> None:
+        if task is not None:
+            queue_name = task.queue_name
+            self.dispatch_notifier.notify(queue_name.value if hasattr(queue_name, 'value') else str(queue_name))
+
     async def mark_started(self, task_id: str) -> Optional[SchedulerTask]:
         """Mark task as started."""
         task = await self.store.mark_started(task_id)
@@ -241,6 +328,9 @@ class SchedulerTaskService:
         """Mark task as completed."""
         task = await self.store.mark_completed(task_id)
         logger.info(f"Task completed: {task_id}")
+        # Dependents (in any queue) may now be runnable
+        if task is not None:
+            self.dispatch_notifier.notify_all()
         return task
 
     async def mark_failed(self, task_id: str, error: str) -> Optional[SchedulerTask]:
@@ -255,6 +345,7 @@ class SchedulerTaskService:
             if task:
                 # Schedule the retry with exponential backoff
                 await self._retry_scheduler.schedule_retry(task_id, task.retry_count)
+                self._notify_queue(task)
                 return task
         else:
             logger.error(f"Task failed (no more retries): {task_id} - {error}")
@@ -265,6 +356,7 @@ class SchedulerTaskService:
         """Retry a failed task."""
         task = await self.store.increment_retry(task_id)
         logger.info(f"Task queued for retry: {task_id} (attempt {task.retry_count})")
+        self._notify_queue(task)
         return task
 
     async def execute_task(self, task: SchedulerTask) -> Dict[str, Any]:
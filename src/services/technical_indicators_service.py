@@ -251,3 +251,113 @@ class TechnicalIndicatorsService:
 
         return indicators
 
+    def calculate_universe_indicators(
+        self,
+        symbols: List[str],
+        highs: np.ndarray,
+        lows: np.ndarray,
+        closes: np.ndarray
+    ) -> pd.DataFrame:
+        """
+        Calculate all indicators for a whole universe in one vectorized pass.
+
+        Each matrix is shaped (symbols x bars), rows aligned to ``symbols`` and
+        columns ordered oldest to newest; rows with a shorter history are padded
+        with leading NaN. Results use the same formulas as
+        ``calculate_all_indicators`` and are NaN where a row lacks enough bars.
+
+        Args:
+            symbols: Row labels for the matrices
+            highs: High prices, shape (n_symbols, n_bars)
+            lows: Low prices, shape (n_symbols, n_bars)
+            closes: Closing prices, shape (n_symbols, n_bars)
+
+        Returns:
+            DataFrame indexed by symbol with one column per indicator
+        """
+        closes = np.asarray(closes, dtype=np.float64)
+        highs = np.asarray(highs, dtype=np.float64)
+        lows = np.asarray(lows, dtype=np.float64)
+        if closes.ndim != 2 or closes.shape != highs.shape or closes.shape != lows.shape:
+            raise ValueError("highs, lows and closes must be 2-D matrices of equal shape")
+        if closes.shape[0] != len(symbols):
+            raise ValueError("Row count must match the number of symbols")
+
+        n_bars = closes.shape[1]
+        row_bars = np.count_nonzero(~np.isnan(closes), axis=1)
+        nan_column = np.full(closes.shape[0], np.nan)
+        result: Dict[str, np.ndarray] = {}
+
+        def ready(values: np.ndarray, min_bars: int) -> np.ndarray:
+            return np.where(row_bars >= min_bars, values, np.nan)
+
+        # RSI: simple rolling mean of gains/losses over the last 14 deltas
+        if n_bars >= 15:
+            delta = np.diff(closes[:, -15:], axis=1)
+            gain = np.where(delta > 0, delta, 0.0).mean(axis=1)
+            loss = np.where(delta < 0, -delta, 0.0).mean(axis=1)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                result["rsi"] = ready(100 - (100 / (1 + gain / loss)), 15)
+        else:
+            result["rsi"] = nan_column
+
+        # MACD and EMAs share one recursive pass over bars, vectorized across symbols
+        ema_fast = _ema_matrix(closes, 12)
+        ema_slow = _ema_matrix(closes, 26)
+        macd_line = ema_fast - ema_slow
+        signal_line = _ema_matrix(macd_line, 9)
+        macd_ready = n_bars >= 26 + 9
+        result["macd"] = ready(macd_line[:, -1], 26 + 9) if macd_ready else nan_column
+        result["macd_signal"] = ready(signal_line[:, -1], 26 + 9) if macd_ready else nan_column
+        result["macd_histogram"] = ready(macd_line[:, -1] - signal_line[:, -1], 26 + 9) if macd_ready else nan_column
+
+        # Bollinger Bands over the last 20 closes (sample std, ddof=1)
+        if n_bars >= 20:
+            window = closes[:, -20:]
+            middle = window.mean(axis=1)
+            band = window.std(axis=1, ddof=1) * 2.0
+            result["bollinger_upper"] = middle + band
+            result["bollinger_middle"] = middle
+            result["bollinger_lower"] = middle - band
+        else:
+            result["bollinger_upper"] = result["bollinger_middle"] = result["bollinger_lower"] = nan_column
+
+        ema_ready = n_bars >= 21
+        result["ema_9"] = ready(_ema_matrix(closes, 9)[:, -1], 21) if ema_ready else nan_column
+        result["ema_21"] = ready(_ema_matrix(closes, 21)[:, -1], 21) if ema_ready else nan_column
+
+        # ATR: simple rolling mean of the last 14 true ranges
+        if n_bars >= 15:
+            prev_close = closes[:, -15:-1]
+            high = highs[:, -14:]
+            low = lows[:, -14:]
+            true_range = np.maximum.reduce([high - low, np.abs(high - prev_close), np.abs(low - prev_close)])
+            result["atr"] = true_range.mean(axis=1)
+        else:
+            result["atr"] = nan_column
+
+        result["current_price"] = closes[:, -1] if n_bars else nan_column
+
+        return pd.DataFrame(result, index=pd.Index(symbols, name="symbol"))
+
+
+def _ema_matrix(values: np.ndarray, period: int) -> np.ndarray:
+    """
+    Row-wise EMA equivalent to ``ewm(span=period, adjust=False).mean()``.
+
+    Each row is seeded at its first non-NaN value (NaN before it), so rows
+    padded with leading NaN match the EMA of their own bars; a NaN after the
+    seed carries the previous value forward.
+    """
+    alpha = 2.0 / (period + 1.0)
+    out = np.full_like(values, np.nan)
+    if values.shape[1] == 0:
+        return out
+    previous = values[:, 0].copy()
+    out[:, 0] = previous
+    for column in range(1, values.shape[1]):
+        current = values[:, column]
+        blended = alpha * current + (1.0 - alpha) * previous
+        previous = np.where(np.isnan(previous), current, np.where(np.isnan(current), previous, blended))
+        out[:, column] = previous
+    return out
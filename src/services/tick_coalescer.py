@@ -0,0 +1,112 @@
+"""
+Tick Coalescing Ingestion Stage
+
+Sits between provider WebSocket threads and MarketDataService. The socket
+thread only overwrites the latest tick per symbol in a slot table; a single
+loop-side drainer flushes all changed symbols as one batch every interval.
+"""
+
+import asyncio
+import itertools
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from loguru import logger
+
+from src.models.market_data import MarketData
+
+BatchApplyCallback = Callable[[List[MarketData]], Awaitable[None]]
+
+
+class TickCoalescer:
+    """
+    Coalesces per-instrument ticks into periodic batches.
+
+    The slot table is a plain dict written from the provider thread with
+    single-key assignments and drained with single-key pops, both of which
+    are atomic under the GIL, so no lock is shared with the socket thread.
+    A tick that lands after its symbol was popped simply waits for the
+    next flush. The received counter is an ``itertools.count`` because
+    ``next()`` on it is atomic, unlike ``+=`` on a shared integer.
+    """
+
+    def __init__(self, apply_batch: BatchApplyCallback, flush_interval_ms: int = 100):
+        self._apply_batch = apply_batch
+        self._flush_interval = max(flush_interval_ms, 1) / 1000.0
+        self._slots: Dict[str, MarketData] = {}
+        self._drain_task: Optional[asyncio.Task] = None
+        self._running = False
+
+        self._received_counter = itertools.count(1)
+        self._ticks_received = 0
+        self._stats = {
+            "ticks_applied": 0,
+            "batches_flushed": 0,
+            "flush_errors": 0,
+        }
+
+    def offer(self, market_data: MarketData) -> None:
+        """Record the latest tick for a symbol. Safe to call from any thread."""
+        self._slots[market_data.symbol] = market_data
+        self._ticks_received = next(self._received_counter)
+
+    async def start(self) -> None:
+        """Start the loop-side drainer."""
+        if self._running:
+            return
+        self._running = True
+        self._drain_task = asyncio.create_task(self._drain_loop())
+        logger.info(f"Tick coalescer started ({self._flush_interval * 1000:.0f} ms flush interval)")
+
+    async def stop(self) -> None:
+        """Stop the drainer after applying any remaining ticks."""
+        self._running = False
+        if self._drain_task and not self._drain_task.done():
+            self._drain_task.cancel()
+            try:
+                await self._drain_task
+            except asyncio.CancelledError:
+                pass
+        self._drain_task = None
+        await self.flush()
+
+    async def flush(self) -> int:
+        """Apply every pending tick as one batch and return the batch size."""
+        batch: List[MarketData] = []
+        for symbol in list(self._slots.keys()):
+            market_data = self._slots.pop(symbol, None)
+            if market_data is not None:
+                batch.append(market_data)
+
+        if not batch:
+            return 0
+
+        try:
+            await self._apply_batch(batch)
+        except Exception as e:
+            self._stats["flush_errors"] += 1
+            # Requeue for the next interval unless a newer tick already replaced it
+            for market_data in batch:
+                self._slots.setdefault(market_data.symbol, market_data)
+            logger.error(f"Failed to apply coalesced tick batch of {len(batch)} symbols, will retry: {e}")
+            return 0
+
+        self._stats["ticks_applied"] += len(batch)
+        self._stats["batches_flushed"] += 1
+        return len(batch)
+
+    async def _drain_loop(self) -> None:
+        while self._running:
+            await asyncio.sleep(self._flush_interval)
+            await self.flush()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get ticks-received vs ticks-applied counters."""
+        received = self._ticks_received
+        applied = self._stats["ticks_applied"]
+        pending = len(self._slots)
+        return {
+            **self._stats,
+            "ticks_received": received,
+            "pending_symbols": pending,
+            "ticks_coalesced": max(received - applied - pending, 0),
+        }
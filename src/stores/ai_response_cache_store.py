@@ -0,0 +1,283 @@
+"""
+AI Response Cache Store
+
+Persists AI runtime responses keyed by a digest of everything that shapes
+the answer (role, system prompt, prompt, output schema, model), so re-running
+research or a decision review on unchanged inputs is a single indexed read
+instead of a model round-trip. Entries expire on a per-role TTL, the table is
+bounded by least-recently-used eviction, and an entry is discarded when the
+market data it was generated from has changed since.
+
+An entry can also be reached through any number of aliases (e.g. a research
+packet by candidate and by symbol). Aliases live in their own table, point at
+one stored entry, do not count against the LRU bound, and disappear with the
+entry they point at.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from typing import Any, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Seconds a response stays reusable, by role; unknown roles use "default"
+DEFAULT_ROLE_TTL_SECONDS: Dict[str, float] = {
+    "research": 6 * 3600,
+    "research_packet": 6 * 3600,
+    "review": 12 * 3600,
+    "decision": 10 * 60,
+    "discovery": 2 * 3600,
+    "triage": 3600,
+    "default": 30 * 60,
+}
+
+
+def content_digest(*parts: Any) -> str:
+    """Stable sha256 over JSON-serialisable parts (dict keys sorted)."""
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def response_digest(
+    role: str,
+    system_prompt: str,
+    prompt: str,
+    output_schema: Dict[str, Any],
+    model: Optional[str],
+    options: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Cache key for one structured AI request."""
+    return content_digest(role, system_prompt, prompt, output_schema, model, options or {})
+
+
+class AIResponseCacheStore:
+    """Async SQLite-backed LRU cache of AI runtime responses."""
+
+    def __init__(
+        self,
+        db_connection,
+        *,
+        max_entries: int = 2000,
+        ttl_by_role: Optional[Dict[str, float]] = None,
+    ):
+        """Initialize store with database connection."""
+        self.db_connection = db_connection
+        self.max_entries = max(1, max_entries)
+        self.ttl_by_role = {**DEFAULT_ROLE_TTL_SECONDS, **(ttl_by_role or {})}
+        self._lock = asyncio.Lock()
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "stale": 0, "writes": 0, "evictions": 0}
+
+    async def initialize(self) -> None:
+        """Create the ai_response_cache table if it doesn't exist."""
+        async with self._lock:
+            db = self.db_connection
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS ai_response_cache (
+                    digest TEXT PRIMARY KEY,
+                    role TEXT NOT NULL,
+                    model TEXT,
+                    response_json TEXT NOT NULL,
+                    freshness_digest TEXT NOT NULL DEFAULT '',
+                    symbols TEXT NOT NULL DEFAULT '',
+                    created_at REAL NOT NULL,
+                    expires_at REAL NOT NULL,
+                    last_used_at REAL NOT NULL,
+                    hits INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            await db.execute("""
+                CREATE INDEX IF NOT EXISTS idx_ai_response_cache_lru
+                ON ai_response_cache(last_used_at)
+            """)
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS ai_response_cache_aliases (
+                    alias TEXT PRIMARY KEY,
+                    digest TEXT NOT NULL
+                )
+            """)
+            await db.execute("""
+                CREATE INDEX IF NOT EXISTS idx_ai_response_cache_aliases_digest
+                ON ai_response_cache_aliases(digest)
+            """)
+            await db.commit()
+            logger.info("AI response cache schema initialized")
+
+    def ttl_for(self, role: str) -> float:
+        return float(self.ttl_by_role.get(role, self.ttl_by_role["default"]))
+
+    async def get(self, digest: str, *, freshness: str = "") -> Optional[Dict[str, Any]]:
+        """
+        Return the cached response for ``digest``.
+
+        Expired entries, and entries generated from different market data than
+        ``freshness`` describes, are deleted and reported as a miss.
+        """
+        async with self._lock:
+            try:
+                return await self._get_entry(self.db_connection, digest, freshness)
+            except Exception as e:
+                logger.error(f"Failed to read AI response cache entry: {e}")
+                return None
+
+    async def get_alias(self, alias: str, *, freshness: str = "") -> Optional[Dict[str, Any]]:
+        """Return the cached response an alias points at; dangling aliases are a miss."""
+        async with self._lock:
+            try:
+                db = self.db_connection
+                cursor = await db.execute(
+                    "SELECT digest FROM ai_response_cache_aliases WHERE alias = ?",
+                    (alias,),
+                )
+                row = await cursor.fetchone()
+                if row is None:
+                    self._stats["misses"] += 1
+                    return None
+                return await self._get_entry(db, row[0], freshness)
+            except Exception as e:
+                logger.error(f"Failed to read AI response cache alias: {e}")
+                return None
+
+    async def _get_entry(self, db, digest: str, freshness: str) -> Optional[Dict[str, Any]]:
+        cursor = await db.execute(
+            "SELECT response_json, freshness_digest, expires_at FROM ai_response_cache WHERE digest = ?",
+            (digest,),
+        )
+        row = await cursor.fetchone()
+        now = time.time()
+        if row is None:
+            self._stats["misses"] += 1
+            return None
+        response_json, stored_freshness, expires_at = row
+        if expires_at <= now or stored_freshness != freshness:
+            self._stats["expired" if expires_at <= now else "stale"] += 1
+            self._stats["misses"] += 1
+            await db.execute("DELETE FROM ai_response_cache WHERE digest = ?", (digest,))
+            await db.execute("DELETE FROM ai_response_cache_aliases WHERE digest = ?", (digest,))
+            await db.commit()
+            return None
+        await db.execute(
+            "UPDATE ai_response_cache SET last_used_at = ?, hits = hits + 1 WHERE digest = ?",
+            (now, digest),
+        )
+        await db.commit()
+        self._stats["hits"] += 1
+        return json.loads(response_json)
+
+    @staticmethod
+    async def _prune_aliases(db) -> None:
+        """Drop aliases whose entry was evicted, invalidated or expired."""
+        await db.execute(
+            """DELETE FROM ai_response_cache_aliases
+               WHERE digest NOT IN (SELECT digest FROM ai_response_cache)"""
+        )
+
+    async def put(
+        self,
+        digest: str,
+        *,
+        role: str,
+        response: Dict[str, Any],
+        model: Optional[str] = None,
+        freshness: str = "",
+        symbols: Iterable[str] = (),
+        ttl_seconds: Optional[float] = None,
+        aliases: Iterable[str] = (),
+    ) -> bool:
+        """
+        Store a response and evict the least recently used entries beyond ``max_entries``.
+
+        ``aliases`` are (re)pointed at ``digest`` for ``get_alias``.
+        """
+        async with self._lock:
+            try:
+                db = self.db_connection
+                now = time.time()
+                symbol_list = sorted({symbol.upper() for symbol in symbols if symbol})
+                await db.execute(
+                    """INSERT OR REPLACE INTO ai_response_cache
+                       (digest, role, model, response_json, freshness_digest, symbols,
+                        created_at, expires_at, last_used_at, hits)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 0)""",
+                    (
+                        digest,
+                        role,
+                        model,
+                        json.dumps(response, default=str),
+                        freshness,
+                        f",{','.join(symbol_list)}," if symbol_list else "",
+                        now,
+                        now + (ttl_seconds if ttl_seconds is not None else self.ttl_for(role)),
+                        now,
+                    ),
+                )
+                await db.executemany(
+                    "INSERT OR REPLACE INTO ai_response_cache_aliases (alias, digest) VALUES (?, ?)",
+                    [(alias, digest) for alias in aliases],
+                )
+                cursor = await db.execute(
+                    """DELETE FROM ai_response_cache WHERE digest IN (
+                           SELECT digest FROM ai_response_cache
+                           ORDER BY last_used_at DESC, rowid DESC LIMIT -1 OFFSET ?
+                       )""",
+                    (self.max_entries,),
+                )
+                evicted = max(cursor.rowcount, 0)
+                if evicted:
+                    await self._prune_aliases(db)
+                self._stats["evictions"] += evicted
+                await db.commit()
+                self._stats["writes"] += 1
+                return True
+            except Exception as e:
+                logger.error(f"Failed to store AI response cache entry: {e}")
+                return False
+
+    async def invalidate_symbols(self, symbols: Iterable[str]) -> int:
+        """Drop every entry generated from any of ``symbols``."""
+        async with self._lock:
+            try:
+                db = self.db_connection
+                removed = 0
+                for symbol in {symbol.upper() for symbol in symbols if symbol}:
+                    cursor = await db.execute(
+                        "DELETE FROM ai_response_cache WHERE symbols LIKE ?",
+                        (f"%,{symbol},%",),
+                    )
+                    removed += max(cursor.rowcount, 0)
+                if removed:
+                    await self._prune_aliases(db)
+                await db.commit()
+                return removed
+            except Exception as e:
+                logger.error(f"Failed to invalidate AI response cache entries: {e}")
+                return 0
+
+    async def purge_expired(self) -> int:
+        """Delete every expired entry."""
+        async with self._lock:
+            try:
+                db = self.db_connection
+                cursor = await db.execute("DELETE FROM ai_response_cache WHERE expires_at <= ?", (time.time(),))
+                removed = max(cursor.rowcount, 0)
+                if removed:
+                    await self._prune_aliases(db)
+                await db.commit()
+                return removed
+            except Exception as e:
+                logger.error(f"Failed to purge expired AI response cache entries: {e}")
+                return 0
+
+    async def close(self) -> None:
+        """Close the store's database connection."""
+        async with self._lock:
+            await self.db_connection.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "max_entries": self.max_entries,
+            "hit_rate": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,232 @@
+"""
+Bar Store
+
+Persistent OHLCV bars per (symbol, interval). Each key keeps one sorted
+structured NumPy array that is memory-mapped on read, plus the inclusive
+calendar-date ranges that have already been fetched from the broker. The
+recorded coverage is what lets callers fetch only the missing dates: a
+holiday or a pre-listing range that returned no bars is still covered.
+
+Layout::
+
+    <root>/<interval>/<SYMBOL>.npy             structured bars sorted by ts
+    <root>/<interval>/<SYMBOL>.coverage.json   [[from, to], ...] inclusive dates
+"""
+
+import json
+import logging
+import os
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Kite timestamps daily bars at 00:00 IST; slicing by IST date keeps them on the right day
+IST = timezone(timedelta(hours=5, minutes=30))
+
+BAR_DTYPE = np.dtype([
+    ("ts", "<f8"),
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("volume", "<i8"),
+])
+
+DateRange = Tuple[date, date]  # inclusive
+
+
+@dataclass(frozen=True)
+class BarSeries:
+    """Column arrays for one symbol's bars, ordered by timestamp."""
+    symbol: str
+    interval: str
+    timestamps: np.ndarray  # epoch seconds, float64
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.timestamps.shape[0])
+
+    @classmethod
+    def from_array(cls, symbol: str, interval: str, bars: np.ndarray) -> "BarSeries":
+        return cls(
+            symbol=symbol,
+            interval=interval,
+            timestamps=bars["ts"],
+            open=bars["open"],
+            high=bars["high"],
+            low=bars["low"],
+            close=bars["close"],
+            volume=bars["volume"],
+        )
+
+    def to_dataframe(self):
+        """Build a DataFrame indexed by IST timestamp (no per-row objects)."""
+        import pandas as pd
+
+        return pd.DataFrame(
+            {"open": self.open, "high": self.high, "low": self.low, "close": self.close, "volume": self.volume},
+            index=pd.to_datetime(self.timestamps, unit="s", utc=True).tz_convert(IST),
+        )
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Materialize the Kite ``historical_data`` list-of-dicts shape."""
+        return [
+            {
+                "date": datetime.fromtimestamp(float(ts), tz=IST),
+                "open": float(o),
+                "high": float(h),
+                "low": float(low),
+                "close": float(c),
+                "volume": int(v),
+            }
+            for ts, o, h, low, c, v in zip(self.timestamps, self.open, self.high, self.low, self.close, self.volume)
+        ]
+
+
+def _bar_epoch(value: Any) -> float:
+    if isinstance(value, datetime):
+        parsed = value
+    elif isinstance(value, date):
+        parsed = datetime.combine(value, time.min)
+    else:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=IST)
+    return parsed.timestamp()
+
+
+def bars_from_records(records: Iterable[Dict[str, Any]]) -> np.ndarray:
+    """Convert Kite ``historical_data`` rows into a sorted structured array."""
+    rows = [
+        (
+            _bar_epoch(row["date"]),
+            float(row.get("open") or 0.0),
+            float(row.get("high") or 0.0),
+            float(row.get("low") or 0.0),
+            float(row.get("close") or 0.0),
+            int(row.get("volume") or 0),
+        )
+        for row in records
+        if row.get("date") is not None
+    ]
+    bars = np.array(rows, dtype=BAR_DTYPE)
+    return bars[np.argsort(bars["ts"], kind="stable")]
+
+
+def merge_ranges(ranges: Iterable[DateRange]) -> List[DateRange]:
+    """Union inclusive date ranges, joining ranges that touch."""
+    merged: List[DateRange] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + timedelta(days=1):
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def subtract_ranges(start: date, end: date, covered: Iterable[DateRange]) -> List[DateRange]:
+    """Sub-ranges of [start, end] not covered by ``covered`` (which must be merged)."""
+    gaps: List[DateRange] = []
+    cursor = start
+    for covered_start, covered_end in covered:
+        if covered_end < cursor:
+            continue
+        if covered_start > end:
+            break
+        if covered_start > cursor:
+            gaps.append((cursor, covered_start - timedelta(days=1)))
+        cursor = max(cursor, covered_end + timedelta(days=1))
+        if cursor > end:
+            return gaps
+    if cursor <= end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+class BarStore:
+    """Per-(symbol, interval) bar arrays with fetched-range coverage."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def _paths(self, symbol: str, interval: str) -> Tuple[Path, Path]:
+        base = self.root / interval
+        name = symbol.replace(":", "_").replace("/", "_")
+        return base / f"{name}.npy", base / f"{name}.coverage.json"
+
+    def coverage(self, symbol: str, interval: str) -> List[DateRange]:
+        _, coverage_path = self._paths(symbol, interval)
+        if not coverage_path.exists():
+            return []
+        try:
+            raw = json.loads(coverage_path.read_text())
+            return merge_ranges((date.fromisoformat(start), date.fromisoformat(end)) for start, end in raw)
+        except (OSError, ValueError, TypeError) as exc:
+            logger.warning(f"Ignoring unreadable bar coverage {coverage_path}: {exc}")
+            return []
+
+    def missing_ranges(self, symbol: str, interval: str, start: date, end: date) -> List[DateRange]:
+        """Date ranges inside [start, end] that have never been fetched."""
+        if end < start:
+            return []
+        return subtract_ranges(start, end, self.coverage(symbol, interval))
+
+    def _load(self, symbol: str, interval: str) -> np.ndarray:
+        bars_path, _ = self._paths(symbol, interval)
+        if not bars_path.exists():
+            return np.empty(0, dtype=BAR_DTYPE)
+        try:
+            bars = np.load(bars_path, mmap_mode="r")
+        except (OSError, ValueError) as exc:
+            logger.warning(f"Ignoring unreadable bar file {bars_path}: {exc}")
+            return np.empty(0, dtype=BAR_DTYPE)
+        if bars.dtype != BAR_DTYPE:
+            logger.warning(f"Ignoring bar file {bars_path} with unexpected layout {bars.dtype}")
+            return np.empty(0, dtype=BAR_DTYPE)
+        return bars
+
+    def merge(self, symbol: str, interval: str, bars: np.ndarray, covered: Iterable[DateRange]) -> int:
+        """
+        Merge freshly fetched bars and record the ranges they cover.
+
+        Fetched bars replace stored bars with the same timestamp. The bar file
+        is replaced before the coverage file, so a crash in between only
+        causes a refetch. Returns the stored bar count.
+        """
+        bars_path, coverage_path = self._paths(symbol, interval)
+        bars_path.parent.mkdir(parents=True, exist_ok=True)
+
+        existing = np.asarray(self._load(symbol, interval))
+        combined = np.concatenate([bars.astype(BAR_DTYPE, copy=False), existing])
+        # np.unique sorts by ts and indexes the first occurrence, so fresh bars win over stored ones
+        _, first = np.unique(combined["ts"], return_index=True)
+        merged = combined[first]
+
+        temp_path = bars_path.with_suffix(".tmp.npy")
+        np.save(temp_path, merged)
+        os.replace(temp_path, bars_path)
+
+        ranges = merge_ranges([*self.coverage(symbol, interval), *covered])
+        temp_coverage = coverage_path.with_suffix(".tmp")
+        temp_coverage.write_text(json.dumps([[start.isoformat(), end.isoformat()] for start, end in ranges]))
+        os.replace(temp_coverage, coverage_path)
+        return int(merged.shape[0])
+
+    def read(self, symbol: str, interval: str, start: date, end: date) -> BarSeries:
+        """Bars whose IST date falls in [start, end], as column arrays."""
+        bars = self._load(symbol, interval)
+        lower = datetime.combine(start, time.min, tzinfo=IST).timestamp()
+        upper = datetime.combine(end + timedelta(days=1), time.min, tzinfo=IST).timestamp()
+        ts = bars["ts"]
+        left, right = np.searchsorted(ts, lower, side="left"), np.searchsorted(ts, upper, side="left")
+        return BarSeries.from_array(symbol, interval, np.array(bars[left:right]))
@@ -0,0 +1,151 @@
+"""
+Open Position Index
+
+In-memory index of open paper trades keyed by symbol, maintained by
+PaperTradingStore on every create/close/stop-out/risk-level change so
+per-tick consumers (price monitor, trigger engine) never touch SQLite.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional
+
+from ..models.paper_trading import PaperTrade, TradeStatus, TradeType
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class OpenPosition:
+    """Minimal open-trade view needed for per-tick P&L and exit checks."""
+    account_id: str
+    trade_id: str
+    symbol: str
+    trade_type: TradeType
+    quantity: int
+    entry_price: float
+    stop_loss: Optional[float] = None
+    target_price: Optional[float] = None
+
+    @classmethod
+    def from_trade(cls, trade: PaperTrade) -> "OpenPosition":
+        return cls(
+            account_id=trade.account_id,
+            trade_id=trade.trade_id,
+            symbol=trade.symbol,
+            trade_type=trade.trade_type,
+            quantity=trade.quantity,
+            entry_price=trade.entry_price,
+            stop_loss=trade.stop_loss,
+            target_price=trade.target_price,
+        )
+
+    def unrealized_pnl(self, price: float) -> float:
+        if self.trade_type == TradeType.SELL:
+            return (self.entry_price - price) * self.quantity
+        return (price - self.entry_price) * self.quantity
+
+
+# Listener signature: (change, position) where change is "opened", "closed" or "levels".
+PositionListener = Callable[[str, OpenPosition], None]
+
+
+class OpenPositionIndex:
+    """symbol → {trade_id → OpenPosition}, plus a trade_id lookup."""
+
+    def __init__(self):
+        self._by_symbol: Dict[str, Dict[str, OpenPosition]] = {}
+        self._by_trade: Dict[str, OpenPosition] = {}
+        self._listeners: List[PositionListener] = []
+
+    def __len__(self) -> int:
+        return len(self._by_trade)
+
+    def add_listener(self, listener: PositionListener) -> None:
+        """Receive a callback for every index change."""
+        self._listeners.append(listener)
+
+    def _notify(self, change: str, position: OpenPosition) -> None:
+        for listener in self._listeners:
+            try:
+                listener(change, position)
+            except Exception as e:
+                logger.error(f"Open position listener failed on {change} for {position.trade_id}: {e}")
+
+    def load(self, trades: Iterable[PaperTrade]) -> None:
+        """Replace the index contents with the given open trades."""
+        for position in list(self._by_trade.values()):
+            self._remove(position.trade_id)
+        for trade in trades:
+            self.apply_trade(trade)
+
+    def apply_trade(self, trade: Optional[PaperTrade]) -> None:
+        """Insert, update or remove a trade according to its current status."""
+        if trade is None:
+            return
+        if trade.status != TradeStatus.OPEN:
+            self._remove(trade.trade_id)
+            return
+
+        existing = self._by_trade.get(trade.trade_id)
+        if existing is None:
+            position = OpenPosition.from_trade(trade)
+            self._by_trade[trade.trade_id] = position
+            self._by_symbol.setdefault(trade.symbol, {})[trade.trade_id] = position
+            self._notify("opened", position)
+            return
+
+        if (existing.stop_loss, existing.target_price) != (trade.stop_loss, trade.target_price):
+            existing.stop_loss = trade.stop_loss
+            existing.target_price = trade.target_price
+            self._notify("levels", existing)
+
+    def remove(self, trade_id: str) -> None:
+        """Drop a trade from the index."""
+        self._remove(trade_id)
+
+    def remove_account(self, account_id: str) -> None:
+        """Drop every position belonging to an account."""
+        for position in [p for p in self._by_trade.values() if p.account_id == account_id]:
+            self._remove(position.trade_id)
+
+    def _remove(self, trade_id: str) -> None:
+        position = self._by_trade.pop(trade_id, None)
+        if position is None:
+            return
+        symbol_positions = self._by_symbol.get(position.symbol)
+        if symbol_positions is not None:
+            symbol_positions.pop(trade_id, None)
+            if not symbol_positions:
+                del self._by_symbol[position.symbol]
+        self._notify("closed", position)
+
+    def get(self, trade_id: str) -> Optional[OpenPosition]:
+        return self._by_trade.get(trade_id)
+
+    def positions(self) -> List[OpenPosition]:
+        return list(self._by_trade.values())
+
+    def symbols(self) -> List[str]:
+        return list(self._by_symbol.keys())
+
+    def positions_for_symbol(self, symbol: str) -> List[OpenPosition]:
+        return list(self._by_symbol.get(symbol, {}).values())
+
+    def positions_for(self, symbol: str, account_id: str) -> List[OpenPosition]:
+        return [p for p in self._by_symbol.get(symbol, {}).values() if p.account_id == account_id]
+
+    def accounts_for_symbol(self, symbol: str) -> set:
+        return {p.account_id for p in self._by_symbol.get(symbol, {}).values()}
+
+    def diff(self, trades: Iterable[PaperTrade]) -> Dict[str, List[str]]:
+        """Compare the index with authoritative open trades from the store."""
+        expected = {trade.trade_id: OpenPosition.from_trade(trade) for trade in trades}
+        missing = sorted(set(expected) - set(self._by_trade))
+        stale = sorted(set(self._by_trade) - set(expected))
+        mismatched = sorted(
+            trade_id
+            for trade_id in set(expected) & set(self._by_trade)
+            if expected[trade_id] != self._by_trade[trade_id]
+        )
+        return {"missing": missing, "stale": stale, "mismatched": mismatched}
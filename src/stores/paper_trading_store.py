@@ -4,8 +4,9 @@ import logging
 import asyncio
 import json
 import uuid
+from contextlib import asynccontextmanager, nullcontext
 from datetime import datetime, timedelta, timezone
-from typing import Optional, List, Dict, Any, Tuple
+from typing import Optional, List, Dict, Any, Tuple, AsyncIterator
 import aiosqlite
 
 from ..models.paper_trading import (
@@ -17,6 +18,7 @@ from ..models.paper_trading import (
     AccountType,
     RiskLevel,
 )
+from .open_position_index import OpenPositionIndex
 
 logger = logging.getLogger(__name__)
 
@@ -44,10 +46,113 @@ class PaperTradingStore:
         TradeStatus.CANCELLED.value,
     }
 
-    def __init__(self, db_connection):
-        """Initialize store with database connection."""
+    # Realized P&L of a closed row; legacy rows without a persisted value fall back to prices
+    _REALIZED_PNL_SQL = """
+        COALESCE(realized_pnl, CASE
+            WHEN exit_price IS NULL THEN 0.0
+            WHEN trade_type = 'buy' THEN (exit_price - entry_price) * quantity
+            ELSE (entry_price - exit_price) * quantity
+        END)
+    """
+    # One paper_trade_aggregates row per (account, exit day, strategy tag) for the closed
+    # trades matching {where}; bound parameters are (updated_at, *where parameters)
+    _AGGREGATE_SELECT_SQL = """
+        SELECT account_id, trade_date, strategy_tag,
+               COUNT(*), SUM(pnl > 0), SUM(pnl < 0), SUM(pnl),
+               SUM(MAX(pnl, 0)), SUM(MAX(-pnl, 0)), MAX(pnl), MIN(pnl), SUM(hold_days), ?
+        FROM (
+            SELECT account_id,
+                   substr(exit_timestamp, 1, 10) AS trade_date,
+                   COALESCE(NULLIF(strategy_rationale, ''), 'unclassified') AS strategy_tag,
+                   {realized_pnl} AS pnl,
+                   COALESCE(MAX(1, CAST(julianday(exit_timestamp) - julianday(entry_timestamp) AS INTEGER)), 0)
+                       AS hold_days
+            FROM paper_trades
+            WHERE status IN ('closed', 'stopped_out') AND exit_timestamp IS NOT NULL AND {where}
+        )
+        GROUP BY account_id, trade_date, strategy_tag
+    """
+    _AGGREGATE_COLUMNS = """
+        account_id, trade_date, strategy_tag, closed_trades, winning_trades, losing_trades,
+        realized_pnl, gross_profit, gross_loss, best_trade, worst_trade, hold_days_total, updated_at
+    """
+
+    def __init__(self, db_connection, pool=None):
+        """
+        Initialize store with database connection.
+
+        Args:
+            db_connection: Connection used for schema setup and all writes
+            pool: Optional SQLiteConnectionPool over the same database; read-only
+                dashboard queries then run on pooled readers instead of waiting
+                on this store's lock and connection
+        """
         self.db_connection = db_connection
+        self.pool = pool
         self._lock = asyncio.Lock()
+        # Task holding the lock inside unit_of_work(); tasks it spawns are not owners
+        self._owner: Optional[asyncio.Task] = None
+        # Open trades by symbol, kept in step with every trade mutation below
+        self.open_positions = OpenPositionIndex()
+
+    @asynccontextmanager
+    async def unit_of_work(self) -> AsyncIterator["PaperTradingStore"]:
+        """
+        Run several store mutations as one transaction with a single commit.
+
+        Holds the store lock for the whole block; store methods called from
+        the same task inside it skip their own lock and commit. Everything is
+        rolled back if the block raises. Nested calls from the same task join
+        the outer unit; other tasks, including ones spawned inside the block,
+        wait for the lock and are not part of the transaction.
+
+        Example:
+            async with store.unit_of_work():
+                await store.close_trade(trade_id, exit_price, realized_pnl)
+                await store.update_account_balance(account_id, balance, buying_power)
+        """
+        if self._in_unit_of_work():
+            yield self
+            return
+        async with self._lock:
+            self._owner = asyncio.current_task()
+            try:
+                yield self
+                await self.db_connection.commit()
+            except BaseException:
+                await self.db_connection.rollback()
+                # The index followed the rolled-back writes; resync it with the database
+                self.open_positions.load(await self._get_all_open_trades_unlocked())
+                raise
+            finally:
+                self._owner = None
+
+    def _in_unit_of_work(self) -> bool:
+        """Whether the current task is the one holding the lock in unit_of_work()."""
+        return self._owner is not None and self._owner is asyncio.current_task()
+
+    def _locked(self):
+        """The store lock, unless this task already holds it via unit_of_work()."""
+        return nullcontext() if self._in_unit_of_work() else self._lock
+
+    async def _commit(self) -> None:
+        """Commit now, or leave it to the enclosing unit_of_work()."""
+        if not self._in_unit_of_work():
+            await self.db_connection.commit()
+
+    @asynccontextmanager
+    async def _reader(self, locked: bool = False) -> AsyncIterator[aiosqlite.Connection]:
+        """Connection for a read-only query: a pooled reader, else the store connection."""
+        if self.pool is not None and not self._in_unit_of_work():
+            async with self.pool.read("paper_trading") as reader:
+                yield reader
+        elif locked:
+            async with self._locked():
+                self.db_connection.row_factory = aiosqlite.Row
+                yield self.db_connection
+        else:
+            self.db_connection.row_factory = aiosqlite.Row
+            yield self.db_connection
 
     async def initialize(self) -> None:
         """Initialize the store."""
@@ -55,7 +160,7 @@ class PaperTradingStore:
 
     async def initialize_schema(self) -> None:
         """Initialize database schema if it doesn't exist, with migrations for legacy schemas."""
-        async with self._lock:
+        async with self._locked():
             # Use the database connection from state manager (direct connection, not pool)
             db = self.db_connection
 
@@ -180,6 +285,26 @@ class PaperTradingStore:
                 )
             """)
 
+            # Closed-trade totals per account, exit day and strategy tag, kept in step by the close paths
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS paper_trade_aggregates (
+                    account_id TEXT NOT NULL,
+                    trade_date TEXT NOT NULL,
+                    strategy_tag TEXT NOT NULL,
+                    closed_trades INTEGER NOT NULL DEFAULT 0,
+                    winning_trades INTEGER NOT NULL DEFAULT 0,
+                    losing_trades INTEGER NOT NULL DEFAULT 0,
+                    realized_pnl REAL NOT NULL DEFAULT 0,
+                    gross_profit REAL NOT NULL DEFAULT 0,
+                    gross_loss REAL NOT NULL DEFAULT 0,
+                    best_trade REAL,
+                    worst_trade REAL,
+                    hold_days_total INTEGER NOT NULL DEFAULT 0,
+                    updated_at TEXT NOT NULL,
+                    PRIMARY KEY (account_id, trade_date, strategy_tag)
+                )
+            """)
+
             # Check and migrate legacy schemas
             await self._migrate_legacy_schema(db)
             await self._normalize_trade_statuses(db)
@@ -187,10 +312,14 @@ class PaperTradingStore:
 
             # Create indexes (these will only succeed if columns exist)
             await self._create_indexes_safely(db)
+            await self._backfill_performance_aggregates(db)
 
             await db.commit()
             logger.info("Paper trading schema initialized and migrated in database")
 
+            self.open_positions.load(await self._get_all_open_trades_unlocked())
+            logger.info(f"Loaded {len(self.open_positions)} open paper trades into the position index")
+
     async def _migrate_legacy_schema(self, db) -> None:
         """Migrate legacy database schemas to current format."""
         try:
@@ -429,7 +558,12 @@ class PaperTradingStore:
         await db.execute("DROP TABLE paper_trades_legacy_backup")
 
     async def _normalize_trade_statuses(self, db) -> None:
-        """Canonicalize legacy trade statuses to lowercase enum values."""
+        """
+        Canonicalize legacy trade statuses to lowercase enum values.
+
+        Status filters compare the column directly so they can use the
+        (account_id, status, ...) indexes; this keeps stored values canonical.
+        """
         try:
             cursor = await db.execute("SELECT DISTINCT status FROM paper_trades")
             statuses = await cursor.fetchall()
@@ -439,11 +573,11 @@ class PaperTradingStore:
             return
 
         for row in statuses:
-            raw_status = str((row or [""])[0] or "").strip()
-            if not raw_status:
+            raw_status = (row or [None])[0]
+            if raw_status is None:
                 continue
-            canonical = raw_status.lower()
-            if raw_status == canonical:
+            canonical = str(raw_status).strip().lower()
+            if not canonical or raw_status == canonical:
                 continue
             logger.info("Normalizing legacy paper trade status %s -> %s", raw_status, canonical)
             await db.execute(
@@ -464,7 +598,7 @@ class PaperTradingStore:
                 + ", ".join(missing_columns)
             )
 
-        cursor = await db.execute("SELECT DISTINCT LOWER(status) FROM paper_trades")
+        cursor = await db.execute("SELECT DISTINCT status FROM paper_trades")
         statuses = {str((row or [""])[0] or "").strip() for row in await cursor.fetchall()}
         await cursor.close()
         unexpected = sorted(status for status in statuses if status and status not in self.VALID_TRADE_STATUSES)
@@ -477,13 +611,28 @@ class PaperTradingStore:
     async def _create_indexes_safely(self, db) -> None:
         """Create indexes safely, handling cases where columns might not exist."""
         try:
-            # Create account_id index (will fail gracefully if column doesn't exist)
+            # Open-position and entry-window lookups: account_id = ? AND status = ? ORDER BY entry_timestamp
+            await db.execute("""
+                CREATE INDEX IF NOT EXISTS idx_trades_account_status_entry
+                ON paper_trades(account_id, status, entry_timestamp)
+            """)
+        except Exception as e:
+            logger.warning(f"Failed to create account/status/entry index (column may not exist): {e}")
+
+        try:
+            # Closed-trade and P&L lookups; realized_pnl is included so the daily SUM never touches the table
             await db.execute("""
-                CREATE INDEX IF NOT EXISTS idx_trades_account_id
-                ON paper_trades(account_id)
+                CREATE INDEX IF NOT EXISTS idx_trades_account_status_exit
+                ON paper_trades(account_id, status, exit_timestamp, realized_pnl)
             """)
         except Exception as e:
-            logger.warning(f"Failed to create account_id index (column may not exist): {e}")
+            logger.warning(f"Failed to create account/status/exit index (column may not exist): {e}")
+
+        try:
+            # Superseded by the composite indexes above, which share its account_id prefix
+            await db.execute("DROP INDEX IF EXISTS idx_trades_account_id")
+        except Exception as e:
+            logger.warning(f"Failed to drop superseded account_id index: {e}")
 
         try:
             # Create symbol index
@@ -518,6 +667,175 @@ class PaperTradingStore:
         except Exception as e:
             logger.warning(f"Failed to create automation run active index: {e}")
 
+    async def _backfill_performance_aggregates(self, db) -> None:
+        """Populate paper_trade_aggregates on first start after the table was added."""
+        cursor = await db.execute("SELECT 1 FROM paper_trade_aggregates LIMIT 1")
+        has_aggregates = await cursor.fetchone()
+        await cursor.close()
+        if has_aggregates:
+            return
+        buckets = await self._rebuild_performance_aggregates_unlocked(db, None)
+        if buckets:
+            logger.info("Backfilled %s paper trade aggregate rows from trade history", buckets)
+
+    async def _rebuild_performance_aggregates_unlocked(self, db, account_id: Optional[str]) -> int:
+        """Recompute aggregates from paper_trades for one account (or all); returns rows written."""
+        now = datetime.now(timezone.utc).isoformat()
+        if account_id:
+            await db.execute("DELETE FROM paper_trade_aggregates WHERE account_id = ?", (account_id,))
+            where, params = "account_id = ?", (now, account_id)
+        else:
+            await db.execute("DELETE FROM paper_trade_aggregates")
+            where, params = "1", (now,)
+        cursor = await db.execute(
+            f"INSERT INTO paper_trade_aggregates ({self._AGGREGATE_COLUMNS}) "
+            + self._AGGREGATE_SELECT_SQL.format(realized_pnl=self._REALIZED_PNL_SQL, where=where),
+            params,
+        )
+        written = cursor.rowcount
+        await cursor.close()
+        return written
+
+    async def rebuild_performance_aggregates(self, account_id: Optional[str] = None) -> int:
+        """
+        Recompute paper_trade_aggregates from the trade history.
+
+        Used for backfill and to repair drift after trades were edited outside
+        the store. Returns the number of aggregate rows written.
+        """
+        async with self.unit_of_work():
+            written = await self._rebuild_performance_aggregates_unlocked(self.db_connection, account_id)
+        logger.info("Rebuilt %s paper trade aggregate rows (account=%s)", written, account_id or "all")
+        return written
+
+    async def _apply_closes_to_aggregates(self, trade_ids: List[str]) -> None:
+        """Fold trades that just moved from open to closed into their aggregate rows."""
+        now = datetime.now(timezone.utc).isoformat()
+        await self.db_connection.executemany(
+            f"INSERT INTO paper_trade_aggregates ({self._AGGREGATE_COLUMNS}) "
+            + self._AGGREGATE_SELECT_SQL.format(realized_pnl=self._REALIZED_PNL_SQL, where="trade_id = ?")
+            + """
+            ON CONFLICT(account_id, trade_date, strategy_tag) DO UPDATE SET
+                closed_trades = closed_trades + excluded.closed_trades,
+                winning_trades = winning_trades + excluded.winning_trades,
+                losing_trades = losing_trades + excluded.losing_trades,
+                realized_pnl = realized_pnl + excluded.realized_pnl,
+                gross_profit = gross_profit + excluded.gross_profit,
+                gross_loss = gross_loss + excluded.gross_loss,
+                best_trade = MAX(COALESCE(best_trade, excluded.best_trade), excluded.best_trade),
+                worst_trade = MIN(COALESCE(worst_trade, excluded.worst_trade), excluded.worst_trade),
+                hold_days_total = hold_days_total + excluded.hold_days_total,
+                updated_at = excluded.updated_at
+            """,
+            [(now, trade_id) for trade_id in dict.fromkeys(trade_ids)],
+        )
+
+    async def _refresh_aggregate_bucket(self, trade: PaperTrade) -> None:
+        """Recompute the single aggregate row a closed trade belongs to."""
+        if not trade.exit_timestamp:
+            return
+        trade_date = str(trade.exit_timestamp)[:10]
+        strategy_tag = trade.strategy_rationale or "unclassified"
+        start_ts, end_ts = self._get_period_bounds(trade_date)
+        await self.db_connection.execute(
+            "DELETE FROM paper_trade_aggregates WHERE account_id = ? AND trade_date = ? AND strategy_tag = ?",
+            (trade.account_id, trade_date, strategy_tag),
+        )
+        where = (
+            "account_id = ? AND exit_timestamp >= ? AND exit_timestamp < ? "
+            "AND COALESCE(NULLIF(strategy_rationale, ''), 'unclassified') = ?"
+        )
+        await self.db_connection.execute(
+            f"INSERT INTO paper_trade_aggregates ({self._AGGREGATE_COLUMNS}) "
+            + self._AGGREGATE_SELECT_SQL.format(realized_pnl=self._REALIZED_PNL_SQL, where=where),
+            (datetime.now(timezone.utc).isoformat(), trade.account_id, start_ts, end_ts, strategy_tag),
+        )
+
+    async def _record_close(self, previous: Optional[PaperTrade], trade: Optional[PaperTrade]) -> None:
+        """Keep aggregates in step with one close_trade/mark_stopped_out update."""
+        if trade is None:
+            return
+        if previous is None or previous.status == TradeStatus.OPEN:
+            await self._apply_closes_to_aggregates([trade.trade_id])
+            return
+        # Re-closing an already closed trade can move it between buckets; recount both
+        await self._refresh_aggregate_bucket(previous)
+        await self._refresh_aggregate_bucket(trade)
+
+    async def get_performance_aggregates(
+        self,
+        account_id: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Closed-trade totals for an account from paper_trade_aggregates.
+
+        Args:
+            account_id: Account to summarize
+            start_date: Inclusive YYYY-MM-DD lower bound on exit day (None for all history)
+            end_date: Exclusive YYYY-MM-DD upper bound on exit day
+
+        Returns:
+            {"totals": {...}, "strategies": {tag: {...}}} with closed/winning/losing
+            counts, realized_pnl, gross_profit, gross_loss, best_trade, worst_trade,
+            hold_days_total and first/last exit day
+        """
+        query = """
+            SELECT strategy_tag,
+                   SUM(closed_trades) AS closed_trades,
+                   SUM(winning_trades) AS winning_trades,
+                   SUM(losing_trades) AS losing_trades,
+                   SUM(realized_pnl) AS realized_pnl,
+                   SUM(gross_profit) AS gross_profit,
+                   SUM(gross_loss) AS gross_loss,
+                   MAX(best_trade) AS best_trade,
+                   MIN(worst_trade) AS worst_trade,
+                   SUM(hold_days_total) AS hold_days_total,
+                   MIN(trade_date) AS first_trade_date,
+                   MAX(trade_date) AS last_trade_date
+            FROM paper_trade_aggregates
+            WHERE account_id = ?
+        """
+        params: List[Any] = [account_id]
+        if start_date:
+            query += " AND trade_date >= ?"
+            params.append(start_date)
+        if end_date:
+            query += " AND trade_date < ?"
+            params.append(end_date)
+        query += " GROUP BY strategy_tag"
+
+        async with self._reader() as db:
+            cursor = await db.execute(query, params)
+            rows = await cursor.fetchall()
+            await cursor.close()
+
+        strategies = {row["strategy_tag"]: dict(row) for row in rows}
+        totals: Dict[str, Any] = {
+            "closed_trades": 0,
+            "winning_trades": 0,
+            "losing_trades": 0,
+            "realized_pnl": 0.0,
+            "gross_profit": 0.0,
+            "gross_loss": 0.0,
+            "best_trade": None,
+            "worst_trade": None,
+            "hold_days_total": 0,
+            "first_trade_date": None,
+            "last_trade_date": None,
+        }
+        for metrics in strategies.values():
+            metrics.pop("strategy_tag")
+            for key in ("closed_trades", "winning_trades", "losing_trades", "realized_pnl",
+                        "gross_profit", "gross_loss", "hold_days_total"):
+                totals[key] += metrics[key] or 0
+            for key, pick in (("best_trade", max), ("worst_trade", min),
+                              ("first_trade_date", min), ("last_trade_date", max)):
+                if metrics[key] is not None:
+                    totals[key] = metrics[key] if totals[key] is None else pick(totals[key], metrics[key])
+        return {"totals": totals, "strategies": strategies}
+
     async def create_account(
         self,
         account_name: str,
@@ -529,7 +847,7 @@ class PaperTradingStore:
         account_id: Optional[str] = None
     ) -> PaperTradingAccount:
         """Create new paper trading account."""
-        async with self._lock:
+        async with self._locked():
             if not account_id:
                 account_id = f"paper_{strategy_type.value}_{uuid.uuid4().hex[:8]}"
             now = datetime.now(timezone.utc).isoformat()
@@ -551,7 +869,7 @@ class PaperTradingStore:
             )
             await cursor.close()
             await self._ensure_account_policy_unlocked(account_id)
-            await self.db_connection.commit()
+            await self._commit()
 
             logger.info(f"Created paper trading account: {account_id}")
             return await self._get_account_unlocked(account_id)
@@ -571,8 +889,18 @@ class PaperTradingStore:
 
     async def get_account(self, account_id: str) -> Optional[PaperTradingAccount]:
         """Get account by ID."""
-        async with self._lock:
-            return await self._get_account_unlocked(account_id)
+        async with self._reader(locked=True) as db:
+            return await self._fetch_account(db, account_id)
+
+    @staticmethod
+    async def _fetch_account(db: aiosqlite.Connection, account_id: str) -> Optional[PaperTradingAccount]:
+        cursor = await db.execute(
+            "SELECT * FROM paper_trading_accounts WHERE account_id = ?",
+            (account_id,)
+        )
+        row = await cursor.fetchone()
+        await cursor.close()
+        return PaperTradingAccount.from_dict(dict(row)) if row else None
 
     async def _ensure_account_policy_unlocked(self, account_id: str) -> Optional[PaperTradingAccountPolicy]:
         """Create a default policy row for an account when missing."""
@@ -642,16 +970,16 @@ class PaperTradingStore:
 
     async def get_account_policy(self, account_id: str) -> Optional[PaperTradingAccountPolicy]:
         """Return merged account policy from policy storage and account risk fields."""
-        async with self._lock:
+        async with self._locked():
             policy = await self._ensure_account_policy_unlocked(account_id)
             if policy is None:
                 return None
-            await self.db_connection.commit()
+            await self._commit()
             return policy
 
     async def update_account_policy(self, account_id: str, policy_data: Dict[str, Any]) -> Optional[PaperTradingAccountPolicy]:
         """Update merged account policy and account-level risk fields."""
-        async with self._lock:
+        async with self._locked():
             account = await self._get_account_unlocked(account_id)
             if account is None:
                 return None
@@ -736,19 +1064,18 @@ class PaperTradingStore:
                 ),
             )
 
-            await self.db_connection.commit()
+            await self._commit()
             return await self._ensure_account_policy_unlocked(account_id)
 
     async def get_all_accounts(self) -> List[PaperTradingAccount]:
         """Get all paper trading accounts."""
-        async with self._lock:
-            self.db_connection.row_factory = aiosqlite.Row
-            cursor = await self.db_connection.execute(
+        async with self._reader(locked=True) as db:
+            cursor = await db.execute(
                 "SELECT * FROM paper_trading_accounts ORDER BY created_at DESC"
             )
             rows = await cursor.fetchall()
             await cursor.close()
-            return [PaperTradingAccount.from_dict(dict(row)) for row in rows]
+        return [PaperTradingAccount.from_dict(dict(row)) for row in rows]
 
     async def delete_account(self, account_id: str) -> bool:
         """
@@ -760,7 +1087,7 @@ class PaperTradingStore:
         Returns:
             True if account was deleted, False if not found
         """
-        async with self._lock:
+        async with self._locked():
             # First check if account exists
             self.db_connection.row_factory = aiosqlite.Row
             cursor = await self.db_connection.execute(
@@ -782,13 +1109,13 @@ class PaperTradingStore:
                 "DELETE FROM paper_trading_account_policy WHERE account_id = ?",
                 (account_id,),
             )
-            await self.db_connection.commit()
+            await self._commit()
             logger.info(f"Deleted paper trading account: {account_id}")
             return True
 
     async def update_account_balance(self, account_id: str, new_balance: float, buying_power: float) -> None:
         """Update account balance and buying power."""
-        async with self._lock:
+        async with self._locked():
             now = datetime.now(timezone.utc).isoformat()
             cursor = await self.db_connection.execute(
                 """
@@ -799,7 +1126,7 @@ class PaperTradingStore:
                 (new_balance, buying_power, now, account_id)
             )
             await cursor.close()
-            await self.db_connection.commit()
+            await self._commit()
 
     async def create_trade(
         self,
@@ -814,7 +1141,7 @@ class PaperTradingStore:
         target_price: Optional[float] = None
     ) -> PaperTrade:
         """Create new trade record."""
-        async with self._lock:
+        async with self._locked():
             trade_id = f"trade_{uuid.uuid4().hex[:16]}"
             now = datetime.now(timezone.utc).isoformat()
 
@@ -833,10 +1160,12 @@ class PaperTradingStore:
                 )
             )
             await cursor.close()
-            await self.db_connection.commit()
+            await self._commit()
 
             logger.info(f"Created trade: {trade_id} ({symbol} {quantity}@{entry_price})")
-            return await self._get_trade_unlocked(trade_id)
+            trade = await self._get_trade_unlocked(trade_id)
+            self.open_positions.apply_trade(trade)
+            return trade
 
     async def _get_trade_unlocked(self, trade_id: str) -> Optional[PaperTrade]:
         """Get trade by ID (assumes lock is already held)."""
@@ -853,20 +1182,50 @@ class PaperTradingStore:
 
     async def get_trade(self, trade_id: str) -> Optional[PaperTrade]:
         """Get trade by ID."""
-        async with self._lock:
+        async with self._locked():
             return await self._get_trade_unlocked(trade_id)
 
-    async def get_open_trades(self, account_id: str) -> List[PaperTrade]:
-        """Get all open trades for account."""
+    async def _get_all_open_trades_unlocked(self) -> List[PaperTrade]:
+        """Get open trades across all accounts (assumes lock is already held)."""
         self.db_connection.row_factory = aiosqlite.Row
         cursor = await self.db_connection.execute(
-            "SELECT * FROM paper_trades WHERE account_id = ? AND LOWER(status) = ?",
-            (account_id, TradeStatus.OPEN.value)
+            "SELECT * FROM paper_trades WHERE status = ?",
+            (TradeStatus.OPEN.value,)
         )
         rows = await cursor.fetchall()
         await cursor.close()
         return [PaperTrade.from_dict(self._normalize_trade_row(dict(row))) for row in rows]
 
+    async def verify_open_position_index(self, repair: bool = True) -> Dict[str, List[str]]:
+        """
+        Compare the in-memory open-position index with the database.
+
+        Args:
+            repair: Reload the index from the database when it has drifted
+
+        Returns:
+            Trade IDs that are missing from, stale in, or mismatched with the index
+        """
+        async with self._locked():
+            open_trades = await self._get_all_open_trades_unlocked()
+            drift = self.open_positions.diff(open_trades)
+            if any(drift.values()):
+                logger.warning(f"Open position index drifted from database: {drift}")
+                if repair:
+                    self.open_positions.load(open_trades)
+            return drift
+
+    async def get_open_trades(self, account_id: str) -> List[PaperTrade]:
+        """Get all open trades for account."""
+        async with self._reader() as db:
+            cursor = await db.execute(
+                "SELECT * FROM paper_trades WHERE account_id = ? AND status = ?",
+                (account_id, TradeStatus.OPEN.value)
+            )
+            rows = await cursor.fetchall()
+            await cursor.close()
+        return [PaperTrade.from_dict(self._normalize_trade_row(dict(row))) for row in rows]
+
     async def update_trade_risk_levels(
         self,
         account_id: str,
@@ -875,7 +1234,7 @@ class PaperTradingStore:
         target_price: Optional[float] = None,
     ) -> Optional[PaperTrade]:
         """Update stop-loss and target-price values for an open trade."""
-        async with self._lock:
+        async with self._locked():
             existing_trade = await self._get_trade_unlocked(trade_id)
             if existing_trade is None or existing_trade.account_id != account_id:
                 return None
@@ -890,7 +1249,7 @@ class PaperTradingStore:
                 SET stop_loss = COALESCE(?, stop_loss),
                     target_price = COALESCE(?, target_price),
                     updated_at = ?
-                WHERE trade_id = ? AND account_id = ? AND LOWER(status) = ?
+                WHERE trade_id = ? AND account_id = ? AND status = ?
                 """,
                 (
                     stop_loss,
@@ -902,8 +1261,10 @@ class PaperTradingStore:
                 ),
             )
             await cursor.close()
-            await self.db_connection.commit()
-            return await self._get_trade_unlocked(trade_id)
+            await self._commit()
+            trade = await self._get_trade_unlocked(trade_id)
+            self.open_positions.apply_trade(trade)
+            return trade
 
     def _normalize_trade_row(self, row: dict) -> dict:
         """Map both current and legacy DB column names to the PaperTrade model."""
@@ -968,7 +1329,7 @@ class PaperTradingStore:
         reason: str = "Manual exit"
     ) -> Optional[PaperTrade]:
         """Close a trade."""
-        async with self._lock:
+        async with self.unit_of_work():
             now = datetime.now(timezone.utc).isoformat()
             existing_trade = await self._get_trade_unlocked(trade_id)
             realized_pnl_pct = 0.0
@@ -986,13 +1347,15 @@ class PaperTradingStore:
                 (exit_price, now, realized_pnl, realized_pnl_pct, TradeStatus.CLOSED.value, now, trade_id)
             )
             await cursor.close()
-            await self.db_connection.commit()
 
-            return await self._get_trade_unlocked(trade_id)
+            trade = await self._get_trade_unlocked(trade_id)
+            await self._record_close(existing_trade, trade)
+            self.open_positions.apply_trade(trade)
+            return trade
 
     async def mark_stopped_out(self, trade_id: str, exit_price: float, realized_pnl: float) -> Optional[PaperTrade]:
         """Mark trade as stopped out."""
-        async with self._lock:
+        async with self.unit_of_work():
             now = datetime.now(timezone.utc).isoformat()
             existing_trade = await self._get_trade_unlocked(trade_id)
             realized_pnl_pct = 0.0
@@ -1010,25 +1373,115 @@ class PaperTradingStore:
                 (exit_price, now, realized_pnl, realized_pnl_pct, TradeStatus.STOPPED_OUT.value, now, trade_id)
             )
             await cursor.close()
-            await self.db_connection.commit()
 
-            return await self._get_trade_unlocked(trade_id)
+            trade = await self._get_trade_unlocked(trade_id)
+            await self._record_close(existing_trade, trade)
+            self.open_positions.apply_trade(trade)
+            return trade
 
-    async def get_monthly_trades(self, account_id: str, year: int, month: int) -> List[PaperTrade]:
-        """Get all trades for a specific month."""
-        start_date, end_date = self._get_month_bounds(year, month)
+    async def record_exits(self, exits: List[Tuple[str, float, float, TradeStatus]]) -> List[PaperTrade]:
+        """
+        Close several open trades and settle their accounts in one transaction.
 
-        self.db_connection.row_factory = aiosqlite.Row
-        cursor = await self.db_connection.execute(
+        Args:
+            exits: (trade_id, exit_price, realized_pnl, status) per trade, where
+                status is CLOSED or STOPPED_OUT
+
+        Returns:
+            Trades that were still open and are now closed
+        """
+        if not exits:
+            return []
+
+        async with self.unit_of_work():
+            now = datetime.now(timezone.utc).isoformat()
+            trade_ids = [trade_id for trade_id, _, _, _ in exits]
+            placeholders = ",".join("?" * len(trade_ids))
+            cursor = await self.db_connection.execute(
+                f"SELECT trade_id, entry_price, quantity FROM paper_trades "
+                f"WHERE trade_id IN ({placeholders}) AND status = ?",
+                (*trade_ids, TradeStatus.OPEN.value)
+            )
+            cost_basis = {row[0]: (row[1] or 0.0) * (row[2] or 0) for row in await cursor.fetchall()}
+            await cursor.close()
+
+            rows = [
+                (
+                    exit_price, now, realized_pnl,
+                    (realized_pnl / cost_basis[trade_id]) * 100 if cost_basis[trade_id] else 0.0,
+                    status.value, now, trade_id, TradeStatus.OPEN.value,
+                )
+                for trade_id, exit_price, realized_pnl, status in exits
+                if trade_id in cost_basis
+            ]
+            if not rows:
+                return []
+
+            await self.db_connection.executemany(
+                """
+                UPDATE paper_trades
+                SET exit_price = ?, exit_timestamp = ?, realized_pnl = ?, realized_pnl_pct = ?,
+                    status = ?, updated_at = ?
+                WHERE trade_id = ? AND status = ?
+                """,
+                rows
+            )
+            closed_ids = [row[6] for row in rows]
+            await self._apply_closes_to_aggregates(closed_ids)
+
+            self.db_connection.row_factory = aiosqlite.Row
+            cursor = await self.db_connection.execute(
+                f"SELECT * FROM paper_trades WHERE trade_id IN ({','.join('?' * len(closed_ids))})",
+                closed_ids
+            )
+            closed = [PaperTrade.from_dict(self._normalize_trade_row(dict(row))) for row in await cursor.fetchall()]
+            await cursor.close()
+            await self._settle_closes(closed, now)
+            for trade in closed:
+                self.open_positions.apply_trade(trade)
+            return closed
+
+    async def _settle_closes(self, closed: List[PaperTrade], now: str) -> None:
+        """
+        Release the buying power locked by closed trades and credit their P&L.
+
+        Same settlement as PaperTradeExecutor.close_position: the entry value is
+        unlocked, and a profitable long also adds its realized P&L to balance
+        and buying power.
+        """
+        deltas: Dict[str, List[float]] = {}
+        for trade in closed:
+            delta = deltas.setdefault(trade.account_id, [0.0, 0.0])  # [balance, buying power]
+            delta[1] += trade.entry_price * trade.quantity
+            realized_pnl = trade.realized_pnl or 0.0
+            if trade.trade_type == TradeType.BUY and realized_pnl > 0:
+                delta[0] += realized_pnl
+                delta[1] += realized_pnl
+
+        await self.db_connection.executemany(
             """
-            SELECT * FROM paper_trades
-            WHERE account_id = ? AND entry_timestamp >= ? AND entry_timestamp < ?
-            ORDER BY entry_timestamp DESC
+            UPDATE paper_trading_accounts
+            SET current_balance = current_balance + ?, buying_power = buying_power + ?, updated_at = ?
+            WHERE account_id = ?
             """,
-            (account_id, start_date, end_date)
+            [(balance, buying_power, now, account_id) for account_id, (balance, buying_power) in deltas.items()]
         )
-        rows = await cursor.fetchall()
-        await cursor.close()
+
+    async def get_monthly_trades(self, account_id: str, year: int, month: int) -> List[PaperTrade]:
+        """Get all trades for a specific month."""
+        start_date, end_date = self._get_month_bounds(year, month)
+
+        async with self._reader() as db:
+            cursor = await db.execute(
+                """
+                SELECT * FROM paper_trades
+                WHERE account_id = ? AND entry_timestamp >= ? AND entry_timestamp < ?
+                ORDER BY entry_timestamp DESC
+                """,
+                (account_id, start_date, end_date)
+            )
+            rows = await cursor.fetchall()
+            await cursor.close()
         return [PaperTrade.from_dict(self._normalize_trade_row(dict(row))) for row in rows]
 
     async def calculate_account_pnl(self, account_id: str, current_prices: Dict[str, float]) -> tuple[float, float]:
@@ -1054,17 +1507,17 @@ class PaperTradingStore:
         # Get realized PnL from closed trades
         realized_pnl = 0.0
         today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-        self.db_connection.row_factory = aiosqlite.Row
-        cursor = await self.db_connection.execute(
-            """
-            SELECT COALESCE(SUM(realized_pnl), 0) as total
-            FROM paper_trades
-            WHERE account_id = ? AND LOWER(status) IN (?, ?) AND exit_timestamp >= ?
-            """,
-            (account_id, TradeStatus.CLOSED.value, TradeStatus.STOPPED_OUT.value, today)
-        )
-        row = await cursor.fetchone()
-        await cursor.close()
+        async with self._reader() as db:
+            cursor = await db.execute(
+                """
+                SELECT COALESCE(SUM(realized_pnl), 0) as total
+                FROM paper_trades
+                WHERE account_id = ? AND status IN (?, ?) AND exit_timestamp >= ?
+                """,
+                (account_id, TradeStatus.CLOSED.value, TradeStatus.STOPPED_OUT.value, today)
+            )
+            row = await cursor.fetchone()
+            await cursor.close()
         if row:
             realized_pnl = row['total']
 
@@ -1093,14 +1546,14 @@ class PaperTradingStore:
             (account.initial_balance, account.initial_balance, today, now, account_id)
         )
         await cursor.close()
-        await self.db_connection.commit()
+        await self._commit()
 
         logger.info(f"Reset monthly account: {account_id}")
     async def get_closed_trades(self, account_id: str, month: Optional[int] = None, year: Optional[int] = None, symbol: Optional[str] = None, limit: int = 50) -> List[PaperTrade]:
         """Get closed trades for account with optional filters."""
         query = """
             SELECT * FROM paper_trades
-            WHERE account_id = ? AND LOWER(status) IN (?, ?)
+            WHERE account_id = ? AND status IN (?, ?)
         """
         params = [account_id, TradeStatus.CLOSED.value, TradeStatus.STOPPED_OUT.value]
 
@@ -1116,10 +1569,10 @@ class PaperTradingStore:
         query += " ORDER BY exit_timestamp DESC LIMIT ?"
         params.append(limit)
 
-        self.db_connection.row_factory = aiosqlite.Row
-        cursor = await self.db_connection.execute(query, params)
-        rows = await cursor.fetchall()
-        await cursor.close()
+        async with self._reader() as db:
+            cursor = await db.execute(query, params)
+            rows = await cursor.fetchall()
+            await cursor.close()
         return [PaperTrade.from_dict(self._normalize_trade_row(dict(row))) for row in rows]
 
     async def record_manual_run_audit(
@@ -1137,7 +1590,7 @@ class PaperTradingStore:
         provider_metadata: Dict[str, Any],
     ) -> None:
         """Persist audit metadata for explicit operator-triggered runs."""
-        async with self._lock:
+        async with self._locked():
             now = datetime.now(timezone.utc).isoformat()
             cursor = await self.db_connection.execute(
                 """
@@ -1162,7 +1615,7 @@ class PaperTradingStore:
                 ),
             )
             await cursor.close()
-            await self.db_connection.commit()
+            await self._commit()
 
     async def get_manual_run_audit_entries(
         self,
@@ -1171,7 +1624,7 @@ class PaperTradingStore:
         limit: int = 20,
     ) -> List[Dict[str, Any]]:
         """Return recent manual-run audit entries for the account."""
-        async with self._lock:
+        async with self._locked():
             self.db_connection.row_factory = aiosqlite.Row
             cursor = await self.db_connection.execute(
                 """
@@ -1203,7 +1656,7 @@ class PaperTradingStore:
 
     async def create_automation_run(self, entry: Dict[str, Any]) -> None:
         """Persist a new automation run record."""
-        async with self._lock:
+        async with self._locked():
             await self.db_connection.execute(
                 """
                 INSERT OR REPLACE INTO automation_runs (
@@ -1236,7 +1689,7 @@ class PaperTradingStore:
                     entry["updated_at"],
                 ),
             )
-            await self.db_connection.commit()
+            await self._commit()
 
     async def update_automation_run(self, run_id: str, updates: Dict[str, Any]) -> None:
         """Update an existing automation run record."""
@@ -1266,16 +1719,16 @@ class PaperTradingStore:
         if not columns:
             return
         params.append(run_id)
-        async with self._lock:
+        async with self._locked():
             await self.db_connection.execute(
                 f"UPDATE automation_runs SET {', '.join(columns)} WHERE run_id = ?",
                 tuple(params),
             )
-            await self.db_connection.commit()
+            await self._commit()
 
     async def get_automation_run(self, run_id: str) -> Optional[Dict[str, Any]]:
         """Return a single automation run record."""
-        async with self._lock:
+        async with self._locked():
             self.db_connection.row_factory = aiosqlite.Row
             cursor = await self.db_connection.execute(
                 "SELECT * FROM automation_runs WHERE run_id = ?",
@@ -1289,7 +1742,7 @@ class PaperTradingStore:
 
     async def list_automation_runs(self, account_id: str, *, limit: int = 20) -> List[Dict[str, Any]]:
         """Return recent automation runs for the account."""
-        async with self._lock:
+        async with self._locked():
             self.db_connection.row_factory = aiosqlite.Row
             cursor = await self.db_connection.execute(
                 """
@@ -1307,7 +1760,7 @@ class PaperTradingStore:
 
     async def get_active_automation_run(self, account_id: str, job_type: str) -> Optional[Dict[str, Any]]:
         """Return an active queued/in-progress automation run if present."""
-        async with self._lock:
+        async with self._locked():
             self.db_connection.row_factory = aiosqlite.Row
             cursor = await self.db_connection.execute(
                 """
@@ -1327,7 +1780,7 @@ class PaperTradingStore:
 
     async def set_automation_global_pause(self, paused: bool, *, reason: str = "") -> None:
         """Persist the global automation pause state."""
-        async with self._lock:
+        async with self._locked():
             now = datetime.now(timezone.utc).isoformat()
             await self.db_connection.execute(
                 """
@@ -1336,11 +1789,11 @@ class PaperTradingStore:
                 """,
                 ("global_pause", json.dumps({"paused": paused, "reason": reason}), now),
             )
-            await self.db_connection.commit()
+            await self._commit()
 
     async def get_automation_global_pause(self) -> Dict[str, Any]:
         """Return the global automation pause state."""
-        async with self._lock:
+        async with self._locked():
             self.db_connection.row_factory = aiosqlite.Row
             cursor = await self.db_connection.execute(
                 "SELECT control_value, updated_at FROM automation_global_control WHERE control_key = ?",
@@ -1356,7 +1809,7 @@ class PaperTradingStore:
 
     async def upsert_automation_job_control(self, entry: Dict[str, Any]) -> None:
         """Create or update per-job automation controls."""
-        async with self._lock:
+        async with self._locked():
             await self.db_connection.execute(
                 """
                 INSERT OR REPLACE INTO automation_job_controls (
@@ -1375,11 +1828,11 @@ class PaperTradingStore:
                     entry["updated_at"],
                 ),
             )
-            await self.db_connection.commit()
+            await self._commit()
 
     async def get_automation_job_control(self, job_type: str) -> Optional[Dict[str, Any]]:
         """Return a single per-job automation control row."""
-        async with self._lock:
+        async with self._locked():
             self.db_connection.row_factory = aiosqlite.Row
             cursor = await self.db_connection.execute(
                 "SELECT * FROM automation_job_controls WHERE job_type = ?",
@@ -1395,7 +1848,7 @@ class PaperTradingStore:
 
     async def list_automation_job_controls(self) -> List[Dict[str, Any]]:
         """Return all per-job automation controls."""
-        async with self._lock:
+        async with self._locked():
             self.db_connection.row_factory = aiosqlite.Row
             cursor = await self.db_connection.execute(
                 "SELECT * FROM automation_job_controls ORDER BY job_type ASC"
@@ -1432,10 +1885,9 @@ class PaperTradingStore:
         current_prices = current_prices or {}
         start_ts, end_ts = self._get_period_bounds(review_date)
 
-        async with self._lock:
-            self.db_connection.row_factory = aiosqlite.Row
+        async with self._reader(locked=True) as db:
 
-            cursor = await self.db_connection.execute(
+            cursor = await db.execute(
                 """
                 SELECT * FROM paper_trades
                 WHERE account_id = ?
@@ -1491,10 +1943,10 @@ class PaperTradingStore:
                     elif realized < 0:
                         losing_trades += 1
 
-            cursor = await self.db_connection.execute(
+            cursor = await db.execute(
                 """
                 SELECT * FROM paper_trades
-                WHERE account_id = ? AND LOWER(status) = ?
+                WHERE account_id = ? AND status = ?
                 ORDER BY entry_timestamp DESC
                 """,
                 (account_id, TradeStatus.OPEN.value),
@@ -1509,7 +1961,7 @@ class PaperTradingStore:
                 trade_pnl, _ = trade.calculate_pnl(current_price)
                 unrealized_pnl += trade_pnl
 
-            account = await self._get_account_unlocked(account_id)
+            account = await self._fetch_account(db, account_id)
             initial_balance = account.initial_balance if account else 0.0
             daily_pnl = realized_pnl + unrealized_pnl
             daily_pnl_percent = (daily_pnl / initial_balance * 100) if initial_balance > 0 else 0.0
@@ -1537,84 +1989,47 @@ class PaperTradingStore:
             }
 
     async def calculate_monthly_pnl(self, account_id: str, year: int, month: int) -> Dict[str, Any]:
-        """Calculate truthful monthly P&L summary from closed trades."""
+        """Calculate truthful monthly P&L summary from the closed-trade aggregates."""
         start_ts, end_ts = self._get_month_bounds(year, month)
+        aggregates = await self.get_performance_aggregates(account_id, start_ts[:10], end_ts[:10])
+        totals = aggregates["totals"]
+
+        strategy_breakdown: Dict[str, Dict[str, Any]] = {
+            name: {
+                "name": name,
+                "pnl": metrics["realized_pnl"],
+                "trades": metrics["closed_trades"],
+                "winning_trades": metrics["winning_trades"],
+            }
+            for name, metrics in aggregates["strategies"].items()
+        }
+        top_strategies = sorted(
+            [
+                {
+                    "name": name,
+                    "pnl": metrics["pnl"],
+                    "trades": metrics["trades"],
+                    "win_rate": (metrics["winning_trades"] / metrics["trades"] * 100) if metrics["trades"] else 0.0,
+                }
+                for name, metrics in strategy_breakdown.items()
+            ],
+            key=lambda item: item["pnl"],
+            reverse=True,
+        )
 
-        async with self._lock:
-            self.db_connection.row_factory = aiosqlite.Row
-            cursor = await self.db_connection.execute(
-                """
-                SELECT * FROM paper_trades
-                WHERE account_id = ?
-                  AND LOWER(status) IN (?, ?)
-                  AND exit_timestamp >= ?
-                  AND exit_timestamp < ?
-                ORDER BY exit_timestamp DESC
-                """,
-                (
-                    account_id,
-                    TradeStatus.CLOSED.value,
-                    TradeStatus.STOPPED_OUT.value,
-                    start_ts,
-                    end_ts,
-                ),
-            )
-            rows = await cursor.fetchall()
-            await cursor.close()
-
-            trades = [PaperTrade.from_dict(self._normalize_trade_row(dict(row))) for row in rows]
-            strategy_breakdown: Dict[str, Dict[str, Any]] = {}
-            total_pnl = 0.0
-            winning_trades = 0
-            best_trade = 0.0
-            worst_trade = 0.0
-
-            for trade in trades:
-                realized = self._calculate_realized_pnl(trade)
-                total_pnl += realized
-                if realized > 0:
-                    winning_trades += 1
-                    best_trade = max(best_trade, realized)
-                else:
-                    worst_trade = min(worst_trade, realized)
-
-                strategy_tag = trade.strategy_rationale or "unclassified"
-                strategy_metrics = strategy_breakdown.setdefault(
-                    strategy_tag,
-                    {"name": strategy_tag, "pnl": 0.0, "trades": 0, "winning_trades": 0},
-                )
-                strategy_metrics["pnl"] += realized
-                strategy_metrics["trades"] += 1
-                if realized > 0:
-                    strategy_metrics["winning_trades"] += 1
-
-            top_strategies = sorted(
-                [
-                    {
-                        "name": name,
-                        "pnl": metrics["pnl"],
-                        "trades": metrics["trades"],
-                        "win_rate": (metrics["winning_trades"] / metrics["trades"] * 100) if metrics["trades"] else 0.0,
-                    }
-                    for name, metrics in strategy_breakdown.items()
-                ],
-                key=lambda item: item["pnl"],
-                reverse=True,
-            )
-
-            total_trades = len(trades)
-            win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0.0
+        total_trades = totals["closed_trades"]
+        win_rate = (totals["winning_trades"] / total_trades * 100) if total_trades > 0 else 0.0
 
-            return {
-                "account_id": account_id,
-                "year": year,
-                "month": month,
-                "total_pnl": total_pnl,
-                "win_rate": win_rate,
-                "total_trades": total_trades,
-                "winning_trades": winning_trades,
-                "best_trade": best_trade if total_trades else 0.0,
-                "worst_trade": worst_trade if total_trades else 0.0,
-                "top_strategies": top_strategies,
-                "strategy_breakdown": strategy_breakdown,
-            }
+        return {
+            "account_id": account_id,
+            "year": year,
+            "month": month,
+            "total_pnl": totals["realized_pnl"],
+            "win_rate": win_rate,
+            "total_trades": total_trades,
+            "winning_trades": totals["winning_trades"],
+            "best_trade": max(totals["best_trade"], 0.0) if total_trades else 0.0,
+            "worst_trade": min(totals["worst_trade"], 0.0) if total_trades else 0.0,
+            "top_strategies": top_strategies,
+            "strategy_breakdown": strategy_breakdown,
+        }
@@ -0,0 +1,272 @@
+"""
+Queue Stats Index
+
+In-memory per-queue task counters maintained by SchedulerTaskStore on every
+task state transition, so status polls never aggregate queue_tasks. Counts
+drift only when something writes queue_tasks behind the store's back (manual
+cleanup, another process); the store periodically reloads them from a single
+GROUP BY query.
+
+Durations are measured on completion and kept in a bounded window per
+(queue, task type) for percentiles.
+"""
+
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+from ..models.scheduler import SchedulerTask, TaskStatus
+
+logger = logging.getLogger(__name__)
+
+# Completed-task durations kept per (queue, task type) for percentiles
+DURATION_WINDOW = 512
+
+PERCENTILES = (50, 95, 99)
+
+
+def _value(item: Any) -> str:
+    return item.value if hasattr(item, "value") else str(item)
+
+
+def _percentiles(samples: Iterable[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    if not ordered:
+        return {}
+    last = len(ordered) - 1
+    return {f"p{pct}": round(ordered[min(last, int(round(pct / 100.0 * last)))], 1) for pct in PERCENTILES}
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+@dataclass
+class QueueCounters:
+    """Live counters for one queue."""
+    pending: int = 0
+    running: int = 0
+    completed_today: int = 0
+    failed: int = 0
+    completed_count: int = 0
+    completed_total_ms: float = 0.0
+    # AVG duration of today's completions at the last reconciliation; used until samples arrive
+    reconciled_average_ms: Optional[float] = None
+    last_completed_task_id: Optional[str] = None
+    last_completed_at: Optional[str] = None
+    # Latest running task seen at reconciliation (tasks the store did not start itself)
+    reconciled_current_task: Optional[Dict[str, Any]] = None
+
+    @property
+    def average_duration_ms(self) -> float:
+        if self.completed_count:
+            return self.completed_total_ms / self.completed_count
+        return self.reconciled_average_ms or 0.0
+
+
+@dataclass
+class _RunningTask:
+    queue_name: str
+    task_type: str
+    started_at: Optional[str]
+    started_monotonic: float
+
+
+class QueueStatsIndex:
+    """queue_name → QueueCounters, plus the running tasks and duration windows behind them."""
+
+    def __init__(self, duration_window: int = DURATION_WINDOW):
+        self.duration_window = duration_window
+        self._queues: Dict[str, QueueCounters] = {}
+        self._running: Dict[str, _RunningTask] = {}
+        self._durations: Dict[Tuple[str, str], Deque[float]] = {}
+        self._day = ""
+        self.reconciled_at: Optional[float] = None
+
+    def _counters(self, queue_name: str) -> QueueCounters:
+        self._roll_day()
+        counters = self._queues.get(queue_name)
+        if counters is None:
+            counters = self._queues[queue_name] = QueueCounters()
+        return counters
+
+    def _roll_day(self) -> None:
+        """Zero completed_today at the UTC day boundary (completed_at is stored in UTC)."""
+        today = datetime.utcnow().strftime("%Y-%m-%d")
+        if today != self._day:
+            self._day = today
+            for counters in self._queues.values():
+                counters.completed_today = 0
+
+    def is_stale(self, max_age_seconds: float) -> bool:
+        return self.reconciled_at is None or time.monotonic() - self.reconciled_at >= max_age_seconds
+
+    def invalidate(self) -> None:
+        """Force a reconciliation on the next read (e.g. after a bulk delete)."""
+        self.reconciled_at = None
+
+    # ------------------------------------------------------------------
+    # Transitions
+    # ------------------------------------------------------------------
+
+    def task_created(self, task: SchedulerTask) -> None:
+        self._counters(_value(task.queue_name)).pending += 1
+
+    def task_started(self, task: SchedulerTask) -> None:
+        """pending → running; repeat calls (claim, then mark_started) count once."""
+        if task.task_id in self._running:
+            return
+        queue_name = _value(task.queue_name)
+        counters = self._counters(queue_name)
+        counters.pending = max(0, counters.pending - 1)
+        counters.running += 1
+        self._running[task.task_id] = _RunningTask(
+            queue_name=queue_name,
+            task_type=_value(task.task_type),
+            started_at=task.started_at,
+            started_monotonic=time.monotonic(),
+        )
+
+    def task_finished(self, task: SchedulerTask) -> None:
+        """running → completed/failed; records the duration of completions."""
+        queue_name = _value(task.queue_name)
+        counters = self._counters(queue_name)
+        running = self._running.pop(task.task_id, None)
+        counters.running = max(0, counters.running - 1)
+
+        if task.status != TaskStatus.COMPLETED:
+            counters.failed += 1
+            return
+
+        counters.completed_today += 1
+        counters.last_completed_task_id = task.task_id
+        counters.last_completed_at = task.completed_at
+        if running is not None:
+            duration_ms = (time.monotonic() - running.started_monotonic) * 1000
+        else:
+            started, completed = _parse_timestamp(task.started_at), _parse_timestamp(task.completed_at)
+            if started is None or completed is None:
+                return
+            duration_ms = max(0.0, (completed - started).total_seconds() * 1000)
+        self.record_duration(queue_name, _value(task.task_type), duration_ms)
+
+    def task_requeued(self, task: SchedulerTask) -> None:
+        """failed (or running) → pending for a retry."""
+        counters = self._counters(_value(task.queue_name))
+        if self._running.pop(task.task_id, None) is not None:
+            counters.running = max(0, counters.running - 1)
+        else:
+            counters.failed = max(0, counters.failed - 1)
+        counters.pending += 1
+
+    def record_duration(self, queue_name: str, task_type: str, duration_ms: float) -> None:
+        counters = self._counters(queue_name)
+        counters.completed_count += 1
+        counters.completed_total_ms += duration_ms
+        window = self._durations.get((queue_name, task_type))
+        if window is None:
+            window = self._durations[(queue_name, task_type)] = deque(maxlen=self.duration_window)
+        window.append(duration_ms)
+
+    # ------------------------------------------------------------------
+    # Reconciliation
+    # ------------------------------------------------------------------
+
+    def load(self, rows: Iterable[Tuple]) -> None:
+        """
+        Replace counts with a reconciliation result.
+
+        Rows are (queue_name, status, count, completed_today, avg_today_ms,
+        latest_at, latest_task_id, latest_task_type) per queue and status;
+        latest_* is the last completion for 'completed' and the most recently
+        started task for 'running'. Duration windows are kept.
+        """
+        self._roll_day()
+        previous = self._queues
+        self._queues = {}
+        running_queues = set()
+        for queue_name, status, count, completed_today, avg_today_ms, latest_at, latest_id, latest_type in rows:
+            counters = self._queues.get(queue_name)
+            if counters is None:
+                counters = self._queues[queue_name] = QueueCounters()
+            if status in (TaskStatus.PENDING.value, TaskStatus.RETRYING.value):
+                counters.pending += count or 0
+            elif status == TaskStatus.RUNNING.value:
+                counters.running = count or 0
+                running_queues.add(queue_name)
+                counters.reconciled_current_task = {
+                    "task_id": latest_id, "task_type": latest_type, "started_at": latest_at,
+                }
+            elif status == TaskStatus.COMPLETED.value:
+                counters.completed_today = completed_today or 0
+                counters.reconciled_average_ms = avg_today_ms
+                counters.last_completed_task_id = latest_id
+                counters.last_completed_at = latest_at
+            elif status == TaskStatus.FAILED.value:
+                counters.failed = count or 0
+
+        # Measured durations are not in the database; carry them over
+        for queue_name, old in previous.items():
+            if old.completed_count:
+                counters = self._queues.setdefault(queue_name, QueueCounters())
+                counters.completed_count = old.completed_count
+                counters.completed_total_ms = old.completed_total_ms
+        # Running tasks deleted or finished elsewhere
+        for task_id, running in list(self._running.items()):
+            if running.queue_name not in running_queues:
+                del self._running[task_id]
+        self.reconciled_at = time.monotonic()
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def get(self, queue_name: Any) -> QueueCounters:
+        self._roll_day()
+        return self._queues.get(_value(queue_name)) or QueueCounters()
+
+    def queue_names(self) -> List[str]:
+        return list(self._queues)
+
+    def current_task(self, queue_name: Any) -> Optional[Dict[str, Any]]:
+        """Most recently started running task of a queue."""
+        queue_value = _value(queue_name)
+        latest = None
+        for task_id, running in self._running.items():
+            if running.queue_name == queue_value:
+                if latest is None or running.started_monotonic > latest[1].started_monotonic:
+                    latest = (task_id, running)
+        if latest is not None:
+            task_id, running = latest
+            return {"task_id": task_id, "task_type": running.task_type, "started_at": running.started_at}
+        counters = self._queues.get(queue_value)
+        if counters is not None and counters.running:
+            return counters.reconciled_current_task
+        return None
+
+    def duration_percentiles(self, queue_name: Any, task_type: Any = None) -> Dict[str, float]:
+        """p50/p95/p99 (ms) over the recent completions of a queue, or of one task type in it."""
+        queue_value = _value(queue_name)
+        if task_type is not None:
+            return _percentiles(self._durations.get((queue_value, _value(task_type)), ()))
+        samples: List[float] = []
+        for (name, _), window in self._durations.items():
+            if name == queue_value:
+                samples.extend(window)
+        return _percentiles(samples)
+
+    def task_type_durations(self, queue_name: Any) -> Dict[str, Dict[str, float]]:
+        queue_value = _value(queue_name)
+        return {
+            task_type: {"count": len(window), **_percentiles(window)}
+            for (name, task_type), window in self._durations.items()
+            if name == queue_value and window
+        }
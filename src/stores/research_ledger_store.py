@@ -134,6 +134,39 @@ class ResearchLedgerStore:
                 logger.error(f"Failed to get history for {symbol}: {e}")
                 return []
 
+    async def get_history_for_symbols(
+        self, symbols: List[str], limit: int = 20
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Get recent entries for many symbols in one query (same per-symbol order as get_history)."""
+        if not symbols:
+            return {}
+        async with self._lock:
+            try:
+                db = self.db_connection
+                placeholders = ",".join("?" * len(symbols))
+                cursor = await db.execute(
+                    f"""SELECT id, symbol, timestamp, features_json, score, action,
+                               feature_confidence, sources_json, extraction_model
+                        FROM (
+                            SELECT *, ROW_NUMBER() OVER (
+                                PARTITION BY symbol ORDER BY timestamp DESC
+                            ) AS rank_in_symbol
+                            FROM research_ledger
+                            WHERE symbol IN ({placeholders})
+                        )
+                        WHERE rank_in_symbol <= ?
+                        ORDER BY symbol, timestamp DESC""",
+                    (*symbols, limit),
+                )
+                rows = await cursor.fetchall()
+                history: Dict[str, List[Dict[str, Any]]] = {}
+                for row in rows:
+                    history.setdefault(row[1], []).append(_row_to_dict(row))
+                return history
+            except Exception as e:
+                logger.error(f"Failed to get history for {len(symbols)} symbols: {e}")
+                return {}
+
     async def get_all_latest(self, limit: int = 50) -> List[Dict[str, Any]]:
         """Get the most recent entry for each symbol."""
         async with self._lock:
@@ -2,29 +2,77 @@
 
 import logging
 import asyncio
-import aiosqlite
 import json
-from typing import List, Optional, Dict, Any
+from contextlib import nullcontext
+from typing import List, Optional, Dict, Any, Iterable
 from datetime import datetime, timedelta
 
 from ..models.scheduler import (
     SchedulerTask, QueueName, TaskType, TaskStatus, QueueStatistics
 )
+from .queue_stats_index import QueueStatsIndex
 
 logger = logging.getLogger(__name__)
 
 
+_TASK_COLUMNS = """
+    task_id, queue_name, task_type, priority, payload, dependencies,
+    status, retry_count, max_retries, scheduled_at, started_at,
+    completed_at, error_message, created_at, updated_at
+"""
+
+
 class SchedulerTaskStore:
     """Database operations for scheduler tasks and queues."""
 
-    def __init__(self, db_connection):
-        """Initialize store with database connection."""
+    STORE_NAME = "scheduler_tasks"
+
+    # Reload the live queue counters from the table at most this often
+    STATS_RECONCILE_SECONDS = 60.0
+
+    def __init__(self, db_connection, pool=None):
+        """
+        Initialize store with database connection.
+
+        Args:
+            db_connection: Shared aiosqlite connection (schema setup, legacy path)
+            pool: Optional SQLiteConnectionPool; when given, reads use pooled
+                read-only connections and writes go through the queued writer
+        """
         self.db_connection = db_connection
+        self.pool = pool
         self._lock = asyncio.Lock()
+        self._reconcile_lock = asyncio.Lock()
+        self.queue_stats = QueueStatsIndex()
+
+    def _guard(self):
+        """Serialize access to the shared connection; the pool needs no store lock."""
+        return self._lock if self.pool is None else nullcontext()
+
+    async def _fetchall(self, query: str, params: Iterable[Any] = ()) -> list:
+        if self.pool is not None:
+            return await self.pool.fetchall(query, params, store=self.STORE_NAME)
+        cursor = await self.db_connection.execute(query, tuple(params))
+        return await cursor.fetchall()
+
+    async def _fetchone(self, query: str, params: Iterable[Any] = ()):
+        if self.pool is not None:
+            return await self.pool.fetchone(query, params, store=self.STORE_NAME)
+        cursor = await self.db_connection.execute(query, tuple(params))
+        return await cursor.fetchone()
+
+    async def _execute_write(self, query: str, params: Iterable[Any] = ()) -> int:
+        """Execute and commit one statement; returns the affected row count."""
+        if self.pool is not None:
+            return await self.pool.execute_write(query, params, store=self.STORE_NAME)
+        cursor = await self.db_connection.execute(query, tuple(params))
+        await self.db_connection.commit()
+        return cursor.rowcount
 
     async def initialize(self) -> None:
         """Initialize the store."""
         await self.initialize_schema()
+        await self.reconcile_queue_statistics()
 
     async def initialize_schema(self) -> None:
         """Initialize database schema if it doesn't exist."""
@@ -66,9 +114,50 @@ class SchedulerTaskStore:
                 ON queue_tasks(scheduled_at)
             """)
 
+            await self._ensure_lease_columns()
+
+            # Serves the claim query: next runnable task of one queue in dispatch order
+            await self.db_connection.execute("""
+                CREATE INDEX IF NOT EXISTS idx_queue_tasks_dispatch
+                ON queue_tasks(queue_name, status, priority DESC, created_at)
+            """)
+
             await self.db_connection.commit()
             logger.info("Scheduler task store schema initialized")
 
+    async def _ensure_lease_columns(self) -> None:
+        cursor = await self.db_connection.execute("PRAGMA table_info(queue_tasks)")
+        rows = await cursor.fetchall()
+        await cursor.close()
+        existing_columns = {row[1] for row in rows}
+
+        migrations = [
+            ("lease_owner", "ALTER TABLE queue_tasks ADD COLUMN lease_owner TEXT"),
+            ("lease_expires_at", "ALTER TABLE queue_tasks ADD COLUMN lease_expires_at TEXT"),
+        ]
+        for column_name, statement in migrations:
+            if column_name not in existing_columns:
+                await self.db_connection.execute(statement)
+
+    @staticmethod
+    def _task_from_row(row) -> SchedulerTask:
+        return SchedulerTask.from_dict({
+            "task_id": row[0],
+            "queue_name": row[1],
+            "task_type": row[2],
+            "priority": row[3],
+            "payload": row[4] if row[4] is not None else "{}",
+            "dependencies": row[5] if row[5] is not None else "[]",
+            "status": row[6],
+            "retry_count": row[7],
+            "max_retries": row[8],
+            "scheduled_at": row[9],
+            "started_at": row[10],
+            "completed_at": row[11],
+            "error_message": row[12],
+            "created_at": row[13],
+        })
+
     async def create_task(
         self,
         queue_name: QueueName,
@@ -79,7 +168,7 @@ class SchedulerTaskStore:
         max_retries: int = 3
     ) -> SchedulerTask:
         """Create a new scheduler task."""
-        async with self._lock:
+        async with self._guard():
             # Handle both enum and string inputs for robustness
             queue_value = queue_name.value if hasattr(queue_name, 'value') else str(queue_name)
             task_type_value = task_type.value if hasattr(task_type, 'value') else str(task_type)
@@ -95,12 +184,10 @@ class SchedulerTaskStore:
             dependencies_json = json.dumps(dependencies or [])
             payload_json = json.dumps(payload or {})
 
-            self.db_connection.row_factory = aiosqlite.Row
-            await self.db_connection.execute(
+            await self._execute_write(
                 query, (task_id, queue_value, task_type_value,
                        priority, payload_json, dependencies_json, max_retries)
             )
-            await self.db_connection.commit()
 
             task = SchedulerTask(
                 task_id=task_id,
@@ -112,6 +199,7 @@ class SchedulerTaskStore:
                 max_retries=max_retries,
                 created_at=datetime.utcnow().isoformat()
             )
+            self.queue_stats.task_created(task)
 
             logger.info(f"Created task in database: {task_id}")
             return task
@@ -126,8 +214,7 @@ class SchedulerTaskStore:
             WHERE task_id = ?
         """
 
-        cursor = await self.db_connection.execute(query, (task_id,))
-        row = await cursor.fetchone()
+        row = await self._fetchone(query, (task_id,))
 
         if not row:
             return None
@@ -161,12 +248,12 @@ class SchedulerTaskStore:
 
     async def get_task(self, task_id: str) -> Optional[SchedulerTask]:
         """Get task by ID."""
-        async with self._lock:
+        async with self._guard():
             return await self._get_task_unlocked(task_id)
 
     async def get_pending_tasks(self, queue_name: QueueName) -> List[SchedulerTask]:
         """Get all pending tasks for a queue."""
-        async with self._lock:
+        async with self._guard():
             query = """
                 SELECT task_id, queue_name, task_type, priority, payload, dependencies,
                        status, retry_count, max_retries, scheduled_at, started_at,
@@ -178,8 +265,7 @@ class SchedulerTaskStore:
 
             # Handle queue_name as either enum or string
             queue_value = queue_name.value if hasattr(queue_name, 'value') else str(queue_name)
-            cursor = await self.db_connection.execute(query, (queue_value,))
-            rows = await cursor.fetchall()
+            rows = await self._fetchall(query, (queue_value,))
             tasks = []
 
             for row in rows:
@@ -213,145 +299,234 @@ class SchedulerTaskStore:
 
             return tasks
 
+    async def claim_next_task(
+        self,
+        queue_name: QueueName,
+        lease_owner: str,
+        lease_seconds: float,
+        exclude_task_types: Iterable[Any] = (),
+    ) -> Optional[SchedulerTask]:
+        """
+        Atomically lease the next runnable task of a queue.
+
+        Picks the highest-priority, oldest task that is pending (or running
+        under an expired lease, i.e. its worker died) and whose dependencies
+        have all completed, marks it running under ``lease_owner`` and
+        returns it. Only that one row is read and decoded. Task types in
+        ``exclude_task_types`` (e.g. ones at their concurrency limit) are
+        skipped.
+        """
+        queue_value = queue_name.value if hasattr(queue_name, 'value') else str(queue_name)
+        excluded = [t.value if hasattr(t, 'value') else str(t) for t in exclude_task_types]
+        type_filter = f"AND candidate.task_type NOT IN ({', '.join('?' * len(excluded))})" if excluded else ""
+        query = f"""
+            UPDATE queue_tasks
+            SET status = 'running', started_at = datetime('now'), updated_at = datetime('now'),
+                lease_owner = ?, lease_expires_at = datetime('now', '+' || ? || ' seconds')
+            WHERE task_id = (
+                SELECT task_id FROM queue_tasks AS candidate
+                WHERE candidate.queue_name = ?
+                  AND (
+                      candidate.status IN ('pending', 'retrying')
+                      OR (candidate.status = 'running' AND candidate.lease_expires_at < datetime('now'))
+                  )
+                  {type_filter}
+                  AND NOT EXISTS (
+                      SELECT 1 FROM json_each(candidate.dependencies) AS dependency
+                      WHERE NOT EXISTS (
+                          SELECT 1 FROM queue_tasks AS parent
+                          WHERE parent.task_id = dependency.value AND parent.status = 'completed'
+                      )
+                  )
+                ORDER BY candidate.priority DESC, candidate.created_at ASC
+                LIMIT 1
+            )
+            RETURNING {_TASK_COLUMNS}
+        """
+        params = (lease_owner, int(max(1, lease_seconds)), queue_value, *excluded)
+
+        if self.pool is not None:
+            async def _claim(db):
+                cursor = await db.execute(query, params)
+                row = await cursor.fetchone()
+                await cursor.close()
+                return row
+
+            row = await self.pool.write(_claim, store=self.STORE_NAME)
+        else:
+            async with self._lock:
+                cursor = await self.db_connection.execute(query, params)
+                row = await cursor.fetchone()
+                await cursor.close()
+                await self.db_connection.commit()
+
+        if not row:
+            return None
+        task = self._task_from_row(row)
+        self.queue_stats.task_started(task)
+        return task
+
+    async def renew_lease(self, task_id: str, lease_owner: str, lease_seconds: float) -> bool:
+        """Extend a lease still held by ``lease_owner``; False if it was lost."""
+        async with self._guard():
+            rowcount = await self._execute_write(
+                """
+                UPDATE queue_tasks
+                SET lease_expires_at = datetime('now', '+' || ? || ' seconds')
+                WHERE task_id = ? AND lease_owner = ? AND status = 'running'
+                """,
+                (int(max(1, lease_seconds)), task_id, lease_owner),
+            )
+            return rowcount > 0
+
+    async def get_next_lease_expiry(self, queue_name: QueueName) -> Optional[datetime]:
+        """Earliest expiry among the queue's running leases (UTC), or None."""
+        async with self._guard():
+            queue_value = queue_name.value if hasattr(queue_name, 'value') else str(queue_name)
+            row = await self._fetchone(
+                """
+                SELECT MIN(lease_expires_at) FROM queue_tasks
+                WHERE queue_name = ? AND status = 'running' AND lease_expires_at IS NOT NULL
+                """,
+                (queue_value,),
+            )
+            if not row or row[0] is None:
+                return None
+            return datetime.strptime(row[0], "%Y-%m-%d %H:%M:%S")
+
     async def mark_started(self, task_id: str) -> Optional[SchedulerTask]:
         """Mark task as started."""
-        async with self._lock:
+        async with self._guard():
             query = """
                 UPDATE queue_tasks
                 SET status = 'running', started_at = datetime('now'), updated_at = datetime('now')
                 WHERE task_id = ?
             """
 
-            await self.db_connection.execute(query, (task_id,))
-            await self.db_connection.commit()
+            await self._execute_write(query, (task_id,))
 
             task = await self._get_task_unlocked(task_id)
             if task:
+                self.queue_stats.task_started(task)
                 logger.info(f"Marked task as started: {task_id}")
             return task
 
     async def mark_completed(self, task_id: str) -> Optional[SchedulerTask]:
         """Mark task as completed."""
-        async with self._lock:
+        async with self._guard():
             query = """
                 UPDATE queue_tasks
                 SET status = 'completed', completed_at = datetime('now'),
-                    updated_at = datetime('now')
+                    updated_at = datetime('now'), lease_owner = NULL, lease_expires_at = NULL
                 WHERE task_id = ?
             """
 
-            await self.db_connection.execute(query, (task_id,))
-            await self.db_connection.commit()
+            await self._execute_write(query, (task_id,))
 
             task = await self._get_task_unlocked(task_id)
             if task:
+                self.queue_stats.task_finished(task)
                 logger.info(f"Marked task as completed: {task_id}")
             return task
 
     async def mark_failed(self, task_id: str, error: str) -> Optional[SchedulerTask]:
         """Mark task as failed."""
-        async with self._lock:
+        async with self._guard():
             query = """
                 UPDATE queue_tasks
                 SET status = 'failed', error_message = ?, completed_at = datetime('now'),
-                    updated_at = datetime('now')
+                    updated_at = datetime('now'), lease_owner = NULL, lease_expires_at = NULL
                 WHERE task_id = ?
             """
 
-            await self.db_connection.execute(query, (error, task_id))
-            await self.db_connection.commit()
+            await self._execute_write(query, (error, task_id))
 
             task = await self._get_task_unlocked(task_id)
             if task:
+                self.queue_stats.task_finished(task)
                 logger.info(f"Marked task as failed: {task_id}")
             return task
 
     async def increment_retry(self, task_id: str) -> Optional[SchedulerTask]:
         """Increment retry count and reset task for retry."""
-        async with self._lock:
+        async with self._guard():
             query = """
                 UPDATE queue_tasks
                 SET retry_count = retry_count + 1, status = 'pending',
-                    started_at = NULL, error_message = NULL, updated_at = datetime('now')
+                    started_at = NULL, error_message = NULL, updated_at = datetime('now'),
+                    lease_owner = NULL, lease_expires_at = NULL
                 WHERE task_id = ? AND retry_count < max_retries
             """
 
-            await self.db_connection.execute(query, (task_id,))
-            await self.db_connection.commit()
+            requeued = await self._execute_write(query, (task_id,))
 
             task = await self._get_task_unlocked(task_id)
+            if task and requeued:
+                self.queue_stats.task_requeued(task)
             if task:
                 logger.info(f"Incremented retry for task: {task_id} (attempt {task.retry_count})")
             return task
 
-    async def get_queue_statistics(self, queue_name: QueueName) -> QueueStatistics:
-        """Get statistics for a queue."""
-        async with self._lock:
-            # Handle queue_name as either enum or string
-            queue_value = queue_name.value if hasattr(queue_name, 'value') else str(queue_name)
+    async def reconcile_queue_statistics(self) -> None:
+        """Reload the live queue counters from one GROUP BY over queue_tasks."""
+        today = datetime.utcnow().strftime("%Y-%m-%d")
+        # With a single MAX() aggregate, SQLite takes the bare task_id/task_type
+        # columns from the row holding the maximum: the last completion for
+        # 'completed' and the most recently started task for 'running'.
+        query = """
+            SELECT queue_name, status, COUNT(*),
+                   SUM(CASE WHEN completed_at >= ? THEN 1 ELSE 0 END),
+                   AVG(CASE WHEN completed_at >= ? AND started_at IS NOT NULL
+                       THEN (julianday(completed_at) - julianday(started_at)) * 86400000 END),
+                   MAX(CASE WHEN status = 'running' THEN started_at ELSE completed_at END),
+                   task_id, task_type
+            FROM queue_tasks
+            GROUP BY queue_name, status
+        """
+        async with self._guard():
+            rows = await self._fetchall(query, (today, today))
+        self.queue_stats.load(rows)
+
+    async def _refresh_queue_statistics(self) -> None:
+        if not self.queue_stats.is_stale(self.STATS_RECONCILE_SECONDS):
+            return
+        async with self._reconcile_lock:
+            if self.queue_stats.is_stale(self.STATS_RECONCILE_SECONDS):
+                await self.reconcile_queue_statistics()
+
+    async def get_live_queue_stats(self) -> QueueStatsIndex:
+        """The in-memory queue counters, reconciled if they are due."""
+        await self._refresh_queue_statistics()
+        return self.queue_stats
+
+    def _queue_statistics(self, queue_name: QueueName) -> QueueStatistics:
+        counters = self.queue_stats.get(queue_name)
+        return QueueStatistics(
+            queue_name=queue_name,
+            pending_count=counters.pending,
+            running_count=counters.running,
+            completed_today=counters.completed_today,
+            failed_count=counters.failed,
+            average_duration_ms=counters.average_duration_ms,
+            last_completed_task_id=counters.last_completed_task_id,
+            last_completed_at=counters.last_completed_at,
+            duration_percentiles_ms=self.queue_stats.duration_percentiles(queue_name),
+            task_type_durations_ms=self.queue_stats.task_type_durations(queue_name),
+        )
 
-            # Get pending tasks count
-            pending_query = """
-                SELECT COUNT(*) FROM queue_tasks
-                WHERE queue_name = ? AND status = 'pending'
-            """
-            cursor = await self.db_connection.execute(pending_query, (queue_value,))
-            pending_row = await cursor.fetchone()
-            pending_count = pending_row[0] if pending_row else 0
-
-            # Get running tasks count
-            running_query = """
-                SELECT COUNT(*) FROM queue_tasks
-                WHERE queue_name = ? AND status = 'running'
-            """
-            cursor = await self.db_connection.execute(running_query, (queue_value,))
-            running_row = await cursor.fetchone()
-            running_count = running_row[0] if running_row else 0
-
-            # Get completed tasks today
-            completed_query = """
-                SELECT COUNT(*) FROM queue_tasks
-                WHERE queue_name = ? AND status = 'completed'
-                  AND DATE(completed_at) = DATE('now')
-            """
-            cursor = await self.db_connection.execute(completed_query, (queue_value,))
-            completed_row = await cursor.fetchone()
-            completed_today = completed_row[0] if completed_row else 0
-
-            # Get failed tasks count
-            failed_query = """
-                SELECT COUNT(*) FROM queue_tasks
-                WHERE queue_name = ? AND status = 'failed'
-            """
-            cursor = await self.db_connection.execute(failed_query, (queue_value,))
-            failed_row = await cursor.fetchone()
-            failed_count = failed_row[0] if failed_row else 0
-
-            # Get last completed task info
-            last_completed_query = """
-                SELECT task_id, completed_at FROM queue_tasks
-                WHERE queue_name = ? AND status = 'completed'
-                ORDER BY completed_at DESC LIMIT 1
-            """
-            cursor = await self.db_connection.execute(last_completed_query, (queue_value,))
-            last_completed_row = await cursor.fetchone()
-            last_completed_task_id = last_completed_row[0] if last_completed_row else None
-            last_completed_at = last_completed_row[1] if last_completed_row else None
+    async def get_queue_statistics(self, queue_name: QueueName) -> QueueStatistics:
+        """Get statistics for a queue from the live counters."""
+        await self._refresh_queue_statistics()
+        return self._queue_statistics(queue_name)
 
-            return QueueStatistics(
-                queue_name=queue_name,
-                pending_count=pending_count,
-                running_count=running_count,
-                completed_today=completed_today,
-                failed_count=failed_count,
-                average_duration_ms=0.0,  # TODO: Calculate average duration
-                last_completed_task_id=last_completed_task_id,
-                last_completed_at=last_completed_at
-            )
+    async def get_all_queue_statistics(self) -> Dict[str, QueueStatistics]:
+        """Get statistics for every queue from the live counters."""
+        await self._refresh_queue_statistics()
+        return {queue_name.value: self._queue_statistics(queue_name) for queue_name in QueueName}
 
     async def get_completed_task_ids_today(self) -> List[str]:
         """Get IDs of tasks completed today."""
-        async with self._lock:
+        async with self._guard():
             query = """
                 SELECT task_id
                 FROM queue_tasks
@@ -359,13 +534,12 @@ class SchedulerTaskStore:
                   AND DATE(completed_at) = DATE('now')
             """
 
-            cursor = await self.db_connection.execute(query)
-            rows = await cursor.fetchall()
+            rows = await self._fetchall(query)
             return [row[0] for row in rows]
 
     async def cleanup_old_tasks(self, days_to_keep: int = 7) -> int:
         """Clean up old completed tasks."""
-        async with self._lock:
+        async with self._guard():
             cutoff_date = datetime.utcnow() - timedelta(days=days_to_keep)
 
             query = """
@@ -374,16 +548,15 @@ class SchedulerTaskStore:
                   AND completed_at < ?
             """
 
-            cursor = await self.db_connection.execute(query, (cutoff_date.isoformat(),))
-            await self.db_connection.commit()
-
-            deleted_count = cursor.rowcount if hasattr(cursor, 'rowcount') else 0
+            deleted_count = max(await self._execute_write(query, (cutoff_date.isoformat(),)), 0)
+            if deleted_count:
+                self.queue_stats.invalidate()
             logger.info(f"Cleaned up {deleted_count} old tasks older than {days_to_keep} days")
             return deleted_count
 
     async def get_failed_tasks_for_retry(self, max_age_hours: int = 1) -> List[SchedulerTask]:
         """Get failed tasks that can be retried."""
-        async with self._lock:
+        async with self._guard():
             query = """
                 SELECT task_id, queue_name, task_type, priority, payload, dependencies,
                        status, retry_count, max_retries, scheduled_at, started_at,
@@ -395,8 +568,7 @@ class SchedulerTaskStore:
                 ORDER BY priority DESC, completed_at ASC
             """
 
-            cursor = await self.db_connection.execute(query, (max_age_hours,))
-            rows = await cursor.fetchall()
+            rows = await self._fetchall(query, (max_age_hours,))
             tasks = []
 
             for row in rows:
@@ -0,0 +1,297 @@
+"""
+Tick Store
+
+Columnar, append-only storage for intraday ticks. Each symbol gets one
+directory per trading day holding fixed-width column files that are
+memory-mapped on read, so history queries never build per-row objects
+and retention drops whole day directories instead of running a DELETE.
+
+Layout::
+
+    <root>/<SYMBOL>/<YYYY-MM-DD>/ts.f8        epoch seconds (float64)
+                                 ltp.f8       last traded price (float64)
+                                 volume.i8    volume, -1 when unknown (int64)
+                                 provider.u1  provider code (uint8)
+
+Symbols that are not plain exchange tickers are percent-encoded before they
+become a directory name. ``BufferedTickWriter`` batches appends made on the
+event loop and writes them from a worker thread.
+"""
+
+import asyncio
+import logging
+import re
+import shutil
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_COLUMNS: Dict[str, np.dtype] = {
+    "ts": np.dtype("<f8"),
+    "ltp": np.dtype("<f8"),
+    "volume": np.dtype("<i8"),
+    "provider": np.dtype("u1"),
+}
+_FILE_NAMES = {name: f"{name}.{dtype.kind}{dtype.itemsize}" for name, dtype in _COLUMNS.items()}
+
+PROVIDER_CODES: List[str] = [
+    "unknown",
+    "zerodha_kite",
+    "upstox",
+    "yahoo_finance",
+    "alpha_vantage",
+    "broker_api",
+]
+_PROVIDER_INDEX = {name: code for code, name in enumerate(PROVIDER_CODES)}
+
+TickRow = Tuple[str, str, float, Optional[int], str]  # symbol, iso timestamp, ltp, volume, provider
+
+# Exchange tickers (INFY, M&M, BAJAJ-AUTO, NIFTY_50) are used as directory names as-is
+_PLAIN_SYMBOL = re.compile(r"[A-Za-z0-9_&-][A-Za-z0-9_&.-]*")
+
+
+@dataclass(frozen=True)
+class TickSeries:
+    """Column arrays for one symbol's ticks, ordered by timestamp."""
+    symbol: str
+    timestamps: np.ndarray  # epoch seconds, float64
+    ltp: np.ndarray
+    volume: np.ndarray      # -1 where the provider sent no volume
+    provider: np.ndarray    # codes into PROVIDER_CODES
+
+    def __len__(self) -> int:
+        return int(self.timestamps.shape[0])
+
+    def to_dataframe(self):
+        """Build a DataFrame indexed by UTC timestamp (no per-row objects)."""
+        import pandas as pd
+
+        return pd.DataFrame(
+            {"ltp": self.ltp, "volume": self.volume},
+            index=pd.to_datetime(self.timestamps, unit="s", utc=True),
+        )
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Materialize the legacy list-of-dicts shape."""
+        return [
+            {
+                "price": float(price),
+                "volume": int(volume) if volume >= 0 else None,
+                "timestamp": datetime.fromtimestamp(float(ts), tz=timezone.utc).isoformat(),
+                "provider": PROVIDER_CODES[int(code)] if code < len(PROVIDER_CODES) else "unknown",
+            }
+            for ts, price, volume, code in zip(self.timestamps, self.ltp, self.volume, self.provider)
+        ]
+
+
+def _parse_epoch(timestamp: str) -> float:
+    parsed = datetime.fromisoformat(str(timestamp).replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def symbol_dir_name(symbol: str) -> str:
+    """Directory name for a symbol; anything that could escape the store root is encoded."""
+    if _PLAIN_SYMBOL.fullmatch(symbol):
+        return symbol
+    return quote(symbol, safe="&").replace(".", "%2E")
+
+
+class TickStore:
+    """Per-symbol, per-day append-only column files."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _symbol_dir(self, symbol: str) -> Path:
+        return self.root / symbol_dir_name(symbol)
+
+    def _day_dir(self, symbol: str, day: date) -> Path:
+        return self._symbol_dir(symbol) / day.isoformat()
+
+    def append_many(self, rows: Iterable[TickRow]) -> int:
+        """Append ticks, grouping them into one write per column per symbol-day."""
+        grouped: Dict[Tuple[str, date], List[Tuple[float, float, int, int]]] = defaultdict(list)
+        for symbol, timestamp, ltp, volume, provider in rows:
+            epoch = _parse_epoch(timestamp)
+            day = datetime.fromtimestamp(epoch, tz=timezone.utc).date()
+            grouped[(symbol, day)].append((
+                epoch,
+                float(ltp),
+                -1 if volume is None else int(volume),
+                _PROVIDER_INDEX.get(provider, 0),
+            ))
+
+        written = 0
+        for (symbol, day), values in grouped.items():
+            day_dir = self._day_dir(symbol, day)
+            day_dir.mkdir(parents=True, exist_ok=True)
+            columns = list(zip(*values))
+            for (name, dtype), column in zip(_COLUMNS.items(), columns):
+                with open(day_dir / _FILE_NAMES[name], "ab") as handle:
+                    handle.write(np.asarray(column, dtype=dtype).tobytes())
+            written += len(values)
+        return written
+
+    def append(self, symbol: str, timestamp: str, ltp: float, volume: Optional[int], provider: str) -> None:
+        """Append a single tick."""
+        self.append_many([(symbol, timestamp, ltp, volume, provider)])
+
+    def _read_day(self, day_dir: Path) -> Optional[Dict[str, np.ndarray]]:
+        lengths = []
+        columns: Dict[str, np.ndarray] = {}
+        for name, dtype in _COLUMNS.items():
+            path = day_dir / _FILE_NAMES[name]
+            # A torn append can leave a partial trailing value; map whole values only.
+            length = path.stat().st_size // dtype.itemsize if path.exists() else 0
+            if length == 0:
+                return None
+            columns[name] = np.memmap(path, dtype=dtype, mode="r", shape=(length,))
+            lengths.append(length)
+        # A crash mid-append can leave columns of unequal length; trust the shortest.
+        count = min(lengths)
+        return {name: array[:count] for name, array in columns.items()}
+
+    def read(self, symbol: str, since: datetime, until: Optional[datetime] = None) -> TickSeries:
+        """Read ticks for a symbol in [since, until) as column arrays."""
+        start = since.timestamp()
+        end = until.timestamp() if until else float("inf")
+        start_day = since.astimezone(timezone.utc).date().isoformat()
+        end_day = until.astimezone(timezone.utc).date().isoformat() if until else "9999-12-31"
+
+        parts: Dict[str, List[np.ndarray]] = {name: [] for name in _COLUMNS}
+        symbol_dir = self._symbol_dir(symbol)
+        day_dirs = sorted(symbol_dir.iterdir()) if symbol_dir.exists() else []
+        for day_dir in day_dirs:
+            if not (start_day <= day_dir.name <= end_day):
+                continue
+            columns = self._read_day(day_dir)
+            if columns is None:
+                continue
+            ts = columns["ts"]
+            mask = (ts >= start) & (ts < end)
+            for name in _COLUMNS:
+                parts[name].append(columns[name][mask])
+
+        arrays = {
+            name: np.concatenate(chunks) if chunks else np.empty(0, dtype=_COLUMNS[name])
+            for name, chunks in parts.items()
+        }
+        order = np.argsort(arrays["ts"], kind="stable")
+        return TickSeries(
+            symbol=symbol,
+            timestamps=arrays["ts"][order],
+            ltp=arrays["ltp"][order],
+            volume=arrays["volume"][order],
+            provider=arrays["provider"][order],
+        )
+
+    def drop_before(self, cutoff: date) -> int:
+        """Delete whole day directories older than the cutoff date."""
+        removed = 0
+        cutoff_name = cutoff.isoformat()
+        for symbol_dir in self.root.iterdir():
+            if not symbol_dir.is_dir():
+                continue
+            for day_dir in symbol_dir.iterdir():
+                if day_dir.is_dir() and day_dir.name < cutoff_name:
+                    shutil.rmtree(day_dir, ignore_errors=True)
+                    removed += 1
+        if removed:
+            logger.info(f"Tick store retention removed {removed} day partitions before {cutoff_name}")
+        return removed
+
+
+class BufferedTickWriter:
+    """
+    Collects ticks on the event loop and appends them to a TickStore in batches.
+
+    ``add()`` only buffers; a batch is written from a worker thread once
+    ``max_rows`` are pending or ``max_delay_ms`` has passed since the first
+    one. Call ``flush()`` before reading recent history and ``close()`` on
+    shutdown. A failed write keeps its rows for the next flush, up to
+    ``max_pending``; beyond that the oldest are dropped.
+    """
+
+    def __init__(self, store: TickStore, *, max_rows: int = 1000, max_delay_ms: float = 250.0,
+                 max_pending: Optional[int] = None):
+        self.store = store
+        self.max_rows = max(1, max_rows)
+        self.max_delay = max(0.0, max_delay_ms) / 1000.0
+        self.max_pending = max_pending or self.max_rows * 50
+        self._pending: List[TickRow] = []
+        self._flush_lock = asyncio.Lock()
+        self._timer: Optional[asyncio.Task] = None
+        self._full = asyncio.Event()
+        self._stats = {"rows": 0, "writes": 0, "failed_writes": 0, "dropped": 0, "last_write_ms": 0.0}
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def add(self, rows: Iterable[TickRow]) -> None:
+        before = len(self._pending)
+        self._pending.extend(rows)
+        self._stats["rows"] += len(self._pending) - before
+        if len(self._pending) >= self.max_rows:
+            self._full.set()
+        if self._timer is None or self._timer.done():
+            self._timer = asyncio.create_task(self._flush_soon())
+
+    async def _flush_soon(self) -> None:
+        """Flush after ``max_delay``, or as soon as ``max_rows`` are pending."""
+        try:
+            await asyncio.wait_for(self._full.wait(), self.max_delay)
+        except asyncio.TimeoutError:
+            pass
+        self._full.clear()
+        try:
+            # Shielded so close() cancelling the timer never interrupts a write in flight
+            await asyncio.shield(self.flush())
+        except Exception as e:
+            logger.error(f"Tick store append failed; {self.pending} ticks kept for retry: {e}")
+
+    async def flush(self) -> None:
+        """Write everything buffered so far."""
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            rows, self._pending = self._pending, []
+            started = time.perf_counter()
+            try:
+                await asyncio.to_thread(self.store.append_many, rows)
+            except Exception:
+                self._stats["failed_writes"] += 1
+                rows.extend(self._pending)
+                overflow = len(rows) - self.max_pending
+                if overflow > 0:
+                    del rows[:overflow]
+                    self._stats["dropped"] += overflow
+                self._pending = rows
+                raise
+            self._stats["writes"] += 1
+            self._stats["last_write_ms"] = round((time.perf_counter() - started) * 1000, 3)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self._stats, "pending": self.pending}
+
+    async def close(self) -> None:
+        """Stop the delay timer and write whatever is still buffered."""
+        if self._timer is not None and not self._timer.done():
+            self._timer.cancel()
+            try:
+                await self._timer
+            except asyncio.CancelledError:
+                pass
+        self._timer = None
+        await self.flush()
@@ -247,6 +247,12 @@ async def lifespan(app: FastAPI):
     app.state.connection_manager = connection_manager
     logger.info("ConnectionManager created")
 
+    try:
+        broadcast_coordinator = await container.get("broadcast_coordinator")
+        broadcast_coordinator.set_connection_stats_provider(connection_manager.get_stats)
+    except Exception as e:
+        logger.warning(f"Broadcast health metrics will not include WebSocket fan-out stats: {e}")
+
     initialization_status["orchestrator_initialized"] = False
     initialization_status["bootstrap_completed"] = False
     initialization_status["initialization_errors"] = []
@@ -278,6 +284,8 @@ async def lifespan(app: FastAPI):
                 "message": "Server shutting down",
                 "timestamp": datetime.now(timezone.utc).isoformat()
             })
+            await connection_manager.drain(timeout=1.0)
+            await connection_manager.shutdown()
 
         await cleanup_container()
         logger.info("DI container cleanup completed")
@@ -76,6 +76,16 @@ class HealthMetrics:
         self.recent_errors = deque(recent_errors, maxlen=50)
         self.error_rate = len(recent_errors) / 50.0 * 100 if recent_errors else 0.0
 
+    def broadcast_time_percentiles(self) -> Dict[str, float]:
+        """p50/p95/p99 of recent broadcast times (seconds)."""
+        samples = sorted(self.recent_broadcast_times)
+        if not samples:
+            return {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+        return {
+            f"p{int(p * 100)}": samples[min(len(samples) - 1, int(p * len(samples)))]
+            for p in (0.50, 0.95, 0.99)
+        }
+
     def add_broadcast_time(self, duration: float) -> None:
         """Add a new broadcast time measurement."""
         self.recent_broadcast_times.append(duration)
@@ -100,10 +110,13 @@ class BroadcastHealthMonitor:
     def __init__(
         self,
         broadcast_callback: Callable,
-        config: Optional[Dict[str, Any]] = None
+        config: Optional[Dict[str, Any]] = None,
+        connection_stats_provider: Optional[Callable[[], Dict[str, Any]]] = None
     ):
         self.broadcast_callback = broadcast_callback
         self.config = config or {}
+        # Returns ConnectionManager.get_stats() (per-connection queue depths, fan-out percentiles)
+        self._connection_stats_provider = connection_stats_provider
 
         # Circuit breaker state
         self._circuit_breaker_open = False
@@ -461,8 +474,19 @@ class BroadcastHealthMonitor:
         """Add a recovery handler callback."""
         self._recovery_handlers.append(handler)
 
+    def set_connection_stats_provider(self, provider: Optional[Callable[[], Dict[str, Any]]]) -> None:
+        """Attach the connection manager's fan-out statistics to health metrics."""
+        self._connection_stats_provider = provider
+
     def get_health_metrics(self) -> Dict[str, Any]:
         """Get comprehensive health metrics."""
+        connection_stats = None
+        if self._connection_stats_provider:
+            try:
+                connection_stats = self._connection_stats_provider()
+            except Exception as e:
+                logger.warning(f"Failed to collect connection stats: {e}")
+
         return {
             "total_broadcasts": self._metrics.total_broadcasts,
             "successful_broadcasts": self._metrics.successful_broadcasts,
@@ -479,6 +503,12 @@ class BroadcastHealthMonitor:
             "backpressure_detected": self._backpressure_detected,
             "last_broadcast_time": self._metrics.last_broadcast_time.isoformat() if self._metrics.last_broadcast_time else None,
             "last_error_time": self._metrics.last_error_time.isoformat() if self._metrics.last_error_time else None,
+            "broadcast_time_percentiles": self._metrics.broadcast_time_percentiles(),
             "queue_size": self._broadcast_queue.qsize(),
-            "recent_errors": len(self._metrics.recent_errors)
+            "recent_errors": len(self._metrics.recent_errors),
+            "connection_queue_depths": {
+                conn_id: stats["queue_depth"]
+                for conn_id, stats in (connection_stats or {}).get("connections", {}).items()
+            },
+            "fanout": connection_stats,
         }
\ No newline at end of file
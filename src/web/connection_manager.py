@@ -2,47 +2,115 @@
 WebSocket Connection Manager for Robo Trader
 
 Thread-safe WebSocket connection manager with atomic snapshot mechanism
-and concurrent broadcasting to eliminate race conditions.
+and encode-once fan-out: each broadcast is serialized a single time and the
+pre-encoded frame is handed to per-connection bounded send queues, so a slow
+client never holds up delivery to the others.
 """
 
 import asyncio
-from datetime import datetime, timezone
-from typing import Dict, Any, Optional, Set, Tuple
+import json
+import time
+from collections import deque
+from typing import Deque, Dict, Any, Optional, Set
 from dataclasses import dataclass
 
 from fastapi import WebSocket
 from loguru import logger
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+_DURATION_SAMPLES = 1024
+
+
+def encode_message(message: Dict[str, Any]) -> str:
+    """Serialize a message once for all recipients (orjson when installed)."""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(message, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:
+            pass  # Fall back for types orjson rejects (e.g. int keys > 64 bit)
+    # Same separators Starlette's send_json uses
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
 
 @dataclass
 class BroadcastResult:
-    """Result of a broadcast operation."""
+    """
+    Result of a broadcast operation.
+
+    Delivery is asynchronous, so ``queued_sends`` counts frames handed to send
+    queues; delivered and failed frames are counted by the sender tasks in
+    ``ConnectionManager.get_stats()``.
+    """
     total_connections: int
-    successful_sends: int
-    failed_sends: int
-    dead_connections: int
+    queued_sends: int
+    failed_sends: int  # queued, but superseding an undelivered older frame
+    dead_connections: int  # skipped: their sender task already failed
     duration_ms: float
 
 
+class _ConnectionChannel:
+    """Bounded send queue and sender task for one WebSocket."""
+
+    def __init__(self, connection_id: str, websocket: WebSocket, maxsize: int):
+        self.connection_id = connection_id
+        self.websocket = websocket
+        self.queue: Deque[str] = deque()
+        self.maxsize = maxsize
+        self.ready = asyncio.Event()
+        self.sent = 0
+        self.dropped = 0
+        self.failed = 0
+        self.task: Optional[asyncio.Task] = None
+
+    def offer(self, frame: str) -> bool:
+        """Queue a frame; when full the oldest frame is superseded. Returns False on a drop."""
+        dropped = False
+        if len(self.queue) >= self.maxsize:
+            self.queue.popleft()
+            self.dropped += 1
+            dropped = True
+        self.queue.append(frame)
+        self.ready.set()
+        return not dropped
+
+
 class ConnectionManager:
     """
     Thread-safe WebSocket connection manager.
 
     Features:
     - Atomic snapshot mechanism prevents race conditions during broadcast
-    - Concurrent message sending with asyncio.gather
+    - Encode-once fan-out to per-connection bounded send queues
+    - Slow consumers drop their oldest queued frames instead of blocking broadcasts
     - Background cleanup of dead connections
     - Graceful error handling for stale connections
     """
 
-    def __init__(self):
+    def __init__(self, send_queue_size: int = 64, send_timeout_seconds: float = 2.0):
         self.active_connections: Dict[str, WebSocket] = {}
         self._lock = asyncio.Lock()
         self._dead_connections: Set[str] = set()
-        self._generation_counter = 0
         self._cleanup_task: Optional[asyncio.Task] = None
         self._cleanup_interval_seconds = 10
 
+        self._send_queue_size = send_queue_size
+        self._send_timeout_seconds = send_timeout_seconds
+        self._channels: Dict[str, _ConnectionChannel] = {}
+        self._broadcast_durations_ms: Deque[float] = deque(maxlen=_DURATION_SAMPLES)
+        self._stats = {
+            "broadcasts": 0,
+            "frames_encoded": 0,
+            "frames_sent": 0,
+            "frames_dropped": 0,
+            "frames_failed": 0,
+            "dead_connections": 0,
+        }
+
     async def connect(self, websocket: WebSocket, client_id: Optional[str] = None) -> str:
         """
         Add a new WebSocket connection.
@@ -59,8 +127,11 @@ class ConnectionManager:
         connection_id = client_id or f"ws_{id(websocket)}"
 
         async with self._lock:
+            previous = self._channels.pop(connection_id, None)
             self.active_connections[connection_id] = websocket
-            self._generation_counter += 1
+            self._channels[connection_id] = self._open_channel(connection_id, websocket)
+        if previous:
+            self._close_channel(previous)
 
         logger.info(f"WebSocket connected: {connection_id} (total: {len(self.active_connections)})")
 
@@ -82,16 +153,22 @@ class ConnectionManager:
 
         async with self._lock:
             removed = self.active_connections.pop(connection_id, None)
+            channel = self._channels.pop(connection_id, None)
             self._dead_connections.discard(connection_id)
-            if removed:
-                self._generation_counter += 1
+        if channel:
+            self._close_channel(channel)
 
         if removed:
             logger.info(f"WebSocket disconnected: {connection_id} (remaining: {len(self.active_connections)})")
 
     async def broadcast(self, message: Dict[str, Any]) -> BroadcastResult:
         """
-        Broadcast message to all connected clients with atomic snapshot and concurrent sends.
+        Broadcast message to all connected clients: encode once, enqueue everywhere.
+
+        Delivery happens on each connection's sender task, so this returns as soon
+        as the frame is queued. A connection whose queue is full has its oldest
+        frame superseded and is counted as a failed send; connections whose
+        sender already failed are skipped and counted as dead.
 
         Args:
             message: Message dict to broadcast
@@ -99,74 +176,97 @@ class ConnectionManager:
         Returns:
             BroadcastResult with broadcast statistics
         """
-        start_time = datetime.now(timezone.utc)
+        started = time.perf_counter()
 
-        snapshot, generation = await self._get_snapshot()
+        async with self._lock:
+            channels = [
+                channel for conn_id, channel in self._channels.items()
+                if conn_id not in self._dead_connections
+            ]
+            dead = len(self._channels) - len(channels)
 
-        if not snapshot:
+        if not channels:
             return BroadcastResult(
-                total_connections=0,
-                successful_sends=0,
+                total_connections=dead,
+                queued_sends=0,
                 failed_sends=0,
-                dead_connections=0,
+                dead_connections=dead,
                 duration_ms=0.0
             )
 
-        tasks = [
-            self._send_message(websocket, message, conn_id)
-            for conn_id, websocket in snapshot.items()
-        ]
-
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        frame = encode_message(message)
+        self._stats["frames_encoded"] += 1
 
-        successful = sum(1 for r in results if r is True)
-        failed = sum(1 for r in results if r is False or isinstance(r, Exception))
+        queued = sum(1 for channel in channels if channel.offer(frame))
+        dropped = len(channels) - queued
+        self._stats["frames_dropped"] += dropped
+        self._stats["broadcasts"] += 1
 
-        newly_dead = [
-            conn_id for conn_id, result in zip(snapshot.keys(), results)
-            if result is False or isinstance(result, Exception)
-        ]
-
-        if newly_dead:
-            async with self._lock:
-                for conn_id in newly_dead:
-                    self._dead_connections.add(conn_id)
-
-        duration = (datetime.now(timezone.utc) - start_time).total_seconds() * 1000
+        duration = (time.perf_counter() - started) * 1000
+        self._broadcast_durations_ms.append(duration)
 
         return BroadcastResult(
-            total_connections=len(snapshot),
-            successful_sends=successful,
-            failed_sends=failed,
-            dead_connections=len(newly_dead),
+            total_connections=len(channels) + dead,
+            queued_sends=queued,
+            failed_sends=dropped,
+            dead_connections=dead,
             duration_ms=duration
         )
 
-    async def _get_snapshot(self) -> Tuple[Dict[str, WebSocket], int]:
-        """
-        Get atomic snapshot of active connections.
-
-        Returns:
-            (snapshot dict, generation counter)
-        """
-        async with self._lock:
-            snapshot = self.active_connections.copy()
-            generation = self._generation_counter
-
-        return snapshot, generation
-
-    async def _send_message(
+    async def drain(self, timeout: float = 1.0) -> bool:
+        """Wait until every send queue is empty (e.g. before shutdown). Returns False on timeout."""
+        deadline = time.monotonic() + timeout
+        while any(channel.queue for channel in self._channels.values()):
+            if time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(0.01)
+        return True
+
+    def _open_channel(self, connection_id: str, websocket: WebSocket) -> _ConnectionChannel:
+        channel = _ConnectionChannel(connection_id, websocket, self._send_queue_size)
+        channel.task = asyncio.create_task(self._sender_loop(channel))
+        return channel
+
+    @staticmethod
+    def _close_channel(channel: _ConnectionChannel) -> None:
+        if channel.task and not channel.task.done():
+            channel.task.cancel()
+
+    async def _sender_loop(self, channel: _ConnectionChannel) -> None:
+        """Deliver queued frames to one WebSocket until it fails or is closed."""
+        try:
+            while True:
+                await channel.ready.wait()
+                while channel.queue:
+                    frame = channel.queue.popleft()
+                    if not await self._send_frame(channel.websocket, frame, channel.connection_id):
+                        # The failed frame and everything still queued behind it are lost
+                        lost = 1 + len(channel.queue)
+                        channel.queue.clear()
+                        channel.failed += lost
+                        self._stats["frames_failed"] += lost
+                        self._stats["dead_connections"] += 1
+                        async with self._lock:
+                            self._dead_connections.add(channel.connection_id)
+                        return
+                    channel.sent += 1
+                    self._stats["frames_sent"] += 1
+                channel.ready.clear()
+        except asyncio.CancelledError:
+            pass
+
+    async def _send_frame(
         self,
         websocket: WebSocket,
-        message: Dict[str, Any],
+        frame: str,
         connection_id: str
     ) -> bool:
         """
-        Send message to single WebSocket with timeout.
+        Send a pre-encoded frame to single WebSocket with timeout.
 
         Args:
             websocket: Target WebSocket
-            message: Message to send
+            frame: JSON text produced by encode_message
             connection_id: Connection identifier for logging
 
         Returns:
@@ -174,8 +274,8 @@ class ConnectionManager:
         """
         try:
             await asyncio.wait_for(
-                websocket.send_json(message),
-                timeout=2.0
+                websocket.send_text(frame),
+                timeout=self._send_timeout_seconds
             )
             return True
         except asyncio.TimeoutError:
@@ -209,11 +309,11 @@ class ConnectionManager:
                 if conn_id in self.active_connections:
                     del self.active_connections[conn_id]
                     removed_count += 1
+                channel = self._channels.pop(conn_id, None)
+                if channel:
+                    self._close_channel(channel)
                 self._dead_connections.discard(conn_id)
 
-            if removed_count > 0:
-                self._generation_counter += 1
-
         if removed_count > 0:
             logger.debug(f"Cleaned up {removed_count} dead WebSocket connections")
 
@@ -245,6 +345,36 @@ class ConnectionManager:
         async with self._lock:
             return len(self.active_connections)
 
+    def get_stats(self) -> Dict[str, Any]:
+        """Get fan-out statistics: per-connection queue depth and broadcast-duration percentiles."""
+        samples = sorted(self._broadcast_durations_ms)
+
+        def percentile(p: float) -> float:
+            if not samples:
+                return 0.0
+            return round(samples[min(len(samples) - 1, int(p * len(samples)))], 3)
+
+        return {
+            **self._stats,
+            "encoder": "orjson" if ORJSON_AVAILABLE else "json",
+            "broadcast_duration_ms": {
+                "p50": percentile(0.50),
+                "p95": percentile(0.95),
+                "p99": percentile(0.99),
+                "max": round(samples[-1], 3) if samples else 0.0,
+            },
+            "connections": {
+                conn_id: {
+                    "queue_depth": len(channel.queue),
+                    "sent": channel.sent,
+                    "dropped": channel.dropped,
+                    "failed": channel.failed,
+                    "dead": conn_id in self._dead_connections,
+                }
+                for conn_id, channel in self._channels.items()
+            },
+        }
+
     async def shutdown(self) -> None:
         """Gracefully shutdown connection manager."""
         logger.debug("Shutting down WebSocket ConnectionManager")
@@ -258,7 +388,13 @@ class ConnectionManager:
 
         async with self._lock:
             connection_count = len(self.active_connections)
+            channels = list(self._channels.values())
             self.active_connections.clear()
+            self._channels.clear()
             self._dead_connections.clear()
 
+        for channel in channels:
+            self._close_channel(channel)
+        await asyncio.gather(*(c.task for c in channels if c.task), return_exceptions=True)
+
         logger.debug(f"ConnectionManager shutdown complete ({connection_count} connections closed)")
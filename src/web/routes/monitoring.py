@@ -1,7 +1,7 @@
 """Emergency control routes kept after removing system health endpoints."""
 
 import os
-from typing import Dict
+from typing import Any, Dict
 
 from fastapi import APIRouter, Depends, Request
 from slowapi import Limiter
@@ -9,6 +9,7 @@ from slowapi.util import get_remote_address
 
 from src.core.di import DependencyContainer
 from src.core.errors import TradingError
+from src.core.rate_limiter import get_rate_limiter
 from ..dependencies import get_container
 from ..utils.error_handlers import handle_trading_error, handle_unexpected_error
 
@@ -66,3 +67,14 @@ async def emergency_resume(request: Request, container: DependencyContainer = De
         return await handle_trading_error(e)
     except Exception as e:
         return await handle_unexpected_error(e, "emergency_resume")
+
+
+@router.get("/monitoring/rate-limits")
+@limiter.limit(default_limit)
+async def rate_limit_utilization(request: Request) -> Dict[str, Any]:
+    """Live token-bucket utilization, queue depth and wait times per provider endpoint."""
+
+    try:
+        return {"status": "success", "endpoints": get_rate_limiter().get_stats()}
+    except Exception as e:
+        return await handle_unexpected_error(e, "rate_limit_utilization")
@@ -1,7 +1,17 @@
-from typing import Dict, Any, Optional, List
-import json
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime, timezone
 
+# Marker key for keyed-list operations inside a partial update
+LIST_OPS = "__list_ops__"
+
+# Fields that identify list items, in preference order (positions by trade_id, orders by id)
+LIST_KEY_FIELDS = ("trade_id", "order_id", "id", "symbol")
+
+# Items carrying this field are compared by stamp alone; producers bump it on change
+VERSION_FIELD = "_version"
+
+_UNCHANGED = object()
+
 
 class WebSocketDiffer:
     """
@@ -9,6 +19,12 @@ class WebSocketDiffer:
 
     Compares current and previous data states to send only changed fields,
     significantly reducing bandwidth and improving performance.
+
+    Cost is proportional to what changed rather than total state size:
+    subtrees shared by identity between the two states are skipped, items
+    with equal ``_version`` stamps are skipped, and lists of dicts keyed by
+    ``trade_id`` / ``order_id`` / ``id`` / ``symbol`` are diffed per item
+    into insert/update/remove ops instead of being resent whole.
     """
 
     @staticmethod
@@ -24,31 +40,8 @@ class WebSocketDiffer:
         if previous is None:
             return {"type": "full_update", "data": current, "timestamp": datetime.now(timezone.utc).isoformat()}
 
-        diff = {}
-        changed = False
-
-        for key, current_value in current.items():
-            previous_value = previous.get(key)
-
-            if isinstance(current_value, dict) and isinstance(previous_value, dict):
-                nested_diff = WebSocketDiffer._diff_dict(previous_value, current_value)
-                if nested_diff:
-                    diff[key] = nested_diff
-                    changed = True
-            elif isinstance(current_value, list) and isinstance(previous_value, list):
-                if not WebSocketDiffer._lists_equal(previous_value, current_value):
-                    diff[key] = current_value
-                    changed = True
-            elif current_value != previous_value:
-                diff[key] = current_value
-                changed = True
-
-        for key in previous:
-            if key not in current:
-                diff[key] = None
-                changed = True
-
-        if not changed:
+        diff = WebSocketDiffer._diff_dict(previous, current)
+        if not diff:
             return {}
 
         return {
@@ -57,42 +50,100 @@ class WebSocketDiffer:
             "timestamp": datetime.now(timezone.utc).isoformat()
         }
 
+    @staticmethod
+    def _diff_value(previous: Any, current: Any) -> Any:
+        """Diff one value; returns _UNCHANGED or the payload to send."""
+        if current is previous:
+            return _UNCHANGED
+
+        if isinstance(current, dict) and isinstance(previous, dict):
+            if WebSocketDiffer._same_version(previous, current):
+                return _UNCHANGED
+            nested_diff = WebSocketDiffer._diff_dict(previous, current)
+            return nested_diff if nested_diff else _UNCHANGED
+
+        if isinstance(current, list) and isinstance(previous, list):
+            key_field = WebSocketDiffer._list_key(previous, current)
+            if key_field is not None:
+                ops = WebSocketDiffer._diff_keyed_list(previous, current, key_field)
+                return {LIST_OPS: ops} if ops else _UNCHANGED
+            return _UNCHANGED if current == previous else current
+
+        return _UNCHANGED if current == previous else current
+
     @staticmethod
     def _diff_dict(previous: Dict, current: Dict) -> Optional[Dict]:
         """Recursively diff nested dictionaries."""
         diff = {}
-        changed = False
 
         for key, current_value in current.items():
-            previous_value = previous.get(key)
-
-            if isinstance(current_value, dict) and isinstance(previous_value, dict):
-                nested_diff = WebSocketDiffer._diff_dict(previous_value, current_value)
-                if nested_diff:
-                    diff[key] = nested_diff
-                    changed = True
-            elif isinstance(current_value, list) and isinstance(previous_value, list):
-                if not WebSocketDiffer._lists_equal(previous_value, current_value):
-                    diff[key] = current_value
-                    changed = True
-            elif current_value != previous_value:
-                diff[key] = current_value
-                changed = True
+            value_diff = WebSocketDiffer._diff_value(previous.get(key), current_value)
+            if value_diff is not _UNCHANGED:
+                diff[key] = value_diff
 
         for key in previous:
             if key not in current:
                 diff[key] = None
-                changed = True
 
-        return diff if changed else None
+        return diff or None
+
+    @staticmethod
+    def _same_version(previous: Dict, current: Dict) -> bool:
+        stamp = current.get(VERSION_FIELD)
+        return stamp is not None and stamp == previous.get(VERSION_FIELD)
+
+    @staticmethod
+    def _list_key(previous: List, current: List) -> Optional[str]:
+        """Return the field that uniquely identifies the items of each list, if any."""
+        items = previous + current
+        if not items or not all(isinstance(item, dict) for item in items):
+            return None
+        for field in LIST_KEY_FIELDS:
+            if all(item.get(field) is not None for item in items):
+                if WebSocketDiffer._unique(previous, field) and WebSocketDiffer._unique(current, field):
+                    return field
+        return None
+
+    @staticmethod
+    def _unique(items: List[Dict], field: str) -> bool:
+        keys = [item[field] for item in items]
+        return len(set(keys)) == len(keys)
 
     @staticmethod
-    def _lists_equal(list1: List, list2: List) -> bool:
-        """Compare two lists for equality with proper serialization."""
-        try:
-            return json.dumps(list1, sort_keys=True, default=str) == json.dumps(list2, sort_keys=True, default=str)
-        except (TypeError, ValueError):
-            return list1 == list2
+    def _diff_keyed_list(previous: List[Dict], current: List[Dict], key_field: str) -> Optional[Dict[str, Any]]:
+        """Insert/update/remove ops between two lists of dicts keyed by key_field."""
+        previous_by_key = {item[key_field]: item for item in previous}
+        current_keys = [item[key_field] for item in current]
+
+        inserts: List[Tuple[int, Dict]] = []
+        updates: Dict[Any, Dict] = {}
+        for index, item in enumerate(current):
+            key = item[key_field]
+            previous_item = previous_by_key.get(key)
+            if previous_item is None:
+                inserts.append((index, item))
+                continue
+            item_diff = WebSocketDiffer._diff_value(previous_item, item)
+            if item_diff is not _UNCHANGED:
+                updates[key] = item_diff
+
+        current_key_set = set(current_keys)
+        removes = [key for key in previous_by_key if key not in current_key_set]
+
+        ops: Dict[str, Any] = {"key": key_field}
+        if inserts:
+            ops["insert"] = [{"index": index, "item": item} for index, item in inserts]
+        if updates:
+            ops["update"] = [{"key": key, "changes": changes} for key, changes in updates.items()]
+        if removes:
+            ops["remove"] = removes
+
+        # Only ship the ordering when surviving items moved relative to each other
+        surviving = [key for key in previous_by_key if key in current_key_set]
+        if surviving != [key for key in current_keys if key in previous_by_key]:
+            ops["order"] = current_keys
+
+        return ops if len(ops) > 1 else None
 
     @staticmethod
     def apply_diff(base: Dict[str, Any], diff: Dict[str, Any]) -> Dict[str, Any]:
@@ -105,21 +156,18 @@ class WebSocketDiffer:
             return diff["data"]
 
         if diff.get("type") == "partial_update":
-            result = base.copy()
-            changes = diff.get("changes", {})
-
-            for key, value in changes.items():
-                if value is None:
-                    result.pop(key, None)
-                elif isinstance(value, dict) and isinstance(result.get(key), dict):
-                    result[key] = WebSocketDiffer._merge_dict(result[key], value)
-                else:
-                    result[key] = value
-
-            return result
+            return WebSocketDiffer._merge_dict(base, diff.get("changes", {}))
 
         return base
 
+    @staticmethod
+    def _merge_value(base: Any, update: Any) -> Any:
+        if isinstance(update, dict) and LIST_OPS in update and isinstance(base, list):
+            return WebSocketDiffer._apply_list_ops(base, update[LIST_OPS])
+        if isinstance(update, dict) and isinstance(base, dict):
+            return WebSocketDiffer._merge_dict(base, update)
+        return update
+
     @staticmethod
     def _merge_dict(base: Dict, update: Dict) -> Dict:
         """Recursively merge update into base dictionary."""
@@ -128,9 +176,31 @@ class WebSocketDiffer:
         for key, value in update.items():
             if value is None:
                 result.pop(key, None)
-            elif isinstance(value, dict) and isinstance(result.get(key), dict):
-                result[key] = WebSocketDiffer._merge_dict(result[key], value)
             else:
-                result[key] = value
+                result[key] = WebSocketDiffer._merge_value(result.get(key), value)
 
         return result
+
+    @staticmethod
+    def _apply_list_ops(base: List[Dict], ops: Dict[str, Any]) -> List[Dict]:
+        """Apply keyed-list insert/update/remove ops produced by _diff_keyed_list."""
+        key_field = ops["key"]
+        removed = set(ops.get("remove", ()))
+        items = [item for item in base if item.get(key_field) not in removed]
+
+        updates = {update["key"]: update["changes"] for update in ops.get("update", ())}
+        if updates:
+            items = [
+                WebSocketDiffer._merge_value(item, updates[item[key_field]]) if item[key_field] in updates else item
+                for item in items
+            ]
+
+        for insert in ops.get("insert", ()):
+            items.insert(insert["index"], insert["item"])
+
+        order = ops.get("order")
+        if order is not None:
+            by_key = {item[key_field]: item for item in items}
+            items = [by_key[key] for key in order if key in by_key]
+
+        return items
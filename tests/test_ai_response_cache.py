@@ -0,0 +1,160 @@
+"""
+Tests for the persistent AI response cache and its runtime integrations.
+
+A local fake runtime counts model round-trips so cache hits are observable
+without the Codex sidecar.
+"""
+
+from types import SimpleNamespace
+
+import aiosqlite
+import pytest
+
+from src.models.agent_artifacts import ResearchPacket
+from src.services.claude_agent.agent_artifact_service import AgentArtifactService
+from src.services.codex_runtime_client import CodexRuntimeClient
+from src.stores.ai_response_cache_store import AIResponseCacheStore, response_digest
+
+
+@pytest.fixture
+async def cache():
+    conn = await aiosqlite.connect(":memory:")
+    store = AIResponseCacheStore(conn, max_entries=3)
+    await store.initialize()
+    yield store
+    await conn.close()
+
+
+class _FakeRuntime:
+    """Stands in for the Codex sidecar and counts model calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def run_focused_research(self, payload):
+        self.calls += 1
+        return {
+            "research": {
+                "research_id": f"r-{self.calls}",
+                "candidate_id": "cand-1",
+                "account_id": "paper_main",
+                "symbol": "TCS",
+                "thesis": "test",
+                "evidence": [],
+                "risks": [],
+                "invalidation": "x",
+                "confidence": 0.5,
+                "next_step": "y",
+            },
+            "provider_metadata": {"provider": "codex", "model": payload["model"]},
+        }
+
+
+class _Container:
+    def __init__(self, services):
+        self._services = services
+
+    async def get(self, name):
+        if name not in self._services:
+            raise KeyError(name)
+        return self._services[name]
+
+
+def _service(runtime, cache):
+    service = AgentArtifactService(_Container({"codex_runtime_client": runtime, "ai_response_cache": cache}))
+    service.container.config = SimpleNamespace(
+        ai_runtime=SimpleNamespace(codex_model="gpt-5.4", codex_reasoning_light="low", codex_reasoning_deep="medium"),
+        project_dir="/tmp",
+    )
+    return service
+
+
+@pytest.mark.asyncio
+async def test_store_expires_invalidates_and_evicts_least_recently_used(cache):
+    key = response_digest("decision", "system", "prompt", {"type": "object"}, "gpt-5.4")
+    assert key == response_digest("decision", "system", "prompt", {"type": "object"}, "gpt-5.4")
+    assert key != response_digest("decision", "system", "prompt", {"type": "object"}, "gpt-5-mini")
+
+    await cache.put("expired", role="decision", response={"v": 0}, ttl_seconds=-1)
+    assert await cache.get("expired") is None
+
+    await cache.put("marked", role="decision", response={"v": 1}, freshness="price-100")
+    assert await cache.get("marked", freshness="price-101") is None
+    assert await cache.get("marked", freshness="price-100") is None  # stale entry was dropped
+
+    for name in ("a", "b", "c"):
+        await cache.put(name, role="research", response={"v": name}, symbols=[f"sym_{name}"])
+    assert await cache.get("a") == {"v": "a"}  # refresh "a" so "b" is least recently used
+    await cache.put("d", role="research", response={"v": "d"})
+    assert await cache.get("b") is None
+    assert await cache.get("a") == {"v": "a"}
+
+    assert await cache.invalidate_symbols(["SYM_A"]) == 1
+    assert await cache.get("a") is None
+
+    stats = cache.get_stats()
+    assert stats["expired"] == 1
+    assert stats["stale"] == 1
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 2
+
+
+@pytest.mark.asyncio
+async def test_run_structured_reuses_cached_response_until_market_inputs_change(cache, monkeypatch):
+    client = CodexRuntimeClient("http://127.0.0.1:8765", response_cache=cache)
+    calls = []
+
+    async def _fake_request(method, path, *, json_body=None, timeout_seconds=None):
+        calls.append(json_body)
+        return {"output": {"score": len(calls)}}
+
+    monkeypatch.setattr(client, "_request_json", _fake_request)
+    request = {
+        "system_prompt": "system",
+        "prompt": "score INFY",
+        "output_schema": {"type": "object", "properties": {"score": {"type": "number"}}},
+        "model": "gpt-5-mini",
+    }
+
+    first = await client.run_structured(**request, market_inputs={"INFY": 1500.0})
+    second = await client.run_structured(**request, market_inputs={"INFY": 1500.0})
+    moved = await client.run_structured(**request, market_inputs={"INFY": 1512.5})
+    uncached = await client.run_structured(**request, cache_role=None)
+
+    assert first["output"] == second["output"] == {"score": 1}
+    assert second["cache_hit"] is True
+    assert moved["output"] == {"score": 2}
+    assert uncached["output"] == {"score": 3}
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_structured_role_and_research_packets_survive_a_restart(cache):
+    runtime = _FakeRuntime()
+    service = _service(runtime, cache)
+    role_kwargs = dict(
+        client_type="agent_research_paper_main",
+        role_name="research",
+        system_prompt="system",
+        prompt="prompt",
+        output_model=ResearchPacket,
+        allowed_tools=[],
+        session_id="research:paper_main:cand-1",
+        symbols=["TCS"],
+    )
+
+    first, _ = await service._run_structured_role(**role_kwargs)
+    await service._store_research("paper_main", first)
+
+    restarted = _service(runtime, cache)
+    second, metadata = await restarted._run_structured_role(**role_kwargs)
+    packet = await restarted._get_cached_research("paper_main", candidate_id=None, symbol="tcs")
+
+    assert runtime.calls == 1
+    assert second.research_id == first.research_id
+    assert metadata["response_cache"] == "hit"
+    assert packet is not None and packet.research_id == first.research_id
+
+    await cache.invalidate_symbols(["TCS"])
+    await _service(runtime, cache)._run_structured_role(**role_kwargs)
+    assert runtime.calls == 2
@@ -135,7 +135,7 @@ async def test_codex_runtime_client_validate_runtime_hits_validation_endpoint(mo
         async def __aexit__(self, exc_type, exc, tb):
             return None
 
-        async def request(self, method, url, json=None):
+        async def request(self, method, url, json=None, timeout=None):
             captured["method"] = method
             captured["url"] = url
             captured["json"] = json
@@ -155,3 +155,48 @@ async def test_codex_runtime_client_validate_runtime_hits_validation_endpoint(mo
         "json": {"timeout_seconds": 12.0},
     }
     assert payload["status"] == "ready"
+
+
+@pytest.mark.asyncio
+async def test_codex_runtime_client_reuses_one_http_client_across_requests(monkeypatch):
+    created = []
+
+    class _Response:
+        status_code = 200
+
+        def json(self):
+            return {"status": "ready"}
+
+    class _AsyncClient:
+        def __init__(self, *args, **kwargs):
+            self.is_closed = False
+            self.timeouts = []
+            created.append(self)
+
+        async def request(self, method, url, json=None, timeout=None):
+            self.timeouts.append(timeout)
+            return _Response()
+
+        async def aclose(self):
+            self.is_closed = True
+
+    monkeypatch.setattr(
+        "src.services.codex_runtime_client.httpx.AsyncClient",
+        _AsyncClient,
+    )
+
+    client = CodexRuntimeClient("http://127.0.0.1:8765", timeout_seconds=12.0)
+    await client.get_health()
+    await client.validate_runtime(timeout_seconds=30.0)
+
+    assert len(created) == 1
+    assert created[0].timeouts == [12.0, 30.0]
+
+    await client.close()
+    assert created[0].is_closed is True
+
+    shared = _AsyncClient()
+    borrowing = CodexRuntimeClient("http://127.0.0.1:8765", http_client=shared)
+    await borrowing.get_health()
+    await borrowing.close()
+    assert shared.is_closed is False
@@ -0,0 +1,124 @@
+import asyncio
+import json
+
+import pytest
+
+from src.web import connection_manager as connection_manager_module
+from src.web.broadcast_health_monitor import BroadcastHealthMonitor
+from src.web.connection_manager import ConnectionManager
+
+
+class _FakeWebSocket:
+    def __init__(self, gate: asyncio.Event = None):
+        self.gate = gate
+        self.frames = []
+
+    async def accept(self):
+        return None
+
+    async def send_text(self, frame: str):
+        if self.gate is not None:
+            await self.gate.wait()
+        self.frames.append(json.loads(frame))
+
+
+@pytest.mark.asyncio
+async def test_broadcast_encodes_once_and_delivers_to_every_connection(monkeypatch):
+    calls = []
+    real_encode = connection_manager_module.encode_message
+
+    def _counting_encode(message):
+        calls.append(message)
+        return real_encode(message)
+
+    monkeypatch.setattr(connection_manager_module, "encode_message", _counting_encode)
+    manager = ConnectionManager()
+    sockets = [_FakeWebSocket() for _ in range(5)]
+    for index, websocket in enumerate(sockets):
+        await manager.connect(websocket, client_id=f"client_{index}")
+
+    try:
+        result = await manager.broadcast({"type": "tick", "price": 101.5})
+        assert await manager.drain(timeout=1.0)
+    finally:
+        await manager.shutdown()
+
+    assert len(calls) == 1
+    assert result.queued_sends == 5
+    assert manager.get_stats()["frames_sent"] == 5
+    assert all(websocket.frames == [{"type": "tick", "price": 101.5}] for websocket in sockets)
+
+
+@pytest.mark.asyncio
+async def test_slow_consumer_drops_oldest_without_blocking_others():
+    manager = ConnectionManager(send_queue_size=2)
+    gate = asyncio.Event()
+    slow, fast = _FakeWebSocket(gate), _FakeWebSocket()
+    await manager.connect(slow, client_id="slow")
+    await manager.connect(fast, client_id="fast")
+
+    try:
+        for index in range(6):
+            await asyncio.wait_for(manager.broadcast({"seq": index}), timeout=0.5)
+            await asyncio.sleep(0)
+
+        stats = manager.get_stats()
+        assert stats["connections"]["slow"]["dropped"] > 0
+        assert stats["connections"]["slow"]["queue_depth"] == 2
+        assert [frame["seq"] for frame in fast.frames] == list(range(6))
+
+        gate.set()
+        assert await manager.drain(timeout=1.0)
+    finally:
+        await manager.shutdown()
+
+    # The slow client catches up with the newest frames; superseded ones are gone.
+    assert slow.frames[-1] == {"seq": 5}
+    assert len(slow.frames) < 6
+
+
+class _ClosedWebSocket(_FakeWebSocket):
+    async def send_text(self, frame: str):
+        raise RuntimeError("websocket is closed")
+
+
+@pytest.mark.asyncio
+async def test_failed_sender_reports_lost_frames_and_dead_connection():
+    manager = ConnectionManager()
+    await manager.connect(_ClosedWebSocket(), client_id="closed")
+    live = _FakeWebSocket()
+    await manager.connect(live, client_id="live")
+
+    try:
+        await manager.broadcast({"seq": 0})
+        assert await manager.drain(timeout=1.0)
+        result = await manager.broadcast({"seq": 1})
+        assert await manager.drain(timeout=1.0)
+        stats = manager.get_stats()
+    finally:
+        await manager.shutdown()
+
+    assert (result.total_connections, result.queued_sends, result.dead_connections) == (2, 1, 1)
+    assert (stats["frames_sent"], stats["frames_failed"], stats["dead_connections"]) == (2, 1, 1)
+    assert stats["connections"]["closed"]["dead"] is True
+    assert [frame["seq"] for frame in live.frames] == [0, 1]
+
+
+@pytest.mark.asyncio
+async def test_health_monitor_reports_fanout_stats_and_percentiles():
+    manager = ConnectionManager()
+    await manager.connect(_FakeWebSocket(), client_id="client_0")
+    monitor = BroadcastHealthMonitor(manager.broadcast, connection_stats_provider=manager.get_stats)
+
+    try:
+        for index in range(10):
+            assert await monitor.broadcast({"seq": index})
+        await manager.drain(timeout=1.0)
+        metrics = monitor.get_health_metrics()
+    finally:
+        await manager.shutdown()
+
+    assert set(metrics["broadcast_time_percentiles"]) == {"p50", "p95", "p99"}
+    assert metrics["connection_queue_depths"] == {"client_0": 0}
+    assert metrics["fanout"]["frames_encoded"] == 10
+    assert metrics["fanout"]["broadcast_duration_ms"]["p99"] >= metrics["fanout"]["broadcast_duration_ms"]["p50"]
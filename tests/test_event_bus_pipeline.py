@@ -0,0 +1,310 @@
+import asyncio
+import sqlite3
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from src.config import Config, EventBusConfig
+from src.core.event_bus import Event, EventBus, EventHandler, EventType
+from src.core.event_pipeline import EventDurability
+
+
+class _RecordingHandler(EventHandler):
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.events = []
+
+    async def handle_event(self, event: Event) -> None:
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.events.append(event)
+
+
+def _config(tmp_path: Path, **event_bus) -> Config:
+    return Config(
+        state_dir=tmp_path / "state",
+        logs_dir=tmp_path / "logs",
+        project_dir=tmp_path,
+        event_bus=EventBusConfig(pipeline_enabled=True, **event_bus),
+    )
+
+
+def _event(event_type: EventType, **data) -> Event:
+    return Event(
+        id=str(uuid.uuid4()),
+        type=event_type,
+        timestamp=datetime.now(timezone.utc).isoformat(),
+        source="test",
+        data=data,
+    )
+
+
+def _event_rows(bus: EventBus):
+    conn = sqlite3.connect(bus.db_path)
+    try:
+        return conn.execute("SELECT type, status FROM events ORDER BY rowid").fetchall()
+    finally:
+        conn.close()
+
+
+@pytest.mark.asyncio
+async def test_pipeline_publish_does_not_wait_for_slow_handlers(tmp_path: Path):
+    bus = EventBus(_config(tmp_path))
+    await bus.initialize()
+    handler = _RecordingHandler(delay=0.2)
+    bus.subscribe(EventType.PORTFOLIO_PNL_UPDATE, handler)
+
+    try:
+        started = asyncio.get_running_loop().time()
+        for index in range(5):
+            await bus.publish(_event(EventType.PORTFOLIO_PNL_UPDATE, index=index))
+        elapsed = asyncio.get_running_loop().time() - started
+
+        assert elapsed < 0.1
+        assert bus.get_metrics()["queue_depths"]["portfolio.pnl_update"] >= 4
+    finally:
+        await bus.close()
+
+    assert [event.data["index"] for event in handler.events] == [0, 1, 2, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_pipeline_applies_per_type_durability(tmp_path: Path):
+    bus = EventBus(_config(tmp_path, flush_interval_ms=10_000))
+    await bus.initialize()
+
+    try:
+        assert bus.durability_for(EventType.MARKET_PRICE_UPDATE) is EventDurability.NONE
+        assert bus.durability_for(EventType.EXECUTION_ORDER_FILLED) is EventDurability.SYNC
+        assert bus.durability_for(EventType.PORTFOLIO_PNL_UPDATE) is EventDurability.BATCHED
+
+        await bus.publish(_event(EventType.MARKET_PRICE_UPDATE, symbol="INFY"))
+        await bus.publish(_event(EventType.EXECUTION_ORDER_FILLED, symbol="INFY"))
+        await bus.publish(_event(EventType.PORTFOLIO_PNL_UPDATE, pnl=10.0))
+
+        # Only the sync event is committed before the write-behind flush runs.
+        assert _event_rows(bus) == [("execution.order_filled", "pending")]
+
+        await bus.flush()
+        assert _event_rows(bus) == [
+            ("execution.order_filled", "pending"),
+            ("portfolio.pnl_update", "pending"),
+        ]
+    finally:
+        await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_pipeline_batches_processed_marks_and_honours_overrides(tmp_path: Path):
+    bus = EventBus(_config(tmp_path, durability={"market.price_update": "batched"}))
+    await bus.initialize()
+    handler = _RecordingHandler()
+    bus.subscribe(EventType.MARKET_PRICE_UPDATE, handler)
+
+    try:
+        for index in range(20):
+            await bus.publish(_event(EventType.MARKET_PRICE_UPDATE, index=index))
+    finally:
+        await bus.close()
+
+    rows = _event_rows(bus)
+    assert len(handler.events) == 20
+    assert len(rows) == 20
+    assert {status for _, status in rows} == {"processed"}
+
+    metrics = bus.get_metrics()
+    assert metrics["mode"] == "pipeline"
+    assert metrics["events_published"] == 20
+    assert metrics["flushes"] < 20
+
+
+@pytest.mark.asyncio
+async def test_pipeline_ring_drops_oldest_non_durable_events(tmp_path: Path):
+    bus = EventBus(_config(tmp_path, queue_maxsize=2))
+    await bus.initialize()
+    gate = asyncio.Event()
+
+    class _BlockedHandler(EventHandler):
+        def __init__(self):
+            self.seen = []
+
+        async def handle_event(self, event: Event) -> None:
+            await gate.wait()
+            self.seen.append(event.data["index"])
+
+    handler = _BlockedHandler()
+    bus.subscribe(EventType.MARKET_PRICE_UPDATE, handler)
+
+    try:
+        for index in range(6):
+            await bus.publish(_event(EventType.MARKET_PRICE_UPDATE, index=index))
+            await asyncio.sleep(0)
+        gate.set()
+    finally:
+        await bus.close()
+
+    assert handler.seen[-1] == 5
+    assert bus.get_metrics()["events_dropped"] > 0
+
+
+@pytest.mark.asyncio
+async def test_pipeline_flush_failure_keeps_buffered_rows(tmp_path: Path):
+    bus = EventBus(_config(tmp_path, flush_interval_ms=10_000))
+    await bus.initialize()
+
+    try:
+        await bus.publish(_event(EventType.PORTFOLIO_PNL_UPDATE, pnl=1.0))
+        await bus.publish(_event(EventType.PORTFOLIO_PNL_UPDATE, pnl=2.0))
+
+        connection = bus._db_connection
+        real_executemany = connection.executemany
+
+        async def _failing_executemany(*args, **kwargs):
+            raise sqlite3.OperationalError("disk I/O error")
+
+        connection.executemany = _failing_executemany
+        with pytest.raises(sqlite3.OperationalError):
+            await bus.flush()
+        assert bus.get_metrics()["pending_inserts"] == 2
+        assert _event_rows(bus) == []
+
+        connection.executemany = real_executemany
+        await bus.flush()
+        assert len(_event_rows(bus)) == 2
+        assert bus.get_metrics()["pending_inserts"] == 0
+    finally:
+        await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_pipeline_caps_buffered_rows_while_flushes_fail(tmp_path: Path):
+    bus = EventBus(_config(tmp_path, flush_interval_ms=10_000, flush_batch_size=2, max_pending_inserts=3))
+    await bus.initialize()
+
+    try:
+        connection = bus._db_connection
+        real_executemany = connection.executemany
+
+        async def _failing_executemany(*args, **kwargs):
+            raise sqlite3.OperationalError("disk I/O error")
+
+        connection.executemany = _failing_executemany
+        for pnl in range(10):
+            # Publishers flush the full buffer themselves; the failure is absorbed
+            await bus.publish(_event(EventType.PORTFOLIO_PNL_UPDATE, pnl=float(pnl)))
+            assert bus.get_metrics()["pending_inserts"] <= 3
+
+        metrics = bus.get_metrics()
+        assert metrics["inserts_dropped"] > 0
+        assert metrics["pending_inserts"] + metrics["inserts_dropped"] == 10
+
+        connection.executemany = real_executemany
+        await bus.flush()
+        assert len(_event_rows(bus)) == metrics["pending_inserts"]
+    finally:
+        await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_direct_mode_failed_handler_is_recorded_under_the_write_lock(tmp_path: Path):
+    bus = EventBus(Config(state_dir=tmp_path / "state", logs_dir=tmp_path / "logs", project_dir=tmp_path))
+    await bus.initialize()
+
+    class _FailingHandler(EventHandler):
+        async def handle_event(self, event: Event) -> None:
+            assert not bus._write_lock.locked()
+            raise RuntimeError("boom")
+
+    bus.subscribe(EventType.PORTFOLIO_PNL_UPDATE, _FailingHandler())
+
+    try:
+        await asyncio.wait_for(bus.publish(_event(EventType.PORTFOLIO_PNL_UPDATE, pnl=1.0)), timeout=2.0)
+    finally:
+        await bus.close()
+
+    conn = sqlite3.connect(bus.db_path)
+    try:
+        rows = conn.execute("SELECT status, retry_count FROM events").fetchall()
+    finally:
+        conn.close()
+    assert rows == [("pending", 1)]
+
+
+@pytest.mark.asyncio
+async def test_pipeline_close_is_bounded_by_drain_timeout(tmp_path: Path):
+    bus = EventBus(_config(tmp_path, shutdown_drain_timeout_seconds=0.1))
+    await bus.initialize()
+    never = asyncio.Event()
+
+    class _HungHandler(EventHandler):
+        async def handle_event(self, event: Event) -> None:
+            await never.wait()
+
+    bus.subscribe(EventType.PORTFOLIO_PNL_UPDATE, _HungHandler())
+    await bus.publish(_event(EventType.PORTFOLIO_PNL_UPDATE, pnl=1.0))
+    await bus.publish(_event(EventType.PORTFOLIO_PNL_UPDATE, pnl=2.0))
+
+    await asyncio.wait_for(bus.close(), timeout=2.0)
+
+    # Undispatched durable events remain pending for replay.
+    assert [status for _, status in _event_rows(bus)] == ["pending", "pending"]
+
+
+@pytest.mark.asyncio
+async def test_pipeline_event_with_failed_handler_is_not_marked_processed(tmp_path: Path):
+    bus = EventBus(_config(tmp_path))
+    await bus.initialize()
+
+    class _FailingHandler(EventHandler):
+        async def handle_event(self, event: Event) -> None:
+            raise RuntimeError("boom")
+
+    succeeding = _RecordingHandler()
+    bus.subscribe(EventType.PORTFOLIO_PNL_UPDATE, succeeding)
+    bus.subscribe(EventType.PORTFOLIO_PNL_UPDATE, _FailingHandler())
+
+    try:
+        await bus.publish(_event(EventType.PORTFOLIO_PNL_UPDATE, pnl=1.0))
+    finally:
+        await bus.close()
+
+    conn = sqlite3.connect(bus.db_path)
+    try:
+        rows = conn.execute("SELECT status, retry_count FROM events").fetchall()
+    finally:
+        conn.close()
+
+    assert len(succeeding.events) == 1
+    assert rows == [("pending", 1)]
+    assert bus.get_metrics()["events_failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_pipeline_handler_republishing_own_type_does_not_deadlock(tmp_path: Path):
+    bus = EventBus(_config(tmp_path, queue_maxsize=1))
+    await bus.initialize()
+
+    class _Republisher(EventHandler):
+        def __init__(self):
+            self.seen = 0
+
+        async def handle_event(self, event: Event) -> None:
+            self.seen += 1
+            if event.data.get("depth", 0) < 3:
+                for _ in range(3):
+                    await bus.publish(
+                        _event(EventType.PORTFOLIO_PNL_UPDATE, depth=event.data.get("depth", 0) + 1)
+                    )
+
+    handler = _Republisher()
+    bus.subscribe(EventType.PORTFOLIO_PNL_UPDATE, handler)
+
+    await bus.publish(_event(EventType.PORTFOLIO_PNL_UPDATE, depth=0))
+    await asyncio.wait_for(bus.close(), timeout=2.0)
+
+    metrics = bus.get_metrics()
+    assert handler.seen >= 1
+    assert metrics["events_overflowed"] > 0
+    assert len(_event_rows(bus)) == metrics["events_published"]
@@ -0,0 +1,170 @@
+"""Tests for the tick-driven paper trading exit trigger engine."""
+
+import asyncio
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import aiosqlite
+import pytest
+
+from src.config import Config
+from src.core.event_bus import Event, EventBus, EventHandler, EventType
+from src.models.paper_trading import AccountType, RiskLevel, TradeStatus, TradeType
+from src.services.paper_trading.exit_trigger_engine import ExitTriggerEngine
+from src.stores.paper_trading_store import PaperTradingStore
+
+
+@pytest.fixture
+async def store(tmp_path):
+    db = await aiosqlite.connect(str(tmp_path / "paper.db"))
+    trading_store = PaperTradingStore(db)
+    await trading_store.initialize()
+    await trading_store.create_account(
+        account_name="Main",
+        initial_balance=100000.0,
+        strategy_type=AccountType.SWING,
+        risk_level=RiskLevel.MODERATE,
+        max_position_size=5.0,
+        max_portfolio_risk=10.0,
+        account_id="paper_main",
+    )
+    try:
+        yield trading_store
+    finally:
+        await db.close()
+
+
+async def _open(store, symbol, trade_type, stop_loss=None, target_price=None):
+    return await store.create_trade(
+        account_id="paper_main",
+        symbol=symbol,
+        trade_type=trade_type,
+        quantity=10,
+        entry_price=100.0,
+        strategy_rationale="test",
+        claude_session_id="session",
+        stop_loss=stop_loss,
+        target_price=target_price,
+    )
+
+
+def _engine(store):
+    event_bus = MagicMock()
+    event_bus.publish = AsyncMock()
+    return ExitTriggerEngine(event_bus, store), event_bus
+
+
+@pytest.mark.asyncio
+async def test_crossed_levels_fire_in_one_batch(store):
+    long_stop = await _open(store, "INFY", TradeType.BUY, stop_loss=95.0, target_price=110.0)
+    short_target = await _open(store, "INFY", TradeType.SELL, stop_loss=105.0, target_price=96.0)
+    untouched = await _open(store, "INFY", TradeType.BUY, stop_loss=90.0, target_price=120.0)
+    engine, event_bus = _engine(store)
+    assert engine.armed_levels() == 6
+
+    exits = await engine.on_prices({"INFY": 94.0})
+
+    assert {(e["trade_id"], e["reason"]) for e in exits} == {
+        (long_stop.trade_id, "stop_loss"),
+        (short_target.trade_id, "target"),
+    }
+    assert (await store.get_trade(long_stop.trade_id)).status == TradeStatus.STOPPED_OUT
+    closed_short = await store.get_trade(short_target.trade_id)
+    assert closed_short.status == TradeStatus.CLOSED
+    assert closed_short.realized_pnl == pytest.approx(60.0)
+    assert (await store.get_trade(untouched.trade_id)).status == TradeStatus.OPEN
+
+    # Fired levels are disarmed; the same tick again is a no-op.
+    assert engine.armed_levels() == 2
+    assert await engine.on_prices({"INFY": 94.0}) == []
+    await engine.close()
+    assert event_bus.publish.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_gap_through_both_levels_prefers_stop(store):
+    trade = await _open(store, "TCS", TradeType.SELL, stop_loss=105.0, target_price=95.0)
+    engine, _ = _engine(store)
+
+    # With the target re-levelled above the stop, one tick crosses both; the stop wins.
+    await store.update_trade_risk_levels("paper_main", trade.trade_id, target_price=106.0)
+    exits = await engine.on_prices({"TCS": 107.0})
+
+    assert [(e["trade_id"], e["reason"]) for e in exits] == [(trade.trade_id, "stop_loss")]
+
+
+@pytest.mark.asyncio
+async def test_relevel_and_coalesced_event_rearm_ladders(store):
+    trade = await _open(store, "HDFC", TradeType.BUY, stop_loss=90.0)
+    engine, _ = _engine(store)
+
+    await store.update_trade_risk_levels("paper_main", trade.trade_id, stop_loss=98.0)
+    await engine.handle_event(Event(
+        id="evt",
+        type=EventType.MARKET_PRICE_UPDATE,
+        timestamp="2026-01-01T09:15:00+00:00",
+        source="test",
+        data={"updates": [{"symbol": "HDFC", "price": 97.5}, {"symbol": "OTHER", "price": 1.0}]},
+    ))
+
+    assert (await store.get_trade(trade.trade_id)).status == TradeStatus.STOPPED_OUT
+    assert engine.get_stats()["stops_fired"] == 1
+    assert engine.armed_levels() == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_exit_write_rearms_positions(store):
+    trade = await _open(store, "INFY", TradeType.BUY, stop_loss=95.0)
+    engine, _ = _engine(store)
+    store.record_exits = AsyncMock(side_effect=RuntimeError("database is locked"))
+
+    assert await engine.on_prices({"INFY": 94.0}) == []
+    assert engine.get_stats()["exit_failures"] == 1
+    assert engine.evaluate("INFY", 94.0) == [(trade.trade_id, TradeStatus.STOPPED_OUT)]
+
+
+@pytest.mark.asyncio
+async def test_triggered_exits_settle_the_account(store):
+    winner = await _open(store, "INFY", TradeType.BUY, target_price=110.0)
+    loser = await _open(store, "INFY", TradeType.SELL, stop_loss=105.0)
+    # The executor locks each entry's value when it opens the trade
+    await store.update_account_balance("paper_main", 100000.0, 100000.0 - 2 * 1000.0)
+    engine, _ = _engine(store)
+
+    await engine.on_prices({"INFY": 111.0})
+
+    assert (await store.get_trade(winner.trade_id)).realized_pnl == pytest.approx(110.0)
+    assert (await store.get_trade(loser.trade_id)).realized_pnl == pytest.approx(-110.0)
+    account = await store.get_account("paper_main")
+    assert account.current_balance == pytest.approx(100110.0)
+    assert account.buying_power == pytest.approx(100110.0)
+
+
+@pytest.mark.asyncio
+async def test_exits_fired_from_a_direct_mode_bus_handler_are_published(store, tmp_path):
+    bus = EventBus(Config(state_dir=tmp_path / "state", logs_dir=tmp_path / "logs", project_dir=tmp_path))
+    await bus.initialize()
+    lifecycle = asyncio.Event()
+
+    class _LifecycleListener(EventHandler):
+        async def handle_event(self, event: Event) -> None:
+            lifecycle.set()
+
+    bus.subscribe(EventType.TRADE_LIFECYCLE_UPDATE, _LifecycleListener())
+    trade = await _open(store, "INFY", TradeType.BUY, stop_loss=95.0)
+    engine = ExitTriggerEngine(bus, store)
+    try:
+        await asyncio.wait_for(bus.publish(Event(
+            id=str(uuid.uuid4()),
+            type=EventType.MARKET_PRICE_UPDATE,
+            timestamp=datetime.now(timezone.utc).isoformat(),
+            source="test",
+            data={"symbol": "INFY", "price": 94.0},
+        )), timeout=5.0)
+        await asyncio.wait_for(lifecycle.wait(), timeout=5.0)
+    finally:
+        await engine.close()
+        await bus.close()
+
+    assert (await store.get_trade(trade.trade_id)).status == TradeStatus.STOPPED_OUT
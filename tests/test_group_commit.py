@@ -0,0 +1,209 @@
+import asyncio
+import sqlite3
+
+import aiosqlite
+import pytest
+
+from src.config import Config
+from src.core.database_state.base import DatabaseConnection
+from src.core.group_commit import GroupCommitWriter
+from src.models.paper_trading import AccountType, RiskLevel, TradeType
+from src.stores.paper_trading_store import PaperTradingStore
+
+
+class _CountingConnection:
+    """Wraps an aiosqlite connection and counts commits."""
+
+    def __init__(self, db):
+        self.db = db
+        self.commits = 0
+
+    async def execute(self, *args):
+        return await self.db.execute(*args)
+
+    async def executemany(self, *args):
+        return await self.db.executemany(*args)
+
+    async def commit(self):
+        self.commits += 1
+        await self.db.commit()
+
+    async def rollback(self):
+        await self.db.rollback()
+
+
+@pytest.fixture
+async def quotes_db():
+    db = await aiosqlite.connect(":memory:")
+    await db.execute("CREATE TABLE quotes (symbol TEXT PRIMARY KEY, price REAL NOT NULL)")
+    await db.commit()
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+@pytest.mark.asyncio
+async def test_group_writer_commits_on_count_and_interval(quotes_db):
+    connection = _CountingConnection(quotes_db)
+    writer = GroupCommitWriter.for_connection(connection, max_batch=100, max_delay_ms=20)
+
+    for index in range(250):
+        await writer.execute("INSERT OR REPLACE INTO quotes VALUES (?, ?)", (f"SYM{index}", float(index)))
+
+    # Two full batches committed inline; the remaining 50 wait for the interval
+    assert connection.commits == 2
+    assert writer.pending == 50
+    await asyncio.sleep(0.1)
+    assert connection.commits == 3
+    assert writer.pending == 0
+
+    cursor = await quotes_db.execute("SELECT COUNT(*) FROM quotes")
+    assert (await cursor.fetchone())[0] == 250
+    assert writer.get_stats()["statements_per_commit"] == pytest.approx(250 / 3, rel=0.01)
+    await writer.close()
+
+
+@pytest.mark.asyncio
+async def test_group_writer_keeps_locked_batch_for_retry(quotes_db):
+    connection = _CountingConnection(quotes_db)
+    real_commit = connection.commit
+
+    async def _locked_commit():
+        raise sqlite3.OperationalError("database is locked")
+
+    connection.commit = _locked_commit
+    writer = GroupCommitWriter.for_connection(connection, max_batch=10, max_delay_ms=1000)
+    await writer.execute("INSERT INTO quotes VALUES (?, ?)", ("INFY", 1500.0))
+    await writer.execute("INSERT INTO quotes VALUES (?, ?)", ("TCS", 3500.0))
+
+    with pytest.raises(sqlite3.OperationalError):
+        await writer.flush()
+    assert writer.pending == 2
+
+    connection.commit = real_commit
+    await writer.close()
+    cursor = await quotes_db.execute("SELECT COUNT(*) FROM quotes")
+    assert (await cursor.fetchone())[0] == 2
+    assert writer.get_stats()["failed_commits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_group_writer_drops_a_bad_statement_and_commits_the_rest(quotes_db):
+    writer = GroupCommitWriter.for_connection(quotes_db, max_batch=100, max_delay_ms=1000)
+    await writer.execute("INSERT INTO quotes VALUES (?, ?)", ("BAD", None))
+    for index in range(5):
+        await writer.execute("INSERT INTO quotes VALUES (?, ?)", (f"SYM{index}", float(index)))
+        await writer.flush()
+
+    cursor = await quotes_db.execute("SELECT COUNT(*) FROM quotes")
+    assert (await cursor.fetchone())[0] == 5
+    stats = writer.get_stats()
+    assert (stats["rejected"], stats["pending"]) == (1, 0)
+    await writer.close()
+
+
+@pytest.mark.asyncio
+async def test_database_batch_is_all_or_nothing(tmp_path):
+    config = Config(state_dir=tmp_path / "state", logs_dir=tmp_path / "logs", project_dir=tmp_path)
+    database = DatabaseConnection(config)
+    await database.initialize()
+    try:
+        with pytest.raises(RuntimeError):
+            async with database.batch("portfolio") as batch:
+                batch.execute("INSERT INTO learning_insights (insights, created_at) VALUES (?, ?)", ("{}", "t0"))
+                raise RuntimeError("abort")
+
+        async with database.batch("portfolio") as batch:
+            batch.executemany(
+                "INSERT INTO learning_insights (insights, created_at) VALUES (?, ?)",
+                [("{}", f"t{index}") for index in range(20)],
+            )
+
+        async with database.read() as reader:
+            cursor = await reader.execute("SELECT COUNT(*) FROM learning_insights")
+            assert (await cursor.fetchone())[0] == 20
+        assert database.get_query_stats()["stores"]["portfolio"]["write"]["count"] == 1
+    finally:
+        await database.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_store_unit_of_work_commits_once_and_rolls_back_with_index():
+    db = await aiosqlite.connect(":memory:")
+    store = PaperTradingStore(db)
+    await store.initialize()
+    try:
+        account = await store.create_account(
+            account_name="Main",
+            initial_balance=100000.0,
+            strategy_type=AccountType.SWING,
+            risk_level=RiskLevel.MODERATE,
+            max_position_size=5.0,
+            max_portfolio_risk=10.0,
+            account_id="paper_main",
+        )
+        trade = await store.create_trade(
+            account_id=account.account_id, symbol="INFY", trade_type=TradeType.BUY, quantity=10,
+            entry_price=100.0, strategy_rationale="momentum", claude_session_id="s1",
+        )
+
+        with pytest.raises(RuntimeError):
+            async with store.unit_of_work():
+                await store.close_trade(trade.trade_id, exit_price=110.0, realized_pnl=100.0)
+                await store.update_account_balance(account.account_id, 100100.0, 100100.0)
+                raise RuntimeError("settlement failed")
+
+        assert (await store.get_trade(trade.trade_id)).status.value == "open"
+        assert (await store.get_account(account.account_id)).current_balance == 100000.0
+        assert store.open_positions.get(trade.trade_id) is not None
+
+        commits = []
+        real_commit = db.commit
+
+        async def _counting_commit():
+            commits.append(1)
+            await real_commit()
+
+        db.commit = _counting_commit
+        async with store.unit_of_work():
+            await store.close_trade(trade.trade_id, exit_price=110.0, realized_pnl=100.0)
+            await store.update_account_balance(account.account_id, 100100.0, 100100.0)
+            # Reads inside the unit see its uncommitted writes
+            assert (await store.get_account(account.account_id)).current_balance == 100100.0
+
+        assert len(commits) == 1
+        assert store.open_positions.get(trade.trade_id) is None
+    finally:
+        await db.close()
+
+
+@pytest.mark.asyncio
+async def test_tasks_spawned_inside_a_unit_of_work_wait_for_its_lock():
+    db = await aiosqlite.connect(":memory:")
+    store = PaperTradingStore(db)
+    await store.initialize()
+    try:
+        account = await store.create_account(
+            account_name="Main",
+            initial_balance=100000.0,
+            strategy_type=AccountType.SWING,
+            risk_level=RiskLevel.MODERATE,
+            max_position_size=5.0,
+            max_portfolio_risk=10.0,
+            account_id="paper_main",
+        )
+
+        with pytest.raises(RuntimeError):
+            async with store.unit_of_work():
+                await store.update_account_balance(account.account_id, 90000.0, 90000.0)
+                child = asyncio.create_task(store.update_account_balance(account.account_id, 95000.0, 95000.0))
+                await asyncio.sleep(0.05)
+                # The child is not the owner: it waits instead of writing into this transaction
+                assert not child.done()
+                raise RuntimeError("rolled back")
+
+        await child
+        assert (await store.get_account(account.account_id)).current_balance == 95000.0
+    finally:
+        await db.close()
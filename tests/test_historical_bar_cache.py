@@ -0,0 +1,107 @@
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from src.services.historical_bar_cache import HistoricalBarCache, split_range
+from src.stores.bar_store import IST, BarStore, subtract_ranges
+
+
+def _daily_bars(start: date, end: date):
+    bars = []
+    day = start
+    while day <= end:
+        if day.weekday() < 5:
+            close = 100.0 + day.toordinal() % 50
+            bars.append({
+                "date": datetime(day.year, day.month, day.day, tzinfo=IST),
+                "open": close - 1,
+                "high": close + 2,
+                "low": close - 2,
+                "close": close,
+                "volume": 1000 + day.day,
+            })
+        day += timedelta(days=1)
+    return bars
+
+
+class _Broker:
+    def __init__(self):
+        self.calls = []
+
+    async def fetch(self, symbol, from_date, to_date, interval):
+        self.calls.append((symbol, from_date, to_date, interval))
+        return _daily_bars(from_date, to_date)
+
+
+def test_subtract_ranges_returns_only_uncovered_dates():
+    covered = [(date(2026, 3, 5), date(2026, 3, 10)), (date(2026, 3, 15), date(2026, 3, 20))]
+
+    assert subtract_ranges(date(2026, 3, 1), date(2026, 3, 25), covered) == [
+        (date(2026, 3, 1), date(2026, 3, 4)),
+        (date(2026, 3, 11), date(2026, 3, 14)),
+        (date(2026, 3, 21), date(2026, 3, 25)),
+    ]
+    assert subtract_ranges(date(2026, 3, 6), date(2026, 3, 9), covered) == []
+    assert split_range(date(2026, 1, 1), date(2026, 1, 10), 4) == [
+        (date(2026, 1, 1), date(2026, 1, 4)),
+        (date(2026, 1, 5), date(2026, 1, 8)),
+        (date(2026, 1, 9), date(2026, 1, 10)),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_cache_fetches_only_missing_ranges_and_serves_columns(tmp_path):
+    broker = _Broker()
+    cache = HistoricalBarCache(BarStore(tmp_path / "bars"), broker.fetch)
+
+    first = await cache.get_bars("infy", "2026-03-02", "2026-03-13")
+    assert broker.calls == [("INFY", date(2026, 3, 2), date(2026, 3, 13), "day")]
+    assert len(first) == 10
+    assert first.close.dtype == np.float64
+
+    again = await cache.get_bars("INFY", "2026-03-04", "2026-03-11")
+    assert len(broker.calls) == 1
+    assert len(again) == 6
+    assert again.to_records()[0]["date"] == datetime(2026, 3, 4, tzinfo=IST)
+
+    wider = await cache.get_bars("INFY", "2026-02-23", "2026-03-20")
+    assert broker.calls[1:] == [
+        ("INFY", date(2026, 2, 23), date(2026, 3, 1), "day"),
+        ("INFY", date(2026, 3, 14), date(2026, 3, 20), "day"),
+    ]
+    assert np.all(np.diff(wider.timestamps) > 0)
+    assert len(wider) == 20
+
+    stats = cache.get_stats()
+    assert stats["requests"] == 3
+    assert stats["misses"] == 1
+    assert stats["hits"] == 1
+    assert stats["partial_hits"] == 1
+    assert stats["fetches"] == 3
+
+    # Coverage and bars persist for the next process
+    reopened = HistoricalBarCache(BarStore(tmp_path / "bars"), broker.fetch)
+    assert len(await reopened.get_bars("INFY", "2026-02-23", "2026-03-20")) == 20
+    assert len(broker.calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_prefetch_warms_watchlist_and_reports_failures(tmp_path):
+    broker = _Broker()
+
+    async def _fetch(symbol, from_date, to_date, interval):
+        if symbol == "BROKEN":
+            raise RuntimeError("token not found")
+        return await broker.fetch(symbol, from_date, to_date, interval)
+
+    cache = HistoricalBarCache(BarStore(tmp_path / "bars"), _fetch, prefetch_concurrency=2)
+
+    result = await cache.prefetch(["TCS", "INFY", "tcs", "BROKEN"], "2026-03-02", "2026-03-06")
+
+    assert result["bars"] == {"TCS": 5, "INFY": 5}
+    assert list(result["failed"]) == ["BROKEN"]
+    assert sorted(call[0] for call in broker.calls) == ["INFY", "TCS"]
+
+    await cache.prefetch(["TCS", "INFY"], "2026-03-02", "2026-03-06")
+    assert len(broker.calls) == 2
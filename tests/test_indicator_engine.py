@@ -0,0 +1,124 @@
+import math
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from src.config import Config
+from src.services.indicator_engine import IncrementalIndicatorEngine
+from src.services.technical_indicators_service import TechnicalIndicatorsService
+
+
+def _history(bars: int, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    closes = 1000 + np.cumsum(rng.normal(0, 12, bars))
+    start = date(2025, 1, 1)
+    history = []
+    for index, close in enumerate(closes):
+        spread = abs(rng.normal(0, 8))
+        history.append({
+            "date": (start + timedelta(days=index)).isoformat(),
+            "open": float(close - rng.normal(0, 4)),
+            "high": float(close + spread),
+            "low": float(close - spread),
+            "close": float(close),
+            "volume": int(rng.integers(1_000, 100_000)),
+        })
+    return history
+
+
+def _assert_matches(streaming, batch):
+    assert streaming.keys() >= batch.keys()
+    for key, expected in batch.items():
+        actual = streaming[key]
+        if expected is None or (isinstance(expected, float) and math.isnan(expected)):
+            assert actual is None or math.isnan(actual), key
+        else:
+            assert actual == pytest.approx(expected, rel=1e-9, abs=1e-9), key
+
+
+@pytest.mark.parametrize("bars", [30, 45, 120, 400])
+def test_streaming_indicators_match_batch_after_every_bar(bars):
+    history = _history(bars)
+    batch_service = TechnicalIndicatorsService(Config())
+    engine = IncrementalIndicatorEngine()
+
+    engine.seed("INFY", history[:30])
+    _assert_matches(engine.get_indicators("INFY"), batch_service.calculate_all_indicators(history[:30]))
+
+    for index in range(30, bars):
+        bar = history[index]
+        engine.update_bar("INFY", bar["high"], bar["low"], bar["close"], bar["date"])
+        _assert_matches(
+            engine.get_indicators("INFY"),
+            batch_service.calculate_all_indicators(history[: index + 1]),
+        )
+
+
+def test_ticks_preview_the_forming_bar_without_committing_it():
+    history = _history(60)
+    batch_service = TechnicalIndicatorsService(Config())
+    engine = IncrementalIndicatorEngine()
+    engine.seed("TCS", history)
+
+    next_day = (date.fromisoformat(history[-1]["date"]) + timedelta(days=1)).isoformat()
+    for price in (1010.0, 1030.0, 995.0, 1005.0):
+        engine.update_tick("TCS", price, f"{next_day}T05:00:00+00:00")
+
+    forming_bar = {"date": next_day, "open": 1010.0, "high": 1030.0, "low": 995.0, "close": 1005.0, "volume": 0}
+    _assert_matches(
+        engine.get_indicators("TCS"),
+        batch_service.calculate_all_indicators(history + [forming_bar]),
+    )
+
+    # A tick on the following day commits the forming bar and starts a new one.
+    day_after = (date.fromisoformat(next_day) + timedelta(days=1)).isoformat()
+    engine.update_tick("TCS", 1001.0, f"{day_after}T05:00:00+00:00")
+    later_bar = {"date": day_after, "open": 1001.0, "high": 1001.0, "low": 1001.0, "close": 1001.0, "volume": 0}
+    _assert_matches(
+        engine.get_indicators("TCS"),
+        batch_service.calculate_all_indicators(history + [forming_bar, later_bar]),
+    )
+
+
+def test_engine_requires_enough_history():
+    engine = IncrementalIndicatorEngine()
+    engine.seed("SBIN", _history(10))
+
+    assert engine.has_symbol("SBIN") is False
+    assert engine.get_indicators("SBIN") is None
+    assert engine.get_indicators("UNKNOWN") is None
+
+
+def test_universe_indicators_match_per_symbol_batch():
+    service = TechnicalIndicatorsService(Config())
+    histories = {symbol: _history(80, seed=index) for index, symbol in enumerate(["INFY", "TCS", "SBIN"])}
+    symbols = list(histories)
+    highs = np.array([[bar["high"] for bar in histories[s]] for s in symbols])
+    lows = np.array([[bar["low"] for bar in histories[s]] for s in symbols])
+    closes = np.array([[bar["close"] for bar in histories[s]] for s in symbols])
+
+    frame = service.calculate_universe_indicators(symbols, highs, lows, closes)
+
+    assert list(frame.index) == symbols
+    for symbol in symbols:
+        _assert_matches(frame.loc[symbol].to_dict(), service.calculate_all_indicators(histories[symbol]))
+
+
+def test_universe_indicators_handle_rows_padded_for_shorter_history():
+    service = TechnicalIndicatorsService(Config())
+    full, short, tiny = _history(80, seed=1), _history(50, seed=2), _history(10, seed=3)
+
+    def _matrix(field):
+        return np.array([
+            [bar[field] for bar in full],
+            [np.nan] * 30 + [bar[field] for bar in short],
+            [np.nan] * 70 + [bar[field] for bar in tiny],
+        ])
+
+    frame = service.calculate_universe_indicators(
+        ["INFY", "TCS", "SBIN"], _matrix("high"), _matrix("low"), _matrix("close")
+    )
+
+    _assert_matches(frame.loc["TCS"].to_dict(), service.calculate_all_indicators(short))
+    assert frame.loc["SBIN", ["rsi", "macd", "ema_9", "ema_21"]].isna().all()
@@ -0,0 +1,79 @@
+import pytest
+
+from src.services import instrument_master as instrument_master_module
+from src.services.instrument_master import (
+    Instrument,
+    InstrumentIndex,
+    InstrumentMaster,
+    get_instrument_master,
+    parse_kite_instruments_csv,
+)
+from src.services.quote_stream_adapter import KiteInstrumentResolver, UpstoxInstrumentResolver
+
+
+def test_index_round_trips_every_symbol(tmp_path):
+    instruments = [
+        Instrument(symbol=f"SYM{index:05d}", token=100000 + index, key=f"NSE_EQ|INE{index:09d}", lot_size=1, tick_size=0.05)
+        for index in range(5000)
+    ]
+    path = tmp_path / "kite_nse.idx"
+    assert InstrumentIndex.write(path, instruments, "2026-10-16") == 5000
+
+    index = InstrumentIndex(path)
+    try:
+        assert len(index) == 5000
+        assert index.trading_day == "2026-10-16"
+        assert all(index.get(instrument.symbol) == instrument for instrument in instruments)
+        assert index.get("sym00042").token == 100042
+        assert index.get("NOTLISTED") is None
+    finally:
+        index.close()
+
+
+@pytest.mark.asyncio
+async def test_master_downloads_once_per_trading_day_and_maps_from_disk(tmp_path, monkeypatch):
+    trading_day = {"value": "2026-10-15"}
+    monkeypatch.setattr(instrument_master_module, "current_trading_day", lambda: trading_day["value"])
+    calls = []
+
+    async def _loader():
+        calls.append(trading_day["value"])
+        if len(calls) == 3:
+            raise ConnectionError("instruments endpoint down")
+        return parse_kite_instruments_csv(
+            "instrument_token,exchange,tradingsymbol,lot_size,tick_size\n"
+            f"408065,NSE,INFY,1,0.05\n{len(calls)},NSE,TCS,1,0.05\n884737,BSE,INFY,1,0.05\n"
+        )
+
+    master = InstrumentMaster(tmp_path)
+    assert (await master.resolve("kite", "INFY", _loader)).token == 408065
+    assert (await master.resolve("kite", "tcs", _loader)).token == 1
+    assert master.lookup("kite", "RELIANCE") is None
+
+    # A restarted process maps today's index instead of downloading again
+    restarted = InstrumentMaster(tmp_path)
+    assert (await restarted.resolve("kite", "INFY", _loader)).token == 408065
+    assert restarted.get_stats()["disk_loads"] == 1
+
+    trading_day["value"] = "2026-10-16"
+    assert (await restarted.resolve("kite", "TCS", _loader)).token == 2
+    assert calls == ["2026-10-15", "2026-10-16"]
+
+    # A failed refresh keeps serving the previous day's index
+    trading_day["value"] = "2026-10-17"
+    assert (await restarted.resolve("kite", "TCS", _loader)).token == 2
+    assert restarted.get_stats()["indexes"]["kite:NSE"]["trading_day"] == "2026-10-16"
+
+
+@pytest.mark.asyncio
+async def test_provider_resolvers_share_one_master(tmp_path):
+    state_dir = tmp_path / "state"
+    kite = KiteInstrumentResolver("test-key", "test-token", state_dir)
+    upstox = UpstoxInstrumentResolver(state_dir)
+    assert kite._master is upstox._master is get_instrument_master(state_dir)
+
+    kite._cache_path.write_text("instrument_token,exchange,tradingsymbol\n408065,NSE,INFY\n", encoding="utf-8")
+    assert await kite.resolve_instrument_token("INFY") == 408065
+    assert kite.cache_ready is True
+    assert upstox.cache_ready is False
+    assert (state_dir / "instruments" / "kite_nse.idx").exists()
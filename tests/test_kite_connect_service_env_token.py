@@ -4,6 +4,7 @@ from unittest.mock import AsyncMock
 
 import pytest
 
+from src.core.rate_limiter import RateLimiter
 from src.services.kite_connect_service import KiteConnectService
 
 
@@ -84,9 +85,8 @@ async def test_get_quotes_supports_kite_net_change_payload(monkeypatch):
     service.logger = logging.getLogger("kite-connect-test")
     service.kite = _DummyKite()
     service._active_session = SimpleNamespace(expires_at="2026-03-24T11:11:11.192506+00:00")
-    service._last_api_call = {}
-    service._min_interval = 0
-    service.real_time_state = SimpleNamespace(store_real_time_quote=AsyncMock())
+    service._rate_limiter = RateLimiter()
+    service.real_time_state = SimpleNamespace(buffer_real_time_quotes=AsyncMock())
 
     quotes = await service.get_quotes(["RELIANCE"])
 
@@ -94,4 +94,47 @@ async def test_get_quotes_supports_kite_net_change_payload(monkeypatch):
     assert quotes["RELIANCE"].change == 0.0
     assert quotes["RELIANCE"].change_percent == 0.0
     assert quotes["RELIANCE"].timestamp == "2026-03-23T11:24:25+00:00"
-    service.real_time_state.store_real_time_quote.assert_awaited_once()
+    service.real_time_state.buffer_real_time_quotes.assert_awaited_once()
+
+
+class _ChunkedKite:
+    def __init__(self) -> None:
+        self.calls = []
+
+    def quote(self, instruments):
+        self.calls.append(list(instruments))
+        if "NSE:BROKEN" in instruments:
+            raise RuntimeError("quote request failed")
+        return {
+            instrument: {
+                "instrument_token": index,
+                "timestamp": "2026-03-23 16:54:25",
+                "last_price": 100.0 + index,
+                "average_price": 100.0,
+                "volume": 10,
+                "buy_quantity": 1,
+                "sell_quantity": 1,
+                "net_change": 0.0,
+                "ohlc": {"close": 100.0},
+            }
+            for index, instrument in enumerate(instruments)
+        }
+
+
+@pytest.mark.asyncio
+async def test_get_quotes_chunks_bulk_requests_and_stores_one_batch():
+    service = object.__new__(KiteConnectService)
+    service.logger = logging.getLogger("kite-connect-test")
+    service.kite = _ChunkedKite()
+    service._active_session = SimpleNamespace(expires_at="2026-03-24T11:11:11.192506+00:00")
+    service._rate_limiter = RateLimiter()
+    service._quote_chunk_size = 2
+    service.real_time_state = SimpleNamespace(buffer_real_time_quotes=AsyncMock())
+
+    quotes = await service.get_quotes(["A", "B", "C", "BROKEN", "E", "A"])
+
+    assert sorted(service.kite.calls) == [["NSE:A", "NSE:B"], ["NSE:C", "NSE:BROKEN"], ["NSE:E"]]
+    assert sorted(quotes) == ["A", "B", "E"]
+    service.real_time_state.buffer_real_time_quotes.assert_awaited_once()
+    stored = service.real_time_state.buffer_real_time_quotes.await_args.args[0]
+    assert sorted(quote.symbol for quote in stored) == ["A", "B", "E"]
@@ -8,8 +8,10 @@ import pytest
 from src.config import Config
 from src.core.event_bus import EventBus
 from src.models.market_data import MarketData, MarketDataProvider, SubscriptionMode
+from src.services.indicator_engine import IncrementalIndicatorEngine
 from src.services.market_data_service import MarketDataService
-from src.services.quote_stream_adapter import QuoteStreamStatus
+from src.services.quote_stream_adapter import KiteTickerQuoteStreamAdapter, QuoteStreamStatus
+from src.services.tick_coalescer import TickCoalescer
 
 
 class _FakeQuoteStreamAdapter:
@@ -339,6 +341,51 @@ async def test_market_data_service_emits_unique_event_ids_for_rapid_updates(tmp_
         await service.close()
 
 
+@pytest.mark.asyncio
+async def test_market_data_service_feeds_ticks_to_the_indicator_engine(tmp_path: Path):
+    config = Config(
+        state_dir=tmp_path / "state",
+        logs_dir=tmp_path / "logs",
+        project_dir=tmp_path,
+    )
+    event_bus = EventBus(config)
+    await event_bus.initialize()
+
+    engine = IncrementalIndicatorEngine()
+    engine.seed("INFY", [
+        {"date": f"2026-02-{day:02d}", "high": 1510.0 + day, "low": 1490.0 + day, "close": 1500.0 + day}
+        for day in range(1, 29)
+    ] + [
+        {"date": f"2026-03-{day:02d}", "high": 1540.0, "low": 1520.0, "close": 1530.0}
+        for day in range(1, 24)
+    ])
+    committed = engine.get_indicators("INFY")
+
+    service = MarketDataService(
+        config,
+        event_bus,
+        broker=None,
+        quote_stream_adapter=_FakeQuoteStreamAdapter(),
+        default_provider=MarketDataProvider.UPSTOX,
+        indicator_engine=engine,
+    )
+    await service.initialize()
+
+    try:
+        await service._update_market_data(MarketData(
+            symbol="INFY", ltp=1555.0, volume=1000, timestamp="2026-03-24T06:36:00+00:00", provider="upstox",
+        ))
+        await service._apply_market_data_batch([MarketData(
+            symbol="INFY", ltp=1560.0, volume=1200, timestamp="2026-03-24T06:36:01+00:00", provider="upstox",
+        )])
+
+        forming = engine.get_indicators("INFY")
+        assert forming["current_price"] == 1560.0
+        assert forming["ema_9"] > committed["ema_9"]
+    finally:
+        await service.close()
+
+
 @pytest.mark.asyncio
 async def test_market_data_service_seeds_zerodha_cache_for_restored_subscriptions_on_initialize(tmp_path: Path):
     config = Config(
@@ -402,3 +449,89 @@ async def test_market_data_service_seeds_zerodha_cache_for_restored_subscription
         assert rows == [("HDFCBANK", 744.15, "zerodha_kite")]
     finally:
         await service.close()
+
+
+@pytest.mark.asyncio
+async def test_market_data_service_coalesces_streaming_ticks_into_one_batch(tmp_path: Path):
+    config = Config(
+        state_dir=tmp_path / "state",
+        logs_dir=tmp_path / "logs",
+        project_dir=tmp_path,
+    )
+    config.integration.quote_coalesce_interval_ms = 60_000
+    event_bus = EventBus(config)
+    await event_bus.initialize()
+
+    adapter = KiteTickerQuoteStreamAdapter(config, AsyncMock())
+    adapter._token_to_symbol = {101: "INFY", 202: "TCS"}
+    service = MarketDataService(
+        config,
+        event_bus,
+        broker=None,
+        quote_stream_adapter=adapter,
+        default_provider=MarketDataProvider.ZERODHA_KITE,
+    )
+    await service.initialize()
+
+    try:
+        # Simulate the KiteTicker socket thread delivering several ticks per symbol.
+        adapter._handle_tick(None, [
+            {"instrument_token": 101, "last_price": 1500.0},
+            {"instrument_token": 202, "last_price": 3900.0},
+            {"instrument_token": 101, "last_price": 1501.0},
+        ])
+        adapter._handle_tick(None, [{"instrument_token": 101, "last_price": 1502.5}])
+
+        applied = await service._tick_coalescer.flush()
+
+        assert applied == 2
+        assert service._market_data["INFY"].ltp == 1502.5
+        assert service._market_data["TCS"].ltp == 3900.0
+
+        stats = service.get_tick_ingestion_stats()
+        assert stats["ticks_received"] == 4
+        assert stats["ticks_applied"] == 2
+        assert stats["ticks_coalesced"] == 2
+
+        infy_history = await service.get_price_history("INFY", as_format="arrays")
+        tcs_history = await service.get_price_history("TCS", as_format="arrays")
+        assert infy_history.ltp.tolist() == [1502.5]
+        assert tcs_history.ltp.tolist() == [3900.0]
+
+        conn = sqlite3.connect(event_bus.db_path)
+        try:
+            events = conn.execute(
+                "SELECT data FROM events WHERE type = 'market.price_update'"
+            ).fetchall()
+        finally:
+            conn.close()
+        assert len(events) == 1
+        assert '"INFY": 1502.5' in events[0][0]
+    finally:
+        await service.close()
+
+
+@pytest.mark.asyncio
+async def test_tick_coalescer_requeues_batch_when_apply_fails():
+    attempts = []
+
+    async def _apply(batch):
+        attempts.append([md.symbol for md in batch])
+        if len(attempts) == 1:
+            raise RuntimeError("database is locked")
+
+    coalescer = TickCoalescer(_apply, flush_interval_ms=60_000)
+    coalescer.offer(MarketData(symbol="INFY", ltp=1500.0, provider="zerodha_kite"))
+    coalescer.offer(MarketData(symbol="TCS", ltp=3900.0, provider="zerodha_kite"))
+
+    assert await coalescer.flush() == 0
+    # A newer INFY tick arriving before the retry must win over the requeued one.
+    coalescer.offer(MarketData(symbol="INFY", ltp=1501.0, provider="zerodha_kite"))
+    assert coalescer.get_stats()["pending_symbols"] == 2
+
+    assert await coalescer.flush() == 2
+    stats = coalescer.get_stats()
+    assert stats["ticks_received"] == 3
+    assert stats["ticks_applied"] == 2
+    assert stats["flush_errors"] == 1
+    assert stats["ticks_coalesced"] == 1
@@ -0,0 +1,59 @@
+import json
+import os
+
+import pytest
+
+from src.services.nse_universe import NSEUniverse, NSEUniverseService, UniverseSelection
+
+STOCKS = [
+    {"symbol": "RELIANCE", "name": "Reliance Industries", "sector": "Energy", "cap": "large"},
+    {"symbol": "KAYNES", "name": "Kaynes Technology", "sector": "Capital Goods", "cap": "mid"},
+    {"symbol": "TANLA", "name": "Tanla Platforms", "sector": "Technology", "cap": "small"},
+    {"symbol": "TCS", "name": "Tata Consultancy Services", "sector": "Technology", "cap": "large"},
+    {"symbol": "POLYCAB", "sector": "Capital Goods", "cap": "large"},
+]
+
+
+def _write(path, stocks):
+    path.write_text(json.dumps({"universe": stocks}), encoding="utf-8")
+
+
+def test_bitmap_filters_match_a_python_scan():
+    universe = NSEUniverse(STOCKS)
+
+    mask = universe.select(sectors=["Technology", "Capital Goods"], caps=["large", "mid"])
+    assert [universe.symbols[row] for row in universe.rows(mask)] == ["KAYNES", "TCS", "POLYCAB"]
+    assert universe.select() == universe.all_mask
+
+    selection = UniverseSelection(universe, mask, discovery_source="test").excluding({"TCS", "UNLISTED"})
+    assert [stock["symbol"] for stock in selection] == ["KAYNES", "POLYCAB"]
+    assert selection[1] == {
+        "symbol": "POLYCAB",
+        "name": "POLYCAB",
+        "sector": "Capital Goods",
+        "cap": "large",
+        "discovery_source": "test",
+    }
+
+
+@pytest.mark.asyncio
+async def test_service_reloads_only_when_the_file_changes(tmp_path):
+    path = tmp_path / "nse_universe.json"
+    _write(path, STOCKS[:2])
+    service = NSEUniverseService(path)
+    await service.initialize()
+
+    first = await service.get_universe()
+    assert len(first) == 2
+    assert await service.get_universe() is first
+
+    _write(path, STOCKS)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert len(await service.get_universe()) == 5
+
+    # A broken edit keeps the last good snapshot
+    path.write_text("{not json", encoding="utf-8")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000_000))
+    assert len(await service.get_universe()) == 5
+    assert service.reloads == 2
@@ -0,0 +1,105 @@
+"""Tests for the in-memory open-position index kept by PaperTradingStore."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import aiosqlite
+import pytest
+
+from src.core.event_bus import Event, EventType
+from src.models.paper_trading import AccountType, RiskLevel, TradeType
+from src.services.paper_trading.price_monitor import PaperTradingPriceMonitor
+from src.stores.paper_trading_store import PaperTradingStore
+
+
+@pytest.fixture
+async def store(tmp_path):
+    db = await aiosqlite.connect(str(tmp_path / "paper.db"))
+    trading_store = PaperTradingStore(db)
+    await trading_store.initialize()
+    await trading_store.create_account(
+        account_name="Main",
+        initial_balance=100000.0,
+        strategy_type=AccountType.SWING,
+        risk_level=RiskLevel.MODERATE,
+        max_position_size=5.0,
+        max_portfolio_risk=10.0,
+        account_id="paper_main",
+    )
+    try:
+        yield trading_store
+    finally:
+        await db.close()
+
+
+async def _open(store, symbol, trade_type=TradeType.BUY, **kwargs):
+    return await store.create_trade(
+        account_id="paper_main",
+        symbol=symbol,
+        trade_type=trade_type,
+        quantity=10,
+        entry_price=100.0,
+        strategy_rationale="test",
+        claude_session_id="session",
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_index_follows_trade_lifecycle(store):
+    infy = await _open(store, "INFY", stop_loss=95.0)
+    tcs = await _open(store, "TCS")
+    stopped = await _open(store, "TCS", trade_type=TradeType.SELL)
+
+    index = store.open_positions
+    assert sorted(index.symbols()) == ["INFY", "TCS"]
+    assert len(index.positions_for("TCS", "paper_main")) == 2
+
+    await store.update_trade_risk_levels("paper_main", infy.trade_id, stop_loss=97.0, target_price=110.0)
+    assert (index.get(infy.trade_id).stop_loss, index.get(infy.trade_id).target_price) == (97.0, 110.0)
+
+    await store.close_trade(tcs.trade_id, exit_price=105.0, realized_pnl=50.0)
+    await store.mark_stopped_out(stopped.trade_id, exit_price=104.0, realized_pnl=-40.0)
+    assert index.symbols() == ["INFY"]
+    assert index.get(tcs.trade_id) is None
+
+    assert await store.verify_open_position_index() == {"missing": [], "stale": [], "mismatched": []}
+
+
+@pytest.mark.asyncio
+async def test_index_is_rebuilt_on_initialize_and_repairs_drift(store):
+    trade = await _open(store, "INFY")
+
+    reloaded = PaperTradingStore(store.db_connection)
+    await reloaded.initialize()
+    assert reloaded.open_positions.get(trade.trade_id) is not None
+
+    # A write that bypasses the store leaves the index stale until verification repairs it.
+    await store.db_connection.execute("UPDATE paper_trades SET status = 'closed' WHERE trade_id = ?", (trade.trade_id,))
+    await store.db_connection.commit()
+
+    drift = await store.verify_open_position_index(repair=True)
+    assert drift["stale"] == [trade.trade_id]
+    assert len(store.open_positions) == 0
+
+
+@pytest.mark.asyncio
+async def test_price_monitor_reads_positions_without_querying_store(store):
+    await _open(store, "INFY")
+    await _open(store, "INFY", trade_type=TradeType.SELL)
+
+    coordinator = MagicMock()
+    coordinator.broadcast_to_ui = AsyncMock()
+    monitor = PaperTradingPriceMonitor(MagicMock(), store, coordinator)
+    await monitor.register_account("paper_main")
+    store.get_open_trades = AsyncMock(side_effect=AssertionError("per-tick DB read"))
+
+    await monitor.handle_event(Event(
+        id="evt",
+        type=EventType.MARKET_PRICE_UPDATE,
+        timestamp="2026-01-01T09:15:00+00:00",
+        source="test",
+        data={"symbol": "INFY", "price": 110.0},
+    ))
+
+    payload = coordinator.broadcast_to_ui.await_args.args[0]
+    assert sorted(p["unrealized_pnl"] for p in payload["positions"]) == [-100.0, 100.0]
@@ -0,0 +1,114 @@
+from datetime import datetime, timezone
+
+import aiosqlite
+import pytest
+
+from src.models.paper_trading import AccountType, RiskLevel, TradeStatus, TradeType
+from src.services.paper_trading.account_manager import PaperTradingAccountManager
+from src.stores.paper_trading_store import PaperTradingStore
+
+
+@pytest.fixture
+async def store():
+    db = await aiosqlite.connect(":memory:")
+    trade_store = PaperTradingStore(db)
+    await trade_store.initialize()
+    await trade_store.create_account(
+        account_name="Main",
+        initial_balance=100000.0,
+        strategy_type=AccountType.SWING,
+        risk_level=RiskLevel.MODERATE,
+        account_id="paper_main",
+    )
+    try:
+        yield trade_store
+    finally:
+        await db.close()
+
+
+async def _open(store, symbol, strategy="momentum", trade_type=TradeType.BUY):
+    return await store.create_trade(
+        account_id="paper_main", symbol=symbol, trade_type=trade_type, quantity=10,
+        entry_price=100.0, strategy_rationale=strategy, claude_session_id="s1",
+    )
+
+
+async def _aggregate_rows(db):
+    cursor = await db.execute(
+        "SELECT account_id, trade_date, strategy_tag, closed_trades, winning_trades, losing_trades, "
+        "realized_pnl, gross_profit, gross_loss, best_trade, worst_trade, hold_days_total "
+        "FROM paper_trade_aggregates ORDER BY trade_date, strategy_tag"
+    )
+    rows = [tuple(row) for row in await cursor.fetchall()]
+    await cursor.close()
+    return rows
+
+
+@pytest.mark.asyncio
+async def test_close_paths_maintain_aggregates_like_a_rebuild(store):
+    trades = [await _open(store, f"SYM{index}", strategy="momentum" if index % 2 else "breakout") for index in range(6)]
+    await store.close_trade(trades[0].trade_id, exit_price=110.0, realized_pnl=100.0)
+    await store.mark_stopped_out(trades[1].trade_id, exit_price=95.0, realized_pnl=-50.0)
+    await store.record_exits([
+        (trades[2].trade_id, 120.0, 200.0, TradeStatus.CLOSED),
+        (trades[3].trade_id, 90.0, -100.0, TradeStatus.STOPPED_OUT),
+        (trades[3].trade_id, 90.0, -100.0, TradeStatus.STOPPED_OUT),
+    ])
+    # Re-closing an already closed trade replaces its contribution instead of adding to it
+    await store.close_trade(trades[0].trade_id, exit_price=105.0, realized_pnl=50.0)
+
+    incremental = await _aggregate_rows(store.db_connection)
+    assert await store.rebuild_performance_aggregates() == 2
+    assert await _aggregate_rows(store.db_connection) == incremental
+
+    aggregates = await store.get_performance_aggregates("paper_main")
+    assert aggregates["totals"]["closed_trades"] == 4
+    assert aggregates["totals"]["realized_pnl"] == pytest.approx(100.0)
+    assert aggregates["totals"]["best_trade"] == pytest.approx(200.0)
+    assert aggregates["strategies"]["breakout"]["realized_pnl"] == pytest.approx(250.0)
+    assert aggregates["strategies"]["momentum"]["losing_trades"] == 2
+
+
+@pytest.mark.asyncio
+async def test_aggregate_failure_rolls_back_the_close(store):
+    trade = await _open(store, "INFY")
+    await store.db_connection.execute("DROP TABLE paper_trade_aggregates")
+
+    with pytest.raises(aiosqlite.OperationalError):
+        await store.close_trade(trade.trade_id, exit_price=110.0, realized_pnl=100.0)
+
+    assert (await store.get_trade(trade.trade_id)).status == TradeStatus.OPEN
+    assert store.open_positions.get(trade.trade_id) is not None
+
+
+@pytest.mark.asyncio
+async def test_metrics_read_aggregates_and_backfill_on_startup(store):
+    for index in range(60):
+        trade = await _open(store, f"SYM{index}")
+        await store.close_trade(trade.trade_id, exit_price=101.0, realized_pnl=10.0 if index % 3 else -5.0)
+
+    await store.db_connection.execute("DELETE FROM paper_trade_aggregates")
+    await store.db_connection.commit()
+    await store.initialize()
+
+    now = datetime.now(timezone.utc)
+    monthly = await store.calculate_monthly_pnl("paper_main", now.year, now.month)
+    assert monthly["total_trades"] == 60
+    assert monthly["total_pnl"] == pytest.approx(40 * 10.0 - 20 * 5.0)
+    assert monthly["best_trade"] == pytest.approx(10.0)
+    assert monthly["worst_trade"] == pytest.approx(-5.0)
+
+    # All-time metrics cover the full history, not just the latest page of closed trades
+    metrics = await PaperTradingAccountManager(store=store).get_performance_metrics("paper_main", period="all-time")
+    assert metrics["closed_trades"] == 60
+    assert metrics["winning_trades"] == 40
+    assert metrics["avg_loss"] == pytest.approx(-5.0)
+    assert metrics["profit_factor"] == pytest.approx(4.0)
+
+    cursor = await store.db_connection.execute(
+        "EXPLAIN QUERY PLAN SELECT SUM(realized_pnl) FROM paper_trade_aggregates "
+        "WHERE account_id = ? AND trade_date >= ? GROUP BY strategy_tag",
+        ("paper_main", "2026-01-01"),
+    )
+    plan = " | ".join(str(row[-1]) for row in await cursor.fetchall())
+    assert "SEARCH paper_trade_aggregates USING INDEX sqlite_autoindex_paper_trade_aggregates_1" in plan, plan
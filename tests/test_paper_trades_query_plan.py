@@ -0,0 +1,105 @@
+from datetime import datetime, timezone
+
+import aiosqlite
+import pytest
+
+from src.models.paper_trading import AccountType, RiskLevel, TradeType
+from src.stores.paper_trading_store import PaperTradingStore
+
+
+@pytest.fixture
+async def store():
+    db = await aiosqlite.connect(":memory:")
+    trade_store = PaperTradingStore(db)
+    await trade_store.initialize()
+    await trade_store.create_account(
+        account_name="Main",
+        initial_balance=100000.0,
+        strategy_type=AccountType.SWING,
+        risk_level=RiskLevel.MODERATE,
+        account_id="paper_main",
+    )
+    for index, symbol in enumerate(["INFY", "TCS", "HDFCBANK"]):
+        trade = await trade_store.create_trade(
+            account_id="paper_main", symbol=symbol, trade_type=TradeType.BUY, quantity=10,
+            entry_price=100.0 + index, strategy_rationale="momentum", claude_session_id="s1",
+        )
+        if index:
+            await trade_store.close_trade(trade.trade_id, exit_price=110.0, realized_pnl=90.0)
+    try:
+        yield trade_store
+    finally:
+        await db.close()
+
+
+async def _record_trade_queries(store, calls):
+    """Run the store's read paths and return every paper_trades SELECT they issued."""
+    db = store.db_connection
+    real_execute = db.execute
+    recorded = []
+
+    async def _recording_execute(sql, parameters=None):
+        if sql.lstrip().upper().startswith("SELECT") and "paper_trades" in sql:
+            recorded.append((sql, tuple(parameters or ())))
+        return await real_execute(sql, parameters)
+
+    db.execute = _recording_execute
+    try:
+        for call in calls:
+            await call()
+    finally:
+        del db.execute
+    return recorded
+
+
+async def _query_plan(db, sql, parameters):
+    cursor = await db.execute(f"EXPLAIN QUERY PLAN {sql}", parameters)
+    rows = await cursor.fetchall()
+    await cursor.close()
+    return " | ".join(str(row[-1]) for row in rows)
+
+
+@pytest.mark.asyncio
+async def test_status_queries_use_composite_indexes(store):
+    now = datetime.now(timezone.utc)
+    recorded = await _record_trade_queries(store, [
+        lambda: store.get_open_trades("paper_main"),
+        lambda: store.get_closed_trades("paper_main", month=now.month, year=now.year),
+        lambda: store.calculate_account_pnl("paper_main", {}),
+        lambda: store.calculate_monthly_pnl("paper_main", now.year, now.month),
+    ])
+    status_queries = [(sql, params) for sql, params in recorded if "status" in sql]
+    assert len(status_queries) >= 4
+
+    for sql, params in status_queries:
+        assert "LOWER(status)" not in sql
+        plan = await _query_plan(store.db_connection, sql, params)
+        assert "idx_trades_account_status_" in plan, plan
+        assert "SCAN paper_trades" not in plan, plan
+
+
+@pytest.mark.asyncio
+async def test_daily_realized_pnl_is_answered_from_covering_index(store):
+    recorded = await _record_trade_queries(store, [lambda: store.calculate_account_pnl("paper_main", {})])
+    sql, params = next((sql, params) for sql, params in recorded if "SUM(realized_pnl)" in sql)
+
+    plan = await _query_plan(store.db_connection, sql, params)
+    assert "USING COVERING INDEX idx_trades_account_status_exit" in plan, plan
+
+    total_pnl, _ = await store.calculate_account_pnl("paper_main", {})
+    assert total_pnl == pytest.approx(180.0)
+
+
+@pytest.mark.asyncio
+async def test_startup_migration_canonicalizes_legacy_statuses(store):
+    db = store.db_connection
+    await db.execute("UPDATE paper_trades SET status = ' OPEN' WHERE symbol = ?", ("INFY",))
+    await db.execute("UPDATE paper_trades SET status = 'Closed' WHERE symbol = ?", ("TCS",))
+    await db.commit()
+
+    await store.initialize()
+
+    assert [trade.symbol for trade in await store.get_open_trades("paper_main")] == ["INFY"]
+    assert len(await store.get_closed_trades("paper_main")) == 2
+    cursor = await db.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND name = 'idx_trades_account_id'")
+    assert await cursor.fetchone() is None
@@ -11,16 +11,16 @@ from src.services.scheduler.queue_manager import SequentialQueueManager
 async def test_execute_queues_skips_ai_related_executors_on_startup(monkeypatch):
     started_queues: list[str] = []
 
-    class _FakeExecutor:
-        def __init__(self, *, queue_name, task_service, loop, on_task_complete, on_task_failed):
-            self.queue_name = queue_name
+    class _FakeWorkerPool:
+        def __init__(self, task_service, *, policy, on_task_complete, on_task_failed):
+            pass
 
-        async def start(self):
-            started_queues.append(self.queue_name)
+        async def start(self, queues):
+            started_queues.extend(queue.value for queue in queues)
 
     monkeypatch.setattr(
-        "src.services.scheduler.queue_manager.ThreadSafeQueueExecutor",
-        _FakeExecutor,
+        "src.services.scheduler.queue_manager.QueueWorkerPool",
+        _FakeWorkerPool,
     )
 
     task_service = SimpleNamespace(
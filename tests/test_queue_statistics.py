@@ -0,0 +1,80 @@
+import aiosqlite
+import pytest
+
+from src.models.domain import QueueStatus
+from src.models.scheduler import QueueName, TaskType
+from src.repositories.queue_state_repository import QueueStateRepository
+from src.stores.scheduler_task_store import SchedulerTaskStore
+
+
+@pytest.fixture
+async def store():
+    conn = await aiosqlite.connect(":memory:")
+    s = SchedulerTaskStore(conn)
+    await s.initialize()
+    yield s
+    await conn.close()
+
+
+def _no_queries(store):
+    async def _fail(*args, **kwargs):
+        raise AssertionError("statistics read touched queue_tasks")
+
+    store._fetchall = _fail
+    store._fetchone = _fail
+
+
+@pytest.mark.asyncio
+async def test_counters_follow_transitions_without_querying(store):
+    queue = QueueName.DATA_FETCHER
+    for _ in range(4):
+        await store.create_task(queue, TaskType.FUNDAMENTALS_UPDATE, {})
+    await store.create_task(queue, TaskType.NEWS_MONITORING, {})
+
+    done = await store.claim_next_task(queue, "w", 60)
+    await store.mark_started(done.task_id)  # executor re-marks a claimed task; counted once
+    await store.mark_completed(done.task_id)
+
+    retried = await store.claim_next_task(queue, "w", 60)
+    await store.mark_failed(retried.task_id, "boom")
+    await store.increment_retry(retried.task_id)
+
+    dead = await store.claim_next_task(queue, "w", 60)
+    await store.mark_failed(dead.task_id, "boom")
+
+    await store.claim_next_task(queue, "w", 60)
+
+    _no_queries(store)
+    stats = (await store.get_all_queue_statistics())[queue.value]
+    assert (stats.pending_count, stats.running_count, stats.completed_today, stats.failed_count) == (2, 1, 1, 1)
+    assert stats.last_completed_task_id == done.task_id
+    assert set(stats.duration_percentiles_ms) == {"p50", "p95", "p99"}
+    assert stats.task_type_durations_ms[done.task_type.value]["count"] == 1
+
+    states = await QueueStateRepository(None, task_store=store).get_all_statuses()
+    assert states[queue.value].status == QueueStatus.RUNNING
+    assert states[queue.value].current_task_id is not None
+    assert states[QueueName.AI_ANALYSIS.value].status == QueueStatus.IDLE
+
+
+@pytest.mark.asyncio
+async def test_reconciliation_repairs_writes_behind_the_store(store):
+    queue = QueueName.PORTFOLIO_SYNC
+    for _ in range(3):
+        await store.create_task(queue, TaskType.SYNC_ACCOUNT_BALANCES, {})
+    await store.claim_next_task(queue, "w", 60)
+
+    # Manual cleanup deletes straight from the table, as the manual-only runtime does
+    await store.db_connection.execute("DELETE FROM queue_tasks WHERE status IN ('pending', 'running')")
+    await store.db_connection.commit()
+    assert (await store.get_queue_statistics(queue)).pending_count == 2  # not yet reconciled
+
+    store.queue_stats.invalidate()
+    stats = await store.get_queue_statistics(queue)
+    assert (stats.pending_count, stats.running_count) == (0, 0)
+    assert store.queue_stats.current_task(queue) is None
+
+    await store.create_task(queue, TaskType.SYNC_ACCOUNT_BALANCES, {})
+    restarted = SchedulerTaskStore(store.db_connection)
+    await restarted.reconcile_queue_statistics()
+    assert (await restarted.get_queue_statistics(queue)).pending_count == 1
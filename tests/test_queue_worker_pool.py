@@ -0,0 +1,156 @@
+import asyncio
+import time
+from collections import Counter
+
+import pytest
+
+from src.models.scheduler import QueueName, SchedulerTask, TaskType
+from src.services.scheduler.queue_worker_pool import QueueConcurrencyPolicy, QueueWorkerPool
+from src.services.scheduler.task_service import TaskDispatchNotifier
+
+
+class _StubTaskService:
+    """In-memory queues with the claim/execute surface the pool uses; handlers just sleep."""
+
+    def __init__(self, handler_seconds=0.02):
+        self.dispatch_notifier = TaskDispatchNotifier()
+        self.handler_seconds = handler_seconds
+        self.pending = {queue: [] for queue in QueueName}
+        self.started = []
+        self.running = Counter()
+        self.peak_by_queue = Counter()
+        self.peak_by_type = Counter()
+        self.claims = 0
+
+    async def create_task(self, queue, task_type, count=1):
+        for _ in range(count):
+            task = SchedulerTask(
+                task_id=f"{queue.value}-{len(self.pending[queue])}-{time.perf_counter_ns()}",
+                queue_name=queue,
+                task_type=task_type,
+                priority=5,
+                payload={},
+            )
+            self.pending[queue].append(task)
+        self.dispatch_notifier.notify(queue.value)
+
+    async def claim_next_task(self, queue_name, worker_id, lease_seconds, exclude_task_types=None):
+        self.claims += 1
+        excluded = set(exclude_task_types or [])
+        for index, task in enumerate(self.pending[queue_name]):
+            if task.task_type not in excluded:
+                return self.pending[queue_name].pop(index)
+        return None
+
+    async def seconds_until_lease_expiry(self, queue_name):
+        return None
+
+    async def renew_lease(self, task_id, worker_id, lease_seconds):
+        return True
+
+    async def mark_failed(self, task_id, error):
+        return None
+
+    async def execute_task(self, task):
+        queue, task_type = task.queue_name.value, task.task_type.value
+        self.started.append(queue)
+        self.running[queue] += 1
+        self.running[task_type] += 1
+        self.peak_by_queue[queue] = max(self.peak_by_queue[queue], self.running[queue])
+        self.peak_by_type[task_type] = max(self.peak_by_type[task_type], self.running[task_type])
+        await asyncio.sleep(self.handler_seconds)
+        self.running[queue] -= 1
+        self.running[task_type] -= 1
+        return {"success": True}
+
+
+async def _drain(service, pool, queues, total):
+    completed = []
+
+    async def _on_complete(task):
+        completed.append(task.task_id)
+
+    pool.on_task_complete = _on_complete
+    await pool.start(queues)
+    try:
+        while len(completed) < total:
+            await asyncio.sleep(0.005)
+    finally:
+        await pool.stop(timeout_seconds=5)
+    return completed
+
+
+@pytest.mark.asyncio
+async def test_queue_and_task_type_limits_are_respected():
+    service = _StubTaskService()
+    policy = QueueConcurrencyPolicy(
+        max_workers=16,
+        queue_concurrency={QueueName.DATA_FETCHER.value: 6},
+        task_type_concurrency={TaskType.NEWS_MONITORING.value: 2},
+    )
+    await service.create_task(QueueName.DATA_FETCHER, TaskType.FUNDAMENTALS_UPDATE, 10)
+    await service.create_task(QueueName.DATA_FETCHER, TaskType.NEWS_MONITORING, 10)
+    await service.create_task(QueueName.PORTFOLIO_SYNC, TaskType.SYNC_ACCOUNT_BALANCES, 5)
+
+    await _drain(service, QueueWorkerPool(service, policy), [QueueName.DATA_FETCHER, QueueName.PORTFOLIO_SYNC], 25)
+
+    assert service.peak_by_queue[QueueName.DATA_FETCHER.value] == 6
+    assert service.peak_by_type[TaskType.NEWS_MONITORING.value] == 2
+    assert service.peak_by_queue[QueueName.PORTFOLIO_SYNC.value] == 1  # default stays sequential
+
+
+@pytest.mark.asyncio
+async def test_free_slots_are_shared_by_queue_weight():
+    service = _StubTaskService()
+    policy = QueueConcurrencyPolicy(
+        max_workers=1,
+        queue_weights={QueueName.PAPER_TRADING_EXECUTION.value: 3, QueueName.DATA_FETCHER.value: 1},
+    )
+    await service.create_task(QueueName.PAPER_TRADING_EXECUTION, TaskType.PAPER_TRADE_EXECUTION, 12)
+    await service.create_task(QueueName.DATA_FETCHER, TaskType.FUNDAMENTALS_UPDATE, 12)
+
+    pool = QueueWorkerPool(service, policy)
+    await _drain(service, pool, [QueueName.PAPER_TRADING_EXECUTION, QueueName.DATA_FETCHER], 24)
+
+    first_eight = Counter(service.started[:8])
+    assert first_eight[QueueName.PAPER_TRADING_EXECUTION.value] == 6
+    assert first_eight[QueueName.DATA_FETCHER.value] == 2
+
+
+@pytest.mark.asyncio
+async def test_throughput_scales_with_worker_count():
+    elapsed = {}
+    for workers in (1, 4):
+        service = _StubTaskService(handler_seconds=0.02)
+        policy = QueueConcurrencyPolicy(
+            max_workers=workers,
+            queue_concurrency={QueueName.DATA_FETCHER.value: workers},
+        )
+        await service.create_task(QueueName.DATA_FETCHER, TaskType.FUNDAMENTALS_UPDATE, 20)
+        started = time.perf_counter()
+        await _drain(service, QueueWorkerPool(service, policy), [QueueName.DATA_FETCHER], 20)
+        elapsed[workers] = time.perf_counter() - started
+
+    assert elapsed[1] / elapsed[4] > 2.5
+
+
+@pytest.mark.asyncio
+async def test_pool_sleeps_when_idle_and_wakes_on_create_task():
+    service = _StubTaskService(handler_seconds=0)
+    executed = asyncio.Event()
+
+    async def _on_complete(task):
+        executed.set()
+
+    pool = QueueWorkerPool(service, on_task_complete=_on_complete)
+    await pool.start([QueueName.DATA_FETCHER])
+    try:
+        await asyncio.sleep(0.3)
+        assert service.claims == 1  # one empty claim, then no polling
+
+        created_at = time.perf_counter()
+        await service.create_task(QueueName.DATA_FETCHER, TaskType.FUNDAMENTALS_UPDATE)
+        await asyncio.wait_for(executed.wait(), timeout=0.5)
+        assert time.perf_counter() - created_at < 0.5
+    finally:
+        await pool.stop(timeout_seconds=5)
@@ -1,11 +1,14 @@
 import asyncio
+import os
 import sys
+from datetime import datetime, timedelta
 from types import SimpleNamespace
 from unittest.mock import AsyncMock
 
 import pytest
 
 from src.config import Config
+from src.services.instrument_master import IST
 from src.services.quote_stream_adapter import KiteInstrumentResolver, KiteTickerQuoteStreamAdapter, UpstoxQuoteStreamAdapter
 
 
@@ -98,6 +101,29 @@ async def test_kite_instrument_resolver_reads_fresh_cache_without_blocking_netwo
     assert resolver.cache_ready is True
 
 
+@pytest.mark.asyncio
+async def test_kite_instrument_resolver_redownloads_a_dump_from_the_previous_trading_day(monkeypatch, tmp_path):
+    resolver = KiteInstrumentResolver("test-key", "test-token", tmp_path / "state")
+    resolver._cache_path.write_text("instrument_token,exchange,tradingsymbol\n1,NSE,OLD\n", encoding="utf-8")
+    # Written an hour before today's IST midnight: under 24h old, but yesterday's dump
+    ist_midnight = datetime.now(IST).replace(hour=0, minute=0, second=0, microsecond=0)
+    stale = (ist_midnight - timedelta(hours=1)).timestamp()
+    os.utime(resolver._cache_path, (stale, stale))
+
+    response = SimpleNamespace(
+        text="instrument_token,exchange,tradingsymbol\n408065,NSE,NEWLIST\n",
+        raise_for_status=lambda: None,
+    )
+    client = SimpleNamespace(get=AsyncMock(return_value=response))
+    monkeypatch.setattr(
+        "src.services.quote_stream_adapter.get_http_client_pool",
+        lambda: SimpleNamespace(get=lambda *_args, **_kwargs: client),
+    )
+
+    assert await resolver.resolve_instrument_token("NEWLIST") == 408065
+    assert client.get.await_count == 1
+
+
 @pytest.mark.asyncio
 async def test_upstox_handle_message_ignores_malformed_feed(monkeypatch, tmp_path):
     config = Config(
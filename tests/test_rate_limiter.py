@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+from src.core.rate_limiter import Priority, Quota, RateLimiter
+
+
+@pytest.mark.asyncio
+async def test_burst_is_served_immediately_and_unconfigured_endpoints_pass_through():
+    limiter = RateLimiter({"kite.orders": Quota(rate=10, burst=3)})
+
+    waits = [await limiter.acquire("kite.orders", Priority.ORDER) for _ in range(3)]
+
+    assert waits == [0.0, 0.0, 0.0]
+    assert await limiter.acquire("not-configured") == 0.0
+    stats = limiter.get_stats()["kite.orders"]
+    assert stats["granted"] == 3
+    assert stats["throttled"] == 0
+    assert stats["tokens_available"] < 1
+
+
+@pytest.mark.asyncio
+async def test_waiters_are_served_by_priority_then_round_robin_per_client():
+    limiter = RateLimiter({"kite.quote": Quota(rate=50, burst=1)})
+    await limiter.acquire("kite.quote")  # drain the bucket so everyone below queues
+    served = []
+
+    async def _request(tag, priority, client):
+        await limiter.acquire("kite.quote", priority, client=client)
+        served.append(tag)
+
+    await asyncio.gather(
+        _request("research-a1", Priority.RESEARCH, "a"),
+        _request("research-a2", Priority.RESEARCH, "a"),
+        _request("research-a3", Priority.RESEARCH, "a"),
+        _request("research-b1", Priority.RESEARCH, "b"),
+        _request("quote", Priority.QUOTE, "poller"),
+        _request("order", Priority.ORDER, "executor"),
+    )
+
+    assert served == ["order", "quote", "research-a1", "research-b1", "research-a2", "research-a3"]
+    stats = limiter.get_stats()["kite.quote"]
+    assert stats["throttled"] == 6
+    assert stats["max_wait_ms"] > 0
+    assert sum(stats["queued"].values()) == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiters_are_skipped_and_penalty_pauses_endpoint():
+    limiter = RateLimiter({"perplexity": Quota(rate=20, burst=1)})
+    await limiter.acquire("perplexity")
+
+    abandoned = asyncio.create_task(limiter.acquire("perplexity"))
+    await asyncio.sleep(0)
+    abandoned.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await abandoned
+
+    waited = await limiter.acquire("perplexity")
+    assert waited < 0.2
+
+    limiter.penalize("perplexity", 0.2)
+    assert limiter.get_stats()["perplexity"]["paused_for_seconds"] > 0
+    assert await limiter.acquire("perplexity") >= 0.15
+    assert limiter.get_stats()["perplexity"]["penalties"] == 1
+    assert limiter.get_stats()["perplexity"]["cancelled"] == 1
+
+
+@pytest.mark.asyncio
+async def test_reconfiguring_keeps_the_bucket_and_its_waiters():
+    limiter = RateLimiter({"perplexity": Quota(rate=1, burst=1)})
+    await limiter.acquire("perplexity")
+    waiter = asyncio.create_task(limiter.acquire("perplexity", Priority.RESEARCH))
+    await asyncio.sleep(0.05)  # the dispatcher is now sleeping on the 1/s refill
+
+    limiter.configure("perplexity", Quota(rate=1, burst=1))
+    limiter.configure("perplexity", Quota(rate=100, burst=2))
+
+    await asyncio.wait_for(waiter, timeout=0.5)
+    stats = limiter.get_stats()["perplexity"]
+    assert stats["granted"] == 2
+    assert stats["rate_per_second"] == 100
+    assert stats["burst"] == 2
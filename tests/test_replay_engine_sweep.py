@@ -0,0 +1,118 @@
+from datetime import date, timedelta
+
+import aiosqlite
+import numpy as np
+import pytest
+
+from src.services.evaluation.replay_engine import ReplayEngine
+from src.services.recommendation_engine.deterministic_scorer import BUY_THRESHOLD
+from src.stores.research_ledger_store import ResearchLedgerStore
+
+
+class _FakeLedgerStore:
+    def __init__(self, history):
+        self.history = history
+        self.bulk_calls = 0
+
+    async def get_history(self, symbol, limit=20):
+        return self.history.get(symbol, [])[:limit]
+
+    async def get_history_for_symbols(self, symbols, limit=20):
+        self.bulk_calls += 1
+        return {symbol: self.history[symbol][:limit] for symbol in symbols if symbol in self.history}
+
+
+def _synthetic_market(n_symbols=12, n_days=120, seed=5):
+    rng = np.random.default_rng(seed)
+    start = date(2025, 1, 1)
+    prices, history = {}, {}
+    for index in range(n_symbols):
+        symbol = f"SYM{index}"
+        closes = 100 * np.cumprod(1 + rng.normal(0.001, 0.02, n_days))
+        bars = []
+        for day, close in enumerate(closes):
+            if rng.random() < 0.05:
+                continue  # missing bars are skipped, as in live data
+            spread = abs(rng.normal(0, 0.015)) * close
+            bars.append({
+                "date": (start + timedelta(days=day)).isoformat(),
+                "open": close, "high": close + spread, "low": close - spread, "close": close, "volume": 0,
+            })
+        prices[symbol] = bars
+        entries = [
+            {
+                "timestamp": f"{bar['date']}T10:00:00",
+                "score": float(rng.uniform(20, 80)),
+                "action": "BUY" if rng.random() < 0.7 else "HOLD",
+            }
+            for bar in bars if rng.random() < 0.15
+        ]
+        if entries:
+            history[symbol] = list(reversed(entries))  # newest first, like the store
+    return prices, history
+
+
+@pytest.mark.asyncio
+async def test_sweep_matches_per_parameter_replay():
+    prices, history = _synthetic_market()
+    store = _FakeLedgerStore(history)
+    from_date, to_date = "2025-01-10", "2025-04-20"
+
+    frame = await ReplayEngine(store).sweep(
+        prices, from_date, to_date,
+        stop_loss_pcts=[3.0, 8.0],
+        take_profit_pcts=[5.0, 15.0],
+        buy_thresholds=[BUY_THRESHOLD, 60.0],
+    )
+
+    assert store.bulk_calls == 1
+    assert len(frame) == 8
+    assert frame["total_trades"].min() > 0
+    for row in frame[frame["buy_threshold"] == BUY_THRESHOLD].itertuples():
+        # replay() always uses the scorer's BUY_THRESHOLD
+        engine = ReplayEngine(store, stop_loss_pct=row.stop_loss_pct, take_profit_pct=row.take_profit_pct)
+        expected = await engine.replay(prices, from_date, to_date)
+        assert row.total_trades == expected.total_trades
+        assert row.winning_trades == expected.winning_trades
+        assert row.total_pnl == pytest.approx(expected.total_pnl)
+        assert row.max_drawdown_pct == pytest.approx(expected.max_drawdown_pct)
+        assert row.profit_factor == pytest.approx(expected.profit_factor)
+        assert row.sharpe_ratio == pytest.approx(expected.sharpe_ratio)
+
+
+@pytest.mark.asyncio
+async def test_sweep_process_pool_matches_in_process():
+    prices, history = _synthetic_market(n_symbols=6, n_days=60)
+    engine = ReplayEngine(_FakeLedgerStore(history))
+    grid = dict(stop_loss_pcts=[2.0, 4.0, 6.0], take_profit_pcts=[4.0, 8.0], buy_thresholds=[30.0, 50.0])
+
+    in_process = await engine.sweep(prices, "2025-01-01", "2025-03-01", **grid, process_pool_min_params=10_000)
+    pooled = await engine.sweep(prices, "2025-01-01", "2025-03-01", **grid, max_workers=2, process_pool_min_params=1)
+
+    assert np.allclose(in_process.to_numpy(), pooled.to_numpy(), equal_nan=True)
+
+
+@pytest.mark.asyncio
+async def test_ledger_store_bulk_history_matches_per_symbol_history(tmp_path):
+    db = await aiosqlite.connect(str(tmp_path / "ledger.db"))
+    store = ResearchLedgerStore(db)
+    await store.initialize()
+    try:
+        for symbol in ("INFY", "TCS"):
+            for day in range(1, 6):
+                await store.store_entry({
+                    "id": f"{symbol}-{day}",
+                    "symbol": symbol,
+                    "timestamp": f"2025-01-0{day}T10:00:00",
+                    "features_json": "{}",
+                    "score": 50.0 + day,
+                    "action": "BUY",
+                })
+
+        bulk = await store.get_history_for_symbols(["INFY", "TCS", "WIPRO"], limit=3)
+
+        assert set(bulk) == {"INFY", "TCS"}
+        for symbol in ("INFY", "TCS"):
+            assert bulk[symbol] == await store.get_history(symbol, limit=3)
+    finally:
+        await db.close()
@@ -0,0 +1,46 @@
+import aiosqlite
+import pytest
+
+from src.models.scheduler import QueueName, TaskStatus, TaskType
+from src.stores.scheduler_task_store import SchedulerTaskStore
+
+
+@pytest.fixture
+async def store():
+    conn = await aiosqlite.connect(":memory:")
+    s = SchedulerTaskStore(conn)
+    await s.initialize()
+    yield s
+    await conn.close()
+
+
+@pytest.mark.asyncio
+async def test_claim_leases_one_ready_task_and_recovers_expired_leases(store):
+    queue = QueueName.DATA_FETCHER
+    parent = await store.create_task(queue, TaskType.FUNDAMENTALS_UPDATE, {}, priority=5)
+    await store.create_task(queue, TaskType.FUNDAMENTALS_UPDATE, {}, priority=9, dependencies=[parent.task_id])
+    low = await store.create_task(queue, TaskType.FUNDAMENTALS_UPDATE, {}, priority=1)
+
+    # The priority-9 task waits on its dependency, so the parent goes first
+    claimed = await store.claim_next_task(queue, "worker-a", 60)
+    assert claimed.task_id == parent.task_id
+    assert claimed.status == TaskStatus.RUNNING
+    assert await store.get_next_lease_expiry(queue) is not None
+
+    await store.mark_completed(parent.task_id)
+    dependent = await store.claim_next_task(queue, "worker-a", 60)
+    assert dependent.priority == 9
+
+    assert (await store.claim_next_task(queue, "worker-a", 60)).task_id == low.task_id
+    assert await store.claim_next_task(queue, "worker-b", 60) is None
+
+    # worker-a "crashes": its lease lapses and worker-b picks the task up
+    await store.db_connection.execute(
+        "UPDATE queue_tasks SET lease_expires_at = datetime('now', '-1 seconds') WHERE task_id = ?",
+        (low.task_id,),
+    )
+    await store.db_connection.commit()
+    recovered = await store.claim_next_task(queue, "worker-b", 60)
+    assert recovered.task_id == low.task_id
+    assert await store.renew_lease(low.task_id, "worker-a", 60) is False
+    assert await store.renew_lease(low.task_id, "worker-b", 60) is True
@@ -0,0 +1,147 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from src.config import Config
+from src.core.database_state.base import DatabaseConnection
+from src.core.database_state.connection_pool import (
+    DIRECT_WRITERS,
+    QueryLatencyHistogram,
+    SQLiteConnectionPool,
+    open_direct_writer,
+)
+from src.stores.scheduler_task_store import SchedulerTaskStore
+from src.models.scheduler import QueueName, TaskType
+
+
+async def _open_pool(tmp_path: Path, **kwargs) -> SQLiteConnectionPool:
+    pool = SQLiteConnectionPool(tmp_path / "pool.db", reader_count=2, **kwargs)
+    await pool.open()
+    await pool.writer.execute("CREATE TABLE ticks (symbol TEXT PRIMARY KEY, price REAL NOT NULL)")
+    return pool
+
+
+@pytest.mark.asyncio
+async def test_reads_do_not_wait_for_an_open_write_transaction(tmp_path):
+    pool = await _open_pool(tmp_path)
+    await pool.execute_write("INSERT INTO ticks VALUES (?, ?)", ("INFY", 1500.0), store="ticks")
+    inside_write, release_write = asyncio.Event(), asyncio.Event()
+
+    async def _slow_write(db):
+        await db.execute("UPDATE ticks SET price = ? WHERE symbol = ?", (1510.0, "INFY"))
+        inside_write.set()
+        await release_write.wait()
+
+    try:
+        pending = asyncio.create_task(pool.write(_slow_write, store="ticks"))
+        await inside_write.wait()
+
+        # The writer holds an uncommitted transaction; a pooled reader still answers from the last commit
+        row = await asyncio.wait_for(pool.fetchone("SELECT price FROM ticks WHERE symbol = ?", ("INFY",), store="dashboard"), 1.0)
+        assert row["price"] == 1500.0
+
+        release_write.set()
+        await pending
+        row = await pool.fetchone("SELECT price FROM ticks WHERE symbol = ?", ("INFY",), store="dashboard")
+        assert row["price"] == 1510.0
+
+        journal = await pool.fetchone("PRAGMA journal_mode")
+        assert journal[0] == "wal"
+    finally:
+        await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_queued_writes_group_commit_and_isolate_failures(tmp_path):
+    pool = await _open_pool(tmp_path)
+    try:
+        writes = [
+            pool.execute_write("INSERT INTO ticks VALUES (?, ?)", (f"SYM{index}", float(index)), store="ticks")
+            for index in range(50)
+        ]
+        # Duplicate primary key: only this write fails, the rest of its batch commits
+        writes.append(pool.execute_write("INSERT INTO ticks VALUES (?, ?)", ("SYM0", 0.0), store="ticks"))
+        results = await asyncio.gather(*writes, return_exceptions=True)
+
+        assert results[:50] == [1] * 50
+        assert isinstance(results[50], Exception)
+        row = await pool.fetchone("SELECT COUNT(*) FROM ticks")
+        assert row[0] == 50
+
+        stats = pool.get_stats()
+        assert stats["writes"] == 51
+        assert stats["batches"] < 10
+        assert stats["write_errors"] == 1
+        assert stats["stores"]["ticks"]["write"]["count"] == 51
+    finally:
+        await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_database_connection_routes_scheduler_store_through_pool(tmp_path):
+    config = Config(state_dir=tmp_path / "state", logs_dir=tmp_path / "logs", project_dir=tmp_path)
+    database = DatabaseConnection(config)
+    await database.initialize()
+    try:
+        store = SchedulerTaskStore(database.connection, pool=database.pool)
+        await store.initialize()
+        task = await store.create_task(QueueName.AI_ANALYSIS, TaskType.RECOMMENDATION_GENERATION, {"symbol": "INFY"})
+
+        started = await store.mark_started(task.task_id)
+        reads_before = database.get_query_stats()["stores"]["scheduler_tasks"]["read"]["count"]
+        statistics = await store.get_queue_statistics(QueueName.AI_ANALYSIS)
+
+        assert started.status.value == "running"
+        assert statistics.running_count == 1
+        query_stats = database.get_query_stats()
+        assert query_stats["pool_enabled"] is True
+        # Reconciliation and the post-update re-read go through the pool; statistics come from memory
+        assert reads_before >= 2
+        assert query_stats["stores"]["scheduler_tasks"]["read"]["count"] == reads_before
+        assert query_stats["stores"]["scheduler_tasks"]["write"]["count"] == 2
+    finally:
+        await database.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_direct_writers_serialize_with_the_pool_writer(tmp_path):
+    pool = await _open_pool(tmp_path, busy_timeout_ms=5000)
+    await pool.execute_write("INSERT INTO ticks VALUES ('COUNT', 0)")
+    direct = [await open_direct_writer(pool.db_path, busy_timeout_ms=5000) for _ in DIRECT_WRITERS[:2]]
+
+    async def _direct_increments(db, count):
+        for _ in range(count):
+            # Hold the write transaction across awaits, as unit_of_work() does
+            await db.execute("UPDATE ticks SET price = price + 1 WHERE symbol = 'COUNT'")
+            await asyncio.sleep(0.001)
+            await db.execute("SELECT price FROM ticks WHERE symbol = 'COUNT'")
+            await db.commit()
+
+    async def _pooled_increments(count):
+        for _ in range(count):
+            await pool.execute_write("UPDATE ticks SET price = price + 1 WHERE symbol = 'COUNT'")
+
+    try:
+        await asyncio.gather(*(_direct_increments(db, 20) for db in direct), _pooled_increments(20))
+        row = await pool.fetchone("SELECT price FROM ticks WHERE symbol = 'COUNT'")
+        assert row["price"] == 60.0
+        assert {"legacy", "paper_trading"} <= set(DIRECT_WRITERS)
+        assert all(db.isolation_level == "IMMEDIATE" for db in direct)
+    finally:
+        for db in direct:
+            await db.close()
+        await pool.close()
+
+
+def test_latency_histogram_percentiles():
+    histogram = QueryLatencyHistogram()
+    for duration_ms in [0.2] * 90 + [7.0] * 9 + [4000.0]:
+        histogram.record(duration_ms)
+
+    snapshot = histogram.snapshot()
+    assert snapshot["p50_ms"] == 0.5
+    assert snapshot["p95_ms"] == 10.0
+    assert snapshot["p99_ms"] == 10.0
+    assert histogram.percentile(100) == 4000.0
+    assert snapshot["buckets"]["inf"] == 1
@@ -1,9 +1,13 @@
+import asyncio
+import json
+import time
 from datetime import datetime, timedelta, timezone
 from types import SimpleNamespace
 from unittest.mock import AsyncMock
 
 import pytest
 
+from src.services.nse_universe import NSEUniverseService
 from src.services.paper_trading.stock_discovery import StockDiscoveryService
 
 
@@ -400,3 +404,127 @@ async def test_update_watchlist_retires_symbols_that_drop_out_of_latest_discover
 
     assert updates["removed"] == 1
     state_manager.paper_trading.delete_discovery_watchlist_entry.assert_awaited_once_with(1)
+
+
+class _SlowFeatureExtractor:
+    """Feature extractor that takes a fixed latency per symbol, like a model call."""
+
+    def __init__(self, latency_by_symbol, error=None):
+        self.latency_by_symbol = latency_by_symbol
+        self.error = error
+        self.calls = []
+
+    async def extract_features(self, symbol, research_data):
+        self.calls.append(symbol)
+        if self.error:
+            raise RuntimeError(self.error)
+        await asyncio.sleep(self.latency_by_symbol[symbol])
+        return SimpleNamespace(
+            action="BUY",
+            feature_confidence=0.7,
+            score=75.0,
+            id=f"ledger-{symbol}",
+            to_flat_features=lambda: {},
+        )
+
+
+def _seeded_candidates(symbols):
+    return [
+        {
+            "symbol": symbol,
+            "name": symbol,
+            "sector": "Capital Goods",
+            "seed_research": {"research_summary": f"{symbol} order wins.", "errors": []},
+        }
+        for symbol in symbols
+    ]
+
+
+@pytest.mark.asyncio
+async def test_analyze_candidates_pipeline_takes_the_slowest_candidate_not_the_sum():
+    latencies = {"KAYNES": 0.3, "TANLA": 0.1, "POLYCAB": 0.2, "CDSL": 0.1, "BEL": 0.15}
+    service, _, _, _ = _build_service()
+    service.feature_extractor = _SlowFeatureExtractor(latencies)
+    streamed = []
+
+    async def _on_result(result):
+        streamed.append(result["symbol"])
+
+    started = time.perf_counter()
+    result = await service._analyze_candidates(
+        _seeded_candidates(latencies), {}, memory_context={}, market_conditions={}, on_result=_on_result
+    )
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.3 + 0.15  # sequential extraction would take 0.85s
+    assert [item["symbol"] for item in result] == list(latencies)
+    assert all(item["claude_analysis"]["recommendation"] == "BUY" for item in result)
+    assert streamed[-1] == "KAYNES"  # streamed as each finished, slowest last
+    assert set(streamed) == set(latencies)
+
+
+@pytest.mark.asyncio
+async def test_analyze_candidates_bounds_concurrency_and_times_out_slow_candidates():
+    latencies = {"KAYNES": 5.0, "TANLA": 0.05, "CDSL": 0.05}
+    service, _, _, _ = _build_service()
+    service.feature_extractor = _SlowFeatureExtractor(latencies)
+    service.feature_extraction_concurrency = 2
+    service.feature_extraction_timeout_seconds = 0.2
+
+    started = time.perf_counter()
+    result = await service._analyze_candidates(_seeded_candidates(latencies), {}, memory_context={}, market_conditions={})
+
+    assert time.perf_counter() - started < 1.0
+    assert result[0]["claude_analysis"]["analysis_type"] == "fallback"
+    assert "timed out" in result[0]["analysis_error"]
+    assert [item["claude_analysis"]["analysis_type"] for item in result[1:]] == ["feature_extraction"] * 2
+
+
+@pytest.mark.asyncio
+async def test_usage_limit_from_feature_extraction_cancels_remaining_candidates():
+    symbols = ["KAYNES", "TANLA", "POLYCAB"]
+    service, _, _, _ = _build_service()
+    service.feature_extractor = _SlowFeatureExtractor(
+        dict.fromkeys(symbols, 0.05),
+        error="You've hit your usage limit. Try again at 3pm.",
+    )
+    service.feature_extraction_concurrency = 1
+
+    result = await service._analyze_candidates(_seeded_candidates(symbols), {}, memory_context={}, market_conditions={})
+
+    assert service.feature_extractor.calls == ["KAYNES"]
+    assert [item["claude_analysis"]["analysis_type"] for item in result] == ["blocked"] * 3
+    assert all("usage limit" in item["analysis_error"] for item in result)
+
+
+@pytest.mark.asyncio
+async def test_market_universe_is_filtered_and_screened_with_bitmaps(tmp_path):
+    universe_path = tmp_path / "nse_universe.json"
+    universe_path.write_text(
+        json.dumps(
+            {
+                "universe": [
+                    {"symbol": "HDFCBANK", "name": "HDFC Bank", "sector": "Banking", "cap": "large"},
+                    {"symbol": "KAYNES", "name": "Kaynes", "sector": "Capital Goods", "cap": "mid"},
+                    {"symbol": "TANLA", "name": "Tanla", "sector": "Technology", "cap": "mid"},
+                    {"symbol": "POLYCAB", "name": "Polycab", "sector": "Capital Goods", "cap": "large"},
+                ]
+            }
+        ),
+        encoding="utf-8",
+    )
+    service, _, _, _ = _build_service()
+    service.universe_service = NSEUniverseService(universe_path)
+
+    market_stocks = await service._load_market_universe(
+        {"market_cap_tiers": ["mid", "large"], "sectors": ["Capital Goods", "Technology"]}
+    )
+    assert [stock["symbol"] for stock in market_stocks] == ["KAYNES", "TANLA", "POLYCAB"]
+    assert market_stocks[0]["discovery_source"] == "stateful_opportunity_funnel"
+
+    shortlisted, _, _ = await service._screen_market(
+        {},
+        market_stocks,
+        {"held_symbols": {"POLYCAB"}, "recent_symbols": {"TANLA"}, "stale_watchlist_symbols": set()},
+    )
+    assert [stock["symbol"] for stock in shortlisted] == ["KAYNES"]
@@ -0,0 +1,105 @@
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from src.stores.tick_store import BufferedTickWriter, TickStore
+
+
+def _ts(day: int, hour: int, minute: int = 0) -> str:
+    return datetime(2026, 3, day, hour, minute, tzinfo=timezone.utc).isoformat()
+
+
+def test_tick_store_reads_columns_across_day_partitions(tmp_path):
+    store = TickStore(tmp_path / "ticks")
+    store.append_many([
+        ("INFY", _ts(23, 5), 1500.0, 100, "upstox"),
+        ("INFY", _ts(24, 4), 1510.0, None, "zerodha_kite"),
+        ("TCS", _ts(24, 4), 3900.0, 50, "upstox"),
+        ("INFY", _ts(24, 6), 1512.5, 300, "upstox"),
+    ])
+
+    series = store.read("INFY", since=datetime(2026, 3, 23, tzinfo=timezone.utc))
+
+    assert len(series) == 3
+    assert series.ltp.dtype == np.float64
+    assert series.ltp.tolist() == [1500.0, 1510.0, 1512.5]
+    assert series.volume.tolist() == [100, -1, 300]
+
+    windowed = store.read(
+        "INFY",
+        since=datetime(2026, 3, 24, 0, tzinfo=timezone.utc),
+        until=datetime(2026, 3, 24, 5, tzinfo=timezone.utc),
+    )
+    assert windowed.ltp.tolist() == [1510.0]
+
+    records = windowed.to_records()
+    assert records == [{
+        "price": 1510.0,
+        "volume": None,
+        "timestamp": _ts(24, 4),
+        "provider": "zerodha_kite",
+    }]
+
+    frame = series.to_dataframe()
+    assert list(frame.columns) == ["ltp", "volume"]
+    assert frame.index[0] == datetime(2026, 3, 23, 5, tzinfo=timezone.utc)
+
+
+def test_tick_store_retention_drops_whole_day_partitions(tmp_path):
+    store = TickStore(tmp_path / "ticks")
+    store.append_many([
+        ("INFY", _ts(1, 5), 1400.0, 1, "upstox"),
+        ("INFY", _ts(2, 5), 1410.0, 1, "upstox"),
+        ("INFY", _ts(3, 5), 1420.0, 1, "upstox"),
+    ])
+
+    removed = store.drop_before(date(2026, 3, 3))
+
+    assert removed == 2
+    remaining = store.read("INFY", since=datetime(2026, 3, 1, tzinfo=timezone.utc))
+    assert remaining.ltp.tolist() == [1420.0]
+    assert store.read("UNKNOWN", since=datetime.now(timezone.utc) - timedelta(days=1)).ltp.size == 0
+
+
+def test_tick_store_survives_torn_appends_and_encodes_unsafe_symbols(tmp_path):
+    store = TickStore(tmp_path / "ticks")
+    store.append_many([
+        ("INFY", _ts(24, 4), 1510.0, 10, "upstox"),
+        ("INFY", _ts(24, 5), 1511.0, 20, "upstox"),
+        ("../ESCAPE", _ts(24, 4), 1.0, 1, "upstox"),
+    ])
+    # A crash mid-append leaves half a float64 at the end of one column
+    with open(tmp_path / "ticks" / "INFY" / "2026-03-24" / "ltp.f8", "ab") as handle:
+        handle.write(b"\x00" * 4)
+
+    series = store.read("INFY", since=datetime(2026, 3, 24, tzinfo=timezone.utc))
+    assert series.ltp.tolist() == [1510.0, 1511.0]
+
+    assert not (tmp_path / "ESCAPE").exists()
+    assert (tmp_path / "ticks" / "%2E%2E%2FESCAPE" / "2026-03-24").is_dir()
+    assert store.read("../ESCAPE", since=datetime(2026, 3, 24, tzinfo=timezone.utc)).ltp.tolist() == [1.0]
+
+
+@pytest.mark.asyncio
+async def test_buffered_tick_writer_batches_appends_off_the_loop(tmp_path):
+    store = TickStore(tmp_path / "ticks")
+    writer = BufferedTickWriter(store, max_rows=3, max_delay_ms=10_000)
+    since = datetime(2026, 3, 24, tzinfo=timezone.utc)
+
+    writer.add([("INFY", _ts(24, 4, minute), 1500.0 + minute, None, "upstox") for minute in range(2)])
+    await asyncio.sleep(0.05)
+    assert len(store.read("INFY", since=since)) == 0  # below max_rows, still buffered
+
+    writer.add([("INFY", _ts(24, 4, 2), 1502.0, None, "upstox")])
+    for _ in range(100):
+        if not writer.pending:
+            break
+        await asyncio.sleep(0.01)
+    assert len(store.read("INFY", since=since)) == 3
+
+    writer.add([("INFY", _ts(24, 5), 1503.0, None, "upstox")])
+    await writer.close()
+    assert len(store.read("INFY", since=since)) == 4
+    assert writer.get_stats()["writes"] == 2
@@ -0,0 +1,85 @@
+import copy
+import random
+
+from src.web.websocket_differ import LIST_OPS, WebSocketDiffer
+
+
+def _position(index: int, price: float = 100.0):
+    return {"trade_id": f"trade_{index}", "symbol": f"SYM{index}", "current_price": price, "quantity": 10}
+
+
+def _state(positions):
+    return {"account": {"balance": 100000.0, "positions": positions}, "status": "open"}
+
+
+def test_keyed_list_emits_item_ops_instead_of_whole_list():
+    positions = [_position(i) for i in range(300)]
+    previous = _state(positions)
+    current_positions = [dict(p) for p in positions if p["trade_id"] != "trade_5"]
+    current_positions[10] = {**current_positions[10], "current_price": 101.0}
+    current_positions.append(_position(999))
+    current = _state(current_positions)
+
+    diff = WebSocketDiffer.compute_diff(previous, current)
+
+    ops = diff["changes"]["account"]["positions"][LIST_OPS]
+    assert ops["key"] == "trade_id"
+    assert ops["remove"] == ["trade_5"]
+    assert ops["update"] == [{"key": "trade_11", "changes": {"current_price": 101.0}}]
+    assert [insert["item"]["trade_id"] for insert in ops["insert"]] == ["trade_999"]
+    assert "order" not in ops
+    assert WebSocketDiffer.apply_diff(previous, diff) == current
+
+
+def test_shared_and_version_stamped_subtrees_are_skipped():
+    positions = [_position(i) for i in range(50)]
+    previous = _state(positions)
+
+    # Structural sharing: the unchanged list object is reused, so it is never walked.
+    current = {**previous, "status": "closed"}
+    assert WebSocketDiffer.compute_diff(previous, current)["changes"] == {"status": "closed"}
+
+    stamped_previous = {"portfolio": {"_version": 7, "rows": positions}}
+    stamped_current = {"portfolio": {"_version": 7, "rows": copy.deepcopy(positions)}}
+    assert WebSocketDiffer.compute_diff(stamped_previous, stamped_current) == {}
+
+
+def test_random_keyed_list_edits_round_trip():
+    rng = random.Random(3)
+    for _ in range(50):
+        previous = _state([_position(i, rng.uniform(90, 110)) for i in range(rng.randint(0, 30))])
+        positions = [dict(p) for p in previous["account"]["positions"] if rng.random() > 0.2]
+        for position in positions:
+            if rng.random() < 0.3:
+                position["current_price"] = rng.uniform(90, 110)
+        for index in range(rng.randint(0, 5)):
+            positions.insert(rng.randint(0, len(positions)), _position(1000 + index))
+        if rng.random() < 0.3:
+            rng.shuffle(positions)
+        current = _state(positions)
+
+        diff = WebSocketDiffer.compute_diff(previous, current)
+        if diff:
+            assert WebSocketDiffer.apply_diff(previous, diff) == current
+        else:
+            assert previous == current
+
+
+def test_unkeyed_lists_and_removed_keys_keep_previous_semantics():
+    previous = {"tags": ["a", "b"], "stale": 1, "nested": {"x": 1, "y": 2}}
+    current = {"tags": ["a", "c"], "nested": {"x": 1}}
+
+    diff = WebSocketDiffer.compute_diff(previous, current)
+
+    assert diff["changes"] == {"tags": ["a", "c"], "stale": None, "nested": {"y": None}}
+    assert WebSocketDiffer.apply_diff(previous, diff) == current
+
+
+def test_duplicate_keys_in_previous_fall_back_to_whole_list():
+    previous = _state([_position(1), _position(1, price=105.0), _position(2)])
+    current = _state([_position(1), _position(2)])
+
+    diff = WebSocketDiffer.compute_diff(previous, current)
+
+    assert diff["changes"]["account"]["positions"] == current["account"]["positions"]
+    assert WebSocketDiffer.apply_diff(previous, diff) == current